@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""Synthetic scale benchmark for every pipeline stage.
+
+A deterministic generator writes a synthetic requirement corpus, ontology,
+gold graph, SHACL shapes and competency questions at each requested scale
+(number of ontology triples). Every stage is then timed on those inputs:
+
+* ``requirements.load``        -- :class:`RequirementLoader` over the corpus
+* ``ontology.add_turtle``      -- parsing the ontology through the assembler
+* ``ontology.sanitize_turtle``  -- the Turtle repair heuristics on noisy text
+* ``reasoner.sanitize``        -- literal/restriction/class sanitizers
+* ``shacl.validate``           -- :class:`ShaclValidator` (native SHACL Core engine)
+* ``shacl.pyshacl``            -- :class:`ShaclValidator` with ``engine="pyshacl"``
+* ``shacl.sharded``            -- :class:`ShaclValidator` sharded across all cores
+* ``cq.run``                   -- :class:`CompetencyQuestionRunner`
+* ``metrics``                  -- exact + semantic metrics against the gold graph
+* ``pipeline.e2e``             -- a full heuristic-mode pipeline run
+
+Throughput and peak traced memory per stage are appended to a JSON results
+file keyed by git commit, so runs on different commits can be compared::
+
+    python benchmarks/scale.py --scales 1e2,1e3,1e4
+    python benchmarks/scale.py --compare 28eb2ce 9de4996
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+DEFAULT_RESULTS = PROJECT_ROOT / "benchmarks" / "results" / "scale.json"
+DEFAULT_SCALES = "1e2,1e3,1e4"
+BASE_NS = "http://lod.csd.auth.gr/atm/atm.ttl#"
+
+_PREFIXES = (
+    f"@prefix atm: <{BASE_NS}> .\n"
+    "@prefix owl: <http://www.w3.org/2002/07/owl#> .\n"
+    "@prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .\n"
+    "@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .\n"
+    "@prefix sh: <http://www.w3.org/ns/shacl#> .\n"
+    "@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .\n\n"
+)
+_ACTORS = ("ATM", "Customer", "Bank", "Operator", "Terminal")
+_VERBS = ("dispense", "verify", "log", "maintain", "record", "authorize")
+_ITEMS = ("cash", "card", "account", "transaction", "receipt", "balance")
+
+
+# ---------------------------------------------------------------------------
+# Synthetic corpus
+
+
+@dataclass
+class Corpus:
+    """Paths and sizes of one generated scale point."""
+
+    scale: int
+    root: Path
+    requirements: Path
+    ontology: Path
+    gold: Path
+    shapes: Path
+    cqs: Path
+    triples: int
+    requirement_count: int
+    query_count: int
+
+
+def generate_corpus(scale: int, root: Path, seed: int = 0) -> Corpus:
+    """Write a synthetic corpus whose ontology has roughly ``scale`` triples.
+
+    The ontology mixes a class hierarchy, object/datatype properties with
+    domains and ranges, and typed individuals. About 1% of decimal literals
+    are malformed so the sanitizers have work to do, and the gold graph is
+    the ontology with ~10% of individuals dropped and a few triples added.
+    """
+
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    n_classes = max(5, scale // 200)
+    n_props = max(3, n_classes // 2)
+    schema_triples = n_classes * 3 + n_props * 4 * 2
+    n_individuals = max(1, (scale - schema_triples) // 6)
+
+    lines: List[str] = []
+    for idx in range(n_classes):
+        parent = f"atm:C{(idx - 1) // 2}" if idx else "owl:Thing"
+        lines.append(f'atm:C{idx} a owl:Class ; rdfs:label "Class {idx}" ; rdfs:subClassOf {parent} .')
+    for idx in range(n_props):
+        domain, rng_cls = rng.randrange(n_classes), rng.randrange(n_classes)
+        lines.append(
+            f"atm:p{idx} a owl:ObjectProperty ; rdfs:label \"prop {idx}\" ; "
+            f"rdfs:domain atm:C{domain} ; rdfs:range atm:C{rng_cls} ."
+        )
+        lines.append(
+            f"atm:d{idx} a owl:DatatypeProperty ; rdfs:label \"data {idx}\" ; "
+            f"rdfs:domain atm:C{domain} ; rdfs:range xsd:decimal ."
+        )
+    individuals: List[str] = []
+    for idx in range(n_individuals):
+        amount = f"{rng.randint(1, 999)},{rng.randint(0, 99)}" if rng.random() < 0.01 else f"{rng.random() * 1000:.2f}"
+        individuals.append(
+            f"atm:i{idx} a atm:C{rng.randrange(n_classes)} ; rdfs:label \"individual {idx}\" ; "
+            f"atm:p{rng.randrange(n_props)} atm:i{rng.randrange(n_individuals)} , atm:i{rng.randrange(n_individuals)} ; "
+            f"atm:d{rng.randrange(n_props)} \"{amount}\"^^xsd:decimal ."
+        )
+    ontology_text = _PREFIXES + "\n".join(lines + individuals) + "\n"
+    kept = [line for line in individuals if rng.random() >= 0.1]
+    extra = [f"atm:g{idx} a atm:C{rng.randrange(n_classes)} ." for idx in range(max(1, n_individuals // 20))]
+    gold_text = _PREFIXES + "\n".join(lines + kept + extra) + "\n"
+
+    shapes: List[str] = []
+    for idx in range(n_classes):
+        prop = idx % n_props
+        shapes.append(
+            f"atm:C{idx}Shape a sh:NodeShape ; sh:targetClass atm:C{idx} ;\n"
+            f"  sh:property [ sh:path rdfs:label ; sh:minCount 1 ; sh:datatype xsd:string ] ;\n"
+            f"  sh:property [ sh:path atm:p{prop} ; sh:minCount 1 ] ;\n"
+            f"  sh:property [ sh:path atm:d{prop} ; sh:maxCount 1 ; sh:datatype xsd:decimal ] ."
+        )
+    shapes_text = _PREFIXES + "\n".join(shapes) + "\n"
+
+    queries: List[str] = []
+    header = f"PREFIX atm: <{BASE_NS}>\nPREFIX owl: <http://www.w3.org/2002/07/owl#>\nPREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>\n"
+    for idx in range(min(100, n_classes)):
+        kind = idx % 3
+        if kind == 0:
+            body = f"atm:C{idx} a owl:Class ."
+        elif kind == 1:
+            body = f"atm:C{idx} rdfs:subClassOf* atm:C0 ."
+        else:
+            body = f"?x a atm:C{idx} ; atm:p{idx % n_props} ?y ."
+        queries.append(f"# CQ {idx}\n{header}ASK {{\n  {body}\n}}\n")
+    cq_text = "\n".join(queries)
+
+    requirement_count = max(10, scale // 20)
+    requirements: List[str] = []
+    for idx in range(requirement_count):
+        actor, verb, item = rng.choice(_ACTORS), rng.choice(_VERBS), rng.choice(_ITEMS)
+        requirements.append(
+            json.dumps(
+                {
+                    "id": f"SYN-{idx:06d}",
+                    "title": f"Synthetic requirement {idx}",
+                    "text": f"The {actor} shall {verb} the {item} for request {idx}.",
+                    "boilerplate": {"main": f"<System:{actor}> shall <Function:{verb}> <Item:{item}>"},
+                }
+            )
+        )
+
+    corpus = Corpus(
+        scale=scale,
+        root=root,
+        requirements=root / "requirements.jsonl",
+        ontology=root / "ontology.ttl",
+        gold=root / "gold.ttl",
+        shapes=root / "shapes.ttl",
+        cqs=root / "cqs.rq",
+        triples=n_classes * 3 + n_props * 8 + n_individuals * 6,
+        requirement_count=requirement_count,
+        query_count=len(queries),
+    )
+    corpus.requirements.write_text("\n".join(requirements) + "\n", encoding="utf-8")
+    corpus.ontology.write_text(ontology_text, encoding="utf-8")
+    corpus.gold.write_text(gold_text, encoding="utf-8")
+    corpus.shapes.write_text(shapes_text, encoding="utf-8")
+    corpus.cqs.write_text(cq_text, encoding="utf-8")
+    return corpus
+
+
+def _noisy_turtle(text: str) -> str:
+    """Inject the LLM glitches the sanitizer is meant to repair."""
+
+    noisy: List[str] = []
+    for idx, line in enumerate(text.splitlines()):
+        if idx % 50 == 7:
+            line = line.replace("atm:", "'atm:", 1)
+        elif idx % 50 == 23:
+            line = "Note: the following axioms were generated.\n" + line
+        noisy.append(line)
+    return "\n".join(noisy)
+
+
+# ---------------------------------------------------------------------------
+# Stages
+#
+# Each stage's ``prepare`` does the untimed setup and returns the callable to
+# measure together with the number of items it processes and their unit.
+
+Prepared = Tuple[Callable[[], object], int, str]
+
+
+def _parse(path: Path):
+    from rdflib import Graph
+
+    graph = Graph()
+    graph.parse(path, format="turtle")
+    return graph
+
+
+def _prepare_requirements(corpus: Corpus) -> Prepared:
+    from og_nsd.requirements import RequirementLoader
+
+    return (lambda: RequirementLoader(corpus.requirements).load(None)), corpus.requirement_count, "requirements"
+
+
+def _prepare_add_turtle(corpus: Corpus) -> Prepared:
+    from og_nsd.ontology import OntologyAssembler
+
+    assembler = OntologyAssembler(base_namespace=BASE_NS)
+    text = corpus.ontology.read_text(encoding="utf-8")
+    return (lambda: assembler.add_turtle(assembler.bootstrap(), text)), corpus.triples, "triples"
+
+
+def _prepare_sanitize_turtle(corpus: Corpus) -> Prepared:
+    from og_nsd.ontology import _sanitize_turtle
+
+    text = _noisy_turtle(corpus.ontology.read_text(encoding="utf-8"))
+    return (lambda: _sanitize_turtle(text)), text.count("\n") + 1, "lines"
+
+
+def _prepare_reasoner_sanitize(corpus: Corpus) -> Prepared:
+    from og_nsd.reasoning import OwlreadyReasoner
+
+    graph = _parse(corpus.ontology)
+    reasoner = OwlreadyReasoner(enabled=False)
+    return (lambda: reasoner.run(graph)), len(graph), "triples"
+
+
+def _prepare_shacl(corpus: Corpus, engine: str = "native", workers: int = 1) -> Prepared:
+    from og_nsd.reasoning import OwlreadyReasoner
+    from og_nsd.shacl import ShaclValidator
+
+    graph = OwlreadyReasoner(enabled=False).run(_parse(corpus.ontology)).expanded_graph
+    validator = ShaclValidator(corpus.shapes, engine=engine, workers=workers)
+    return (lambda: validator.validate(graph)), len(graph), "triples"
+
+
+def _prepare_pyshacl(corpus: Corpus) -> Prepared:
+    return _prepare_shacl(corpus, engine="pyshacl")
+
+
+def _prepare_sharded_shacl(corpus: Corpus) -> Prepared:
+    return _prepare_shacl(corpus, workers=os.cpu_count() or 1)
+
+
+def _prepare_cq(corpus: Corpus) -> Prepared:
+    from og_nsd.queries import CompetencyQuestionRunner
+
+    graph = _parse(corpus.ontology)
+    runner = CompetencyQuestionRunner(corpus.cqs)
+    return (lambda: runner.run(graph)), len(runner.queries), "queries"
+
+
+def _prepare_metrics(corpus: Corpus) -> Prepared:
+    from og_nsd.repair import final_metrics
+
+    pred, gold = _parse(corpus.ontology), _parse(corpus.gold)
+    return (lambda: final_metrics(pred, gold)), len(pred) + len(gold), "triples"
+
+
+def _prepare_e2e(corpus: Corpus, max_requirements: Optional[int] = None) -> Prepared:
+    from og_nsd.config import PipelineConfig
+    from og_nsd.pipeline import OntologyDraftingPipeline
+
+    out = corpus.root / "e2e"
+    config = PipelineConfig(
+        requirements_path=corpus.requirements,
+        shapes_path=corpus.shapes,
+        base_ontology_path=None,
+        competency_questions_path=corpus.cqs,
+        output_path=out / "generated.ttl",
+        report_path=out / "report.json",
+        llm_mode="heuristic",
+        base_namespace=BASE_NS,
+        max_iterations=1,
+        max_requirements=max_requirements,
+        intermediate_dir=out,
+    )
+    count = min(corpus.requirement_count, max_requirements or corpus.requirement_count)
+    return (lambda: OntologyDraftingPipeline(config).run()), count, "requirements"
+
+
+STAGES: Dict[str, Callable[[Corpus], Prepared]] = {
+    "requirements.load": _prepare_requirements,
+    "ontology.add_turtle": _prepare_add_turtle,
+    "ontology.sanitize_turtle": _prepare_sanitize_turtle,
+    "reasoner.sanitize": _prepare_reasoner_sanitize,
+    "shacl.validate": _prepare_shacl,
+    "shacl.pyshacl": _prepare_pyshacl,
+    "shacl.sharded": _prepare_sharded_shacl,
+    "cq.run": _prepare_cq,
+    "metrics": _prepare_metrics,
+    "pipeline.e2e": _prepare_e2e,
+}
+
+
+def measure(
+    stage: str,
+    corpus: Corpus,
+    track_memory: bool = True,
+    warmup: bool = True,
+    e2e_max_requirements: Optional[int] = None,
+) -> dict:
+    """Time one stage on ``corpus``.
+
+    With ``warmup`` the stage runs once untimed first, so one-off costs such
+    as lazy imports and SPARQL query compilation are not attributed to the
+    smallest scale.
+    """
+
+    row: dict = {"scale": corpus.scale, "stage": stage}
+    try:
+        if stage == "pipeline.e2e":
+            func, items, unit = _prepare_e2e(corpus, e2e_max_requirements)
+        else:
+            func, items, unit = STAGES[stage](corpus)
+        if warmup:
+            func()
+        if track_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if track_memory else None
+    except Exception as exc:  # noqa: BLE001 - a failing stage must not abort the sweep
+        row["error"] = f"{type(exc).__name__}: {exc}"
+        return row
+    finally:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+    row.update(
+        items=items,
+        unit=unit,
+        seconds=round(seconds, 6),
+        throughput=round(items / seconds, 2) if seconds > 0 else None,
+    )
+    if peak is not None:
+        row["peak_mb"] = round(peak / 2**20, 3)
+    return row
+
+
+# ---------------------------------------------------------------------------
+# Results file
+
+
+def _git_revision() -> str:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=PROJECT_ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def load_results(path: Path) -> dict:
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return {"runs": {}}
+
+
+def record_run(path: Path, revision: str, rows: List[dict]) -> None:
+    """Store ``rows`` under ``revision``, replacing rows for the same scale/stage."""
+
+    import rdflib
+
+    results = load_results(path)
+    run = results["runs"].setdefault(revision, {"rows": []})
+    run.update(
+        timestamp=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        python=platform.python_version(),
+        rdflib=rdflib.__version__,
+        machine=platform.machine(),
+    )
+    replaced = {(row["scale"], row["stage"]) for row in rows}
+    run["rows"] = [row for row in run["rows"] if (row["scale"], row["stage"]) not in replaced] + rows
+    run["rows"].sort(key=lambda row: (row["scale"], list(STAGES).index(row["stage"]) if row["stage"] in STAGES else 99))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+def compare(results: dict, base: str, head: str) -> List[str]:
+    """Format a per-(scale, stage) comparison of two recorded revisions."""
+
+    runs = results["runs"]
+    for revision in (base, head):
+        if revision not in runs:
+            raise SystemExit(f"No recorded run for {revision!r}; known: {', '.join(runs) or '-'}")
+    base_rows = {(row["scale"], row["stage"]): row for row in runs[base]["rows"]}
+    lines = [f"{'scale':>9} {'stage':<26} {base:>12} {head:>12} {'speedup':>8} {'peak MB':>17}"]
+    for row in runs[head]["rows"]:
+        before = base_rows.get((row["scale"], row["stage"]))
+        if before is None or "seconds" not in row or "seconds" not in before:
+            continue
+        speedup = before["seconds"] / row["seconds"] if row["seconds"] else float("inf")
+        memory = f"{before.get('peak_mb', '-')} -> {row.get('peak_mb', '-')}"
+        lines.append(
+            f"{row['scale']:>9} {row['stage']:<26} {before['seconds']:>11.4f}s {row['seconds']:>11.4f}s "
+            f"{speedup:>7.2f}x {memory:>17}"
+        )
+    return lines
+
+
+def _parse_scales(value: str) -> List[int]:
+    return [int(float(item)) for item in value.split(",") if item.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark OG-NSD stages on synthetic corpora")
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help="Comma-separated ontology sizes in triples (e.g. 1e2,1e4,1e6)")
+    parser.add_argument("--stages", help=f"Comma-separated subset of: {', '.join(STAGES)}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", type=Path, help="Keep generated corpora here instead of a temp directory")
+    parser.add_argument("--results", type=Path, default=DEFAULT_RESULTS, help="JSON results file shared across commits")
+    parser.add_argument("--revision", help="Key for this run in the results file (defaults to the git commit)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (faster, no peak memory)")
+    parser.add_argument("--no-warmup", action="store_true", help="Time the first (cold) call of each stage")
+    parser.add_argument("--e2e-max-requirements", type=int, help="Cap requirements for the end-to-end run")
+    parser.add_argument("--compare", nargs="+", metavar="REVISION", help="Compare BASE [HEAD] from the results file and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        results = load_results(args.results)
+        base = args.compare[0]
+        head = args.compare[1] if len(args.compare) > 1 else _git_revision()
+        print("\n".join(compare(results, base, head)))
+        return
+
+    # The synthetic corpus deliberately contains malformed xsd:decimal
+    # literals; keep rdflib's per-literal conversion tracebacks out of the log.
+    logging.getLogger("rdflib.term").setLevel(logging.ERROR)
+
+    stages = [name.strip() for name in args.stages.split(",")] if args.stages else list(STAGES)
+    unknown = [name for name in stages if name not in STAGES]
+    if unknown:
+        parser.error(f"Unknown stage(s): {', '.join(unknown)}")
+
+    with tempfile.TemporaryDirectory(prefix="og_nsd_scale_") as tmp:
+        workdir = args.workdir or Path(tmp)
+        os.environ.setdefault("OG_NSD_CACHE_DIR", str(workdir / "cache"))
+        rows: List[dict] = []
+        for scale in _parse_scales(args.scales):
+            corpus = generate_corpus(scale, workdir / f"scale_{scale}", seed=args.seed)
+            print(f"scale={scale}: {corpus.triples} triples, {corpus.requirement_count} requirements, {corpus.query_count} CQs")
+            for stage in stages:
+                row = measure(
+                    stage,
+                    corpus,
+                    track_memory=not args.no_memory,
+                    warmup=not args.no_warmup,
+                    e2e_max_requirements=args.e2e_max_requirements,
+                )
+                rows.append(row)
+                if "error" in row:
+                    print(f"  {stage:<26} failed: {row['error']}")
+                    continue
+                memory = f" peak={row['peak_mb']:.1f}MB" if "peak_mb" in row else ""
+                print(f"  {stage:<26} {row['seconds']:>9.4f}s {row['throughput']:>12.1f} {row['unit']}/s{memory}")
+
+    revision = args.revision or _git_revision()
+    record_run(args.results, revision, rows)
+    print(f"Recorded {len(rows)} rows for {revision} in {args.results}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Measure CLI startup cost: import time and time-to-first-batch per script.
+
+Each experiment script is launched in a fresh interpreter through a small
+driver that records (a) how long it takes to import the script module and
+(b) how long it takes until the first ``generate_axioms`` call, at which point
+the run is aborted. LLM calls are short-circuited, so no network access or API
+key is needed and no run outputs are produced beyond the script's own
+directory setup.
+
+Example::
+
+    python benchmarks/startup.py --repeat 5 --output build/startup_bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_SCRIPTS = (
+    "scripts/run_pipeline.py --requirements atm_requirements.jsonl --output build/startup_bench.ttl --draft-only",
+    "scripts/run_e1_llm_only.py",
+    "scripts/run_e2_symbolic_only.py",
+    "scripts/run_atm_examples.py",
+    "scripts/run_e4_iterative.py",
+    "scripts/run_e5_cross_domain.py",
+    "scripts/run_e6_cq_oriented.py",
+)
+
+# Executed in the child interpreter. It patches the LLM entry points so the
+# first drafting batch ends the run, then reports timings on stdout.
+_DRIVER = r"""
+import importlib.util, json, sys, time
+t0 = time.perf_counter()
+script, argv = sys.argv[1], sys.argv[2:]
+sys.argv = [script] + argv
+spec = importlib.util.spec_from_file_location("__bench_script__", script)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+t_import = time.perf_counter()
+
+class _FirstBatch(BaseException):
+    pass
+
+def _stop(*args, **kwargs):
+    raise _FirstBatch()
+
+import og_nsd.llm as llm
+llm.HeuristicLLM.generate_axioms = _stop
+llm.OpenAILLM.generate_axioms = _stop
+status = "no_batch"
+try:
+    module.main()
+except _FirstBatch:
+    status = "first_batch"
+t_batch = time.perf_counter()
+print(json.dumps({
+    "status": status,
+    "import_s": t_import - t0,
+    "first_batch_s": t_batch - t0,
+    "heavy_modules": sorted(m for m in ("openai", "owlready2", "pyshacl", "owlrl") if m in sys.modules),
+}))
+"""
+
+
+def measure(command: str, repeat: int) -> dict:
+    script, *argv = command.split()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-c", _DRIVER, str(PROJECT_ROOT / script), *argv],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            env={key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"},
+        )
+        wall = time.perf_counter() - started
+        if completed.returncode != 0:
+            return {"script": script, "error": completed.stderr.strip().splitlines()[-1:]}
+        payload = json.loads(completed.stdout.strip().splitlines()[-1])
+        payload["process_s"] = wall
+        samples.append(payload)
+
+    def _median(key: str) -> float:
+        return round(statistics.median(sample[key] for sample in samples), 4)
+
+    return {
+        "script": script,
+        "status": samples[-1]["status"],
+        "import_s": _median("import_s"),
+        "first_batch_s": _median("first_batch_s"),
+        "process_s": _median("process_s"),
+        "heavy_modules_at_first_batch": samples[-1]["heavy_modules"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark OG-NSD script startup")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per script; medians are reported")
+    parser.add_argument("--output", type=Path, help="Optional JSON file for the results")
+    parser.add_argument("scripts", nargs="*", help="Script command lines (defaults to all experiment scripts)")
+    args = parser.parse_args()
+
+    results = [measure(command, args.repeat) for command in (args.scripts or DEFAULT_SCRIPTS)]
+    for row in results:
+        if "error" in row:
+            print(f"{row['script']}: failed {row['error']}")
+            continue
+        print(
+            f"{row['script']}: import={row['import_s']:.3f}s first_batch={row['first_batch_s']:.3f}s "
+            f"process={row['process_s']:.3f}s heavy={','.join(row['heavy_modules_at_first_batch']) or '-'}"
+        )
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,14 @@
 """OG-NSD: Ontology-Guided Neuro-Symbolic Drafting pipeline."""
 
-from .config import PipelineConfig
-from .ontology import OntologyAssembler, load_schema_context
-from .pipeline import OntologyDraftingPipeline
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - import guard for type checkers
+    from .config import PipelineConfig
+    from .ontology import OntologyAssembler, load_schema_context
+    from .pipeline import OntologyDraftingPipeline
 
 __all__ = [
     "PipelineConfig",
@@ -10,3 +16,26 @@ __all__ = [
     "OntologyAssembler",
     "load_schema_context",
 ]
+
+# Public names resolve on first access so that ``import og_nsd`` (and scripts
+# that only need a few helpers) do not pay for rdflib, openai, pyshacl or
+# owlready2 up front.
+_LAZY_EXPORTS = {
+    "PipelineConfig": ".config",
+    "OntologyDraftingPipeline": ".pipeline",
+    "OntologyAssembler": ".ontology",
+    "load_schema_context": ".ontology",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
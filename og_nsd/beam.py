@@ -0,0 +1,231 @@
+"""Speculative patch application: evaluate several repair candidates, keep the best.
+
+One repair step of the E4 loop asks the LLM to apply a patch plan and keeps
+whatever comes back. :class:`BeamRepair` instead proposes up to ``width``
+candidate applications of the same step (the configured model, the
+deterministic :class:`~og_nsd.llm.HeuristicLLM`, the SHACL-only and CQ-only
+subsets of the plan, and resampled temperatures) and requests them
+concurrently through the model's scheduler.
+
+Every candidate ontology is then reasoned over, validated and queried with
+the competency questions in a process pool (:class:`BeamEvaluator`), since
+these checks are CPU-bound. Candidates are ranked by hard violations, then
+CQ pass rate, then remaining results, and the best one is kept.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from rdflib import Graph
+
+from .ledger import llm_call
+from .llm import HeuristicLLM, LLMClient, LLMResponse, OpenAILLM
+from .queries import CompetencyQuestionRunner
+from .reasoning import OwlreadyReasoner
+from .repair import Patch
+from .routing import RoutedLLM
+from .shacl import ShaclValidator, summarize_shacl_report
+from .tracing import span
+
+# Temperatures tried, in order, once the structural candidates are exhausted.
+_RESAMPLE_TEMPERATURES = (0.4, 0.7, 1.0)
+
+
+@dataclass
+class CandidateScore:
+    hard: int
+    soft: int
+    cq_pass_rate: float
+    consistent: Optional[bool] = None
+
+    def rank_key(self) -> Tuple[int, float, int]:
+        return (self.hard, -self.cq_pass_rate, self.hard + self.soft)
+
+
+@dataclass
+class Candidate:
+    """One proposed application of a patch plan."""
+
+    name: str
+    llm: LLMClient
+    patches: List[Patch]
+    response: Optional[LLMResponse] = None
+    score: Optional[CandidateScore] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "patches": len(self.patches),
+            "score": asdict(self.score) if self.score else None,
+            "error": self.error,
+        }
+
+
+def _resampled(llm: LLMClient, temperature: float) -> Optional[LLMClient]:
+    model = llm.strong.llm if isinstance(llm, RoutedLLM) else llm
+    if isinstance(model, OpenAILLM):
+        return model.with_temperature(temperature)
+    return None
+
+
+def propose_candidates(llm: LLMClient, patches: Sequence[Patch], width: int, base_namespace: str) -> List[Candidate]:
+    """Up to ``width`` distinct ways of applying ``patches``; the plain ``llm`` call comes first."""
+
+    patches = list(patches)
+    shacl = [patch for patch in patches if patch.severity != "CQ"]
+    cq = [patch for patch in patches if patch.severity == "CQ"]
+    candidates = [Candidate("llm", llm, patches)]
+    if not isinstance(llm, HeuristicLLM):
+        candidates.append(Candidate("heuristic", HeuristicLLM(base_namespace), patches))
+    if shacl and cq:
+        candidates.append(Candidate("llm_shacl_only", llm, shacl))
+        candidates.append(Candidate("llm_cq_only", llm, cq))
+    for temperature in _RESAMPLE_TEMPERATURES:
+        resampled = _resampled(llm, temperature)
+        if resampled is not None:
+            candidates.append(Candidate(f"llm_t{temperature}", resampled, patches))
+    return candidates[: max(1, width)]
+
+
+# Per-process validators, built once per worker and reused across candidates.
+_CHECKERS: Dict[tuple, tuple] = {}
+
+
+def _checkers(shapes_path: str, cq_path: Optional[str], reasoning: bool, engine: str) -> tuple:
+    key = (shapes_path, cq_path, reasoning, engine)
+    if key not in _CHECKERS:
+        _CHECKERS[key] = (
+            OwlreadyReasoner(enabled=reasoning),
+            ShaclValidator(Path(shapes_path), engine=engine),
+            CompetencyQuestionRunner(Path(cq_path)) if cq_path else None,
+        )
+    return _CHECKERS[key]
+
+
+def score_ntriples(
+    data: str, shapes_path: str, cq_path: Optional[str], reasoning: bool, engine: str = "native"
+) -> CandidateScore:
+    """Reason over, validate and query one candidate serialized as N-Triples."""
+
+    reasoner, validator, cq_runner = _checkers(shapes_path, cq_path, reasoning, engine)
+    graph = Graph()
+    graph.parse(data=data, format="nt")
+    result = reasoner.run(graph)
+    summary = summarize_shacl_report(validator.validate(result.expanded_graph))
+    cq_results = cq_runner.run(result.expanded_graph) if cq_runner else []
+    passed = sum(1 for item in cq_results if item.success)
+    return CandidateScore(
+        hard=summary["violations"]["hard"],
+        soft=summary["violations"]["soft"],
+        cq_pass_rate=passed / len(cq_results) if cq_results else 0.0,
+        consistent=result.report.consistent,
+    )
+
+
+class BeamEvaluator:
+    """Scores candidate graphs in a process pool (in-process when ``workers`` <= 1)."""
+
+    def __init__(
+        self,
+        shapes_path: Path,
+        competency_questions_path: Optional[Path] = None,
+        reasoning: bool = False,
+        workers: Optional[int] = None,
+        engine: str = "native",
+    ) -> None:
+        cq_path = str(competency_questions_path) if competency_questions_path else None
+        self.args = (str(shapes_path), cq_path, reasoning, engine)
+        self.workers = workers if workers is not None else min(4, os.cpu_count() or 1)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def score(self, graphs: Sequence[Graph]) -> List[CandidateScore]:
+        payloads = [graph.serialize(format="nt") for graph in graphs]
+        if self.workers <= 1 or len(payloads) <= 1:
+            return [score_ntriples(payload, *self.args) for payload in payloads]
+        if self._pool is None:
+            # Spawned, not forked: the scheduler's hedge threads are usually alive by now.
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        futures = [self._pool.submit(score_ntriples, payload, *self.args) for payload in payloads]
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def __enter__(self) -> "BeamEvaluator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class BeamRepair:
+    """Applies a patch plan ``width`` ways and returns the best-scoring response."""
+
+    def __init__(self, llm: LLMClient, assembler, evaluator: BeamEvaluator, width: int, base_namespace: str) -> None:
+        self.llm = llm
+        self.assembler = assembler
+        self.evaluator = evaluator
+        self.width = width
+        self.base_namespace = base_namespace
+
+    def step(self, patches: Sequence[Patch], context_ttl: str, label: str = "") -> Tuple[LLMResponse, List[Candidate]]:
+        """Return the winning response and every candidate with its score.
+
+        When no candidate parses, the plain ``llm`` response is returned so
+        the caller's usual parse-error handling applies.
+        """
+
+        candidates = propose_candidates(self.llm, patches, self.width, self.base_namespace)
+        with span("beam.step", candidates=len(candidates)) as stage:
+
+            def _apply(candidate: Candidate) -> Optional[LLMResponse]:
+                try:
+                    with llm_call("apply_patches", batch_id=f"{label}-{candidate.name}") as call:
+                        patch_dicts = [patch.to_dict() for patch in candidate.patches]
+                        response = candidate.llm.apply_patches(patch_dicts, context_ttl)
+                        call.finish(response)
+                        return response
+                except Exception as exc:
+                    # Only the plain call may fail the step; alternatives are optional.
+                    if candidate is candidates[0]:
+                        raise
+                    candidate.error = f"{type(exc).__name__}: {exc}"
+                    return None
+
+            scheduler = getattr(self.llm, "scheduler", None)
+            responses = scheduler.map_ordered(_apply, candidates) if scheduler else map(_apply, candidates)
+            context = Graph()
+            context.parse(data=context_ttl, format="turtle")
+            parsed: List[Tuple[Candidate, Graph]] = []
+            for candidate, response in zip(candidates, responses):
+                if response is None:
+                    continue
+                candidate.response = response
+                try:
+                    triples = self.assembler.response_triples(response)
+                except ValueError as exc:
+                    candidate.error = str(exc)
+                    continue
+                graph = Graph()
+                graph.addN((s, p, o, graph) for s, p, o in context)
+                graph.addN((s, p, o, graph) for s, p, o in triples)
+                parsed.append((candidate, graph))
+
+            if len(parsed) <= 1:
+                # Nothing to choose between; the main loop evaluates the result anyway.
+                stage.set(parsed=len(parsed))
+                return (parsed[0][0] if parsed else candidates[0]).response, candidates
+            for (candidate, _), score in zip(parsed, self.evaluator.score([graph for _, graph in parsed])):
+                candidate.score = score
+            scored = [candidate for candidate, _ in parsed]
+            best = min(scored, key=lambda candidate: (*candidate.score.rank_key(), candidates.index(candidate)))
+            stage.set(parsed=len(scored), winner=best.name)
+            return best.response, candidates
@@ -22,6 +22,23 @@ class PipelineConfig:
     max_requirements: Optional[int] = 20
     include_boilerplate_context: bool = True
     llm_temperature: float = 0.1
+    llm_model: str = "gpt-5.2"
+    # Route easy drafting batches to this model ("heuristic" for the offline model).
+    llm_fast_model: Optional[str] = None
+    llm_route_threshold: float = 0.5
+    heuristic_lexicon_path: Optional[Path] = None
+    llm_streaming: bool = False
+    llm_stream_budget_tokens: Optional[int] = None
+    symbolic_drafting: bool = False
+    draft_memo: bool = False
+    repair_memo: bool = False
+    local_repair: bool = False
+    # "native" falls back to pyshacl for shapes graphs outside its supported subset.
+    shacl_engine: str = "native"
+    shacl_workers: int = 1
+    dedup_threshold: Optional[float] = None
+    few_shot_k: int = 3
+    few_shot_token_budget: Optional[int] = 1200
     prompt_template_path: Optional[Path] = None
     reasoning_enabled: bool = False
     save_intermediate: bool = True
@@ -31,6 +48,8 @@ class PipelineConfig:
     grounding_ontology_path: Optional[Path] = None
     dev_split_path: Optional[Path] = None
     test_split_path: Optional[Path] = None
+    trace_path: Optional[Path] = None
+    llm_call_log_path: Optional[Path] = None
 
     def ensure_output_dirs(self) -> None:
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
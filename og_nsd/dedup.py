@@ -0,0 +1,143 @@
+"""Near-duplicate requirement detection before drafting.
+
+Requirement texts are normalized (lowercase, punctuation dropped, whitespace
+collapsed) and turned into word-shingle sets. MinHash signatures are banded
+for locality-sensitive hashing, so only requirements that share a band become
+candidates. Candidates are then confirmed by their exact shingle Jaccard
+similarity. Confirmed pairs are merged into clusters, and the first
+requirement of each cluster (in corpus order) is its representative.
+
+Only representatives are drafted. :meth:`DuplicateClusters.expand_provenance`
+then copies each representative's ``sourceRequirement`` annotations to the
+other members, so provenance and reports stay per requirement.
+"""
+from __future__ import annotations
+
+import random
+import re
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Set
+
+from rdflib import Literal, URIRef
+
+from .requirements import Requirement
+
+_PRIME = (1 << 61) - 1
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str, size: int = 2) -> Set[int]:
+    """Hash the word ``size``-grams of the normalized ``text`` (whole text if shorter)."""
+
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    grams = (" ".join(words[idx : idx + size]) for idx in range(len(words) - size + 1))
+    return {zlib.crc32(gram.encode("utf-8")) for gram in grams}
+
+
+def jaccard(left: Set[int], right: Set[int]) -> float:
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+class MinHasher:
+    """MinHash signatures over ``bands * rows`` universal hash functions."""
+
+    def __init__(self, bands: int = 16, rows: int = 4, seed: int = 1) -> None:
+        self.bands = bands
+        self.rows = rows
+        rng = random.Random(seed)
+        self._params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(bands * rows)]
+
+    def signature(self, shingle_set: Set[int]) -> List[int]:
+        if not shingle_set:
+            return [_PRIME] * len(self._params)
+        return [min((a * value + b) % _PRIME for value in shingle_set) for a, b in self._params]
+
+    def band_keys(self, signature: List[int]) -> List[tuple]:
+        rows = self.rows
+        return [(band, tuple(signature[band * rows : (band + 1) * rows])) for band in range(self.bands)]
+
+
+@dataclass
+class DuplicateClusters:
+    """Result of :func:`find_near_duplicates`."""
+
+    representatives: List[Requirement]
+    # Representative identifier -> identifiers of the members it stands for.
+    members: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def duplicates(self) -> int:
+        return sum(len(ids) for ids in self.members.values())
+
+    def expand_provenance(self, graph, base_namespace: str) -> int:
+        """Copy representatives' ``sourceRequirement`` annotations to their members.
+
+        Returns the number of triples added.
+        """
+
+        predicate = URIRef(base_namespace.rstrip("#/") + "#sourceRequirement")
+        added = []
+        for representative, member_ids in self.members.items():
+            for node in graph.subjects(predicate, Literal(representative)):
+                added.extend((node, predicate, Literal(member)) for member in member_ids)
+        graph.addN((s, p, o, graph) for s, p, o in added)
+        return len(added)
+
+    def to_dict(self) -> dict:
+        return {
+            "representatives": len(self.representatives),
+            "duplicates": self.duplicates,
+            "clusters": {rep: list(ids) for rep, ids in self.members.items()},
+        }
+
+
+def find_near_duplicates(
+    requirements: Sequence[Requirement],
+    threshold: float = 0.8,
+    hasher: MinHasher | None = None,
+) -> DuplicateClusters:
+    """Cluster requirements whose texts have shingle Jaccard similarity >= ``threshold``."""
+
+    hasher = hasher or MinHasher()
+    shingle_sets = [shingles(req.text) for req in requirements]
+    parent = list(range(len(requirements)))
+
+    def _find(idx: int) -> int:
+        while parent[idx] != idx:
+            parent[idx] = parent[parent[idx]]
+            idx = parent[idx]
+        return idx
+
+    buckets: Dict[tuple, List[int]] = {}
+    for idx, shingle_set in enumerate(shingle_sets):
+        if not shingle_set:
+            continue
+        for key in hasher.band_keys(hasher.signature(shingle_set)):
+            buckets.setdefault(key, []).append(idx)
+
+    checked: Set[tuple] = set()
+    for candidates in buckets.values():
+        for pos, left in enumerate(candidates):
+            for right in candidates[pos + 1 :]:
+                if (left, right) in checked:
+                    continue
+                checked.add((left, right))
+                if _find(left) != _find(right) and jaccard(shingle_sets[left], shingle_sets[right]) >= threshold:
+                    # Keep the earliest requirement as the root so it becomes the representative.
+                    low, high = sorted((_find(left), _find(right)))
+                    parent[high] = low
+
+    representatives: List[Requirement] = []
+    members: Dict[str, List[str]] = {}
+    for idx, req in enumerate(requirements):
+        root = _find(idx)
+        if root == idx:
+            representatives.append(req)
+        else:
+            members.setdefault(requirements[root].identifier, []).append(req.identifier)
+    return DuplicateClusters(representatives=representatives, members=members)
@@ -0,0 +1,130 @@
+"""Retrieval of few-shot exemplars from the dev split.
+
+:class:`ExemplarIndex` is built once per run over the dev-split requirements
+(text plus boilerplate, with tag values kept and tag types dropped). For each
+drafting batch it returns the ``k`` exemplars with the highest Okapi BM25
+score against the batch, skipping exemplars whose rendered block would push
+the selection past ``token_budget``. Block sizes are measured once when the
+index is built; :class:`~og_nsd.llm.OpenAILLM` caches the rendered blocks
+themselves.
+"""
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from typing import List, Optional, Sequence
+
+from .requirements import Requirement
+
+_TAG_RE = re.compile(r"<\w+:([^<>]+)>")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from if in is it its no not of on or shall should the then this to when with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [word for word in _WORD_RE.findall(_TAG_RE.sub(r" \1 ", text).lower()) if word not in _STOPWORDS]
+
+
+def requirement_tokens(requirement: Requirement) -> List[str]:
+    return tokenize(f"{requirement.text} {requirement.boilerplate}")
+
+
+def render_exemplar(exemplar: Requirement) -> str:
+    """Format one exemplar as it appears in the few-shot prompt section."""
+
+    lines = [f"[{exemplar.identifier}] {exemplar.text}"]
+    if exemplar.axioms is not None:
+        for key in ("prefixes", "tbox", "abox"):
+            axioms = exemplar.axioms.get(key)
+            if not axioms:
+                continue
+            if isinstance(axioms, dict):
+                lines.extend(f"@prefix {prefix}: <{uri}> ." for prefix, uri in axioms.items())
+            elif isinstance(axioms, list):
+                lines.extend(axioms)
+    return "\n".join(lines)
+
+
+def estimate_tokens(text: str) -> int:
+    # Same rough 4-characters-per-token rule as the request scheduler.
+    return max(1, len(text) // 4)
+
+
+class ExemplarIndex:
+    """BM25 index over dev-split exemplars."""
+
+    def __init__(
+        self,
+        exemplars: Sequence[Requirement],
+        k: int = 3,
+        token_budget: Optional[int] = None,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ) -> None:
+        self.exemplars = list(exemplars)
+        self.k = k
+        self.token_budget = token_budget
+        self.k1 = k1
+        self.b = b
+        self._term_counts = [Counter(requirement_tokens(req)) for req in self.exemplars]
+        self._lengths = [sum(counts.values()) for counts in self._term_counts]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+        document_frequency: Counter = Counter()
+        for counts in self._term_counts:
+            document_frequency.update(counts.keys())
+        total = len(self.exemplars)
+        self._idf = {
+            term: math.log(1 + (total - freq + 0.5) / (freq + 0.5)) for term, freq in document_frequency.items()
+        }
+        self._block_tokens = [estimate_tokens(render_exemplar(req)) for req in self.exemplars]
+
+    def settings(self) -> dict:
+        return {
+            "exemplars": [req.identifier for req in self.exemplars],
+            "k": self.k,
+            "token_budget": self.token_budget,
+        }
+
+    def scores(self, query_tokens: Sequence[str]) -> List[float]:
+        query = Counter(query_tokens)
+        scores = []
+        for counts, length in zip(self._term_counts, self._lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self._avg_length) if self._avg_length else self.k1
+            score = 0.0
+            for term, weight in query.items():
+                freq = counts.get(term)
+                if freq:
+                    score += weight * self._idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            scores.append(score)
+        return scores
+
+    def select(self, requirements: Sequence[Requirement]) -> List[Requirement]:
+        """Return up to ``k`` exemplars for a batch, most similar first.
+
+        Requirements of the batch itself are never used as their own exemplar,
+        and exemplars with no term overlap are skipped.
+        """
+
+        query: List[str] = []
+        for req in requirements:
+            query.extend(requirement_tokens(req))
+        excluded = {req.identifier for req in requirements}
+        scores = self.scores(query)
+        ranked = sorted(range(len(self.exemplars)), key=lambda idx: (-scores[idx], idx))
+        chosen: List[Requirement] = []
+        spent = 0
+        for idx in ranked:
+            if len(chosen) == self.k or scores[idx] <= 0:
+                break
+            exemplar = self.exemplars[idx]
+            if exemplar.identifier in excluded:
+                continue
+            cost = self._block_tokens[idx]
+            if self.token_budget is not None and spent + cost > self.token_budget:
+                continue
+            chosen.append(exemplar)
+            spent += cost
+        return chosen
@@ -0,0 +1,293 @@
+"""Dry-run forecasts of LLM calls, tokens, cost and wall-clock time.
+
+A forecast starts from the prompts a run would send. Drafting prompts are
+built with :meth:`~og_nsd.llm.OpenAILLM.axiom_messages` for every batch, and
+repair prompts are built for the expected number of repair calls. Tokens are
+counted locally, with ``tiktoken`` when it is installed and the scheduler's
+≈4 characters per token rule otherwise.
+
+Completion sizes, latencies, provider retries and cached-prompt shares come
+from a :class:`CallProfile` per call kind. Profiles are fitted from the
+NDJSON call logs of earlier runs (:meth:`og_nsd.ledger.CallLedger.write_ndjson`):
+latency is a linear fit on completion tokens, and drafting completions are
+taken per requirement. Without logs, conservative defaults apply.
+
+Wall-clock time is simulated per phase. Drafting batches run on
+``concurrency`` workers in submission order, the way
+:meth:`~og_nsd.scheduler.RequestScheduler.map_ordered` runs them. Repair
+calls run one after another. Optional RPM/TPM limits act as throughput
+floors.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .exemplars import ExemplarIndex
+from .llm import OpenAILLM
+from .ontology import SchemaContext
+from .repair import Patch
+from .requirements import Requirement
+from .scheduler import estimate_message_tokens
+
+# Chat formatting adds a few tokens per message on top of the content.
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def load_tokenizer(model: str) -> Tuple[Callable[[str], int], str]:
+    """Return a token counter for ``model`` and the name of the encoding used."""
+
+    try:
+        import tiktoken
+    except Exception:  # pragma: no cover - optional dependency
+        return (lambda text: estimate_message_tokens([{"content": text}])), "chars/4"
+    try:
+        encoding = tiktoken.encoding_for_model(model)
+    except KeyError:
+        encoding = tiktoken.get_encoding("o200k_base")
+    return (lambda text: len(encoding.encode(text))), encoding.name
+
+
+@dataclass
+class PlannedCall:
+    kind: str
+    prompt_tokens: int
+    requirements: int = 0
+
+
+@dataclass
+class Phase:
+    """Calls that run together; ``concurrent`` phases share the worker pool."""
+
+    name: str
+    calls: List[PlannedCall] = field(default_factory=list)
+    concurrent: bool = True
+
+
+@dataclass
+class CallProfile:
+    """Expected behaviour of one call kind."""
+
+    base_latency_s: float = 2.0
+    per_token_s: float = 0.02
+    completion_tokens: float = 400.0
+    completion_per_requirement: Optional[float] = None
+    attempts: float = 1.0
+    cached_fraction: float = 0.0
+    calls_per_run: Optional[float] = None
+    samples: int = 0
+
+    def completion_for(self, call: PlannedCall) -> float:
+        if self.completion_per_requirement is not None and call.requirements:
+            return self.completion_per_requirement * call.requirements
+        return self.completion_tokens
+
+    def latency_for(self, call: PlannedCall) -> float:
+        return (self.base_latency_s + self.per_token_s * self.completion_for(call)) * self.attempts
+
+    def to_dict(self) -> dict:
+        return {key: round(value, 4) if isinstance(value, float) else value for key, value in vars(self).items()}
+
+
+DEFAULT_PROFILES: Dict[str, CallProfile] = {
+    "generate_axioms": CallProfile(completion_tokens=600.0, completion_per_requirement=120.0),
+    "generate_patch": CallProfile(completion_tokens=400.0),
+    # apply_patches re-emits the whole ontology.
+    "apply_patches": CallProfile(completion_tokens=2500.0),
+}
+
+
+def fit_profiles(records: Iterable[dict], runs: int = 1) -> Dict[str, CallProfile]:
+    """Fit a :class:`CallProfile` per kind from ledger records of ``runs`` runs."""
+
+    by_kind: Dict[str, List[dict]] = {}
+    for record in records:
+        if record.get("cache_hit") or record.get("error"):
+            continue
+        by_kind.setdefault(record["kind"], []).append(record)
+
+    profiles = dict(DEFAULT_PROFILES)
+    for kind, items in by_kind.items():
+        default = DEFAULT_PROFILES.get(kind, CallProfile())
+        completions = [float(item.get("completion_tokens", 0)) for item in items]
+        latencies = [float(item.get("latency_s", 0.0)) for item in items]
+        attempts = [max(1, int(item.get("attempts") or 1)) for item in items]
+        base, slope = _linear_fit(completions, latencies, default.per_token_s)
+        requirements = sum(int(item.get("requirements", 0)) for item in items)
+        prompt_tokens = sum(int(item.get("prompt_tokens", 0)) for item in items)
+        cached_tokens = sum(int(item.get("cached_tokens", 0)) for item in items)
+        profiles[kind] = CallProfile(
+            # The fitted latency already includes retries; divide them back out.
+            base_latency_s=base / (sum(attempts) / len(attempts)),
+            per_token_s=slope / (sum(attempts) / len(attempts)),
+            completion_tokens=sum(completions) / len(completions),
+            completion_per_requirement=sum(completions) / requirements if requirements else None,
+            attempts=sum(attempts) / len(attempts),
+            cached_fraction=cached_tokens / prompt_tokens if prompt_tokens else 0.0,
+            calls_per_run=len(items) / max(1, runs),
+            samples=len(items),
+        )
+    return profiles
+
+
+def load_profiles(paths: Sequence[Path]) -> Dict[str, CallProfile]:
+    """Fit profiles from NDJSON call logs (one file per run); defaults when ``paths`` is empty."""
+
+    records: List[dict] = []
+    for path in paths:
+        with Path(path).open("r", encoding="utf-8") as handle:
+            records.extend(json.loads(line) for line in handle if line.strip())
+    return fit_profiles(records, runs=len(paths)) if records else dict(DEFAULT_PROFILES)
+
+
+def _linear_fit(xs: List[float], ys: List[float], default_slope: float) -> Tuple[float, float]:
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if spread == 0:
+        # One completion size only: keep the default slope and fit the intercept.
+        return max(0.0, mean_y - default_slope * mean_x), default_slope
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+    if slope < 0:
+        return mean_y, 0.0
+    return max(0.0, mean_y - slope * mean_x), slope
+
+
+def expected_repair_calls(kind: str, profiles: Dict[str, CallProfile], max_calls: int) -> int:
+    """Repair calls per run: the logged average when known, otherwise the worst case."""
+
+    observed = profiles.get(kind, CallProfile()).calls_per_run
+    if observed is None:
+        return max_calls
+    return min(max_calls, round(observed))
+
+
+def _makespan(latencies: List[float], workers: int) -> float:
+    finish = [0.0] * max(1, workers)
+    for latency in latencies:
+        heapq.heapreplace(finish, finish[0] + latency)
+    return max(finish)
+
+
+def forecast(
+    phases: Sequence[Phase],
+    profiles: Dict[str, CallProfile],
+    concurrency: Sequence[int] = (1, 4, 8),
+    prices: Optional[Dict[str, float]] = None,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+) -> dict:
+    """Totals per call kind and wall-clock seconds per concurrency setting.
+
+    ``prices`` are USD per million tokens for ``prompt``, ``completion`` and
+    (optionally) ``cached`` prompt tokens.
+    """
+
+    by_kind: Dict[str, Dict[str, float]] = {}
+    for phase in phases:
+        for call in phase.calls:
+            profile = profiles.get(call.kind, CallProfile())
+            entry = by_kind.setdefault(
+                call.kind, {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0}
+            )
+            entry["calls"] += 1
+            entry["prompt_tokens"] += call.prompt_tokens
+            entry["cached_tokens"] += call.prompt_tokens * profile.cached_fraction
+            entry["completion_tokens"] += profile.completion_for(call)
+    for entry in by_kind.values():
+        for key in ("cached_tokens", "completion_tokens"):
+            entry[key] = int(round(entry[key]))
+
+    totals = {
+        key: sum(entry[key] for entry in by_kind.values())
+        for key in ("calls", "prompt_tokens", "cached_tokens", "completion_tokens")
+    }
+    totals["total_tokens"] = totals["prompt_tokens"] + totals["completion_tokens"]
+    report: dict = {**totals, "by_kind": by_kind}
+    if prices:
+        cached_price = prices.get("cached", prices.get("prompt", 0.0))
+        uncached = totals["prompt_tokens"] - totals["cached_tokens"]
+        cost = (
+            uncached * prices.get("prompt", 0.0)
+            + totals["cached_tokens"] * cached_price
+            + totals["completion_tokens"] * prices.get("completion", 0.0)
+        ) / 1e6
+        report["cost_usd"] = round(cost, 4)
+
+    wall: Dict[str, float] = {}
+    for workers in concurrency:
+        seconds = 0.0
+        for phase in phases:
+            latencies = [profiles.get(call.kind, CallProfile()).latency_for(call) for call in phase.calls]
+            elapsed = _makespan(latencies, workers) if phase.concurrent else sum(latencies)
+            if requests_per_minute:
+                elapsed = max(elapsed, 60.0 * len(phase.calls) / requests_per_minute)
+            if tokens_per_minute:
+                tokens = sum(
+                    call.prompt_tokens + profiles.get(call.kind, CallProfile()).completion_for(call)
+                    for call in phase.calls
+                )
+                elapsed = max(elapsed, 60.0 * tokens / tokens_per_minute)
+            seconds += elapsed
+        wall[str(workers)] = round(seconds, 1)
+    report["wall_s"] = wall
+    return report
+
+
+def planned_call(counter: Callable[[str], int], kind: str, messages: List[dict], requirements: int = 0) -> PlannedCall:
+    tokens = sum(counter(str(message.get("content", ""))) + _MESSAGE_OVERHEAD_TOKENS for message in messages)
+    return PlannedCall(kind=kind, prompt_tokens=tokens, requirements=requirements)
+
+
+def plan_drafting(
+    llm: OpenAILLM,
+    batches: Sequence[Sequence[Requirement]],
+    counter: Callable[[str], int],
+    schema_context: SchemaContext | None = None,
+    exemplar_index: ExemplarIndex | None = None,
+) -> Phase:
+    """One drafting call per batch, with the exact prompt the run would send."""
+
+    calls = []
+    for batch in batches:
+        exemplars = exemplar_index.select(batch) if exemplar_index else None
+        messages = llm.axiom_messages(batch, schema_context, exemplars or None)
+        calls.append(planned_call(counter, "generate_axioms", messages, requirements=len(batch)))
+    return Phase("draft", calls)
+
+
+def plan_repairs(
+    llm: OpenAILLM,
+    kind: str,
+    calls: int,
+    counter: Callable[[str], int],
+    context_chars: int,
+    issues: int = 5,
+) -> Phase:
+    """``calls`` sequential repair calls over a placeholder ontology of ``context_chars``.
+
+    The violations are not known before the run, so ``issues`` placeholder
+    lines (or patches) stand in for them; the repair prompts truncate the
+    ontology, which bounds the error of this estimate.
+    """
+
+    filler = "atm:PlaceholderConcept a owl:Class ; rdfs:label \"Placeholder concept\" .\n"
+    context = (filler * (context_chars // len(filler) + 1))[:context_chars]
+    if kind == "apply_patches":
+        patch = Patch(
+            action="addProperty",
+            subject="atm:Subject",
+            predicate="atm:relatesTo",
+            object="atm:Object",
+            message="Less than 1 values on atm:Subject->atm:relatesTo",
+            source_shape="atm:SubjectShape",
+            severity="Violation",
+        )
+        messages = llm.apply_patch_messages([patch.to_dict()] * issues, context)
+    else:
+        summary = "atm:Subject violates sh:MinCountConstraintComponent on atm:relatesTo (1 node)"
+        messages = llm.patch_messages([summary] * issues, context)
+    return Phase(kind, [planned_call(counter, kind, messages) for _ in range(calls)], concurrent=False)
@@ -0,0 +1,325 @@
+"""Parsed RDF graph caching: in-process copy-on-write overlays and an on-disk binary cache."""
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import rdflib
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.store import Store
+from rdflib.util import guess_format
+
+
+@dataclass
+class CachedGraph:
+    """A parsed file shared by every caller in the process."""
+
+    path: Path
+    digest: str
+    graph: Graph
+    text: str
+
+
+_CACHE: Dict[Tuple[str, str], CachedGraph] = {}
+_DIGESTS: Dict[Tuple[str, int, int], str] = {}
+_LOCK = threading.Lock()
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 of ``path``, memoized on ``(path, mtime, size)``."""
+
+    stat = path.stat()
+    stat_key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    digest = _DIGESTS.get(stat_key)
+    if digest is None:
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        _DIGESTS[stat_key] = digest
+    return digest
+
+
+def load_cached(path: Path, format: Optional[str] = None) -> CachedGraph:
+    """Parse ``path`` once per process and content hash.
+
+    The returned :class:`CachedGraph` is shared: callers must treat
+    ``graph`` as read-only and use :func:`overlay_graph` when they need to
+    add or remove triples.
+    """
+
+    path = Path(path)
+    key = (str(path.resolve()), file_digest(path))
+    with _LOCK:
+        entry = _CACHE.get(key)
+        if entry is None:
+            text = path.read_text(encoding="utf-8")
+            graph = _load_binary(key[1])
+            if graph is None:
+                graph = Graph()
+                graph.parse(data=text, format=format or _guess_format(path))
+                _store_binary(graph, key[1])
+            entry = CachedGraph(path=path, digest=key[1], graph=graph, text=text)
+            _CACHE[key] = entry
+    return entry
+
+
+def load_graph(path: Path, format: Optional[str] = None) -> Graph:
+    """Return a writable view of the cached graph parsed from ``path``.
+
+    Replaces ``Graph().parse(path)`` for read-mostly inputs such as gold
+    ontologies, grounding TBoxes and shapes: the file is parsed once and each
+    call receives its own copy-on-write overlay.
+    """
+
+    return overlay_graph(load_cached(path, format).graph)
+
+
+def overlay_graph(base: Graph) -> Graph:
+    """Layer a writable graph over ``base`` without copying its triples."""
+
+    return Graph(store=OverlayStore(base))
+
+
+def clear_graph_cache() -> None:
+    with _LOCK:
+        _CACHE.clear()
+        _DIGESTS.clear()
+
+
+def _guess_format(path: Path) -> str:
+    return guess_format(str(path)) or "turtle"
+
+
+# ---------------------------------------------------------------------------
+# On-disk binary cache
+#
+# Layout: magic, ``<I`` header length, JSON header, JSON term table, padding
+# to a 4-byte boundary and finally the triples as little-endian ``uint32``
+# term indexes (s, p, o). The header records the rdflib and format versions;
+# any mismatch, or a truncated/corrupt file, is treated as a cache miss.
+
+_BINARY_MAGIC = b"OGNSDG\x00\x01"
+_BINARY_FORMAT_VERSION = 1
+
+
+def cache_dir() -> Optional[Path]:
+    """Return the on-disk cache directory, or ``None`` when disabled.
+
+    ``OG_NSD_CACHE_DIR`` overrides the default ``~/.cache/og_nsd``; setting it
+    to an empty string, ``0`` or ``off`` disables on-disk caching.
+    """
+
+    value = os.environ.get("OG_NSD_CACHE_DIR")
+    if value is None:
+        return Path.home() / ".cache" / "og_nsd"
+    if value.strip().lower() in {"", "0", "off", "none"}:
+        return None
+    return Path(value)
+
+
+def _binary_path(digest: str) -> Optional[Path]:
+    root = cache_dir()
+    if root is None:
+        return None
+    version = f"rdflib{rdflib.__version__}-v{_BINARY_FORMAT_VERSION}"
+    return root / "graphs" / f"{digest}-{version}.bin"
+
+
+def encode_term(term) -> list:
+    """JSON-friendly ``[kind, ...]`` form of an RDF term; :func:`decode_term` reverses it."""
+
+    if isinstance(term, Literal):
+        datatype = str(term.datatype) if term.datatype is not None else None
+        return ["L", str(term), datatype, term.language]
+    if isinstance(term, BNode):
+        return ["B", str(term)]
+    return ["U", str(term)]
+
+
+def decode_term(entry: list):
+    kind = entry[0]
+    if kind == "U":
+        return URIRef(entry[1])
+    if kind == "B":
+        return BNode(entry[1])
+    datatype = URIRef(entry[2]) if entry[2] is not None else None
+    return Literal(entry[1], datatype=datatype, lang=entry[3])
+
+
+def dump_binary_graph(graph: Graph, path: Path, digest: str) -> None:
+    """Write ``graph`` to ``path`` as an interned term table plus integer triples."""
+
+    index: Dict[object, int] = {}
+    terms: List[list] = []
+    triples: List[int] = []
+    for triple in graph:
+        for term in triple:
+            term_id = index.get(term)
+            if term_id is None:
+                term_id = index[term] = len(terms)
+                terms.append(encode_term(term))
+            triples.append(term_id)
+
+    term_bytes = json.dumps(terms, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    header = {
+        "format": _BINARY_FORMAT_VERSION,
+        "rdflib": rdflib.__version__,
+        "digest": digest,
+        "namespaces": [[prefix, str(ns)] for prefix, ns in graph.namespaces()],
+        "terms_length": len(term_bytes),
+        "triple_count": len(triples) // 3,
+    }
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    offset = len(_BINARY_MAGIC) + 4 + len(header_bytes) + len(term_bytes)
+    padding = b"\x00" * (-offset % 4)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("wb") as handle:
+        handle.write(_BINARY_MAGIC)
+        handle.write(struct.pack("<I", len(header_bytes)))
+        handle.write(header_bytes)
+        handle.write(term_bytes)
+        handle.write(padding)
+        handle.write(struct.pack(f"<{len(triples)}I", *triples))
+    os.replace(tmp_path, path)
+
+
+def load_binary_graph(path: Path, digest: Optional[str] = None) -> Optional[Graph]:
+    """Map a binary graph written by :func:`dump_binary_graph`.
+
+    Returns ``None`` when the file is missing, was written by another rdflib
+    or format version, does not match ``digest`` or is corrupt.
+    """
+
+    try:
+        with path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _decode_binary(mapped, digest)
+    except (OSError, ValueError, KeyError, IndexError, TypeError, struct.error):
+        return None
+
+
+def _decode_binary(mapped: mmap.mmap, digest: Optional[str]) -> Optional[Graph]:
+    magic_end = len(_BINARY_MAGIC)
+    if mapped[:magic_end] != _BINARY_MAGIC:
+        return None
+    (header_length,) = struct.unpack_from("<I", mapped, magic_end)
+    cursor = magic_end + 4
+    header = json.loads(mapped[cursor : cursor + header_length])
+    if (
+        header["format"] != _BINARY_FORMAT_VERSION
+        or header["rdflib"] != rdflib.__version__
+        or (digest is not None and header["digest"] != digest)
+    ):
+        return None
+    cursor += header_length
+    terms = [decode_term(entry) for entry in json.loads(mapped[cursor : cursor + header["terms_length"]])]
+    cursor += header["terms_length"]
+    cursor += -cursor % 4
+    count = header["triple_count"] * 3
+    if cursor + count * 4 != len(mapped):
+        return None
+
+    view = memoryview(mapped)[cursor:]
+    if sys.byteorder == "little":
+        ids = view.cast("I")
+    else:  # pragma: no cover - big-endian hosts
+        ids = struct.unpack_from(f"<{count}I", mapped, cursor)
+    try:
+        graph = Graph()
+        for prefix, namespace in header["namespaces"]:
+            graph.bind(prefix, namespace, override=True)
+        graph.addN((terms[ids[i]], terms[ids[i + 1]], terms[ids[i + 2]], graph) for i in range(0, count, 3))
+    finally:
+        if isinstance(ids, memoryview):
+            ids.release()
+        view.release()
+    return graph
+
+
+def _load_binary(digest: str) -> Optional[Graph]:
+    path = _binary_path(digest)
+    if path is None or not path.exists():
+        return None
+    return load_binary_graph(path, digest)
+
+
+def _store_binary(graph: Graph, digest: str) -> None:
+    path = _binary_path(digest)
+    if path is None:
+        return
+    try:
+        dump_binary_graph(graph, path, digest)
+    except OSError:  # pragma: no cover - read-only or full cache directory
+        pass
+
+
+class OverlayStore(Store):
+    """rdflib store that reads through to a shared base graph.
+
+    Additions go to a private overlay graph and removals of base triples are
+    recorded as tombstones, so the base graph is never modified and its
+    triples are never duplicated.
+    """
+
+    def __init__(self, base: Graph) -> None:
+        super().__init__()
+        self.base = base
+        self.overlay = Graph(bind_namespaces="none")
+        self.removed: set = set()
+
+    def add(self, triple, context, quoted: bool = False) -> None:
+        if triple in self.base:
+            self.removed.discard(triple)
+            return
+        self.overlay.add(triple)
+
+    def remove(self, triple, context=None) -> None:
+        for match in list(self._iter_triples(triple)):
+            if match in self.base:
+                self.removed.add(match)
+            else:
+                self.overlay.remove(match)
+
+    def triples(self, triple_pattern, context=None):
+        for triple in self._iter_triples(triple_pattern):
+            yield triple, iter(())
+
+    def _iter_triples(self, pattern) -> Iterator[tuple]:
+        removed = self.removed
+        for triple in self.base.triples(pattern):
+            if not removed or triple not in removed:
+                yield triple
+        yield from self.overlay.triples(pattern)
+
+    def __len__(self, context=None) -> int:
+        return len(self.base) - len(self.removed) + len(self.overlay)
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    def bind(self, prefix, namespace, override: bool = True) -> None:
+        self.overlay.store.bind(prefix, namespace, override=override)
+
+    def namespace(self, prefix):
+        return self.overlay.store.namespace(prefix) or self.base.store.namespace(prefix)
+
+    def prefix(self, namespace):
+        return self.overlay.store.prefix(namespace) or self.base.store.prefix(namespace)
+
+    def namespaces(self):
+        seen_prefixes: set = set()
+        seen_namespaces: set = set()
+        for prefix, namespace in self.overlay.store.namespaces():
+            seen_prefixes.add(prefix)
+            seen_namespaces.add(namespace)
+            yield prefix, namespace
+        for prefix, namespace in self.base.store.namespaces():
+            if prefix not in seen_prefixes and namespace not in seen_namespaces:
+                yield prefix, namespace
@@ -0,0 +1,186 @@
+"""Per-run ledger of every LLM call.
+
+Like :mod:`og_nsd.tracing`, a :class:`CallLedger` is activated for a run and
+:func:`llm_call` records into whichever ledger is active (and is a no-op
+otherwise). Callers wrap each model call::
+
+    with llm_call("generate_axioms", batch_id="batch-3", requirements=5) as call:
+        response = llm.generate_axioms(batch)
+        call.finish(response)
+
+Clients fill in what only they know through :func:`current_call`:
+:class:`~og_nsd.llm.OpenAILLM` sets the model and counts provider attempts
+(so retries and hedges show up), and :class:`~og_nsd.routing.RoutedLLM` sets
+the tier. The ledger reports totals and latency percentiles per call kind and
+can be written as NDJSON, one call per line.
+"""
+from __future__ import annotations
+
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .scheduler import _percentile
+
+_TOKEN_FIELDS = ("prompt_tokens", "completion_tokens", "cached_tokens", "total_tokens")
+
+
+@dataclass
+class CallRecord:
+    """One LLM call (or one batch of cache hits when ``cache_hit`` is set)."""
+
+    seq: int
+    kind: str
+    batch_id: Optional[str] = None
+    model: Optional[str] = None
+    tier: Optional[str] = None
+    requirements: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    total_tokens: int = 0
+    started_s: float = 0.0
+    latency_s: float = 0.0
+    attempts: int = 0
+    cache_hit: bool = False
+    error: Optional[str] = None
+
+    @property
+    def retries(self) -> int:
+        return max(0, self.attempts - 1)
+
+    def finish(self, response: Any) -> None:
+        """Take token counts from an :class:`~og_nsd.llm.LLMResponse`."""
+
+        usage = getattr(response, "token_usage", None) or {}
+        self.prompt_tokens = usage.get("prompt_tokens", usage.get("input_tokens", 0))
+        self.completion_tokens = usage.get("completion_tokens", usage.get("output_tokens", 0))
+        self.cached_tokens = usage.get("cached_tokens", 0)
+        self.total_tokens = usage.get("total_tokens", self.prompt_tokens + self.completion_tokens)
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload = asdict(self)
+        payload["started_s"] = round(self.started_s, 6)
+        payload["latency_s"] = round(self.latency_s, 6)
+        payload["retries"] = self.retries
+        return payload
+
+
+_ACTIVE: contextvars.ContextVar[Optional["CallLedger"]] = contextvars.ContextVar("og_nsd_ledger", default=None)
+_CURRENT: contextvars.ContextVar[Optional[CallRecord]] = contextvars.ContextVar("og_nsd_call", default=None)
+
+
+class CallLedger:
+    """Collects a :class:`CallRecord` for every LLM call of one run."""
+
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.records: List[CallRecord] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self) -> Iterator["CallLedger"]:
+        token = _ACTIVE.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE.reset(token)
+
+    def _new(self, kind: str, **fields: Any) -> CallRecord:
+        with self._lock:
+            record = CallRecord(seq=len(self.records), kind=kind, **fields)
+            self.records.append(record)
+        return record
+
+    @contextmanager
+    def call(self, kind: str, **fields: Any) -> Iterator[CallRecord]:
+        record = self._new(kind, **fields)
+        token = _CURRENT.set(record)
+        started = time.perf_counter()
+        record.started_s = started - self.origin
+        try:
+            yield record
+        except BaseException as exc:
+            record.error = type(exc).__name__
+            raise
+        finally:
+            record.latency_s = time.perf_counter() - started
+            _CURRENT.reset(token)
+
+    def record_cache_hits(self, kind: str, requirements: int, **fields: Any) -> None:
+        if requirements:
+            self._new(kind, requirements=requirements, cache_hit=True, **fields)
+
+    def token_totals(self) -> Dict[str, int]:
+        with self._lock:
+            records = list(self.records)
+        totals = {name: sum(getattr(record, name) for record in records) for name in _TOKEN_FIELDS}
+        return totals if any(totals.values()) else {}
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals plus per-kind calls, tokens, retries, cache hits and latency percentiles."""
+
+        with self._lock:
+            records = list(self.records)
+        by_kind: Dict[str, List[CallRecord]] = {}
+        for record in records:
+            by_kind.setdefault(record.kind, []).append(record)
+        payload = _aggregate(records)
+        payload["by_kind"] = {kind: _aggregate(items) for kind, items in by_kind.items()}
+        return payload
+
+    def write_ndjson(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            lines = [json.dumps(record.to_dict()) for record in self.records]
+        path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+
+
+def _aggregate(records: List[CallRecord]) -> Dict[str, Any]:
+    calls = [record for record in records if not record.cache_hit]
+    latencies = sorted(record.latency_s for record in calls)
+    payload: Dict[str, Any] = {
+        "calls": len(calls),
+        "cache_hits": sum(record.requirements for record in records if record.cache_hit),
+        "requirements": sum(record.requirements for record in calls),
+        "attempts": sum(record.attempts for record in calls),
+        "retries": sum(record.retries for record in calls),
+        "errors": sum(1 for record in calls if record.error),
+    }
+    for name in _TOKEN_FIELDS:
+        payload[name] = sum(getattr(record, name) for record in calls)
+    payload["latency_s"] = {
+        "total": round(sum(latencies), 6),
+        "p50": _percentile(latencies, 0.5),
+        "p90": _percentile(latencies, 0.9),
+        "p99": _percentile(latencies, 0.99),
+        "max": round(latencies[-1], 3) if latencies else None,
+    }
+    return payload
+
+
+@contextmanager
+def llm_call(kind: str, **fields: Any) -> Iterator[CallRecord]:
+    """Record one LLM call on the active ledger, or hand out a detached record."""
+
+    ledger = _ACTIVE.get()
+    if ledger is None:
+        yield CallRecord(seq=-1, kind=kind, **fields)
+        return
+    with ledger.call(kind, **fields) as record:
+        yield record
+
+
+def current_call() -> Optional[CallRecord]:
+    """The record of the LLM call in progress in this context, if any."""
+
+    return _CURRENT.get()
+
+
+def active_ledger() -> Optional[CallLedger]:
+    return _ACTIVE.get()
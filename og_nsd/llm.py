@@ -2,18 +2,37 @@
 from __future__ import annotations
 
 import abc
+import copy
 import os
 import re
+import threading
 from dataclasses import dataclass
-from typing import Dict, List, Sequence
+from typing import Any, Callable, Dict, List, Sequence, Tuple
 
-from .ontology import SchemaContext
+from rdflib import Graph, Literal, Namespace, URIRef
+from rdflib.term import Node
+from rdflib.namespace import OWL, RDF, RDFS
+
+from .exemplars import render_exemplar
+from .ledger import current_call
+from .keywords import ATM_LEXICON, KeywordMatcher, Lexicon
+from .ontology import IncrementalTurtleParser, SchemaContext, StreamAborted
 from .requirements import Requirement
+from .scheduler import RequestScheduler, SchedulerConfig, estimate_message_tokens
+
+
+def _load_openai():
+    """Import the OpenAI client class on first use; ``None`` when unavailable.
 
-try:
-    from openai import OpenAI
-except Exception:  # pragma: no cover - optional dependency
-    OpenAI = None  # type: ignore
+    The openai package takes longer to import than the rest of the pipeline
+    combined, so heuristic and draft-only runs never load it.
+    """
+
+    try:
+        from openai import OpenAI
+    except Exception:  # pragma: no cover - optional dependency
+        return None
+    return OpenAI
 
 
 def slugify(label: str) -> str:
@@ -26,12 +45,82 @@ def slugify(label: str) -> str:
     return label
 
 
+Triple = Tuple[Node, Node, Node]
+
+
 @dataclass
 class LLMResponse:
     turtle: str
     reasoning_notes: str
     token_usage: Dict[str, int] | None = None
     exemplar_ids: List[str] | None = None
+    # Set when the response was parsed while streaming; ``turtle`` then holds
+    # the raw text and ``streaming`` the parser statistics.
+    graph: Graph | None = None
+    streaming: Dict[str, Any] | None = None
+    # Native triples from offline models, merged without any Turtle parsing.
+    triples: List[Triple] | None = None
+    # Triples per requirement identifier, from models that draft each requirement separately.
+    attribution: Dict[str, List[Triple]] | None = None
+
+    def materialized_turtle(self) -> str | None:
+        """Return the Turtle text if it exists without serializing ``graph``/``triples``."""
+
+        return self.turtle
+
+
+class GraphResponse(LLMResponse):
+    """An :class:`LLMResponse` built as triples; ``turtle`` is serialized on first access.
+
+    Offline models produce triples (or a whole graph) directly, so the
+    assembler can merge them without a Turtle round trip; the text is only
+    rendered when something logs it.
+    """
+
+    def __init__(
+        self,
+        reasoning_notes: str,
+        *,
+        triples: List[Triple] | None = None,
+        graph: Graph | None = None,
+        namespaces: Dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        if (triples is None) == (graph is None):
+            raise ValueError("GraphResponse needs exactly one of triples or graph")
+        super().__init__(turtle=None, reasoning_notes=reasoning_notes, graph=graph, triples=triples, **kwargs)
+        self.namespaces = namespaces or {}
+
+    @property
+    def turtle(self) -> str:
+        if self._turtle is None:
+            graph = self.graph
+            if graph is None:
+                graph = Graph()
+                for prefix, namespace in self.namespaces.items():
+                    graph.bind(prefix, namespace)
+                for triple in self.triples:
+                    graph.add(triple)
+            self._turtle = graph.serialize(format="turtle")
+        return self._turtle
+
+    @turtle.setter
+    def turtle(self, value: str | None) -> None:
+        self._turtle = value
+
+    def materialized_turtle(self) -> str | None:
+        return self._turtle
+
+
+@dataclass
+class _Completion:
+    content: str
+    usage: Any = None
+    graph: Graph | None = None
+    streaming: Dict[str, Any] | None = None
+
+
+_PREFIX_RE = re.compile(r"^\s*(?:@prefix|PREFIX)\s+([\w.-]*):\s*<([^>]*)>", re.IGNORECASE | re.MULTILINE)
 
 
 class LLMClient(abc.ABC):
@@ -65,18 +154,26 @@ class LLMClient(abc.ABC):
         """Apply structured patches to the provided ontology graph.
 
         Implementations may delegate to :meth:`generate_patch` or construct a
-        new prompt that includes the JSON patch plan. The default implementation
-        raises ``NotImplementedError`` so callers must explicitly handle LLM
-        capabilities.
+        new prompt that includes the JSON patch plan. Callers merge the
+        response into ``context_ttl``, so it may hold the whole patched
+        ontology or only the triples the patches add. The default
+        implementation raises ``NotImplementedError`` so callers must
+        explicitly handle LLM capabilities.
         """
         raise NotImplementedError
 
+    def fingerprint(self) -> str:
+        """Describe the configuration that determines this model's drafts (for caching)."""
+
+        return type(self).__name__
+
 
 class HeuristicLLM(LLMClient):
     """Rule-based fallback model for offline experimentation."""
 
-    def __init__(self, base_namespace: str) -> None:
+    def __init__(self, base_namespace: str, lexicon: Lexicon | None = None) -> None:
         self.base_ns = base_namespace.rstrip("#/") + "#"
+        self.matcher = KeywordMatcher(lexicon or ATM_LEXICON)
 
     def generate_axioms(
         self,
@@ -84,33 +181,38 @@ class HeuristicLLM(LLMClient):
         schema_context: SchemaContext | None = None,
         exemplars: Sequence[Requirement] | None = None,
     ) -> LLMResponse:
-        triples: List[str] = [
-            f"@prefix atm: <{self.base_ns}> .",
-            "@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .",
-            "@prefix owl: <http://www.w3.org/2002/07/owl#> .",
-        ]
+        atm = Namespace(self.base_ns)
+        triples: List[Triple] = []
+        attribution: Dict[str, List[Triple]] = {}
         notes: List[str] = []
-        for req in requirements:
-            subject = self._extract_subject(req)
-            obj = self._extract_object(req)
-            prop = slugify(self._extract_predicate(req))
-            triples.append(
-                f"atm:{prop} a owl:ObjectProperty ; rdfs:domain atm:{subject} ; rdfs:range atm:{obj} ."
-            )
-            triples.append(f"atm:{subject} a owl:Class .")
-            triples.append(f"atm:{obj} a owl:Class .")
-            triples.append(
-                f"atm:{subject}_{prop}_{obj} a owl:Axiom ; atm:sourceRequirement \"{req.identifier}\" ."
-            )
+        classified = self.matcher.classify_batch([req.text for req in requirements])
+        for req, (subject, obj, predicate) in zip(requirements, classified):
+            prop = slugify(predicate)
+            axiom = atm[f"{subject}_{prop}_{obj}"]
+            drafted = [
+                (atm[prop], RDF.type, OWL.ObjectProperty),
+                (atm[prop], RDFS.domain, atm[subject]),
+                (atm[prop], RDFS.range, atm[obj]),
+                (atm[subject], RDF.type, OWL.Class),
+                (atm[obj], RDF.type, OWL.Class),
+                (axiom, RDF.type, OWL.Axiom),
+                (axiom, atm.sourceRequirement, Literal(req.identifier)),
+            ]
+            triples += drafted
+            attribution.setdefault(req.identifier, []).extend(drafted)
             notes.append(f"Mapped '{req.text}' → atm:{subject} {prop} atm:{obj}")
-        turtle = "\n".join(triples)
         exemplar_ids = [req.identifier for req in exemplars] if exemplars else None
-        return LLMResponse(
-            turtle=turtle,
-            reasoning_notes="\n".join(notes),
+        return GraphResponse(
+            "\n".join(notes),
+            triples=triples,
+            namespaces=self._namespaces(),
             exemplar_ids=exemplar_ids,
+            attribution=attribution,
         )
 
+    def fingerprint(self) -> str:
+        return f"{type(self).__name__}|{self.base_ns}|{self.matcher.lexicon!r}"
+
     def generate_patch(self, prompts: Sequence[str], context_ttl: str) -> LLMResponse:
         """Emit a simple, deterministic patch guided by violation summaries.
 
@@ -121,46 +223,66 @@ class HeuristicLLM(LLMClient):
         closed-loop controller can progress even without remote LLM access.
         """
 
-        triples: List[str] = [
-            f"@prefix atm: <{self.base_ns}> .",
-            "@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .",
-            "@prefix owl: <http://www.w3.org/2002/07/owl#> .",
-        ]
+        atm = Namespace(self.base_ns)
+        triples: List[Triple] = []
         notes: List[str] = []
         for idx, prompt in enumerate(prompts, start=1):
             focus = slugify(prompt.split()[0])
-            triples.append(f"atm:{focus} a owl:Class .")
-            triples.append(
-                f"atm:{focus}_repair_{idx} a owl:Axiom ; rdfs:comment \"{prompt}\" ."
-            )
+            triples += [
+                (atm[focus], RDF.type, OWL.Class),
+                (atm[f"{focus}_repair_{idx}"], RDF.type, OWL.Axiom),
+                (atm[f"{focus}_repair_{idx}"], RDFS.comment, Literal(prompt)),
+            ]
             notes.append(f"Added repair note for: {prompt}")
 
-        if len(triples) == 3:
+        if not prompts:
             notes.append("No violations provided; emitted empty patch.")
-        turtle = "\n".join(triples)
-        return LLMResponse(turtle=turtle, reasoning_notes="\n".join(notes))
+        return GraphResponse("\n".join(notes), triples=triples, namespaces=self._namespaces())
 
     def apply_patches(self, patches: Sequence[dict], context_ttl: str) -> LLMResponse:
-        """Deterministically apply patch instructions to the ontology graph."""
+        """Deterministically apply patch instructions; the response holds only the added triples.
 
-        from rdflib import Graph, Literal, Namespace, URIRef
-        from rdflib.namespace import OWL, RDF, RDFS, XSD
+        Only the prefix declarations of ``context_ttl`` are read: the response
+        is merged into the context, so triples it already holds are harmless.
+        """
 
         graph = Graph()
-        graph.parse(data=context_ttl, format="turtle")
-        atm = Namespace(self.base_ns)
-        graph.bind("atm", atm)
+        for prefix, namespace in _PREFIX_RE.findall(context_ttl):
+            graph.bind(prefix, namespace, replace=True)
+        return self.patch_graph(patches, graph)
+
+    def patch_graph(self, patches: Sequence[dict], graph: Graph) -> GraphResponse:
+        """Apply patch instructions to ``graph`` in place and return the delta.
+
+        Callers that already hold the ontology as a graph skip the Turtle
+        round trip of :meth:`apply_patches`; the work is proportional to the
+        number of patches, not the size of the ontology.
+        """
+
+        namespaces = {prefix: str(namespace) for prefix, namespace in graph.namespace_manager.namespaces()}
+        namespaces["atm"] = self.base_ns
+        resolved: Dict[str, URIRef] = {}
+        added: List[Triple] = []
         notes: List[str] = []
 
         def _iri(value: str) -> URIRef:
-            if value.startswith("http"):
-                return URIRef(value)
-            if ":" in value:
-                prefix, local = value.split(":", 1)
-                ns = dict(graph.namespace_manager.namespaces()).get(prefix)
-                if ns:
-                    return URIRef(ns + local)
-            return URIRef(self.base_ns + value)
+            iri = resolved.get(value)
+            if iri is None:
+                if value.startswith("http"):
+                    iri = URIRef(value)
+                elif ":" in value and value.split(":", 1)[0] in namespaces:
+                    prefix, local = value.split(":", 1)
+                    iri = URIRef(namespaces[prefix] + local)
+                else:
+                    iri = URIRef(self.base_ns + value)
+                resolved[value] = iri
+            return iri
+
+        def _add(*triples: Triple) -> None:
+            for triple in triples:
+                if triple not in graph:
+                    graph.add(triple)
+                    added.append(triple)
 
         for patch in patches:
             action = patch.get("action", "").lower()
@@ -174,75 +296,168 @@ class HeuristicLLM(LLMClient):
 
             if action in {"addsubclass", "subclass"}:
                 obj_iri = _iri(obj)
-                graph.add((subj_iri, RDFS.subClassOf, obj_iri))
-                graph.add((subj_iri, RDF.type, OWL.Class))
-                graph.add((obj_iri, RDF.type, OWL.Class))
+                _add((subj_iri, RDFS.subClassOf, obj_iri), (subj_iri, RDF.type, OWL.Class), (obj_iri, RDF.type, OWL.Class))
                 notes.append(f"{action}: {subject} rdfs:subClassOf {obj}")
                 continue
 
             if action in {"addtriple", "assert"}:
                 obj_node = _iri(obj) if ":" in obj or obj.startswith("http") else Literal(obj)
-                graph.add((subj_iri, pred_iri, obj_node))
+                _add((subj_iri, pred_iri, obj_node))
                 notes.append(f"{action}: {subject} {predicate} {obj}")
                 continue
 
             if obj.startswith("xsd:"):
-                graph.add((pred_iri, RDFS.domain, subj_iri))
-                graph.add((pred_iri, RDFS.range, _iri(obj)))
-                graph.add((pred_iri, RDFS.label, Literal(message or "Patched property")))
-                graph.add((pred_iri, RDF.type, OWL.DatatypeProperty))
-                graph.add((subj_iri, RDF.type, OWL.Class))
+                _add(
+                    (pred_iri, RDFS.domain, subj_iri),
+                    (pred_iri, RDFS.range, _iri(obj)),
+                    (pred_iri, RDFS.label, Literal(message or "Patched property")),
+                    (pred_iri, RDF.type, OWL.DatatypeProperty),
+                    (subj_iri, RDF.type, OWL.Class),
+                )
             else:
                 obj_iri = _iri(obj)
-                graph.add((pred_iri, RDFS.domain, subj_iri))
-                graph.add((pred_iri, RDFS.range, obj_iri))
-                graph.add((pred_iri, RDF.type, OWL.ObjectProperty))
-                graph.add((subj_iri, RDF.type, OWL.Class))
-                graph.add((obj_iri, RDF.type, OWL.Class))
+                _add(
+                    (pred_iri, RDFS.domain, subj_iri),
+                    (pred_iri, RDFS.range, obj_iri),
+                    (pred_iri, RDF.type, OWL.ObjectProperty),
+                    (subj_iri, RDF.type, OWL.Class),
+                    (obj_iri, RDF.type, OWL.Class),
+                )
 
             notes.append(f"{action or 'patch'}: {subject} {predicate} {obj}")
 
-        turtle = graph.serialize(format="turtle")
-        return LLMResponse(turtle=turtle, reasoning_notes="\n".join(notes) or "Applied patches without notes")
-
-    def _extract_subject(self, requirement: Requirement) -> str:
-        if "customer" in requirement.text.lower():
-            return "Customer"
-        if "bank" in requirement.text.lower():
-            return "Bank"
-        return "ATM"
-
-    def _extract_object(self, requirement: Requirement) -> str:
-        if "transaction" in requirement.text.lower():
-            return "Transaction"
-        if "card" in requirement.text.lower():
-            return "CashCard"
-        if "account" in requirement.text.lower():
-            return "Account"
-        return "RequirementTarget"
-
-    def _extract_predicate(self, requirement: Requirement) -> str:
-        text = requirement.text.lower()
-        if "log" in text:
-            return "logs"
-        if "verify" in text:
-            return "verifies"
-        if "dispense" in text:
-            return "dispenses"
-        if "maintain" in text:
-            return "maintains"
-        return "relatesTo"
+        return GraphResponse("\n".join(notes) or "Applied patches without notes", triples=added, namespaces=namespaces)
+
+    def _namespaces(self) -> Dict[str, str]:
+        return {"atm": self.base_ns, "owl": str(OWL), "rdfs": str(RDFS)}
 
 
 class OpenAILLM(LLMClient):
     """Adapter for the OpenAI Chat Completions API."""
 
-    def __init__(self, model: str = "gpt-5.2", temperature: float = 0.1, system_prompt: str | None = None) -> None:
-        if OpenAI is None:
+    def __init__(
+        self,
+        model: str = "gpt-5.2",
+        temperature: float = 0.1,
+        system_prompt: str | None = None,
+        base_url: str | None = None,
+        scheduler: RequestScheduler | None = None,
+        stream: bool = False,
+        stream_budget_tokens: int | None = None,
+        stream_parser_factory: Callable[..., IncrementalTurtleParser] | None = None,
+    ) -> None:
+        self._client_class = _load_openai()
+        if self._client_class is None:
             raise RuntimeError("openai package is not installed")
         self.model = model
         self.temperature = temperature
         self.system_prompt = system_prompt or self._default_system_prompt()
+        # ``None`` lets the client fall back to ``OPENAI_BASE_URL`` (or the
+        # public endpoint), e.g. to point runs at ``og_nsd.mock_llm``.
+        self.base_url = base_url
+        # Every request goes through the scheduler, which owns retries,
+        # rate limits and timeouts (the SDK's own retries are disabled).
+        self.scheduler = scheduler or RequestScheduler(SchedulerConfig.from_env())
+        self._client = None
+        self._client_lock = threading.Lock()
+        # Streaming parses Turtle statements as they arrive and stops early
+        # once the output runs past ``stream_budget_tokens`` or stops parsing.
+        # Pass ``OntologyAssembler.stream_parser`` as the factory so prefixes
+        # resolve exactly as in ``OntologyAssembler.add_turtle``.
+        self.stream = stream
+        self.stream_budget_tokens = stream_budget_tokens
+        self.stream_parser_factory = stream_parser_factory or IncrementalTurtleParser
+        self._exemplar_blocks: Dict[tuple, str] = {}
+
+    def fingerprint(self) -> str:
+        settings = [self.model, self.temperature, self.system_prompt, self.base_url, self.stream_budget_tokens]
+        return f"{type(self).__name__}|{settings!r}"
+
+    def with_temperature(self, temperature: float) -> "OpenAILLM":
+        """A copy sampling at ``temperature`` that shares this client, scheduler and caches."""
+
+        clone = copy.copy(self)
+        clone.temperature = temperature
+        return clone
+
+    def _get_client(self):
+        """Return the shared API client, creating it on first use."""
+
+        with self._client_lock:
+            if self._client is None:
+                api_key = os.environ.get("OPENAI_API_KEY")
+                if not api_key:
+                    raise RuntimeError("OPENAI_API_KEY is not set")
+                kwargs = {"api_key": api_key, "max_retries": 0}
+                if self.base_url:
+                    kwargs["base_url"] = self.base_url
+                self._client = self._client_class(**kwargs)
+            return self._client
+
+    def _complete(self, messages: List[dict]) -> _Completion:
+        client = self._get_client()
+        call = current_call()
+        if call is not None:
+            call.model = self.model
+
+        def _request(timeout: float | None) -> _Completion:
+            if call is not None:
+                # Every provider attempt (retries and hedges included) lands in the ledger.
+                call.attempts += 1
+            if self.stream:
+                return self._stream_completion(client, messages, timeout)
+            response = client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=self.temperature,
+                timeout=timeout,
+            )
+            content = response.choices[0].message.content.strip() if response.choices else ""
+            return _Completion(content=content, usage=getattr(response, "usage", None))
+
+        return self.scheduler.call(_request, estimated_tokens=estimate_message_tokens(messages))
+
+    def _stream_completion(self, client, messages: List[dict], timeout: float | None) -> _Completion:
+        budget = self.stream_budget_tokens
+        # Same ≈4 characters per token estimate the scheduler uses.
+        parser = self.stream_parser_factory(max_chars=budget * 4 if budget else None)
+        stream = client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+            timeout=timeout,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        usage = None
+        try:
+            for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    usage = chunk.usage
+                for choice in chunk.choices or ():
+                    delta = getattr(choice.delta, "content", None)
+                    if delta:
+                        parser.feed(delta)
+            parser.close()
+        except StreamAborted:
+            # Keep what parsed so far; the caller still gets a usable fragment.
+            stream.close()
+        return _Completion(
+            content=parser.text.strip(),
+            usage=usage,
+            graph=parser.graph,
+            streaming=parser.stats.to_dict(),
+        )
+
+    def _response(self, completion: _Completion, notes: str, **extra) -> LLMResponse:
+        return LLMResponse(
+            turtle=completion.content,
+            reasoning_notes=notes,
+            token_usage=_extract_token_usage(completion),
+            graph=completion.graph,
+            streaming=completion.streaming,
+            **extra,
+        )
 
     def generate_axioms(
         self,
@@ -250,76 +465,42 @@ class OpenAILLM(LLMClient):
         schema_context: SchemaContext | None = None,
         exemplars: Sequence[Requirement] | None = None,
     ) -> LLMResponse:
-        messages = [
-            {"role": "system", "content": self.system_prompt},
-            {
-                "role": "user",
-                "content": self._build_prompt(requirements, schema_context, exemplars),
-            },
-        ]
-        api_key = os.environ.get("OPENAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("OPENAI_API_KEY is not set")
-        client = OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=self.temperature,
-        )
-        content = response.choices[0].message.content.strip() if response.choices else ""
-        token_usage = _extract_token_usage(response)
-        return LLMResponse(
-            turtle=content,
-            reasoning_notes="Generated via OpenAI chat.completions",
-            token_usage=token_usage,
+        messages = self.axiom_messages(requirements, schema_context, exemplars)
+        return self._response(
+            self._complete(messages),
+            "Generated via OpenAI chat.completions",
             exemplar_ids=[req.identifier for req in exemplars] if exemplars else None,
         )
 
     def generate_patch(self, prompts: Sequence[str], context_ttl: str) -> LLMResponse:
-        repair_prompt = self._build_repair_prompt(prompts, context_ttl)
-        messages = [
-            {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": repair_prompt},
-        ]
-        api_key = os.environ.get("OPENAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("OPENAI_API_KEY is not set")
-        client = OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=self.temperature,
-        )
-        content = response.choices[0].message.content.strip() if response.choices else ""
-        token_usage = _extract_token_usage(response)
-        return LLMResponse(
-            turtle=content,
-            reasoning_notes="Patch generated via OpenAI chat.completions",
-            token_usage=token_usage,
-        )
+        messages = self.patch_messages(prompts, context_ttl)
+        return self._response(self._complete(messages), "Patch generated via OpenAI chat.completions")
 
     def apply_patches(self, patches: Sequence[dict], context_ttl: str) -> LLMResponse:
-        patch_prompt = self._build_patch_application_prompt(patches, context_ttl)
-        messages = [
+        messages = self.apply_patch_messages(patches, context_ttl)
+        return self._response(self._complete(messages), "Applied patches via OpenAI chat.completions")
+
+    # The chat messages each call sends; also used to forecast runs without sending them.
+
+    def axiom_messages(
+        self,
+        requirements: Sequence[Requirement],
+        schema_context: SchemaContext | None = None,
+        exemplars: Sequence[Requirement] | None = None,
+    ) -> List[dict]:
+        return self._messages(self._build_prompt(requirements, schema_context, exemplars))
+
+    def patch_messages(self, prompts: Sequence[str], context_ttl: str) -> List[dict]:
+        return self._messages(self._build_repair_prompt(prompts, context_ttl))
+
+    def apply_patch_messages(self, patches: Sequence[dict], context_ttl: str) -> List[dict]:
+        return self._messages(self._build_patch_application_prompt(patches, context_ttl))
+
+    def _messages(self, prompt: str) -> List[dict]:
+        return [
             {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": patch_prompt},
+            {"role": "user", "content": prompt},
         ]
-        api_key = os.environ.get("OPENAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("OPENAI_API_KEY is not set")
-        client = OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=self.temperature,
-        )
-        content = response.choices[0].message.content.strip() if response.choices else ""
-        token_usage = _extract_token_usage(response)
-        return LLMResponse(
-            turtle=content,
-            reasoning_notes="Applied patches via OpenAI chat.completions",
-            token_usage=token_usage,
-        )
 
     def _build_prompt(
         self,
@@ -388,28 +569,17 @@ class OpenAILLM(LLMClient):
 
         blocks: List[str] = ["FEW-SHOT EXAMPLES (dev only):"]
         for exemplar in exemplars:
-            blocks.append(f"[{exemplar.identifier}] {exemplar.text}")
-            axioms_block = self._render_exemplar_axioms(exemplar)
-            if axioms_block:
-                blocks.append(axioms_block)
+            blocks.append(self._exemplar_block(exemplar))
             blocks.append("---")
         return "\n".join(blocks).rstrip("-\n")
 
-    def _render_exemplar_axioms(self, exemplar: Requirement) -> str:
-        if exemplar.axioms is None:
-            return ""
-
-        sections: List[str] = []
-        for key in ("prefixes", "tbox", "abox"):
-            axioms = exemplar.axioms.get(key)
-            if not axioms:
-                continue
-            if isinstance(axioms, dict):
-                for prefix, uri in axioms.items():
-                    sections.append(f"@prefix {prefix}: <{uri}> .")
-            elif isinstance(axioms, list):
-                sections.extend(axioms)
-        return "\n".join(sections)
+    def _exemplar_block(self, exemplar: Requirement) -> str:
+        # Exemplars recur across batches; render each one once per client.
+        key = (exemplar.identifier, exemplar.text)
+        block = self._exemplar_blocks.get(key)
+        if block is None:
+            block = self._exemplar_blocks[key] = render_exemplar(exemplar)
+        return block
 
     def _default_system_prompt(self) -> str:
         return (
@@ -458,6 +628,11 @@ def _extract_token_usage(response) -> Dict[str, int] | None:
         if value is not None:
             token_usage[field] = int(value)
 
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = details.get("cached_tokens") if isinstance(details, dict) else getattr(details, "cached_tokens", None)
+    if isinstance(cached, int):
+        token_usage["cached_tokens"] = cached
+
     # Some response objects expose a to_dict helper; merge to capture additional keys
     if hasattr(usage, "to_dict"):
         for key, value in usage.to_dict().items():  # type: ignore[call-arg]
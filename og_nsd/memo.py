@@ -0,0 +1,250 @@
+"""Per-requirement memo of drafted axioms for incremental re-drafting.
+
+Prompt-level caches miss as soon as a requirement is inserted, because every
+later :func:`~og_nsd.requirements.chunk_requirements` batch shifts. The memo
+instead stores the axioms attributed to each requirement. The key covers the
+requirement's own content (identifier, title, text, boilerplate) plus a
+fingerprint of everything else that shapes the draft: the model
+configuration, schema context and few-shot exemplars. Editing a requirements
+document therefore only redrafts the requirements that changed.
+
+Models that draft each requirement separately, such as
+:class:`~og_nsd.llm.HeuristicLLM`, report the split themselves through
+``LLMResponse.attribution``. Otherwise attribution follows
+``atm:sourceRequirement`` provenance. A requirement owns
+the triples of its provenance nodes (blank-node closure included) plus the
+declarations of every term those triples mention. A batch whose output cannot
+be fully attributed, such as free-form LLM Turtle, is stored as a *group*. Its
+unattributed triples are kept with every member, and the members are only
+reused together.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from rdflib import BNode, Literal, URIRef
+
+from .graphs import cache_dir, decode_term, encode_term
+from .llm import Triple
+from .ontology import SchemaContext
+from .requirements import Requirement
+
+_MEMO_VERSION = 1
+
+
+@dataclass
+class MemoEntry:
+    triples: List[Triple]
+    # Keys drafted together whose output could not be split per requirement.
+    group: List[str] = field(default_factory=list)
+
+
+@dataclass
+class MemoStats:
+    hits: int = 0
+    misses: int = 0
+    stored: int = 0
+    grouped: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def draft_fingerprint(
+    llm_fingerprint: str,
+    schema_context: SchemaContext | None,
+    exemplar_settings: dict | None = None,
+) -> str:
+    """Hash the inputs besides the requirement itself that shape a draft."""
+
+    payload = {
+        "version": _MEMO_VERSION,
+        "llm": llm_fingerprint,
+        "schema": asdict(schema_context) if schema_context else None,
+        "exemplars": exemplar_settings,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class DraftMemo:
+    """Look up and store drafted axioms per requirement.
+
+    Entries live in memory and, unless on-disk caching is disabled, as JSON
+    files under ``<cache_dir>/drafts``.
+    """
+
+    def __init__(self, fingerprint: str, root: Optional[Path] = None) -> None:
+        self.fingerprint = fingerprint
+        self.root = root
+        self.stats = MemoStats()
+        self._entries: Dict[str, MemoEntry] = {}
+
+    @classmethod
+    def open(cls, fingerprint: str) -> "DraftMemo":
+        root = cache_dir()
+        return cls(fingerprint, root / "drafts" if root is not None else None)
+
+    def key(self, requirement: Requirement) -> str:
+        payload = [
+            self.fingerprint,
+            requirement.identifier,
+            requirement.title,
+            requirement.text,
+            requirement.boilerplate,
+        ]
+        return hashlib.sha256(json.dumps(payload).encode("utf-8")).hexdigest()
+
+    def lookup(self, requirements: Sequence[Requirement]) -> Tuple[List[Triple], List[Requirement]]:
+        """Return the memoized triples for all hits and the requirements left to draft."""
+
+        keys = [self.key(req) for req in requirements]
+        present = set(keys)
+        entries = {key: self._load(key) for key in present}
+        # A group is reusable only if every member is unchanged and still cached.
+        stale = {key for key, entry in entries.items() if entry is None}
+        for key, entry in entries.items():
+            if entry is not None and any(member not in present or member in stale for member in entry.group):
+                stale.add(key)
+
+        triples: List[Triple] = []
+        misses: List[Requirement] = []
+        for req, key in zip(requirements, keys):
+            if key in stale:
+                misses.append(req)
+            else:
+                triples.extend(entries[key].triples)
+        self.stats.hits += len(requirements) - len(misses)
+        self.stats.misses += len(misses)
+        return triples, misses
+
+    def store(
+        self,
+        batch: Sequence[Requirement],
+        triples: Iterable[Triple],
+        attribution: Optional[Dict[str, List[Triple]]] = None,
+    ) -> None:
+        """Attribute one drafted batch's triples to its requirements and persist them.
+
+        ``attribution`` is the model's own split per requirement identifier, when it has one.
+        """
+
+        if attribution is None:
+            attributed, leftover = attribute_triples(list(triples), [req.identifier for req in batch])
+        else:
+            attributed = attribution
+            claimed = {triple for owned in attribution.values() for triple in owned}
+            leftover = [triple for triple in triples if triple not in claimed]
+        keys = [self.key(req) for req in batch]
+        group = keys if leftover and len(batch) > 1 else []
+        for req, key in zip(batch, keys):
+            owned = attributed.get(req.identifier, [])
+            if leftover:
+                owned = owned + leftover
+            self._save(key, MemoEntry(triples=owned, group=group))
+        self.stats.stored += len(batch)
+        if group:
+            self.stats.grouped += len(batch)
+
+    def _load(self, key: str) -> Optional[MemoEntry]:
+        entry = self._entries.get(key)
+        if entry is None and self.root is not None:
+            entry = _read_entry(self.root / f"{key}.json")
+            if entry is not None:
+                self._entries[key] = entry
+        return entry
+
+    def _save(self, key: str, entry: MemoEntry) -> None:
+        self._entries[key] = entry
+        if self.root is not None:
+            _write_entry(self.root / f"{key}.json", entry)
+
+
+def attribute_triples(
+    triples: List[Triple], identifiers: Sequence[str]
+) -> Tuple[Dict[str, List[Triple]], List[Triple]]:
+    """Split ``triples`` by ``sourceRequirement`` provenance.
+
+    Returns the triples owned by each identifier and those owned by none.
+    Shared declarations (e.g. a class several requirements mention) are
+    attributed to every requirement that mentions them.
+    """
+
+    by_subject: Dict[object, List[Triple]] = {}
+    roots: Dict[str, List[object]] = {}
+    wanted = {str(identifier) for identifier in identifiers}
+    for triple in triples:
+        subject, predicate, obj = triple
+        by_subject.setdefault(subject, []).append(triple)
+        if _is_provenance(triple) and str(obj) in wanted:
+            roots.setdefault(str(obj), []).append(subject)
+
+    def _closure(start: Iterable[object], identifier: str) -> List[Triple]:
+        seen: Set[object] = set()
+        pending = list(start)
+        owned: List[Triple] = []
+        while pending:
+            node = pending.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            for triple in by_subject.get(node, ()):
+                # A node shared by several requirements keeps each one's provenance separately.
+                if _is_provenance(triple) and str(triple[2]) != identifier:
+                    continue
+                owned.append(triple)
+                if isinstance(triple[2], BNode):
+                    pending.append(triple[2])
+        return owned
+
+    attributed: Dict[str, List[Triple]] = {}
+    claimed: Set[Triple] = set()
+    for identifier, nodes in roots.items():
+        # Provenance nodes first, then the declarations of the terms they mention.
+        core = _closure(nodes, identifier)
+        mentioned = {term for triple in core for term in (triple[0], triple[2]) if isinstance(term, URIRef)}
+        owned = core + _closure(mentioned.difference(nodes), identifier)
+        attributed[identifier] = owned
+        claimed.update(owned)
+    leftover = [triple for triple in triples if triple not in claimed]
+    return attributed, leftover
+
+
+def _is_provenance(triple: Triple) -> bool:
+    return isinstance(triple[2], Literal) and str(triple[1]).endswith("sourceRequirement")
+
+
+def _read_entry(path: Path) -> Optional[MemoEntry]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if payload.get("version") != _MEMO_VERSION:
+        return None
+    terms = [decode_term(entry) for entry in payload["terms"]]
+    triples = [(terms[s], terms[p], terms[o]) for s, p, o in payload["triples"]]
+    return MemoEntry(triples=triples, group=payload.get("group") or [])
+
+
+def _write_entry(path: Path, entry: MemoEntry) -> None:
+    index: Dict[object, int] = {}
+    terms: List[list] = []
+    rows: List[List[int]] = []
+    for triple in entry.triples:
+        row = []
+        for term in triple:
+            term_id = index.get(term)
+            if term_id is None:
+                term_id = index[term] = len(terms)
+                terms.append(encode_term(term))
+            row.append(term_id)
+        rows.append(row)
+    payload = {"version": _MEMO_VERSION, "group": entry.group, "terms": terms, "triples": rows}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    except OSError:  # pragma: no cover - read-only cache directory
+        pass
@@ -6,19 +6,24 @@ from typing import Dict, Set, Tuple
 
 from rdflib import Graph, term
 
-try:  # Optional but recommended: materialise entailments for semantic metrics
-    from rdflib.extras.infixowl import DeductiveClosure, OWLRL_Semantics
-except Exception:  # pragma: no cover - fallback if owlrl is missing at runtime
-    DeductiveClosure = None
-    OWLRL_Semantics = None
+from .graphs import load_graph
+
+
+def _load_owlrl():
+    """Import the OWL 2 RL closure helpers on first use (``(None, None)`` if missing)."""
+
+    try:  # Optional but recommended: materialise entailments for semantic metrics
+        from rdflib.extras.infixowl import DeductiveClosure, OWLRL_Semantics
+    except Exception:  # pragma: no cover - fallback if owlrl is missing at runtime
+        return None, None
+    return DeductiveClosure, OWLRL_Semantics
+
 
 Triple = Tuple[term.Node, term.Node, term.Node]
 
 
 def _load_graph(path: Path) -> Graph:
-    graph = Graph()
-    graph.parse(path, format=_guess_format(path))
-    return graph
+    return load_graph(path, format=_guess_format(path))
 
 
 def _guess_format(path: Path) -> str | None:
@@ -57,6 +62,7 @@ def _materialize_closure(graph: Graph) -> Graph:
 
     Falls back to the input graph when the optional owlrl dependency is unavailable.
     """
+    DeductiveClosure, OWLRL_Semantics = _load_owlrl()
     if DeductiveClosure is None or OWLRL_Semantics is None:
         return graph
     working_copy = Graph()
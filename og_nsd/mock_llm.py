@@ -0,0 +1,586 @@
+"""Offline OpenAI-compatible ``chat.completions`` server with cassette replay.
+
+:class:`MockLLMServer` speaks just enough of the Chat Completions API for
+:class:`~og_nsd.llm.OpenAILLM` (pointed at it via ``base_url`` or
+``OPENAI_BASE_URL``) to run unchanged. Responses come from a
+:class:`Cassette` recorded against a real endpoint; latency, error injection
+(429/5xx/timeouts) and rate/throughput limits are simulated so the real
+client code path can be benchmarked without network access. Requests with
+``"stream": true`` are answered as server-sent ``chat.completion.chunk``
+events paced by the latency model's per-token delay.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+CALL_KINDS = ("generate_axioms", "generate_patch", "apply_patches", "other")
+MISS_POLICIES = ("kind", "synthetic", "error")
+LATENCY_DISTRIBUTIONS = ("none", "fixed", "uniform", "normal", "lognormal", "recorded")
+
+_CASSETTE_VERSION = 1
+_STREAM_CHUNK_CHARS = 16
+
+
+def classify_request(messages: List[dict]) -> str:
+    """Map a chat request to the :class:`~og_nsd.llm.OpenAILLM` call that built it."""
+
+    content = "\n".join(str(message.get("content", "")) for message in messages if message.get("role") == "user")
+    if "deterministic patch plan" in content:
+        return "apply_patches"
+    if "Given the SHACL/Reasoner issues below" in content:
+        return "generate_patch"
+    if "Requirements Input" in content:
+        return "generate_axioms"
+    return "other"
+
+
+def request_key(model: str, messages: List[dict]) -> str:
+    """Content hash identifying a request; temperature and other knobs are ignored."""
+
+    payload = json.dumps({"model": model, "messages": messages}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+@dataclass
+class Interaction:
+    """One recorded request/response pair."""
+
+    key: str
+    kind: str
+    model: str
+    response: dict
+    latency_s: float = 0.0
+
+
+class Cassette:
+    """Recorded interactions, looked up by request hash or by call kind."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self.interactions: List[Interaction] = []
+        self._by_key: Dict[str, List[Interaction]] = {}
+        self._by_kind: Dict[str, List[Interaction]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path) -> "Cassette":
+        cassette = cls(path)
+        if path.exists():
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            for item in payload.get("interactions", []):
+                cassette.add(Interaction(**item))
+        return cassette
+
+    def save(self, path: Optional[Path] = None) -> None:
+        target = path or self.path
+        if target is None:
+            raise ValueError("Cassette has no path to save to")
+        with self._lock:
+            payload = {"version": _CASSETTE_VERSION, "interactions": [asdict(item) for item in self.interactions]}
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    def add(self, interaction: Interaction) -> None:
+        with self._lock:
+            self.interactions.append(interaction)
+            self._by_key.setdefault(interaction.key, []).append(interaction)
+            self._by_kind.setdefault(interaction.kind, []).append(interaction)
+
+    def lookup(self, key: str) -> Optional[Interaction]:
+        """Return the recording for ``key``; repeated requests cycle through its takes."""
+
+        return self._next(self._by_key.get(key), f"key:{key}")
+
+    def for_kind(self, kind: str) -> Optional[Interaction]:
+        """Return recordings of the same call kind in round-robin order."""
+
+        return self._next(self._by_kind.get(kind), f"kind:{kind}")
+
+    def _next(self, items: Optional[List[Interaction]], cursor_key: str) -> Optional[Interaction]:
+        if not items:
+            return None
+        with self._lock:
+            cursor = self._cursors.get(cursor_key, 0)
+            self._cursors[cursor_key] = cursor + 1
+        return items[cursor % len(items)]
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+
+@dataclass
+class LatencyModel:
+    """Simulated response latency.
+
+    ``distribution`` is one of :data:`LATENCY_DISTRIBUTIONS`; ``recorded``
+    replays the latency captured in the cassette. ``per_token_s`` adds
+    generation time per completion token on top of the sampled base latency.
+    """
+
+    distribution: str = "none"
+    mean_s: float = 0.0
+    stddev_s: float = 0.0
+    min_s: float = 0.0
+    max_s: float = 0.0
+    per_token_s: float = 0.0
+
+    def sample(self, rng: random.Random, recorded_s: float = 0.0, completion_tokens: int = 0) -> float:
+        kind = self.distribution
+        if kind == "fixed":
+            base = self.mean_s
+        elif kind == "uniform":
+            base = rng.uniform(self.min_s, self.max_s or self.mean_s)
+        elif kind == "normal":
+            base = rng.gauss(self.mean_s, self.stddev_s)
+        elif kind == "lognormal":
+            # Parameterised by the mean/stddev of the latency itself, not of its log.
+            if self.mean_s <= 0:
+                base = 0.0
+            else:
+                sigma2 = math.log(1 + (self.stddev_s / self.mean_s) ** 2)
+                base = rng.lognormvariate(math.log(self.mean_s) - sigma2 / 2, math.sqrt(sigma2))
+        elif kind == "recorded":
+            base = recorded_s
+        else:
+            base = 0.0
+        return max(0.0, base) + self.per_token_s * completion_tokens
+
+
+@dataclass
+class FaultInjection:
+    """Probabilities of simulated provider failures per request."""
+
+    rate_limit_rate: float = 0.0
+    server_error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    retry_after_s: float = 1.0
+    hang_s: float = 30.0
+    server_error_codes: Tuple[int, ...] = (500, 502, 503)
+
+
+@dataclass
+class ThroughputLimits:
+    """Provider-style quotas; requests over RPM/TPM get a 429 with ``Retry-After``.
+
+    ``max_concurrency`` caps in-flight requests; extra requests queue rather
+    than fail, like a saturated upstream.
+    """
+
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+    max_concurrency: Optional[int] = None
+
+
+class _MinuteBucket:
+    """Token bucket refilled continuously at ``per_minute / 60`` per second."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def take(self, amount: float) -> float:
+        """Consume ``amount`` and return 0, or return the seconds to wait."""
+
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            self.level -= amount
+            return 0.0
+        return (amount - self.level) / self.rate
+
+
+@dataclass
+class ServerStats:
+    requests: int = 0
+    hits: int = 0
+    misses: int = 0
+    recorded: int = 0
+    throttled: int = 0
+    by_status: Dict[str, int] = field(default_factory=dict)
+    by_kind: Dict[str, int] = field(default_factory=dict)
+    injected: Dict[str, int] = field(default_factory=dict)
+
+    def bump(self, bucket: Dict[str, int], key: object) -> None:
+        bucket[str(key)] = bucket.get(str(key), 0) + 1
+
+
+class _Hang(Exception):
+    """Raised to drop the connection without replying (simulated timeout)."""
+
+
+@dataclass
+class _EventStream:
+    """A completion to be sent as server-sent events, ``delay_s`` apart."""
+
+    events: List[dict]
+    delay_s: List[float]
+
+
+Payload = Union[dict, _EventStream]
+
+
+class MockLLMServer:
+    """Threaded OpenAI-compatible server backed by a :class:`Cassette`.
+
+    ``mode="replay"`` answers from the cassette, falling back according to
+    ``on_miss`` (``kind``: reuse a recording of the same call kind,
+    ``synthetic``: emit a small valid Turtle answer, ``error``: 404).
+    ``mode="record"`` forwards every request to ``upstream`` and appends the
+    response to the cassette, which is saved after each call.
+    """
+
+    def __init__(
+        self,
+        cassette: Optional[Cassette] = None,
+        *,
+        mode: str = "replay",
+        upstream: Optional[str] = None,
+        on_miss: str = "kind",
+        latency: Optional[LatencyModel] = None,
+        faults: Optional[FaultInjection] = None,
+        limits: Optional[ThroughputLimits] = None,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        if mode not in ("replay", "record"):
+            raise ValueError(f"Unknown mode: {mode}")
+        if mode == "record" and not upstream:
+            raise ValueError("Record mode needs an upstream base URL")
+        if on_miss not in MISS_POLICIES:
+            raise ValueError(f"Unknown miss policy: {on_miss}")
+        self.cassette = cassette if cassette is not None else Cassette()
+        self.mode = mode
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.on_miss = on_miss
+        self.latency = latency or LatencyModel()
+        self.faults = faults or FaultInjection()
+        self.limits = limits or ThroughputLimits()
+        self.stats = ServerStats()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._rpm = _MinuteBucket(self.limits.requests_per_minute) if self.limits.requests_per_minute else None
+        self._tpm = _MinuteBucket(self.limits.tokens_per_minute) if self.limits.tokens_per_minute else None
+        self._slots = threading.BoundedSemaphore(self.limits.max_concurrency) if self.limits.max_concurrency else None
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def serve_forever(self) -> None:
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    # -- request handling -------------------------------------------------
+
+    def handle(self, body: dict, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], Payload]:
+        """Serve one ``chat.completions`` request; returns status, headers and JSON body.
+
+        Streaming requests get an :class:`_EventStream` body on success.
+        """
+
+        messages = body.get("messages") or []
+        model = str(body.get("model", "mock"))
+        kind = classify_request(messages)
+        prompt_tokens = estimate_tokens("".join(str(m.get("content", "")) for m in messages))
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.bump(self.stats.by_kind, kind)
+            roll = self._rng.random()
+            wait = self._rpm.take(1) if self._rpm else 0.0
+            if not wait and self._tpm:
+                wait = self._tpm.take(prompt_tokens)
+
+        if wait:
+            with self._lock:
+                self.stats.throttled += 1
+            return self._error(429, "Rate limit reached for requests", "rate_limit_exceeded", retry_after=wait)
+        faults = self.faults
+        if roll < faults.rate_limit_rate:
+            return self._injected("429", self._error(429, "Rate limit reached (injected)", "rate_limit_exceeded", faults.retry_after_s))
+        roll -= faults.rate_limit_rate
+        if roll < faults.server_error_rate:
+            with self._lock:
+                code = self._rng.choice(faults.server_error_codes)
+            return self._injected("5xx", self._error(code, "Upstream error (injected)", "server_error"))
+        roll -= faults.server_error_rate
+        if roll < faults.timeout_rate:
+            self._injected("timeout", None)
+            time.sleep(faults.hang_s)
+            raise _Hang()
+
+        if self._slots is not None:
+            self._slots.acquire()
+        stream = bool(body.get("stream"))
+        try:
+            if self.mode == "record":
+                status, extra, payload = self._record(body, headers, model, messages, kind)
+                per_token_s = 0.0
+            else:
+                status, extra, payload = self._replay(model, messages, kind, prompt_tokens, stream)
+                per_token_s = self.latency.per_token_s
+            if stream and status == 200:
+                include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+                return status, extra, _to_event_stream(payload, per_token_s, include_usage)
+            return status, extra, payload
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+    def _replay(
+        self, model: str, messages: List[dict], kind: str, prompt_tokens: int, stream: bool = False
+    ) -> Tuple[int, Dict[str, str], dict]:
+        interaction = self.cassette.lookup(request_key(model, messages))
+        with self._lock:
+            if interaction is not None:
+                self.stats.hits += 1
+            else:
+                self.stats.misses += 1
+        if interaction is None and self.on_miss == "error":
+            return self._error(404, "No cassette recording for this request", "cassette_miss")
+        if interaction is None and self.on_miss == "kind":
+            interaction = self.cassette.for_kind(kind)
+        if interaction is not None:
+            response = dict(interaction.response)
+            recorded_s = interaction.latency_s
+        else:
+            response = _synthetic_completion(model, kind, messages, prompt_tokens)
+            recorded_s = 0.0
+        completion_tokens = int((response.get("usage") or {}).get("completion_tokens") or 0)
+        with self._lock:
+            delay = self.latency.sample(self._rng, recorded_s, completion_tokens)
+            if stream:
+                # Generation time is paid per chunk while streaming instead.
+                delay -= self.latency.per_token_s * completion_tokens
+            if self._tpm and completion_tokens:
+                self._tpm.take(completion_tokens)
+        if delay:
+            time.sleep(delay)
+        return self._ok(response)
+
+    def _record(
+        self, body: dict, headers: Dict[str, str], model: str, messages: List[dict], kind: str
+    ) -> Tuple[int, Dict[str, str], dict]:
+        # Always record complete responses; streams are re-chunked on replay.
+        body = {key: value for key, value in body.items() if key not in ("stream", "stream_options")}
+        request = urllib.request.Request(
+            f"{self.upstream}/chat/completions",
+            data=json.dumps(body).encode("utf-8"),
+            headers={"Content-Type": "application/json", "Authorization": headers.get("Authorization", "")},
+            method="POST",
+        )
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as upstream:
+                payload = json.loads(upstream.read().decode("utf-8"))
+        except urllib.error.HTTPError as exc:
+            detail = exc.read().decode("utf-8", errors="replace")
+            try:
+                error_body = json.loads(detail)
+            except json.JSONDecodeError:
+                error_body = {"error": {"message": detail}}
+            retry_after = exc.headers.get("Retry-After")
+            extra = {"Retry-After": retry_after} if retry_after else {}
+            return self._status(exc.code, extra, error_body)
+        latency = time.perf_counter() - started
+        self.cassette.add(Interaction(request_key(model, messages), kind, model, payload, round(latency, 4)))
+        with self._lock:
+            self.stats.recorded += 1
+        if self.cassette.path is not None:
+            self.cassette.save()
+        return self._ok(payload)
+
+    def _ok(self, payload: dict) -> Tuple[int, Dict[str, str], dict]:
+        return self._status(200, {}, payload)
+
+    def _error(
+        self, code: int, message: str, error_type: str, retry_after: Optional[float] = None
+    ) -> Tuple[int, Dict[str, str], dict]:
+        extra = {"Retry-After": str(max(1, math.ceil(retry_after)))} if retry_after is not None else {}
+        return self._status(code, extra, {"error": {"message": message, "type": error_type, "code": error_type}})
+
+    def _status(self, code: int, extra: Dict[str, str], payload: dict) -> Tuple[int, Dict[str, str], dict]:
+        with self._lock:
+            self.stats.bump(self.stats.by_status, code)
+        return code, extra, payload
+
+    def _injected(self, name: str, result):
+        with self._lock:
+            self.stats.bump(self.stats.injected, name)
+        return result
+
+    def _handler_class(self):
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args) -> None:  # noqa: A002 - stdlib signature
+                return None
+
+            def do_GET(self) -> None:
+                if self.path.rstrip("/").endswith("/stats"):
+                    self._send(200, {}, asdict(server.stats))
+                else:
+                    self._send(404, {}, {"error": {"message": f"Unknown path {self.path}"}})
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b"{}"
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send(404, {}, {"error": {"message": f"Unknown path {self.path}"}})
+                    return
+                try:
+                    body = json.loads(raw.decode("utf-8"))
+                except json.JSONDecodeError:
+                    self._send(400, {}, {"error": {"message": "Invalid JSON body"}})
+                    return
+                try:
+                    status, headers, payload = server.handle(body, dict(self.headers.items()))
+                except _Hang:
+                    self.close_connection = True
+                    return
+                if isinstance(payload, _EventStream):
+                    self._send_events(headers, payload)
+                else:
+                    self._send(status, headers, payload)
+
+            def _send_events(self, headers: Dict[str, str], stream: _EventStream) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.close_connection = True
+                try:
+                    for event, delay in zip(stream.events, stream.delay_s):
+                        if delay:
+                            time.sleep(delay)
+                        self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                        self.wfile.flush()
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client stopped reading (e.g. an aborted stream)
+
+            def _send(self, status: int, headers: Dict[str, str], payload: dict) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+        return _Handler
+
+
+def _to_event_stream(payload: dict, per_token_s: float, include_usage: bool) -> _EventStream:
+    """Split a complete ``chat.completion`` into ``chat.completion.chunk`` events."""
+
+    choices = payload.get("choices") or [{}]
+    content = str((choices[0].get("message") or {}).get("content") or "")
+    base = {
+        "id": payload.get("id", "chatcmpl-mock"),
+        "object": "chat.completion.chunk",
+        "created": payload.get("created", int(time.time())),
+        "model": payload.get("model", "mock"),
+    }
+
+    def _chunk(delta: dict, finish_reason: Optional[str] = None) -> dict:
+        return {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+
+    events = [_chunk({"role": "assistant", "content": ""})]
+    delays = [0.0]
+    for start in range(0, len(content), _STREAM_CHUNK_CHARS):
+        piece = content[start : start + _STREAM_CHUNK_CHARS]
+        events.append(_chunk({"content": piece}))
+        delays.append(per_token_s * estimate_tokens(piece))
+    events.append(_chunk({}, choices[0].get("finish_reason") or "stop"))
+    delays.append(0.0)
+    if include_usage and payload.get("usage"):
+        events.append({**base, "choices": [], "usage": payload["usage"]})
+        delays.append(0.0)
+    return _EventStream(events, delays)
+
+
+_TITLE_RE = re.compile(r"^Title:\s*(.+)$", re.MULTILINE)
+
+
+def _synthetic_completion(model: str, kind: str, messages: List[dict], prompt_tokens: int) -> dict:
+    """Build a small but valid Turtle answer when the cassette has nothing to replay."""
+
+    lines = [
+        "@prefix atm: <http://lod.csd.auth.gr/atm/atm.ttl#> .",
+        "@prefix owl: <http://www.w3.org/2002/07/owl#> .",
+        "@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .",
+    ]
+    if kind == "generate_axioms":
+        content = "\n".join(str(m.get("content", "")) for m in messages)
+        for idx, title in enumerate(_TITLE_RE.findall(content), start=1):
+            name = re.sub(r"[^A-Za-z0-9]+", "_", title).strip("_") or f"Requirement_{idx}"
+            lines.append(f'atm:Mock_{name} a owl:Class ; rdfs:label "{title.strip()}" .')
+    else:
+        lines.append(f'atm:MockRepair a owl:Class ; rdfs:comment "synthetic {kind} response" .')
+    text = "\n".join(lines)
+    completion_tokens = estimate_tokens(text)
+    return {
+        "id": f"chatcmpl-mock-{hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
@@ -1,12 +1,19 @@
 """Ontology graph assembly utilities."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+import copy
+import hashlib
+import json
+import time
+from dataclasses import asdict, dataclass
 from pathlib import Path
 import re
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional
 
-from rdflib import Graph, OWL, RDF, RDFS
+from rdflib import BNode, Graph, OWL, RDF, RDFS, URIRef
+
+from .graphs import cache_dir, file_digest, load_cached, overlay_graph
+from .tracing import span
 
 
 @dataclass
@@ -40,36 +47,135 @@ class OntologyAssembler:
             self.default_prefixes["atm"] = self.base_namespace
 
     def bootstrap(self) -> OntologyState:
-        graph = Graph()
+        """Return a fresh state layered over the (cached) base ontology.
+
+        The base file is parsed once per process; each state gets its own
+        writable overlay so repeated bootstraps neither re-parse nor copy the
+        base triples.
+        """
+
         snippets: list[str] = []
         if self.base_path and self.base_path.exists():
-            graph.parse(self.base_path)
-            snippets.append(self.base_path.read_text(encoding="utf-8"))
+            cached = load_cached(self.base_path)
+            graph = overlay_graph(cached.graph)
+            snippets.append(cached.text)
+        else:
+            graph = Graph()
         return OntologyState(graph=graph, turtle_snippets=snippets)
 
     def add_turtle(self, state: OntologyState, turtle: str) -> None:
+        with span("ontology.add_turtle", chars_in=len(turtle), triples_before=len(state.graph)) as stage:
+            self._add_turtle(state, turtle, stage)
+            stage.set(triples_after=len(state.graph))
+
+    def _add_turtle(self, state: OntologyState, turtle: str, stage) -> None:
+        state.turtle_snippets.append(self._parse_into(state.graph, turtle, stage))
+
+    def _parse_into(self, graph: Graph, turtle: str, stage) -> str:
+        """Parse LLM Turtle into ``graph``; return the text that parsed."""
+
         cleaned = _normalize_base_prefix(
             _strip_code_fence(turtle), base_namespace=self.base_namespace
         )
         cleaned = _ensure_standard_prefixes(cleaned, additional_prefixes=self.default_prefixes)
         try:
-            state.graph.parse(data=cleaned, format="turtle")
+            graph.parse(data=cleaned, format="turtle")
         except Exception as exc:  # pragma: no cover - requires rdflib parse error
             sanitized = _sanitize_turtle(cleaned)
+            stage.set(sanitized=True)
             if sanitized != cleaned:
                 try:
-                    state.graph.parse(data=sanitized, format="turtle")
+                    graph.parse(data=sanitized, format="turtle")
                 except Exception as exc2:  # pragma: no cover - requires rdflib parse error
                     raise ValueError(
                         f"Failed to parse Turtle from LLM response after sanitization: {exc2}"
                     ) from exc2
-                state.turtle_snippets.append(sanitized)
-                return
+                return sanitized
             raise ValueError(f"Failed to parse Turtle from LLM response: {exc}") from exc
-        state.turtle_snippets.append(cleaned)
+        return cleaned
+
+    def add_graph(self, state: OntologyState, graph: Graph, turtle: Optional[str] = None) -> None:
+        """Merge an already built fragment (a streamed or offline-model response)."""
+
+        with span("ontology.add_graph", triples_in=len(graph), triples_before=len(state.graph)) as stage:
+            self._bind_missing(state, graph.namespaces())
+            state.graph.addN((s, p, o, state.graph) for s, p, o in graph)
+            if turtle:
+                state.turtle_snippets.append(turtle)
+            stage.set(triples_after=len(state.graph))
+
+    def add_triples(
+        self,
+        state: OntologyState,
+        triples: Iterable[tuple],
+        namespaces: Optional[Dict[str, str]] = None,
+        turtle: Optional[str] = None,
+    ) -> None:
+        """Add native triples directly, skipping Turtle serialization and parsing."""
+
+        with span("ontology.add_triples", triples_before=len(state.graph)) as stage:
+            if namespaces:
+                self._bind_missing(state, namespaces.items())
+            state.graph.addN((s, p, o, state.graph) for s, p, o in triples)
+            if turtle:
+                state.turtle_snippets.append(turtle)
+            stage.set(triples_after=len(state.graph))
+
+    def add_response(self, state: OntologyState, response) -> None:
+        """Ingest an :class:`~og_nsd.llm.LLMResponse`, preferring native triples or graph."""
+
+        if getattr(response, "triples", None) is not None:
+            self.add_triples(
+                state, response.triples, getattr(response, "namespaces", None), response.materialized_turtle()
+            )
+        elif getattr(response, "graph", None) is not None:
+            self.add_graph(state, response.graph, response.materialized_turtle())
+        else:
+            self.add_turtle(state, response.turtle)
+
+    def response_triples(self, response) -> list:
+        """Return a response's triples, parsing text responses into ``response.graph`` once.
+
+        A later :meth:`add_response` then merges the parsed graph instead of
+        parsing the Turtle again.
+        """
+
+        if getattr(response, "triples", None) is not None:
+            return list(response.triples)
+        if getattr(response, "graph", None) is None:
+            with span("ontology.parse_response", chars_in=len(response.turtle)) as stage:
+                graph = Graph()
+                self._parse_into(graph, response.turtle, stage)
+                response.graph = graph
+        return list(response.graph)
+
+    @staticmethod
+    def _bind_missing(state: OntologyState, namespaces: Iterable[tuple]) -> None:
+        # Binding is surprisingly costly in rdflib; only bind unknown prefixes.
+        store = state.graph.store
+        for prefix, namespace in namespaces:
+            if store.namespace(prefix) is None:
+                state.graph.bind(prefix, namespace, override=False)
+
+    def stream_parser(
+        self, max_chars: Optional[int] = None, max_consecutive_failures: int = 3
+    ) -> "IncrementalTurtleParser":
+        """Return a parser for streamed output that applies this assembler's prefix rules."""
+
+        return IncrementalTurtleParser(
+            base_namespace=self.base_namespace,
+            default_prefixes=self.default_prefixes,
+            max_chars=max_chars,
+            max_consecutive_failures=max_consecutive_failures,
+        )
 
     def serialize(self, state: OntologyState, path: Path) -> None:
-        path.write_text(state.graph.serialize(format="turtle"), encoding="utf-8")
+        with span("ontology.serialize", triples=len(state.graph)):
+            path.write_text(state.graph.serialize(format="turtle"), encoding="utf-8")
+
+
+_SCHEMA_CACHE_VERSION = 1
+_SCHEMA_MEMO: Dict[tuple, dict] = {}
 
 
 def load_schema_context(path: Path, base_namespace: str | None = None) -> SchemaContext:
@@ -78,50 +184,113 @@ def load_schema_context(path: Path, base_namespace: str | None = None) -> Schema
     Only structural vocabulary is returned; axioms are intentionally omitted so the
     LLM receives guidance without an easy-to-copy solution. If ``base_namespace``
     is provided, terms outside that namespace are ignored.
+
+    Results are memoized per process and persisted as JSON next to the graph
+    cache, keyed by the ontology's content hash and ``base_namespace``, so
+    repeat runs skip both parsing and extraction.
     """
 
-    graph = Graph()
-    graph.parse(path)
-    return extract_schema_context(graph, base_namespace)
+    key = (file_digest(path), base_namespace or "")
+    payload = _SCHEMA_MEMO.get(key)
+    if payload is None:
+        cache_path = _schema_cache_path(*key)
+        payload = _read_schema_cache(cache_path) if cache_path else None
+        if payload is None:
+            payload = asdict(extract_schema_context(load_cached(path).graph, base_namespace))
+            if cache_path:
+                _write_schema_cache(cache_path, payload)
+        _SCHEMA_MEMO[key] = payload
+    # Hand out a fresh copy: callers (e.g. OntologyAssembler) extend ``prefixes`` in place.
+    return SchemaContext(**copy.deepcopy(payload))
+
+
+def _schema_cache_path(digest: str, base_namespace: str) -> Optional[Path]:
+    root = cache_dir()
+    if root is None:
+        return None
+    ns_hash = hashlib.sha256(base_namespace.encode("utf-8")).hexdigest()[:16]
+    return root / "schema" / f"{digest}-{ns_hash}-v{_SCHEMA_CACHE_VERSION}.json"
+
+
+def _read_schema_cache(path: Path) -> Optional[dict]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if payload.get("version") != _SCHEMA_CACHE_VERSION:
+        return None
+    return payload.get("schema")
+
+
+def _write_schema_cache(path: Path, payload: dict) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps({"version": _SCHEMA_CACHE_VERSION, "schema": payload}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+    except OSError:  # pragma: no cover - read-only cache directory
+        pass
 
 
 def extract_schema_context(graph: Graph, base_namespace: str | None = None) -> SchemaContext:
-    """Build a :class:`SchemaContext` from an rdflib graph."""
+    """Build a :class:`SchemaContext` from an rdflib graph.
+
+    Each relevant predicate index (``rdf:type``, ``rdfs:domain``,
+    ``rdfs:range``, ``rdfs:label``) is walked exactly once and qname
+    normalization is memoized per term, so extraction is linear in the size
+    of those indexes.
+    """
+
+    qnames: Dict[object, str] = {}
 
     def _qname(term) -> str:
-        try:
-            return graph.namespace_manager.normalizeUri(term)
-        except Exception:  # pragma: no cover - rdflib normalization edge cases
-            return str(term)
+        qname = qnames.get(term)
+        if qname is None:
+            try:
+                qname = graph.namespace_manager.normalizeUri(term)
+            except Exception:  # pragma: no cover - rdflib normalization edge cases
+                qname = str(term)
+            qnames[term] = qname
+        return qname
 
     def _in_scope(term) -> bool:
         return base_namespace is None or str(term).startswith(base_namespace)
 
-    classes = {_qname(cls) for cls in graph.subjects(RDF.type, OWL.Class) if _in_scope(cls)}
-
-    object_properties: Dict[str, Dict[str, str]] = {}
-    for prop in graph.subjects(RDF.type, OWL.ObjectProperty):
-        if not _in_scope(prop):
-            continue
-        qname = _qname(prop)
-        domain = next(graph.objects(prop, RDFS.domain), None)
-        range_ = next(graph.objects(prop, RDFS.range), None)
-        object_properties[qname] = {
-            "domain": _qname(domain) if domain else "(unspecified)",
-            "range": _qname(range_) if range_ else "(unspecified)",
-        }
-
-    datatype_properties: Dict[str, Dict[str, str]] = {}
-    for prop in graph.subjects(RDF.type, OWL.DatatypeProperty):
-        if not _in_scope(prop):
-            continue
-        qname = _qname(prop)
-        domain = next(graph.objects(prop, RDFS.domain), None)
-        range_ = next(graph.objects(prop, RDFS.range), None)
-        datatype_properties[qname] = {
-            "domain": _qname(domain) if domain else "(unspecified)",
-            "range": _qname(range_) if range_ else "(unspecified)",
-        }
+    classes: set[str] = set()
+    object_props: list = []
+    datatype_props: list = []
+    for subject, _, rdf_type in graph.triples((None, RDF.type, None)):
+        if rdf_type == OWL.Class:
+            if _in_scope(subject):
+                classes.add(_qname(subject))
+        elif rdf_type == OWL.ObjectProperty:
+            object_props.append(subject)
+        elif rdf_type == OWL.DatatypeProperty:
+            datatype_props.append(subject)
+
+    domains: Dict[object, object] = {}
+    for prop, _, domain in graph.triples((None, RDFS.domain, None)):
+        domains.setdefault(prop, domain)
+    ranges: Dict[object, object] = {}
+    for prop, _, range_ in graph.triples((None, RDFS.range, None)):
+        ranges.setdefault(prop, range_)
+
+    def _signatures(props: list) -> Dict[str, Dict[str, str]]:
+        signatures: Dict[str, Dict[str, str]] = {}
+        for prop in props:
+            if not _in_scope(prop):
+                continue
+            domain = domains.get(prop)
+            range_ = ranges.get(prop)
+            signatures[_qname(prop)] = {
+                "domain": _qname(domain) if domain else "(unspecified)",
+                "range": _qname(range_) if range_ else "(unspecified)",
+            }
+        return signatures
+
+    object_properties = _signatures(object_props)
+    datatype_properties = _signatures(datatype_props)
 
     labels: Dict[str, str] = {}
     for subject, _, label in graph.triples((None, RDFS.label, None)):
@@ -209,6 +378,298 @@ def _ensure_standard_prefixes(
     return "\n".join(missing + [turtle])
 
 
+class StreamAborted(Exception):
+    """Raised by :class:`IncrementalTurtleParser` when a stream must be cut off."""
+
+    def __init__(self, reason: str, detail: str = "") -> None:
+        super().__init__(f"{reason}: {detail}" if detail else reason)
+        self.reason = reason
+
+
+class TurtleStatementSplitter:
+    """Split Turtle text arriving in arbitrary chunks into complete statements.
+
+    A statement ends at a ``.`` followed by whitespace (or end of input) that
+    is not inside an IRI, a string literal, a comment or a ``[]``/``()``
+    nesting; SPARQL-style ``PREFIX``/``BASE`` directives end at their IRI.
+    Comments and Markdown code-fence lines are dropped.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._current: List[str] = []
+        self._depth = 0
+        self._in_iri = False
+        self._in_comment = False
+        self._quote: Optional[str] = None
+
+    def feed(self, text: str) -> List[str]:
+        self._buffer += text
+        return self._scan(final=False)
+
+    def flush(self) -> List[str]:
+        """Return the remaining statements once the stream has ended."""
+
+        statements = self._scan(final=True)
+        tail = "".join(self._current).strip()
+        self._current = []
+        if tail:
+            statements.append(tail)
+        return statements
+
+    def _scan(self, final: bool) -> List[str]:
+        buffer = self._buffer
+        current = self._current
+        statements: List[str] = []
+        i, end = 0, len(buffer)
+        while i < end:
+            char = buffer[i]
+            if self._in_comment:
+                if char == "\n":
+                    self._in_comment = False
+                    current.append(char)
+                i += 1
+                continue
+            if self._in_iri:
+                current.append(char)
+                i += 1
+                if char == ">":
+                    self._in_iri = False
+                    if self._depth == 0 and _SPARQL_DIRECTIVE_RE.match("".join(current).lstrip()):
+                        statements.append("".join(current).strip())
+                        current.clear()
+                continue
+            if self._quote is not None:
+                quote = self._quote
+                if char == "\\":
+                    if i + 1 >= end and not final:
+                        break
+                    current.append(buffer[i : i + 2])
+                    i += 2
+                    continue
+                if len(quote) == 3:
+                    if buffer.startswith(quote, i):
+                        current.append(quote)
+                        self._quote = None
+                        i += 3
+                        continue
+                    if char == quote[0] and end - i < 3 and not final:
+                        break
+                elif char == quote:
+                    self._quote = None
+                current.append(char)
+                i += 1
+                continue
+
+            if char == "#":
+                self._in_comment = True
+                i += 1
+                continue
+            if char == "`" and buffer.startswith("```", i):
+                newline = buffer.find("\n", i)
+                if newline == -1:
+                    if not final:
+                        break
+                    i = end
+                    continue
+                i = newline + 1
+                continue
+            if char == "`" and end - i < 3 and not final:
+                break
+            if char in "\"'":
+                if end - i < 3 and not final:
+                    break
+                triple = char * 3
+                self._quote = triple if buffer.startswith(triple, i) else char
+                current.append(self._quote)
+                i += len(self._quote)
+                continue
+            if char == "<":
+                self._in_iri = True
+            elif char in "[(":
+                self._depth += 1
+            elif char in "])":
+                self._depth = max(0, self._depth - 1)
+            elif char == "." and self._depth == 0:
+                if i + 1 >= end and not final:
+                    break
+                if i + 1 >= end or buffer[i + 1].isspace() or buffer[i + 1] == "#":
+                    current.append(char)
+                    statement = "".join(current).strip()
+                    if statement:
+                        statements.append(statement)
+                    current.clear()
+                    i += 1
+                    continue
+            current.append(char)
+            i += 1
+        self._buffer = buffer[i:]
+        return statements
+
+
+_SPARQL_DIRECTIVE_RE = re.compile(r"(?:PREFIX|BASE)\b", re.IGNORECASE)
+_PREFIX_DIRECTIVE_RE = re.compile(
+    r"^(?:@prefix|PREFIX)\s+([A-Za-z][\w.-]*)?:\s*<([^>]*)>\s*\.?$", re.IGNORECASE
+)
+_BNODE_LABEL_RE = re.compile(r"(?<![\w<\"'])_:([A-Za-z0-9_][\w-]*)")
+_BNODE_PLACEHOLDER = "urn:og-nsd:stream-bnode:"
+_BASE_DIRECTIVE_RE = re.compile(r"^(?:@base|BASE)\s+<([^>]*)>\s*\.?$", re.IGNORECASE)
+
+
+@dataclass
+class StreamStats:
+    chars: int = 0
+    statements: int = 0
+    failed_statements: int = 0
+    triples: int = 0
+    first_triple_s: Optional[float] = None
+    aborted: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        payload = asdict(self)
+        if self.first_triple_s is not None:
+            payload["first_triple_s"] = round(self.first_triple_s, 4)
+        return payload
+
+
+class IncrementalTurtleParser:
+    """Parse streamed Turtle into a graph one complete statement at a time.
+
+    Prefix handling mirrors :meth:`OntologyAssembler.add_turtle`: standard and
+    default prefixes are available without declaration and ``atm:`` is pinned
+    to ``base_namespace``. Statements that fail to parse are retried through
+    :func:`_sanitize_turtle`; :class:`StreamAborted` is raised when more than
+    ``max_consecutive_failures`` statements in a row are unparseable or the
+    text exceeds ``max_chars``.
+    """
+
+    def __init__(
+        self,
+        base_namespace: Optional[str] = None,
+        default_prefixes: Optional[Dict[str, str]] = None,
+        max_chars: Optional[int] = None,
+        max_consecutive_failures: int = 3,
+    ) -> None:
+        self.graph = Graph()
+        self.stats = StreamStats()
+        self.max_chars = max_chars
+        self.max_consecutive_failures = max_consecutive_failures
+        self._base_namespace = base_namespace.rstrip("#/") + "#" if base_namespace else None
+        self._prefixes: Dict[str, str] = dict(_STANDARD_PREFIXES)
+        self._prefixes.update(default_prefixes or {})
+        if self._base_namespace:
+            self._prefixes["atm"] = self._base_namespace
+        self._base: Optional[str] = None
+        self._header: Optional[str] = None
+        self._splitter = TurtleStatementSplitter()
+        self._chunks: List[str] = []
+        self._consecutive_failures = 0
+        self._bnodes: Dict[str, BNode] = {}
+        self._started = time.perf_counter()
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> None:
+        if not chunk:
+            return
+        self._chunks.append(chunk)
+        self.stats.chars += len(chunk)
+        if self.max_chars is not None and self.stats.chars > self.max_chars:
+            self.stats.aborted = "budget"
+            raise StreamAborted("budget", f"output exceeded {self.max_chars} characters")
+        self._ingest(self._splitter.feed(chunk))
+
+    def feed_all(self, chunks: Iterable[str]) -> Graph:
+        for chunk in chunks:
+            self.feed(chunk)
+        return self.close()
+
+    def close(self) -> Graph:
+        self._ingest(self._splitter.flush(), final=True)
+        return self.graph
+
+    def _ingest(self, statements: List[str], final: bool = False) -> None:
+        data: List[str] = []
+        for statement in statements:
+            self.stats.statements += 1
+            if not self._directive(statement):
+                data.append(statement)
+        if not data:
+            return
+        if not self._parse("\n".join(data)):
+            for statement in data:
+                self._parse_statement(statement, final)
+        else:
+            self._consecutive_failures = 0
+        if self.stats.first_triple_s is None and len(self.graph):
+            self.stats.first_triple_s = time.perf_counter() - self._started
+        self.stats.triples = len(self.graph)
+
+    def _directive(self, statement: str) -> bool:
+        match = _PREFIX_DIRECTIVE_RE.match(statement)
+        if match:
+            prefix = match.group(1) or ""
+            if not (prefix == "atm" and self._base_namespace):
+                self._prefixes[prefix] = match.group(2)
+                self._header = None
+            return True
+        match = _BASE_DIRECTIVE_RE.match(statement)
+        if match:
+            self._base = match.group(1)
+            self._header = None
+            return True
+        return False
+
+    def _parse_statement(self, statement: str, final: bool) -> None:
+        if self._parse(statement) or self._parse(_sanitize_turtle(statement)):
+            self._consecutive_failures = 0
+            return
+        if final and not statement.rstrip().endswith("."):
+            # A truncated trailing statement; try closing it.
+            if self._parse(statement.rstrip(" ;,") + " ."):
+                return
+        self.stats.failed_statements += 1
+        self._consecutive_failures += 1
+        if self._consecutive_failures > self.max_consecutive_failures:
+            self.stats.aborted = "unparseable"
+            raise StreamAborted("unparseable", statement[:200])
+
+    def _parse(self, data: str) -> bool:
+        # rdflib scopes ``_:label`` blank nodes to a single parse, so labels are
+        # parsed as placeholder IRIs and mapped to stream-wide blank nodes.
+        labelled = "_:" in data
+        if labelled:
+            data = _BNODE_LABEL_RE.sub(lambda match: f"<{_BNODE_PLACEHOLDER}{match.group(1)}>", data)
+        fragment = Graph()
+        try:
+            fragment.parse(data=self._prefix_header() + data, format="turtle")
+        except Exception:  # noqa: BLE001 - rdflib raises a variety of parser errors
+            return False
+        if labelled:
+            triples = ((self._bnode(s), p, self._bnode(o)) for s, p, o in fragment)
+        else:
+            triples = iter(fragment)
+        self.graph.addN((s, p, o, self.graph) for s, p, o in triples)
+        return True
+
+    def _bnode(self, term):
+        if isinstance(term, URIRef) and term.startswith(_BNODE_PLACEHOLDER):
+            return self._bnodes.setdefault(term[len(_BNODE_PLACEHOLDER) :], BNode())
+        return term
+
+    def _prefix_header(self) -> str:
+        if self._header is None:
+            lines = [f"@prefix {prefix}: <{uri}> ." for prefix, uri in self._prefixes.items()]
+            if self._base:
+                lines.insert(0, f"@base <{self._base}> .")
+            self._header = "\n".join(lines) + "\n"
+            for prefix, uri in self._prefixes.items():
+                self.graph.bind(prefix, uri, override=True)
+        return self._header
+
+
 _CONTROL_CHAR_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
 _QUOTED_PREFIX_RE = re.compile(r"'([A-Za-z][\w-]*:)")
 _BYTE_LITERAL_RE = re.compile(r"^b['\"](.*)['\"]$", re.DOTALL)
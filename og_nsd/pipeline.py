@@ -7,13 +7,23 @@ from pathlib import Path
 from typing import Optional
 
 from .config import PipelineConfig
+from .dedup import DuplicateClusters, find_near_duplicates
+from .exemplars import ExemplarIndex
+from .keywords import Lexicon
+from .ledger import CallLedger, llm_call
 from .llm import HeuristicLLM, LLMClient, LLMResponse, OpenAILLM
+from .memo import DraftMemo, draft_fingerprint
 from .ontology import OntologyAssembler, load_schema_context
 from .queries import CompetencyQuestionRunner
+from .prerepair import PreRepairEngine
 from .reasoning import OwlreadyReasoner
+from .repair_memo import RepairMemo
 from .reporting import build_report, save_report
 from .requirements import RequirementLoader, chunk_requirements, load_split_ids
-from .shacl import ShaclValidator
+from .routing import ModelTier, RoutedLLM
+from .shacl import ShaclValidator, cluster_shacl_results
+from .templates import TemplateCompiler
+from .tracing import Tracer, span
 
 
 class OntologyDraftingPipeline:
@@ -26,7 +36,11 @@ class OntologyDraftingPipeline:
         self.assembler = OntologyAssembler(
             base_path, base_namespace=config.base_namespace, default_prefixes=default_prefixes
         )
-        self.validator = ShaclValidator(config.shapes_path) if config.shapes_path else None
+        self.validator = (
+            ShaclValidator(config.shapes_path, engine=config.shacl_engine, workers=config.shacl_workers)
+            if config.shapes_path
+            else None
+        )
         self.reasoner = OwlreadyReasoner(enabled=config.reasoning_enabled)
         self.cq_runner: Optional[CompetencyQuestionRunner] = None
         if config.competency_questions_path:
@@ -38,39 +52,164 @@ class OntologyDraftingPipeline:
         self.last_cq_results = None
         self.state_graph = None
         self.reasoned_graph = None
+        self.tracer: Optional[Tracer] = None
+        self.ledger: Optional[CallLedger] = None
+        self.draft_memo: Optional[DraftMemo] = None
+        self.repair_memo = RepairMemo.open() if config.repair_memo else None
+        self.local_repair: Optional[PreRepairEngine] = None
+        if config.local_repair and self.validator is not None:
+            self.local_repair = PreRepairEngine(self.validator.shapes_graph)
 
     def _select_llm(self, config: PipelineConfig) -> LLMClient:
         if config.llm_mode == "openai":
             api_key = os.getenv("OPENAI_API_KEY")
             if api_key:
                 try:
-                    return OpenAILLM(temperature=config.llm_temperature)
+                    llm = OpenAILLM(
+                        model=config.llm_model,
+                        temperature=config.llm_temperature,
+                        stream=config.llm_streaming,
+                        stream_budget_tokens=config.llm_stream_budget_tokens,
+                        stream_parser_factory=self.assembler.stream_parser,
+                    )
+                    return self._routed_llm(config, llm) if config.llm_fast_model else llm
                 except RuntimeError:
                     logging.warning(
                         "openai package missing; falling back to heuristic LLM for offline execution"
                     )
-                    return HeuristicLLM(base_namespace=config.base_namespace)
+                    return self._heuristic_llm(config)
             logging.warning(
                 "OPENAI_API_KEY not set; falling back to heuristic LLM for offline execution"
             )
-            return HeuristicLLM(base_namespace=config.base_namespace)
-        return HeuristicLLM(base_namespace=config.base_namespace)
+            return self._heuristic_llm(config)
+        return self._heuristic_llm(config)
+
+    def _routed_llm(self, config: PipelineConfig, strong: OpenAILLM) -> RoutedLLM:
+        if config.llm_fast_model == "heuristic":
+            fast: LLMClient = self._heuristic_llm(config)
+        else:
+            fast = OpenAILLM(
+                model=config.llm_fast_model,
+                temperature=config.llm_temperature,
+                scheduler=strong.scheduler,
+                stream=config.llm_streaming,
+                stream_budget_tokens=config.llm_stream_budget_tokens,
+                stream_parser_factory=self.assembler.stream_parser,
+            )
+        tiers = [
+            ModelTier(config.llm_fast_model, fast, max_difficulty=config.llm_route_threshold),
+            ModelTier(config.llm_model, strong),
+        ]
+        return RoutedLLM(tiers, schema_context=self.schema_context, check=self.assembler.response_triples)
+
+    def _heuristic_llm(self, config: PipelineConfig) -> HeuristicLLM:
+        lexicon = Lexicon.load(config.heuristic_lexicon_path) if config.heuristic_lexicon_path else None
+        return HeuristicLLM(base_namespace=config.base_namespace, lexicon=lexicon)
 
     def run(self) -> dict:
-        dev_ids = load_split_ids(self.config.dev_split_path)
-        test_ids = load_split_ids(self.config.test_split_path)
-        loader = RequirementLoader(self.config.requirements_path, dev_ids=dev_ids, test_ids=test_ids)
-        requirements = loader.load(self.config.max_requirements)
-        exemplar_pool = (
-            [req for req in requirements if req.split == "dev"][:6] if dev_ids else None
+        self.tracer = Tracer()
+        self.ledger = CallLedger()
+        with self.tracer.activate(), self.ledger.activate():
+            with span("pipeline.run", llm=type(self.llm).__name__):
+                report = self._run()
+        report["performance"] = self.tracer.to_report()
+        report["performance"]["llm_calls"] = self.ledger.summary()
+        # Every drafting batch and repair call, not just the last response.
+        report["token_usage"] = self.ledger.token_totals() or report.get("token_usage")
+        scheduler = getattr(self.llm, "scheduler", None)
+        if scheduler is not None:
+            report["performance"]["llm_scheduler"] = scheduler.snapshot()
+        if isinstance(self.llm, RoutedLLM):
+            report["performance"]["llm_routing"] = self.llm.stats.to_dict()
+        if self.draft_memo is not None:
+            report["performance"]["draft_memo"] = self.draft_memo.stats.to_dict()
+        if self.repair_memo is not None:
+            report["performance"]["repair_memo"] = self.repair_memo.stats.to_dict()
+        if self.config.trace_path:
+            self.tracer.export_chrome_trace(self.config.trace_path)
+        if self.config.llm_call_log_path:
+            self.ledger.write_ndjson(self.config.llm_call_log_path)
+        if self.config.report_path:
+            save_report(report, self.config.report_path)
+        return report
+
+    def _run(self) -> dict:
+        with span("requirements.load") as stage:
+            dev_ids = load_split_ids(self.config.dev_split_path)
+            test_ids = load_split_ids(self.config.test_split_path)
+            loader = RequirementLoader(self.config.requirements_path, dev_ids=dev_ids, test_ids=test_ids)
+            requirements = loader.load(self.config.max_requirements)
+            stage.set(requirements=len(requirements))
+        # Few-shot exemplars are retrieved per batch from an index over the dev split.
+        dev_requirements = [req for req in requirements if req.split == "dev"]
+        exemplar_index = (
+            ExemplarIndex(dev_requirements, k=self.config.few_shot_k, token_budget=self.config.few_shot_token_budget)
+            if dev_requirements
+            else None
         )
         state = self.assembler.bootstrap()
         llm_response: Optional[LLMResponse] = None
-        for batch in chunk_requirements(requirements, size=5):
-            llm_response = self.llm.generate_axioms(
-                batch, schema_context=self.schema_context, exemplars=exemplar_pool
+        clusters: Optional[DuplicateClusters] = None
+        if self.config.dedup_threshold is not None:
+            with span("requirements.dedup", requirements=len(requirements)) as stage:
+                clusters = find_near_duplicates(requirements, self.config.dedup_threshold)
+                requirements = clusters.representatives
+                stage.set(representatives=len(requirements), duplicates=clusters.duplicates)
+        if self.config.symbolic_drafting:
+            with span("draft.templates", requirements=len(requirements)) as stage:
+                templated = self._template_compiler(self.config).compile(requirements)
+                if templated.response is not None:
+                    self.assembler.add_response(state, templated.response)
+                    llm_response = templated.response
+                stage.set(templated=len(templated.handled), remaining=len(templated.remaining))
+            requirements = templated.remaining
+        memo = None
+        if self.config.draft_memo:
+            memo = self.draft_memo = DraftMemo.open(
+                draft_fingerprint(
+                    self.llm.fingerprint(),
+                    self.schema_context,
+                    exemplar_index.settings() if exemplar_index else None,
+                )
             )
-            self.assembler.add_turtle(state, llm_response.turtle)
+            with span("draft.memo", requirements=len(requirements)) as stage:
+                cached, requirements = memo.lookup(requirements)
+                self.assembler.add_triples(state, cached)
+                stage.set(hits=memo.stats.hits, misses=len(requirements))
+            self.ledger.record_cache_hits("generate_axioms", memo.stats.hits, batch_id="draft_memo")
+            if memo.stats.hits and not requirements and llm_response is None:
+                llm_response = LLMResponse(
+                    turtle="", reasoning_notes=f"Reused {memo.stats.hits} requirement drafts from the draft memo"
+                )
+
+        def _generate(item):
+            index, batch = item
+            exemplars = exemplar_index.select(batch) if exemplar_index else None
+            ledger_call = llm_call("generate_axioms", batch_id=f"batch-{index}", requirements=len(batch))
+            stage = span("llm.generate_axioms", requirements=len(batch), exemplars=len(exemplars or ()))
+            with stage, ledger_call as call:
+                response = self.llm.generate_axioms(
+                    batch, schema_context=self.schema_context, exemplars=exemplars or None
+                )
+                call.finish(response)
+                return response
+
+        batches = list(chunk_requirements(requirements, size=5))
+        # Remote models draft batches concurrently under the scheduler's
+        # limits; results are still merged in requirement order.
+        scheduler = getattr(self.llm, "scheduler", None)
+        items = list(enumerate(batches))
+        responses = scheduler.map_ordered(_generate, items) if scheduler else map(_generate, items)
+        with span("draft", requirements=len(requirements)) as draft_stage:
+            for batch, llm_response in zip(batches, responses):
+                with span("draft.batch", requirements=len(batch)) as stage:
+                    _count_tokens(stage, llm_response)
+                    if memo is not None:
+                        memo.store(batch, self.assembler.response_triples(llm_response), llm_response.attribution)
+                    self.assembler.add_response(state, llm_response)
+            if clusters is not None and clusters.members:
+                draft_stage.set(provenance_added=clusters.expand_provenance(state.graph, self.config.base_namespace))
+            draft_stage.set(triples=len(state.graph))
         if llm_response is None:
             raise RuntimeError("LLM returned no axioms")
         self.last_llm_response = llm_response
@@ -82,40 +221,74 @@ class OntologyDraftingPipeline:
                 "llm_notes": llm_response.reasoning_notes,
                 "token_usage": llm_response.token_usage,
             }
+            if clusters is not None:
+                report["deduplication"] = clusters.to_dict()
             self.assembler.serialize(state, self.config.output_path)
-            if self.config.report_path:
-                save_report(report, self.config.report_path)
             return report
 
         iteration_reports = []
         patch_notes: list[str] = []
+        # Results before the last repair and the triples it inserted, for the repair memo to learn from.
+        memo_before = None
         if self.validator is None:
             raise RuntimeError("SHACL validator not configured; provide --shapes or use --draft-only.")
         for iteration in range(self.config.max_iterations + 1):
-            reasoner_result = self.reasoner.run(state.graph)
-            reasoner_report = reasoner_result.report
-            shacl_input_graph = reasoner_result.expanded_graph
-            shacl_report = self.validator.validate(shacl_input_graph)
-            cq_results = self.cq_runner.run(shacl_input_graph) if self.cq_runner else None
-            iteration_reports.append(
-                {
-                    "iteration": iteration,
-                    "conforms": shacl_report.conforms,
-                    "shacl": shacl_report,
-                    "reasoner": reasoner_report,
-                    "cq_results": cq_results,
-                }
-            )
+            with span("iteration", iteration=iteration, triples=len(state.graph)):
+                reasoner_result = self.reasoner.run(state.graph)
+                reasoner_report = reasoner_result.report
+                shacl_input_graph = reasoner_result.expanded_graph
+                shacl_report = self.validator.validate(shacl_input_graph)
+                if self.repair_memo is not None and memo_before is not None:
+                    before_results, added = memo_before
+                    self.repair_memo.observe(before_results, shacl_report.results, added)
+                cq_results = self.cq_runner.run(shacl_input_graph) if self.cq_runner else None
+                iteration_reports.append(
+                    {
+                        "iteration": iteration,
+                        "conforms": shacl_report.conforms,
+                        "shacl": shacl_report,
+                        "reasoner": reasoner_report,
+                        "cq_results": cq_results,
+                    }
+                )
 
-            if shacl_report.conforms or iteration == self.config.max_iterations:
-                break
+                if shacl_report.conforms or iteration == self.config.max_iterations:
+                    break
 
-            prompts = self._synthesize_repair_prompts(shacl_report)
-            context_ttl = state.graph.serialize(format="turtle")
-            patch_response = self.llm.generate_patch(prompts, context_ttl)
-            patch_notes.append(patch_response.reasoning_notes)
-            if patch_response.turtle.strip():
-                self.assembler.add_turtle(state, patch_response.turtle)
+                with span("repair", results=len(shacl_report.results)) as stage:
+                    results = shacl_report.results
+                    added: list = []
+                    if self.local_repair is not None:
+                        local = self.local_repair.repair(state.graph, results)
+                        results = local.residual
+                        added.extend(local.added)
+                        stage.set(local_fixes=len(shacl_report.results) - len(results))
+                    if self.repair_memo is not None:
+                        memo_before = (results, added)
+                        memo_triples, results = self.repair_memo.apply(results)
+                        added.extend(triple for triple in memo_triples if triple not in state.graph)
+                        self.assembler.add_triples(state, memo_triples)
+                        self.ledger.record_cache_hits(
+                            "generate_patch", len(memo_before[0]) - len(results), batch_id=f"iteration-{iteration}"
+                        )
+                        stage.set(memo_triples=len(memo_triples))
+                    if shacl_report.results and not results:
+                        patch_notes.append("All violations repaired locally")
+                        continue
+                    prompts = self._synthesize_repair_prompts(shacl_report, results)
+                    stage.set(prompts=len(prompts))
+                    context_ttl = state.graph.serialize(format="turtle")
+                    ledger_call = llm_call("generate_patch", batch_id=f"iteration-{iteration}")
+                    with span("llm.generate_patch"), ledger_call as call:
+                        patch_response = self.llm.generate_patch(prompts, context_ttl)
+                        call.finish(patch_response)
+                    _count_tokens(stage, patch_response)
+                    patch_notes.append(patch_response.reasoning_notes)
+                    if patch_response.graph is not None or patch_response.turtle.strip():
+                        if self.repair_memo is not None:
+                            patch_triples = self.assembler.response_triples(patch_response)
+                            added.extend(triple for triple in patch_triples if triple not in state.graph)
+                        self.assembler.add_response(state, patch_response)
 
         report = build_report(
             llm_response=llm_response,
@@ -126,6 +299,8 @@ class OntologyDraftingPipeline:
             patch_notes=patch_notes,
             unmatched_split_ids=sorted(loader.unmatched_split_ids),
         )
+        if clusters is not None:
+            report["deduplication"] = clusters.to_dict()
         self.assembler.serialize(state, self.config.output_path)
         self.state_graph = state.graph
         self.reasoned_graph = shacl_input_graph if "shacl_input_graph" in locals() else None
@@ -133,25 +308,27 @@ class OntologyDraftingPipeline:
         self.last_reasoner_report = iteration_reports[-1]["reasoner"]
         self.last_cq_results = iteration_reports[-1]["cq_results"]
         self.last_llm_response = llm_response
-        if self.config.report_path:
-            save_report(report, self.config.report_path)
         return report
 
-    def _synthesize_repair_prompts(self, shacl_report) -> list[str]:
-        prompts: list[str] = []
-        for result in shacl_report.results:
-            parts = []
-            if result.message:
-                parts.append(result.message)
-            if result.path:
-                parts.append(f"path={result.path}")
-            if result.focus_node:
-                parts.append(f"focus={result.focus_node}")
-            prompts.append(" | ".join(parts))
+    def _synthesize_repair_prompts(self, shacl_report, results=None) -> list[str]:
+        # One line per distinct problem (shape/path/component), not per violating node.
+        results = shacl_report.results if results is None else results
+        prompts = [cluster.to_prompt() for cluster in cluster_shacl_results(results)]
         if not prompts and shacl_report.text_report:
             prompts.append(shacl_report.text_report.splitlines()[0])
         return prompts
 
+    def _template_compiler(self, config: PipelineConfig) -> TemplateCompiler:
+        schema_context = self.schema_context
+        if schema_context is None:
+            if config.base_ontology_path is None:
+                raise ValueError(
+                    "Symbolic drafting resolves boilerplate terms against a schema; "
+                    "pass --base or --use-ontology-context."
+                )
+            schema_context = load_schema_context(config.base_ontology_path, config.base_namespace)
+        return TemplateCompiler(schema_context, config.base_namespace)
+
     def _load_schema_context(self, config: PipelineConfig):
         if not config.use_ontology_context:
             return None
@@ -163,3 +340,17 @@ class OntologyDraftingPipeline:
                 "Pass --ontology-context or --base to supply a TTL for schema extraction."
             )
         return load_schema_context(grounding_path, config.base_namespace)
+
+
+def _count_tokens(stage, response: LLMResponse) -> None:
+    if response.token_usage:
+        for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+            if key in response.token_usage:
+                stage.count(key, response.token_usage[key])
+    if response.streaming:
+        stage.count("streamed_statements", response.streaming.get("statements", 0))
+        stage.count("stream_failed_statements", response.streaming.get("failed_statements", 0))
+        if response.streaming.get("aborted"):
+            stage.count(f"stream_aborted_{response.streaming['aborted']}")
+        if response.streaming.get("first_triple_s") is not None:
+            stage.set(first_triple_s=response.streaming["first_triple_s"])
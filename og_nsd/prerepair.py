@@ -0,0 +1,184 @@
+"""Deterministic local repairs for mechanical SHACL violations.
+
+Many violations need no model to fix: a value that lacks the class a
+``sh:class`` constraint asks for, a literal typed with the wrong datatype, or
+a required link on a property the draft already declares. The
+:class:`PreRepairEngine` fixes these in bulk before any LLM round trip. The
+rules are keyed on ``ShaclResult.constraint_component``, and the parameters
+come from the reporting shape in the validator's shapes graph.
+
+Every fix also declares what it relies on when the draft has left it out:
+``owl:Class`` typing for the class, and ``rdfs:domain``/``rdfs:range`` plus the
+property kind for the path. Results no rule can fix, such as inverse paths,
+uncastable literals, required literal values or SPARQL constraints, are
+returned as the residual for the LLM. The next validation confirms the fixes.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.namespace import OWL, RDF, RDFS, SH, XSD
+
+from .llm import Triple
+from .shacl import ShaclResult
+from .tracing import span
+
+_PROPERTY_TYPES = (OWL.ObjectProperty, OWL.DatatypeProperty, RDF.Property)
+
+
+@dataclass
+class PreRepair:
+    """Outcome of one pre-repair pass over a validation report."""
+
+    added: List[Triple] = field(default_factory=list)
+    removed: List[Triple] = field(default_factory=list)
+    residual: List[ShaclResult] = field(default_factory=list)
+    fixed: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "fixed": dict(self.fixed),
+            "residual": len(self.residual),
+            "added": len(self.added),
+            "removed": len(self.removed),
+        }
+
+
+def _iri(value: Optional[str]) -> Optional[URIRef]:
+    return URIRef(value) if value and ":" in value else None
+
+
+def _local_name(iri: URIRef) -> str:
+    return str(iri).rsplit("#", 1)[-1].rsplit("/", 1)[-1]
+
+
+def _castable(lexical: str, datatype: URIRef) -> bool:
+    # rdflib logs a full traceback for every lexical form it cannot convert.
+    term_logger = logging.getLogger("rdflib.term")
+    disabled, term_logger.disabled = term_logger.disabled, True
+    try:
+        return datatype == XSD.string or Literal(lexical, datatype=datatype).value is not None
+    finally:
+        term_logger.disabled = disabled
+
+
+class PreRepairEngine:
+    """Rule-based repair of common constraint components against ``shapes_graph``."""
+
+    def __init__(self, shapes_graph: Graph) -> None:
+        self.shapes_graph = shapes_graph
+        self._rules: Dict[URIRef, Callable[[Graph, ShaclResult, URIRef], Optional[Tuple[list, list]]]] = {
+            SH.ClassConstraintComponent: self._fix_class,
+            SH.DatatypeConstraintComponent: self._fix_datatype,
+            SH.MinCountConstraintComponent: self._fix_min_count,
+        }
+
+    def repair(self, graph: Graph, results: Sequence[ShaclResult]) -> PreRepair:
+        """Fix what the rules cover in ``graph`` (in place) and return the residual results."""
+
+        outcome = PreRepair()
+        with span("repair.local", results=len(results)) as stage:
+            for result in results:
+                rule = self._rules.get(URIRef(result.constraint_component or ""))
+                shape = self._shape(result)
+                fix = rule(graph, result, shape) if rule is not None and shape is not None else None
+                if fix is None:
+                    outcome.residual.append(result)
+                    continue
+                added, removed = fix
+                for triple in removed:
+                    graph.remove(triple)
+                for triple in added:
+                    graph.add(triple)
+                outcome.added.extend(added)
+                outcome.removed.extend(removed)
+                component = _local_name(URIRef(result.constraint_component))
+                outcome.fixed[component] = outcome.fixed.get(component, 0) + 1
+            stage.set(fixed=len(results) - len(outcome.residual), added=len(outcome.added))
+        return outcome
+
+    def _shape(self, result: ShaclResult) -> Optional[URIRef]:
+        if not result.source_shape:
+            return None
+        # pyshacl reports the shapes graph's own nodes, blank nodes included.
+        for node in (URIRef(result.source_shape), BNode(result.source_shape)):
+            if (node, None, None) in self.shapes_graph:
+                return node
+        return None
+
+    def _target_class(self, shape) -> Optional[URIRef]:
+        owner = self.shapes_graph.value(predicate=SH.property, object=shape) or shape
+        return self.shapes_graph.value(owner, SH.targetClass)
+
+    def _declare(
+        self, graph: Graph, prop: URIRef, kind: URIRef, domain: Optional[URIRef], range_: Optional[URIRef]
+    ) -> List[Triple]:
+        """Triples declaring ``prop`` with its domain and range, wherever the draft left them out."""
+
+        triples: List[Triple] = []
+        if not any((prop, RDF.type, declared) in graph for declared in _PROPERTY_TYPES):
+            triples.append((prop, RDF.type, kind))
+        if domain is not None and graph.value(prop, RDFS.domain) is None:
+            triples.append((prop, RDFS.domain, domain))
+        if range_ is not None and graph.value(prop, RDFS.range) is None:
+            triples.append((prop, RDFS.range, range_))
+        return triples
+
+    def _fix_class(self, graph: Graph, result: ShaclResult, shape) -> Optional[Tuple[list, list]]:
+        """Type the offending value with the required class."""
+
+        focus, path, value = _iri(result.focus_node), _iri(result.path), _iri(result.value)
+        required = self.shapes_graph.value(shape, SH["class"])
+        if focus is None or path is None or value is None or not isinstance(required, URIRef):
+            return None
+        added = [(value, RDF.type, required)]
+        if (required, RDF.type, OWL.Class) not in graph:
+            added.append((required, RDF.type, OWL.Class))
+        added += self._declare(graph, path, OWL.ObjectProperty, self._target_class(shape), required)
+        return added, []
+
+    def _fix_datatype(self, graph: Graph, result: ShaclResult, shape) -> Optional[Tuple[list, list]]:
+        """Retype a literal whose lexical form is valid for the required datatype."""
+
+        focus, path = _iri(result.focus_node), _iri(result.path)
+        datatype = self.shapes_graph.value(shape, SH.datatype)
+        if focus is None or path is None or not isinstance(datatype, URIRef) or result.value is None:
+            return None
+        retyped = Literal(result.value, datatype=datatype) if _castable(result.value, datatype) else None
+        if retyped is None:
+            return None
+        removed = [
+            (focus, path, obj)
+            for obj in graph.objects(focus, path)
+            if isinstance(obj, Literal) and str(obj) == result.value and obj.datatype != datatype
+        ]
+        if not removed and (focus, path, retyped) not in graph:
+            return None
+        # Another shape on the same path may already have retyped the literal in this pass.
+        added = [(focus, path, retyped)]
+        added += self._declare(graph, path, OWL.DatatypeProperty, self._target_class(shape), datatype)
+        return added, removed
+
+    def _fix_min_count(self, graph: Graph, result: ShaclResult, shape) -> Optional[Tuple[list, list]]:
+        """Link a placeholder individual through a declared object property."""
+
+        focus, path = _iri(result.focus_node), _iri(result.path)
+        if focus is None or path is None:
+            return None
+        if not any((path, RDF.type, declared) in graph for declared in _PROPERTY_TYPES):
+            return None
+        required = self.shapes_graph.value(shape, SH["class"]) or graph.value(path, RDFS.range)
+        if not isinstance(required, URIRef) or self.shapes_graph.value(shape, SH.datatype) is not None:
+            return None
+        if str(required).startswith(str(XSD)) or required == RDFS.Literal:
+            return None
+        namespace = str(focus)[: len(str(focus)) - len(_local_name(focus))]
+        placeholder = URIRef(f"{namespace}{_local_name(focus)}_{_local_name(path)}")
+        added = [(focus, path, placeholder), (placeholder, RDF.type, required)]
+        if (required, RDF.type, OWL.Class) not in graph:
+            added.append((required, RDF.type, OWL.Class))
+        added += self._declare(graph, path, OWL.ObjectProperty, self._target_class(shape), required)
+        return added, []
@@ -3,10 +3,37 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
 from rdflib import Graph
 
+from .tracing import span
+
+if TYPE_CHECKING:  # pragma: no cover - import guard for type checkers
+    from rdflib.plugins.sparql.sparql import Query
+
+# Parsing SPARQL dominates CQ execution on small graphs, so each distinct query
+# text is prepared once per process and reused across runs and iterations.
+_PREPARED: Dict[str, Optional["Query"]] = {}
+
+
+def _prepared(query: str) -> Union["Query", str]:
+    """Return the prepared form of ``query`` or the raw text if it cannot be prepared.
+
+    Queries that rely on the data graph's prefix bindings (rather than
+    declaring their own ``PREFIX`` lines) fail to prepare up front and are
+    passed to rdflib as text so they keep resolving against the graph.
+    """
+
+    if query not in _PREPARED:
+        from rdflib.plugins.sparql import prepareQuery
+
+        try:
+            _PREPARED[query] = prepareQuery(query)
+        except Exception:
+            _PREPARED[query] = None
+    return _PREPARED[query] or query
+
 
 @dataclass
 class CompetencyQuestionResult:
@@ -44,10 +71,12 @@ class CompetencyQuestionRunner:
 
     def run(self, graph: Graph) -> List[CompetencyQuestionResult]:
         results: List[CompetencyQuestionResult] = []
-        for query in self.queries:
-            try:
-                success = bool(graph.query(query).askAnswer)
-                results.append(CompetencyQuestionResult(query=query, success=success, message=""))
-            except Exception as exc:  # pragma: no cover - rdflib runtime
-                results.append(CompetencyQuestionResult(query=query, success=False, message=str(exc)))
+        with span("cq.run", queries=len(self.queries), triples_in=len(graph)) as stage:
+            for query in self.queries:
+                try:
+                    success = bool(graph.query(_prepared(query)).askAnswer)
+                    results.append(CompetencyQuestionResult(query=query, success=success, message=""))
+                except Exception as exc:  # pragma: no cover - rdflib runtime
+                    results.append(CompetencyQuestionResult(query=query, success=False, message=str(exc)))
+            stage.set(passed=sum(1 for result in results if result.success))
         return results
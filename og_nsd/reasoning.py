@@ -7,15 +7,32 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, Tuple
 
-from isodate import parse_datetime
 from rdflib import Graph, Literal, OWL, RDF, RDFS
 from rdflib.namespace import XSD
 
-try:  # pragma: no cover - optional heavy dependency
-    from owlready2 import get_ontology, sync_reasoner_pellet
-except Exception:  # pragma: no cover
-    get_ontology = None  # type: ignore
-    sync_reasoner_pellet = None  # type: ignore
+from .tracing import span
+
+# owlready2 is heavy to import (and prints warnings), so it is only loaded
+# when a reasoner is actually enabled. ``_UNLOADED`` marks the not-yet-tried
+# state; after a failed import both names are ``None``.
+_UNLOADED: object = object()
+get_ontology = _UNLOADED
+sync_reasoner_pellet = _UNLOADED
+
+
+def _load_owlready() -> None:
+    global get_ontology, sync_reasoner_pellet
+    if get_ontology is not _UNLOADED and sync_reasoner_pellet is not _UNLOADED:
+        return
+    try:  # pragma: no cover - optional heavy dependency
+        from owlready2 import get_ontology as _get_ontology, sync_reasoner_pellet as _sync
+    except Exception:  # pragma: no cover
+        _get_ontology = None  # type: ignore
+        _sync = None  # type: ignore
+    if get_ontology is _UNLOADED:
+        get_ontology = _get_ontology
+    if sync_reasoner_pellet is _UNLOADED:
+        sync_reasoner_pellet = _sync
 
 
 @dataclass
@@ -37,6 +54,8 @@ class ReasonerResult:
 
 class OwlreadyReasoner:
     def __init__(self, enabled: bool = False) -> None:
+        if enabled:
+            _load_owlready()
         self.enabled = enabled and get_ontology is not None
         self.backend = "pellet" if self.enabled and sync_reasoner_pellet is not None else None
 
@@ -48,9 +67,22 @@ class OwlreadyReasoner:
         downstream SHACL validation still receives a graph object.
         """
 
-        base_graph, coerced_literals = _sanitize_numeric_literals(graph)
-        base_graph, stripped_restrictions = _strip_invalid_restrictions(base_graph)
-        base_graph, declared_classes = _declare_missing_classes(base_graph)
+        with span("reasoner.run", triples_in=len(graph)) as stage:
+            result = self._run(graph)
+            stage.set(triples_out=len(result.expanded_graph), backend=result.report.backend)
+            return result
+
+    def _run(self, graph: Graph) -> ReasonerResult:
+        with span("reasoner.sanitize", triples_in=len(graph)) as stage:
+            base_graph, coerced_literals = _sanitize_numeric_literals(graph)
+            base_graph, stripped_restrictions = _strip_invalid_restrictions(base_graph)
+            base_graph, declared_classes = _declare_missing_classes(base_graph)
+            stage.set(
+                coerced_literals=coerced_literals,
+                stripped_restrictions=stripped_restrictions,
+                declared_classes=declared_classes,
+                triples_out=len(base_graph),
+            )
         notes: List[str] = []
         if coerced_literals:
             notes.append(
@@ -68,7 +100,8 @@ class OwlreadyReasoner:
 
         tmp_dir = Path(tempfile.gettempdir())
         tmp_path = tmp_dir / "og_nsd_reasoner.owl"
-        tmp_path.write_text(base_graph.serialize(format="pretty-xml"), encoding="utf-8")
+        with span("reasoner.serialize_owl", triples=len(base_graph)):
+            tmp_path.write_text(base_graph.serialize(format="pretty-xml"), encoding="utf-8")
 
         # Owlready2 and Pellet expect forward-slash paths. On Windows, passing
         # a raw filesystem path with backslashes results in invalid escape
@@ -84,7 +117,7 @@ class OwlreadyReasoner:
             expanded_graph = base_graph
         else:
             try:
-                with onto:
+                with onto, span("reasoner.pellet"):
                     sync_reasoner_pellet(infer_property_values=True, infer_data_property_values=True)
                 unsat = [
                     cls.name
@@ -266,6 +299,8 @@ def _is_valid_numeric_literal(literal: Literal) -> bool:
 
 
 def _is_valid_datetime_literal(literal: Literal) -> bool:
+    from isodate import parse_datetime
+
     try:
         parse_datetime(str(literal))
     except Exception:
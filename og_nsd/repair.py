@@ -12,6 +12,7 @@ from rdflib import Graph
 
 from .metrics import compute_exact_metrics_from_graphs, compute_semantic_metrics
 from .shacl import ShaclReport, summarize_shacl_report
+from .tracing import span
 
 if TYPE_CHECKING:  # pragma: no cover - import guard for type checkers
     from .queries import CompetencyQuestionResult
@@ -100,8 +101,9 @@ def compute_cq_pass_rate(results: Iterable) -> float:
 
 
 def final_metrics(pred_graph: Graph, gold_graph: Graph) -> dict:
-    exact = compute_exact_metrics_from_graphs(pred_graph, gold_graph)
-    semantic = compute_semantic_metrics(pred_graph, gold_graph)
+    with span("metrics", pred_triples=len(pred_graph), gold_triples=len(gold_graph)):
+        exact = compute_exact_metrics_from_graphs(pred_graph, gold_graph)
+        semantic = compute_semantic_metrics(pred_graph, gold_graph)
     return {"exact": exact, "semantic": semantic}
 
 
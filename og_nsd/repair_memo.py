@@ -0,0 +1,211 @@
+"""Persistent memory of repairs that resolved a SHACL violation.
+
+The same violations recur across seeds, stop policies and domains. A
+:class:`RepairMemo` keys repairs by a normalized violation signature: the
+source shape, constraint component and path. Anonymous (blank-node) shapes
+and paths are left out because their labels change on every run. The memo
+learns only repairs that were validated: after a repair round,
+:meth:`RepairMemo.observe` takes each violation that disappeared and stores
+the newly added triples that mention its focus node or value. The focus node
+and value become placeholders, and so do occurrences of the focus node's
+local name inside literals.
+
+Before the next LLM round trip, :meth:`RepairMemo.apply` instantiates the
+stored templates for every matching violation, with the current focus node
+and value substituted in. Only the rest goes to the model. A template that
+fails to resolve its violation is forgotten at the next observation.
+Entries live in memory and as JSON files under ``<cache_dir>/repairs``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from rdflib import BNode, Literal, URIRef
+
+from .graphs import cache_dir, decode_term, encode_term
+from .llm import Triple
+from .shacl import ShaclResult
+
+_MEMO_VERSION = 1
+FOCUS = URIRef("urn:og-nsd:repair#focus")
+VALUE = URIRef("urn:og-nsd:repair#value")
+_FOCUS_NAME = "{focus}"
+
+
+@dataclass
+class RepairMemoStats:
+    hits: int = 0
+    misses: int = 0
+    learned: int = 0
+    forgotten: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _named(term: Optional[str]) -> str:
+    # pyshacl reports anonymous shapes and paths by their blank-node label.
+    return term if term and (":" in term) else ""
+
+
+def violation_signature(result: ShaclResult) -> Optional[str]:
+    """Hash of the shape, constraint component and path; ``None`` when nothing identifies the violation."""
+
+    parts = [_named(result.source_shape), _named(result.constraint_component), _named(result.path)]
+    if not parts[0] and not parts[2]:
+        return None
+    return hashlib.sha256(json.dumps([_MEMO_VERSION, *parts]).encode("utf-8")).hexdigest()
+
+
+def result_node(value: Optional[str]) -> Optional[URIRef]:
+    return URIRef(value) if value and ":" in value else None
+
+
+def _local_name(iri: URIRef) -> str:
+    text = str(iri)
+    return text.rsplit("#", 1)[-1].rsplit("/", 1)[-1]
+
+
+def generalize(triples: Iterable[Triple], focus: URIRef, value: Optional[URIRef]) -> List[Triple]:
+    """Replace ``focus``/``value`` by placeholders; triples with blank nodes are dropped."""
+
+    name = _local_name(focus)
+    template: List[Triple] = []
+    for triple in triples:
+        if any(isinstance(term, BNode) for term in triple):
+            continue
+        row = []
+        for term in triple:
+            if term == focus:
+                term = FOCUS
+            elif value is not None and term == value:
+                term = VALUE
+            elif isinstance(term, Literal) and name and name in str(term):
+                term = Literal(str(term).replace(name, _FOCUS_NAME), datatype=term.datatype, lang=term.language)
+            row.append(term)
+        template.append(tuple(row))
+    return template
+
+
+def instantiate(template: Iterable[Triple], focus: URIRef, value: Optional[URIRef]) -> List[Triple]:
+    """Substitute the current focus node and value into a stored template."""
+
+    name = _local_name(focus)
+    triples: List[Triple] = []
+    for triple in template:
+        row = []
+        for term in triple:
+            if term == FOCUS:
+                term = focus
+            elif term == VALUE:
+                if value is None:
+                    break
+                term = value
+            elif isinstance(term, Literal) and _FOCUS_NAME in str(term):
+                term = Literal(str(term).replace(_FOCUS_NAME, name), datatype=term.datatype, lang=term.language)
+            row.append(term)
+        else:
+            triples.append(tuple(row))
+    return triples
+
+
+class RepairMemo:
+    """Store and reapply validated repairs per violation signature."""
+
+    def __init__(self, root: Optional[Path] = None) -> None:
+        self.root = root
+        self.stats = RepairMemoStats()
+        self._entries: Dict[str, Optional[List[Triple]]] = {}
+        self._applied: Set[Tuple[str, Optional[str]]] = set()
+
+    @classmethod
+    def open(cls) -> "RepairMemo":
+        root = cache_dir()
+        return cls(root / "repairs" if root is not None else None)
+
+    def apply(self, results: Sequence[ShaclResult]) -> Tuple[List[Triple], List[ShaclResult]]:
+        """Return the memoized repair triples and the results no template covers."""
+
+        triples: List[Triple] = []
+        residual: List[ShaclResult] = []
+        self._applied = set()
+        for result in results:
+            signature = violation_signature(result)
+            focus = result_node(result.focus_node)
+            template = self._load(signature) if signature and focus is not None else None
+            repair = instantiate(template, focus, result_node(result.value)) if template else []
+            if not repair:
+                residual.append(result)
+                continue
+            triples.extend(repair)
+            self._applied.add((signature, result.focus_node))
+        self.stats.hits += len(results) - len(residual)
+        self.stats.misses += len(residual)
+        return triples, residual
+
+    def observe(
+        self, before: Sequence[ShaclResult], after: Sequence[ShaclResult], added: Iterable[Triple]
+    ) -> None:
+        """Learn from a repair round: ``before``/``after`` are the results around it, ``added`` the new triples."""
+
+        remaining = {(violation_signature(result), result.focus_node) for result in after}
+        for key in self._applied & remaining:
+            self._forget(key[0])
+        self._applied = set()
+
+        added = list(added)
+        for result in before:
+            signature = violation_signature(result)
+            focus = result_node(result.focus_node)
+            if signature is None or focus is None or (signature, result.focus_node) in remaining:
+                continue
+            if self._load(signature) is not None:
+                continue
+            value = result_node(result.value)
+            relevant = [triple for triple in added if focus in (triple[0], triple[2]) or (value and value in triple)]
+            template = generalize(relevant, focus, value)
+            if template:
+                self._save(signature, template)
+                self.stats.learned += 1
+
+    def _load(self, signature: str) -> Optional[List[Triple]]:
+        if signature not in self._entries:
+            self._entries[signature] = _read_entry(self.root / f"{signature}.json") if self.root is not None else None
+        return self._entries[signature]
+
+    def _save(self, signature: str, template: List[Triple]) -> None:
+        self._entries[signature] = template
+        if self.root is not None:
+            _write_entry(self.root / f"{signature}.json", template)
+
+    def _forget(self, signature: str) -> None:
+        self._entries[signature] = None
+        self.stats.forgotten += 1
+        if self.root is not None:
+            try:
+                (self.root / f"{signature}.json").unlink()
+            except OSError:  # pragma: no cover - already removed or read-only
+                pass
+
+
+def _read_entry(path: Path) -> Optional[List[Triple]]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if payload.get("version") != _MEMO_VERSION:
+        return None
+    return [tuple(decode_term(term) for term in triple) for triple in payload["triples"]]
+
+
+def _write_entry(path: Path, template: List[Triple]) -> None:
+    payload = {"version": _MEMO_VERSION, "triples": [[encode_term(term) for term in triple] for triple in template]}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    except OSError:  # pragma: no cover - read-only cache directory
+        pass
@@ -20,6 +20,8 @@ class Requirement:
     boilerplate_main: str | None
     boilerplate_suffix: str | None
     split: str | None = None
+    boilerplate_type: str | None = None
+    placeholders: list[dict] | None = None
 
     @property
     def boilerplate(self) -> str:
@@ -112,6 +114,8 @@ class RequirementLoader:
             boilerplate_main=boilerplate.get("main"),
             boilerplate_suffix=boilerplate.get("suffix"),
             split=split,
+            boilerplate_type=record.get("boilerplate_type"),
+            placeholders=record.get("placeholders"),
         )
 
     def _determine_identifier(self, idx: int, record: dict) -> str:
@@ -0,0 +1,250 @@
+"""Difficulty-based routing of LLM calls between a fast and a strong model.
+
+:class:`RoutedLLM` wraps an ordered list of :class:`ModelTier` (cheapest
+first). Each drafting batch gets a difficulty score from
+:func:`score_requirement`:
+
+* length: long requirements carry more relations to extract;
+* boilerplate: a main clause shaped like a known template is easy, free text
+  without boilerplate is hard;
+* schema coverage: the share of content words that name a schema class or
+  property (neutral without a schema context);
+* earlier failures: requirements whose draft failed to parse in this run
+  always go to the strongest tier.
+
+The batch score is the score of its hardest requirement. Batches scoring
+below a tier's ``max_difficulty`` go to the first such tier; everything else,
+and every repair call, goes to the last (strong) tier. A response that fails
+the ``check`` callback (e.g. ``OntologyAssembler.response_triples``, which
+raises ``ValueError`` on unparseable Turtle) or drafts nothing is escalated to
+the next tier.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Sequence, Set
+
+from rdflib import Graph
+
+from .exemplars import tokenize
+from .ledger import current_call
+from .llm import LLMClient, LLMResponse
+from .ontology import SchemaContext
+from .requirements import Requirement
+from .templates import parse_main
+
+_CAMEL_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+
+def schema_vocabulary(schema_context: SchemaContext | None) -> Set[str]:
+    """Lowercase words of the schema's class and property local names (``CashCard`` -> cash, card)."""
+
+    if schema_context is None:
+        return set()
+    terms = [*schema_context.classes, *schema_context.object_properties, *schema_context.datatype_properties]
+    words: Set[str] = set()
+    for term in terms:
+        local = re.split(r"[:#/]", term.strip("<>"))[-1]
+        words.update(word.lower() for word in _CAMEL_RE.findall(local))
+    return words
+
+
+@dataclass
+class Difficulty:
+    """Difficulty features of one requirement; ``score`` is in [0, 1]."""
+
+    length: float
+    boilerplate: float
+    uncovered: float
+    failed: bool = False
+
+    @property
+    def score(self) -> float:
+        if self.failed:
+            return 1.0
+        return 0.3 * self.length + 0.3 * self.boilerplate + 0.4 * self.uncovered
+
+
+def score_requirement(
+    requirement: Requirement, vocabulary: Set[str] | None = None, failed: bool = False
+) -> Difficulty:
+    words = tokenize(requirement.text)
+    length = min(1.0, len(requirement.text.split()) / 40)
+    if parse_main(requirement.boilerplate_main) is not None:
+        boilerplate = 0.0
+    elif requirement.boilerplate:
+        boilerplate = 0.5
+    else:
+        boilerplate = 1.0
+    if vocabulary and words:
+        uncovered = sum(1 for word in words if word not in vocabulary) / len(words)
+    else:
+        uncovered = 0.5
+    return Difficulty(length=length, boilerplate=boilerplate, uncovered=uncovered, failed=failed)
+
+
+@dataclass
+class ModelTier:
+    """One routing target; batches scoring below ``max_difficulty`` may use it."""
+
+    name: str
+    llm: LLMClient
+    max_difficulty: float = 1.0
+
+
+@dataclass
+class TierStats:
+    batches: int = 0
+    requirements: int = 0
+    failures: int = 0
+    latency_s: float = 0.0
+    tokens: int = 0
+
+    def to_dict(self) -> dict:
+        per_requirement = self.latency_s / self.requirements if self.requirements else 0.0
+        return {
+            "batches": self.batches,
+            "requirements": self.requirements,
+            "failures": self.failures,
+            "latency_s": round(self.latency_s, 4),
+            "latency_per_requirement_s": round(per_requirement, 4),
+            "total_tokens": self.tokens,
+        }
+
+
+@dataclass
+class RoutingStats:
+    tiers: Dict[str, TierStats] = field(default_factory=dict)
+    escalations: int = 0
+    repairs: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "tiers": {name: stats.to_dict() for name, stats in self.tiers.items()},
+            "escalations": self.escalations,
+            "repairs": self.repairs,
+        }
+
+
+class RoutedLLM(LLMClient):
+    """Send each drafting batch to the cheapest tier that can handle it."""
+
+    def __init__(
+        self,
+        tiers: Sequence[ModelTier],
+        schema_context: SchemaContext | None = None,
+        check: Callable[[LLMResponse], object] | None = None,
+    ) -> None:
+        if not tiers:
+            raise ValueError("RoutedLLM needs at least one model tier")
+        self.tiers = list(tiers)
+        self.vocabulary = schema_vocabulary(schema_context)
+        self.check = check
+        self.stats = RoutingStats(tiers={tier.name: TierStats() for tier in self.tiers})
+        self._failed: Set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def strong(self) -> ModelTier:
+        return self.tiers[-1]
+
+    @property
+    def scheduler(self):
+        # Remote tiers share one scheduler; the pipeline uses it for concurrency and reporting.
+        for tier in reversed(self.tiers):
+            scheduler = getattr(tier.llm, "scheduler", None)
+            if scheduler is not None:
+                return scheduler
+        return None
+
+    def fingerprint(self) -> str:
+        tiers = [(tier.name, tier.llm.fingerprint(), tier.max_difficulty) for tier in self.tiers]
+        return f"{type(self).__name__}|{tiers!r}"
+
+    def difficulty(self, requirements: Sequence[Requirement]) -> float:
+        with self._lock:
+            failed = set(self._failed)
+        scores = [
+            score_requirement(req, self.vocabulary, req.identifier in failed).score for req in requirements
+        ]
+        return max(scores, default=0.0)
+
+    def route(self, requirements: Sequence[Requirement]) -> int:
+        """Index of the first tier whose ``max_difficulty`` exceeds the batch score."""
+
+        score = self.difficulty(requirements)
+        for idx, tier in enumerate(self.tiers[:-1]):
+            if score < tier.max_difficulty:
+                return idx
+        return len(self.tiers) - 1
+
+    def generate_axioms(
+        self,
+        requirements: Sequence[Requirement],
+        schema_context: SchemaContext | None = None,
+        exemplars: Sequence[Requirement] | None = None,
+    ) -> LLMResponse:
+        idx = self.route(requirements)
+        while True:
+            tier = self.tiers[idx]
+            response = self._timed(
+                tier, len(requirements), lambda: tier.llm.generate_axioms(requirements, schema_context, exemplars)
+            )
+            if idx == len(self.tiers) - 1 or self._accepts(response):
+                return response
+            with self._lock:
+                self.stats.tiers[tier.name].failures += 1
+                self.stats.escalations += 1
+                self._failed.update(req.identifier for req in requirements)
+            idx += 1
+
+    def generate_patch(self, prompts: Sequence[str], context_ttl: str) -> LLMResponse:
+        with self._lock:
+            self.stats.repairs += 1
+        return self._timed(self.strong, 0, lambda: self.strong.llm.generate_patch(prompts, context_ttl))
+
+    def apply_patches(self, patches: Sequence[dict], context_ttl: str) -> LLMResponse:
+        with self._lock:
+            self.stats.repairs += 1
+        return self._timed(self.strong, 0, lambda: self.strong.llm.apply_patches(patches, context_ttl))
+
+    def patch_graph(self, patches: Sequence[dict], graph: Graph) -> LLMResponse:
+        """Patch ``graph`` in place through the strong tier, which must support it (e.g. HeuristicLLM)."""
+
+        with self._lock:
+            self.stats.repairs += 1
+        return self._timed(self.strong, 0, lambda: self.strong.llm.patch_graph(patches, graph))
+
+    def _accepts(self, response: LLMResponse) -> bool:
+        if response.streaming and (response.streaming.get("aborted") or response.streaming.get("failed_statements")):
+            return False
+        if self.check is not None:
+            try:
+                self.check(response)
+            except ValueError:
+                return False
+        if response.triples is not None:
+            return bool(response.triples)
+        if response.graph is not None:
+            return len(response.graph) > 0
+        return bool(response.turtle and response.turtle.strip())
+
+    def _timed(self, tier: ModelTier, requirements: int, call: Callable[[], LLMResponse]) -> LLMResponse:
+        record = current_call()
+        if record is not None:
+            record.tier = tier.name
+            record.model = type(tier.llm).__name__
+        started = time.perf_counter()
+        response = call()
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            stats = self.stats.tiers[tier.name]
+            stats.batches += 1
+            stats.requirements += requirements
+            stats.latency_s += elapsed
+            if response.token_usage:
+                stats.tokens += response.token_usage.get("total_tokens", 0)
+        return response
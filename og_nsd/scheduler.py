@@ -0,0 +1,458 @@
+"""Rate-limit-aware scheduling for remote LLM calls.
+
+:class:`RequestScheduler` sits in front of every provider request made by
+:class:`~og_nsd.llm.OpenAILLM`. It combines token buckets for requests and
+tokens per minute, ``Retry-After`` handling, jittered exponential backoff,
+AIMD (additive-increase/multiplicative-decrease) concurrency, per-call
+timeouts and optional hedged requests. Its decisions are counted in
+:class:`SchedulerStats`, which the pipeline adds to the run report.
+"""
+from __future__ import annotations
+
+import contextvars
+import email.utils
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Seconds between multiplicative decreases, so one burst of 429s shrinks the
+# window once instead of collapsing it to the minimum.
+_DECREASE_COOLDOWN_S = 1.0
+
+_ENV_SETTINGS = {
+    "OG_NSD_LLM_RPM": ("requests_per_minute", float),
+    "OG_NSD_LLM_TPM": ("tokens_per_minute", float),
+    "OG_NSD_LLM_MAX_CONCURRENCY": ("max_concurrency", int),
+    "OG_NSD_LLM_MAX_RETRIES": ("max_retries", int),
+    "OG_NSD_LLM_TIMEOUT": ("timeout_s", float),
+    "OG_NSD_LLM_HEDGE_AFTER": ("hedge_after_s", float),
+}
+
+
+@dataclass
+class SchedulerConfig:
+    """Limits and retry policy for :class:`RequestScheduler`.
+
+    ``None`` for a per-minute limit means unlimited. ``hedge_after_s`` enables
+    hedging: a duplicate request is sent when the first has not answered
+    within that many seconds, and the first answer wins.
+    """
+
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+    max_concurrency: int = 8
+    initial_concurrency: int = 2
+    min_concurrency: int = 1
+    decrease_factor: float = 0.5
+    max_retries: int = 6
+    backoff_base_s: float = 1.0
+    backoff_max_s: float = 60.0
+    timeout_s: Optional[float] = 120.0
+    hedge_after_s: Optional[float] = None
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "SchedulerConfig":
+        """Build a config from ``OG_NSD_LLM_*`` environment variables."""
+
+        env = os.environ if environ is None else environ
+        values: Dict[str, Any] = {}
+        for name, (attr, cast) in _ENV_SETTINGS.items():
+            raw = env.get(name)
+            if raw is None or not raw.strip():
+                continue
+            values[attr] = None if raw.strip().lower() in {"none", "off"} else cast(raw)
+        return cls(**values)
+
+
+@dataclass
+class SchedulerStats:
+    calls: int = 0
+    attempts: int = 0
+    successes: int = 0
+    failures: int = 0
+    retries: int = 0
+    retry_reasons: Dict[str, int] = field(default_factory=dict)
+    retry_after_honored: int = 0
+    throttle_wait_s: float = 0.0
+    backoff_wait_s: float = 0.0
+    hedged: int = 0
+    hedge_wins: int = 0
+    concurrency_increases: int = 0
+    concurrency_decreases: int = 0
+    concurrency_limit: float = 0.0
+    peak_in_flight: int = 0
+    latencies_s: List[float] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload = {
+            item.name: getattr(self, item.name) for item in fields(self) if item.name != "latencies_s"
+        }
+        payload["throttle_wait_s"] = round(self.throttle_wait_s, 3)
+        payload["backoff_wait_s"] = round(self.backoff_wait_s, 3)
+        payload["concurrency_limit"] = round(self.concurrency_limit, 2)
+        ordered = sorted(self.latencies_s)
+        payload["latency_s"] = {
+            "p50": _percentile(ordered, 0.5),
+            "p95": _percentile(ordered, 0.95),
+            "max": round(ordered[-1], 3) if ordered else None,
+        }
+        return payload
+
+
+def _percentile(ordered: List[float], fraction: float) -> Optional[float]:
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return round(ordered[index], 3)
+
+
+class TokenBucket:
+    """Thread-safe bucket refilled at ``per_minute / 60`` units per second.
+
+    :meth:`reserve` always succeeds and may drive the level negative; the
+    returned delay is how long the caller must wait before using its
+    reservation. This queues callers fairly instead of letting them race.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = float(per_minute)
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            self._refill()
+            self.level -= min(amount, self.capacity)
+            return 0.0 if self.level >= 0 else -self.level / self.rate
+
+    def try_take(self, amount: float) -> bool:
+        with self._lock:
+            self._refill()
+            if self.level >= amount:
+                self.level -= amount
+                return True
+            return False
+
+    def adjust(self, amount: float) -> None:
+        """Charge (positive) or refund (negative) the difference to an estimate."""
+
+        with self._lock:
+            self.level = min(self.capacity, self.level - amount)
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency window: +1/window per success, ×factor on congestion."""
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        decrease_factor: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(self.maximum, max(self.minimum, initial)))
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self.peak_in_flight = 0
+        self._clock = clock
+        self._last_decrease = -math.inf
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self._enter()
+
+    def try_acquire(self) -> bool:
+        with self._cond:
+            if self.in_flight >= int(self.limit):
+                return False
+            self._enter()
+            return True
+
+    def _enter(self) -> None:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def release(self, outcome: str) -> None:
+        """Release a slot; ``outcome`` is ``success``, ``congestion`` or ``error``."""
+
+        with self._cond:
+            self.in_flight -= 1
+            if outcome == "success" and self.limit < self.maximum:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+                self.increases += 1
+            elif outcome == "congestion":
+                now = self._clock()
+                if now - self._last_decrease >= _DECREASE_COOLDOWN_S:
+                    self.limit = max(self.minimum, self.limit * self.decrease_factor)
+                    self.decreases += 1
+                    self._last_decrease = now
+            self._cond.notify_all()
+
+
+def classify_failure(exc: BaseException) -> Optional[str]:
+    """Return the retry reason for a provider error, or ``None`` if it is final.
+
+    Works on the OpenAI SDK exceptions (and plain ``TimeoutError``) by duck
+    typing, so this module never imports the SDK.
+    """
+
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    name = type(exc).__name__
+    if status == 429 or name == "RateLimitError":
+        return "rate_limit"
+    if isinstance(exc, TimeoutError) or "Timeout" in name or status == 408:
+        return "timeout"
+    if isinstance(status, int) and status >= 500:
+        return "server_error"
+    if name == "APIConnectionError" or isinstance(exc, ConnectionError):
+        return "connection"
+    return None
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Parse ``retry-after-ms`` / ``Retry-After`` (seconds or HTTP date) from an error."""
+
+    headers = getattr(getattr(exc, "response", None), "headers", None) or getattr(exc, "headers", None)
+    if not headers:
+        return None
+    millis = headers.get("retry-after-ms")
+    if millis:
+        try:
+            return max(0.0, float(millis) / 1000.0)
+        except ValueError:
+            pass
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, parsed.timestamp() - time.time())
+
+
+def usage_tokens(result: Any) -> Optional[int]:
+    usage = getattr(result, "usage", None)
+    total = getattr(usage, "total_tokens", None)
+    return int(total) if isinstance(total, (int, float)) else None
+
+
+class RequestScheduler:
+    """Run provider calls under rate limits, retries and adaptive concurrency.
+
+    ``fn`` passed to :meth:`call` receives the per-attempt timeout (seconds
+    or ``None``) and must raise the provider's exceptions unchanged so they
+    can be classified.
+    """
+
+    def __init__(
+        self,
+        config: Optional[SchedulerConfig] = None,
+        *,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.config = config or SchedulerConfig()
+        self.stats = SchedulerStats()
+        self._sleep = sleep
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        cfg = self.config
+        self._requests = TokenBucket(cfg.requests_per_minute, clock) if cfg.requests_per_minute else None
+        self._tokens = TokenBucket(cfg.tokens_per_minute, clock) if cfg.tokens_per_minute else None
+        self.limiter = AdaptiveLimiter(
+            cfg.initial_concurrency, cfg.min_concurrency, cfg.max_concurrency, cfg.decrease_factor, clock
+        )
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+
+    # -- public API -------------------------------------------------------
+
+    def call(self, fn: Callable[[Optional[float]], T], *, estimated_tokens: int = 0) -> T:
+        with self._lock:
+            self.stats.calls += 1
+        last_exc: Optional[BaseException] = None
+        for attempt in range(self.config.max_retries + 1):
+            self._wait_for_capacity(estimated_tokens)
+            self.limiter.acquire()
+            started = self._clock()
+            try:
+                result = self._attempt(fn)
+            except Exception as exc:  # noqa: BLE001 - classified below
+                reason = classify_failure(exc)
+                self.limiter.release("congestion" if reason in ("rate_limit", "timeout") else "error")
+                with self._lock:
+                    self.stats.attempts += 1
+                if reason is None:
+                    self._record_failure()
+                    raise
+                last_exc = exc
+                if attempt == self.config.max_retries:
+                    break
+                self._schedule_retry(attempt, reason, retry_after_seconds(exc))
+                continue
+            self.limiter.release("success")
+            self._record_success(self._clock() - started, estimated_tokens, usage_tokens(result))
+            return result
+        self._record_failure()
+        assert last_exc is not None
+        raise last_exc
+
+    def map_ordered(self, fn: Callable[[T], R], items: Iterable[T]) -> Iterator[R]:
+        """Apply ``fn`` to ``items`` concurrently, yielding results in input order.
+
+        Up to ``max_concurrency`` items run at once; the adaptive limiter
+        still decides how many provider requests are actually in flight.
+        Each worker runs in a copy of the caller's context so tracing spans
+        nest under the caller's span.
+        """
+
+        items = list(items)
+        workers = min(len(items), self.config.max_concurrency)
+        if workers <= 1:
+            for item in items:
+                yield fn(item)
+            return
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm")
+        futures = [pool.submit(contextvars.copy_context().run, fn, item) for item in items]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self.stats.concurrency_limit = self.limiter.limit
+            self.stats.concurrency_increases = self.limiter.increases
+            self.stats.concurrency_decreases = self.limiter.decreases
+            self.stats.peak_in_flight = self.limiter.peak_in_flight
+            return self.stats.to_dict()
+
+    # -- internals --------------------------------------------------------
+
+    def _wait_for_capacity(self, estimated_tokens: int) -> None:
+        delay = max(0.0, self._paused_until - self._clock())
+        if self._requests is not None:
+            delay = max(delay, self._requests.reserve(1))
+        if self._tokens is not None and estimated_tokens:
+            delay = max(delay, self._tokens.reserve(estimated_tokens))
+        if delay > 0:
+            with self._lock:
+                self.stats.throttle_wait_s += delay
+            self._sleep(delay)
+
+    def _schedule_retry(self, attempt: int, reason: str, retry_after: Optional[float]) -> None:
+        cfg = self.config
+        with self._lock:
+            self.stats.retries += 1
+            self.stats.retry_reasons[reason] = self.stats.retry_reasons.get(reason, 0) + 1
+            if retry_after is not None:
+                # Pause every caller, not just this one: the quota is shared.
+                self.stats.retry_after_honored += 1
+                self._paused_until = max(self._paused_until, self._clock() + retry_after)
+                delay = retry_after + self._rng.uniform(0, min(1.0, 0.1 * retry_after + 0.05))
+            else:
+                ceiling = min(cfg.backoff_max_s, cfg.backoff_base_s * (2**attempt))
+                delay = self._rng.uniform(0, ceiling)
+            self.stats.backoff_wait_s += delay
+        self._sleep(delay)
+
+    def _attempt(self, fn: Callable[[Optional[float]], T]) -> T:
+        timeout = self.config.timeout_s
+        hedge_after = self.config.hedge_after_s
+        if hedge_after is None:
+            return fn(timeout)
+
+        pool = self._get_hedge_pool()
+        primary = pool.submit(contextvars.copy_context().run, fn, timeout)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+        if not self._start_hedge():
+            return primary.result()
+        hedge = pool.submit(contextvars.copy_context().run, fn, timeout)
+        hedge.add_done_callback(lambda f: self.limiter.release("success" if f.exception() is None else "error"))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        with self._lock:
+                            self.stats.hedge_wins += 1
+                    return future.result()
+                error = future.exception()
+        assert error is not None
+        raise error
+
+    def _start_hedge(self) -> bool:
+        if not self.limiter.try_acquire():
+            return False
+        if self._requests is not None and not self._requests.try_take(1):
+            self.limiter.release("error")
+            return False
+        with self._lock:
+            self.stats.hedged += 1
+        return True
+
+    def _get_hedge_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(
+                    max_workers=2 * self.config.max_concurrency, thread_name_prefix="llm-hedge"
+                )
+            return self._hedge_pool
+
+    def _record_success(self, latency: float, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        if self._tokens is not None and actual_tokens is not None:
+            self._tokens.adjust(actual_tokens - estimated_tokens)
+        with self._lock:
+            self.stats.attempts += 1
+            self.stats.successes += 1
+            self.stats.latencies_s.append(latency)
+
+    def _record_failure(self) -> None:
+        with self._lock:
+            self.stats.failures += 1
+
+
+def estimate_message_tokens(messages: Iterable[Mapping[str, Any]]) -> int:
+    """Rough prompt size (≈4 characters per token) used to pre-charge the TPM bucket."""
+
+    return max(1, sum(len(str(message.get("content", ""))) for message in messages) // 4)
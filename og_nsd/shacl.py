@@ -1,20 +1,33 @@
 """SHACL validation helpers."""
 from __future__ import annotations
 
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from rdflib import Graph, Literal
+from rdflib import BNode, Graph, Literal
 from rdflib.namespace import RDF, SH, XSD
 
-try:
-    from pyshacl import validate
-    _PYSHACL_IMPORT_ERROR: Optional[Exception] = None
-except ImportError as exc:  # pragma: no cover
-    validate = None  # type: ignore
-    _PYSHACL_IMPORT_ERROR = exc
+from .graphs import load_graph
+from .tracing import span
+
+
+def _load_pyshacl():
+    """Import ``pyshacl.validate`` on first use.
+
+    Returns ``(validate, None)`` on success and ``(None, exc)`` when pyshacl
+    (or one of its own dependencies) cannot be imported.
+    """
+
+    try:
+        from pyshacl import validate
+    except ImportError as exc:  # pragma: no cover
+        return None, exc
+    return validate, None
 
 
 @dataclass
@@ -38,20 +51,80 @@ class ShaclResult:
     value: Optional[str]
 
 
+SHACL_ENGINES = ("native", "pyshacl")
+
+# Below this many focus nodes, forking and per-shard reports cost more than sharding saves.
+_MIN_SHARD_FOCUS_NODES = 2000
+# Several shards per worker keep the pool busy when shards take uneven time.
+_SHARDS_PER_WORKER = 4
+# Per worker process: the validator, the prepared native run and the report root (see _init_shard_worker).
+_WORKER_STATE: Optional[tuple] = None
+
+
+def _init_shard_worker(validator: "ShaclValidator", run, root: BNode) -> None:
+    # Fork hands the initializer arguments over without pickling them.
+    global _WORKER_STATE
+    _WORKER_STATE = (validator, run, root)
+
+
+def _validate_shard(slices) -> Tuple[str, str, List["ShaclResult"]]:
+    """Validate one shard of the inherited native run; returns its report N-Triples, text and results."""
+
+    validator, run, root = _WORKER_STATE
+    run.results = []
+    run.validate(slices)
+    fragment = Graph()
+    text = run.add_results(fragment, root)
+    return fragment.serialize(format="nt"), text, validator._extract_results(fragment)
+
+
 class ShaclValidator:
-    def __init__(self, shapes_path: Path) -> None:
+    """Validate data graphs against a shapes file.
+
+    With ``engine="native"`` (the default) shapes within the supported SHACL
+    Core subset are evaluated by :mod:`og_nsd.shacl_native`; any other shapes
+    graph falls back to pyshacl, with the reason in ``fallback_reason``.
+    ``engine`` is set to the engine actually in use. With ``workers`` > 1 the
+    native engine shards large validations across forked processes, but only
+    while the calling process has no other live threads: forking a
+    multi-threaded process can deadlock on locks those threads hold, so
+    validation stays serial next to a running scheduler thread pool.
+    """
+
+    def __init__(self, shapes_path: Path, engine: str = "native", workers: int = 1) -> None:
         if not shapes_path.exists():
             raise FileNotFoundError(f"SHACL shapes file not found: {shapes_path}")
+        if engine not in SHACL_ENGINES:
+            raise ValueError(f"Unknown SHACL engine {engine!r}; expected one of {', '.join(SHACL_ENGINES)}")
         self.shapes_path = shapes_path
-        self.shapes_graph = Graph().parse(shapes_path)
+        self.shapes_graph = load_graph(shapes_path)
+        self.workers = workers
+        self.engine = "pyshacl"
+        self.fallback_reason: Optional[str] = None
+        self._native = None
+        if engine == "native":
+            from .shacl_native import compile_shapes
+
+            self._native, self.fallback_reason = compile_shapes(self.shapes_graph)
+            if self._native is not None:
+                self.engine = "native"
 
     def validate(self, data_graph: Graph) -> ShaclReport:
-        if validate is None:
-            reason = (
-                "pyshacl import failed"
-                f" ({_PYSHACL_IMPORT_ERROR}); install dependencies via 'pip install -r requirements.txt'"
-            )
-            return ShaclReport(False, reason, None, [])
+        with span("shacl.validate", triples_in=len(data_graph), engine=self.engine) as stage:
+            report = self._validate(data_graph)
+            stage.set(conforms=report.conforms, results=len(report.results))
+            return report
+
+    def _validate(self, data_graph: Graph) -> ShaclReport:
+        validate = None
+        if self._native is None:
+            validate, import_error = _load_pyshacl()
+            if validate is None:
+                reason = (
+                    "pyshacl import failed"
+                    f" ({import_error}); install dependencies via 'pip install -r requirements.txt'"
+                )
+                return ShaclReport(False, reason, None, [])
 
         invalid_decimals = self._find_invalid_decimal_literals(data_graph)
         if invalid_decimals:
@@ -62,13 +135,21 @@ class ShaclValidator:
                 )
             message = "\n".join(message_lines)
             return ShaclReport(False, message, None, [])
-        conforms, report_graph, text_report = validate(
-            data_graph,
-            shacl_graph=self.shapes_graph,
-            inference="rdfs",
-            advanced=True,
-            serialize_report_graph=False,
-        )
+        if validate is None:
+            run = self._native.prepare(data_graph)
+            shards = self._shards(run)
+            if len(shards) > 1:
+                return self._validate_sharded(run, shards)
+            run.validate(shards[0] if shards else [])
+            conforms, report_graph, text_report = run.report()
+        else:
+            conforms, report_graph, text_report = validate(
+                data_graph,
+                shacl_graph=self.shapes_graph,
+                inference="rdfs",
+                advanced=True,
+                serialize_report_graph=False,
+            )
         report_graph_ttl: Optional[str] = None
         parsed_results: List[ShaclResult] = []
 
@@ -96,6 +177,39 @@ class ShaclValidator:
 
         return ShaclReport(bool(conforms), str(text_report), report_graph_ttl, parsed_results)
 
+    def _shards(self, run) -> list:
+        if self.workers <= 1 or run.focus_count < _MIN_SHARD_FOCUS_NODES:
+            return run.shards(1)
+        if "fork" not in multiprocessing.get_all_start_methods() or threading.active_count() > 1:
+            return run.shards(1)
+        return run.shards(self.workers * _SHARDS_PER_WORKER)
+
+    def _validate_sharded(self, run, shards: list) -> ShaclReport:
+        """Validate contiguous shards of focus nodes in forked workers and merge them in shard order.
+
+        Workers receive the closed data graph through the pool initializer,
+        which fork passes on without a copy; each pool is private to one call.
+        The report graph is kept as the workers' N-Triples (valid Turtle):
+        serializing the merged graph as Turtle would be serial again.
+        """
+
+        from .shacl_native import report_header, report_text
+
+        root = BNode()
+        with span("shacl.shards", shards=len(shards), workers=self.workers):
+            context = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=context, initializer=_init_shard_worker, initargs=(self, run, root)
+            ) as pool:
+                outputs = list(pool.map(_validate_shard, shards))
+        results = [result for _, _, shard_results in outputs for result in shard_results]
+        conforms = not results
+        header = Graph()
+        report_header(header, root, conforms)
+        report_graph_ttl = header.serialize(format="nt") + "".join(fragment for fragment, _, _ in outputs)
+        text_report = report_text(conforms, len(results), "".join(text for _, text, _ in outputs))
+        return ShaclReport(conforms, text_report, report_graph_ttl, results)
+
     def _find_invalid_decimal_literals(self, data_graph: Graph) -> list[tuple[str, str, str]]:
         """Return any literals with datatype xsd:decimal that cannot be parsed.
 
@@ -135,6 +249,104 @@ class ShaclValidator:
         return results
 
 
+@dataclass
+class ViolationCluster:
+    """Group of SHACL results that share a shape, path and constraint component."""
+
+    source_shape: Optional[str]
+    path: Optional[str]
+    constraint_component: Optional[str]
+    severity: Optional[str]
+    message: Optional[str]
+    count: int
+    focus_nodes: List[str]
+    values: List[str]
+    # Distinct focus nodes in the cluster; ``focus_nodes`` only keeps examples.
+    focus_count: int = 0
+
+    def to_prompt(self) -> str:
+        """Render the cluster as a single repair-prompt line."""
+
+        parts = []
+        if self.message:
+            parts.append(self.message)
+        if self.path:
+            parts.append(f"path={self.path}")
+        if self.constraint_component:
+            parts.append(f"constraint={_local_name(self.constraint_component)}")
+        if self.focus_nodes:
+            focus = ", ".join(self.focus_nodes)
+            hidden = self.focus_count - len(self.focus_nodes)
+            if hidden > 0:
+                focus += f" (+{hidden} more)"
+            parts.append(f"focus={focus}")
+        if self.values:
+            parts.append(f"values={', '.join(self.values)}")
+        if self.count > 1:
+            parts.append(f"count={self.count}")
+        return " | ".join(parts)
+
+
+_SEVERITY_RANK = {"violation": 0, "warning": 1, "info": 2}
+
+
+def _severity_rank(severity: Optional[str]) -> int:
+    return _SEVERITY_RANK.get(_local_name(severity or "").lower(), len(_SEVERITY_RANK))
+
+
+def _local_name(iri: str) -> str:
+    return iri.rsplit("#", 1)[-1].rsplit("/", 1)[-1]
+
+
+def cluster_shacl_results(
+    results: List[ShaclResult], max_examples: int = 3
+) -> List[ViolationCluster]:
+    """Aggregate SHACL results by ``(source_shape, path, constraint_component)``.
+
+    Each cluster keeps up to ``max_examples`` representative focus nodes and
+    distinct values together with the total number of results it stands for.
+    Clusters are ordered by severity (violations first) and then by impact,
+    i.e. the number of results they cover, so the most pressing problems lead
+    the repair prompt.
+    """
+
+    grouped: dict[tuple, List[ShaclResult]] = {}
+    for result in results:
+        key = (result.source_shape, result.path, result.constraint_component)
+        grouped.setdefault(key, []).append(result)
+
+    clusters: List[ViolationCluster] = []
+    for (source_shape, path, component), members in grouped.items():
+        severity = min((m.severity for m in members), key=_severity_rank)
+        message = next((m.message for m in members if m.message), None)
+        focus_nodes = sorted({m.focus_node for m in members if m.focus_node})
+        values = sorted({m.value for m in members if m.value})
+        clusters.append(
+            ViolationCluster(
+                source_shape=source_shape,
+                path=path,
+                constraint_component=component,
+                severity=severity,
+                message=message,
+                count=len(members),
+                focus_nodes=focus_nodes[:max_examples],
+                values=values[:max_examples],
+                focus_count=len(focus_nodes),
+            )
+        )
+
+    return sorted(
+        clusters,
+        key=lambda c: (
+            _severity_rank(c.severity),
+            -c.count,
+            c.path or "",
+            c.constraint_component or "",
+            c.message or "",
+        ),
+    )
+
+
 def summarize_shacl_report(report: ShaclReport) -> dict:
     """Aggregate SHACL results into a compact severity summary."""
 
@@ -0,0 +1,837 @@
+"""Native evaluation of the SHACL Core subset used by the project's shapes.
+
+pyshacl is general, but it is slow on the critical path of every repair
+iteration. For each call it clones the data graph, runs the owlrl RDFS closure
+over the clone and interprets every shape through rdflib pattern lookups.
+
+:func:`compile_shapes` reads a shapes graph once. The resulting
+:class:`NativeShapes` evaluates it against dictionary indexes over
+:class:`RdfsClosure`, which computes the same entailments as pyshacl's
+``inference="rdfs"`` (rules rdf1 and rdfs2-rdfs13, no axiomatic triples)
+semi-naively.
+
+Supported features:
+
+* node and property shapes with class, node, subjects-of, objects-of and
+  implicit class targets;
+* predicate paths and inverse predicate paths;
+* ``sh:minCount``, ``sh:maxCount``, ``sh:datatype``, ``sh:class``,
+  ``sh:nodeKind``;
+* the four value-range components;
+* node-level SPARQL SELECT constraints.
+
+Results, messages and the report graph follow pyshacl's. A shapes graph that
+uses anything else compiles to ``None`` together with the reason, and
+:class:`~og_nsd.shacl.ShaclValidator` falls back to pyshacl.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.graph import ReadOnlyGraphAggregate
+from rdflib.namespace import OWL, RDF, RDFS, SH, XSD
+from rdflib.plugins.sparql import prepareQuery
+
+_TARGETS = (SH.targetClass, SH.targetNode, SH.targetSubjectsOf, SH.targetObjectsOf)
+_PARAMETERS = {
+    SH.minCount: SH.MinCountConstraintComponent,
+    SH.maxCount: SH.MaxCountConstraintComponent,
+    SH.datatype: SH.DatatypeConstraintComponent,
+    SH["class"]: SH.ClassConstraintComponent,
+    SH.nodeKind: SH.NodeKindConstraintComponent,
+    SH.minInclusive: SH.MinInclusiveConstraintComponent,
+    SH.maxInclusive: SH.MaxInclusiveConstraintComponent,
+    SH.minExclusive: SH.MinExclusiveConstraintComponent,
+    SH.maxExclusive: SH.MaxExclusiveConstraintComponent,
+}
+# Every SHACL predicate a supported shapes graph may use; anything else needs pyshacl.
+_SUPPORTED = frozenset(
+    [*_TARGETS, *_PARAMETERS, SH.property, SH.path, SH.inversePath, SH.severity, SH.message, SH.deactivated,
+     SH.name, SH.description, SH.order, SH.group, SH.sparql, SH.select, SH.prefixes, SH.declare, SH.prefix,
+     SH.namespace]
+)
+_NODE_KINDS = {
+    SH.BlankNode: (BNode,),
+    SH.IRI: (URIRef,),
+    SH.Literal: (Literal,),
+    SH.BlankNodeOrIRI: (BNode, URIRef),
+    SH.BlankNodeOrLiteral: (BNode, Literal),
+    SH.IRIOrLiteral: (URIRef, Literal),
+}
+_VALUE_CHECKS = {
+    XSD.string: (str, bytes),
+    RDF.langString: (str, bytes),
+    XSD.integer: int,
+    XSD.float: float,
+    XSD.decimal: Decimal,
+    XSD.boolean: bool,
+    XSD.date: date,
+    XSD.time: time,
+    XSD.dateTime: datetime,
+}
+_RANGE_TESTS = {
+    SH.MinInclusiveConstraintComponent: (lambda cmp: cmp >= 0, ">="),
+    SH.MinExclusiveConstraintComponent: (lambda cmp: cmp > 0, ">"),
+    SH.MaxInclusiveConstraintComponent: (lambda cmp: cmp <= 0, "<="),
+    SH.MaxExclusiveConstraintComponent: (lambda cmp: cmp < 0, "<"),
+}
+# The variables and clauses pyshacl pre-binds or rejects in SPARQL constraints.
+_BIND_THIS = re.compile(r"([\s{}()])[\$\?]this", flags=re.M)
+_UNSUPPORTED_SPARQL = re.compile(
+    r"[\$\?](PATH|shapesGraph|currentShape)\b|\b(MINUS|VALUES|SERVICE)\b|\bAS\s+[\$\?]", flags=re.I
+)
+# Pre-binding ``$this`` equals filtering an unbound run on it unless the query uses one of these.
+_PER_FOCUS_SPARQL = re.compile(r"\b(OPTIONAL|UNION|EXISTS|GRAPH|LIMIT|OFFSET|GROUP|HAVING)\b", flags=re.I)
+
+
+class _Unsupported(ValueError):
+    """Raised while compiling a shapes graph that needs pyshacl."""
+
+
+# ---------------------------------------------------------------------------
+# RDFS closure
+
+
+class RdfsClosure:
+    """Indexed RDFS closure of a data graph, as pyshacl's ``inference="rdfs"`` derives it.
+
+    Like owlrl, every subject and object of an asserted triple is typed
+    ``rdfs:Resource`` (literals included). All other rules run to a fixpoint.
+    """
+
+    def __init__(self, graph: Graph) -> None:
+        self.graph = graph
+        self.spo: Dict = {}
+        self.pos: Dict = {}
+        self.inferred: List[tuple] = []
+        self._saturate()
+
+    def objects(self, subject, predicate) -> Set:
+        return self.spo.get(subject, {}).get(predicate, set())
+
+    def subjects(self, predicate, obj) -> Set:
+        return self.pos.get(predicate, {}).get(obj, set())
+
+    def pairs(self, predicate) -> List[tuple]:
+        return [(s, o) for o, subjects in self.pos.get(predicate, {}).items() for s in subjects]
+
+    def _saturate(self) -> None:
+        spo, pos = self.spo, self.pos
+        queue: List[tuple] = []
+
+        def add(s, p, o) -> None:
+            objects = spo.setdefault(s, {}).setdefault(p, set())
+            if o not in objects:
+                objects.add(o)
+                pos.setdefault(p, {}).setdefault(o, set()).add(s)
+                queue.append((s, p, o))
+
+        for triple in self.graph:
+            add(*triple)
+        asserted = len(queue)
+        for s, _, o in queue[:asserted]:
+            add(s, RDF.type, RDFS.Resource)
+            add(o, RDF.type, RDFS.Resource)
+
+        objects, subjects, pairs = self.objects, self.subjects, self.pairs
+        position = 0
+        while position < len(queue):
+            s, p, o = queue[position]
+            position += 1
+            add(p, RDF.type, RDF.Property)
+            for cls in tuple(objects(p, RDFS.domain)):
+                add(s, RDF.type, cls)
+            for cls in tuple(objects(p, RDFS.range)):
+                add(o, RDF.type, cls)
+            for parent in tuple(objects(p, RDFS.subPropertyOf)):
+                add(s, parent, o)
+            if p == RDF.type:
+                for parent in tuple(objects(o, RDFS.subClassOf)):
+                    add(s, RDF.type, parent)
+                if o == RDF.Property:
+                    add(s, RDFS.subPropertyOf, s)
+                elif o == RDFS.Class:
+                    add(s, RDFS.subClassOf, RDFS.Resource)
+                    add(s, RDFS.subClassOf, s)
+                elif o == RDFS.ContainerMembershipProperty:
+                    add(s, RDFS.subPropertyOf, RDFS.member)
+                elif o == RDFS.Datatype:
+                    add(s, RDFS.subClassOf, RDFS.Literal)
+            elif p == RDFS.domain:
+                for subject, _ in pairs(s):
+                    add(subject, RDF.type, o)
+            elif p == RDFS.range:
+                for _, value in pairs(s):
+                    add(value, RDF.type, o)
+            elif p == RDFS.subPropertyOf:
+                for parent in tuple(objects(o, RDFS.subPropertyOf)):
+                    add(s, RDFS.subPropertyOf, parent)
+                for child in tuple(subjects(RDFS.subPropertyOf, s)):
+                    add(child, RDFS.subPropertyOf, o)
+                for subject, value in pairs(s):
+                    add(subject, o, value)
+            elif p == RDFS.subClassOf:
+                for instance in tuple(subjects(RDF.type, s)):
+                    add(instance, RDF.type, o)
+                for parent in tuple(objects(o, RDFS.subClassOf)):
+                    add(s, RDFS.subClassOf, parent)
+                for child in tuple(subjects(RDFS.subClassOf, s)):
+                    add(child, RDFS.subClassOf, o)
+        self.inferred = queue[asserted:]
+
+    def graph_view(self) -> Graph:
+        """A read-only rdflib view of the closure, for SPARQL constraints."""
+
+        inferred = Graph()
+        for triple in self.inferred:
+            inferred.add(triple)
+        return ReadOnlyGraphAggregate([self.graph, inferred])
+
+
+# ---------------------------------------------------------------------------
+# Compiled shapes
+
+
+@dataclass
+class _Sparql:
+    node: object
+    query: object
+    bind_this: bool
+    batched: bool
+    messages: List[Literal]
+
+
+@dataclass
+class _Shape:
+    node: object
+    path: object = None
+    predicate: Optional[URIRef] = None
+    inverse: bool = False
+    severity: URIRef = SH.Violation
+    messages: List[Literal] = field(default_factory=list)
+    deactivated: bool = False
+    targets: Dict[URIRef, list] = field(default_factory=dict)
+    implicit_class: bool = False
+    constraints: List[Tuple[URIRef, list]] = field(default_factory=list)
+    properties: List["_Shape"] = field(default_factory=list)
+    sparql: List[_Sparql] = field(default_factory=list)
+
+    @property
+    def is_property_shape(self) -> bool:
+        return self.path is not None
+
+
+@dataclass
+class _Result:
+    shape: _Shape
+    component: URIRef
+    focus: object
+    value: object = None
+    path: object = None
+    source_constraint: object = None
+    messages: List[Literal] = field(default_factory=list)
+    message_texts: List[str] = field(default_factory=list)
+
+
+def _single(graph: Graph, node, predicate):
+    values = list(graph.objects(node, predicate))
+    if len(values) > 1:
+        raise _Unsupported(f"several {predicate.n3(graph.namespace_manager)} values on one shape")
+    return values[0] if values else None
+
+
+def compile_shapes(shapes_graph: Graph) -> Tuple[Optional["NativeShapes"], Optional[str]]:
+    """Compile ``shapes_graph`` for native evaluation; ``(None, reason)`` when it needs pyshacl."""
+
+    for predicate in set(shapes_graph.predicates()):
+        if str(predicate).startswith(str(SH)) and predicate not in _SUPPORTED:
+            return None, f"unsupported predicate {predicate.n3(shapes_graph.namespace_manager)}"
+    try:
+        return NativeShapes(shapes_graph), None
+    except _Unsupported as exc:
+        return None, str(exc)
+
+
+class NativeShapes:
+    """A shapes graph compiled for native validation (see the module docstring)."""
+
+    def __init__(self, shapes_graph: Graph) -> None:
+        self.shapes_graph = shapes_graph
+        self._compiled: Dict[object, _Shape] = {}
+        self._compiling: Set[object] = set()
+        class_types = {RDFS.Class, *shapes_graph.subjects(RDFS.subClassOf, RDFS.Class)}
+        shape_nodes = set(shapes_graph.subjects(RDF.type, SH.NodeShape))
+        shape_nodes |= set(shapes_graph.subjects(RDF.type, SH.PropertyShape))
+        shape_nodes |= set(shapes_graph.objects(None, SH.property))
+        for predicate in (*_TARGETS, SH.property, SH.path, SH.sparql, *_PARAMETERS):
+            shape_nodes |= set(shapes_graph.subjects(predicate, None))
+        roots = []
+        for node in sorted(shape_nodes, key=str):
+            implicit = any(cls in class_types for cls in shapes_graph.objects(node, RDF.type))
+            if implicit or any((node, target, None) in shapes_graph for target in _TARGETS):
+                shape = self._compile(node)
+                shape.implicit_class = implicit
+                roots.append(shape)
+        self.roots = roots
+        self._evaluators: Dict[URIRef, Callable] = {
+            SH.MinCountConstraintComponent: self._min_count,
+            SH.MaxCountConstraintComponent: self._max_count,
+            SH.DatatypeConstraintComponent: self._datatype,
+            SH.ClassConstraintComponent: self._class,
+            SH.NodeKindConstraintComponent: self._node_kind,
+        }
+        for component in _RANGE_TESTS:
+            self._evaluators[component] = self._value_range
+
+    # -- compilation --------------------------------------------------------
+
+    def _compile(self, node) -> _Shape:
+        if node in self._compiled:
+            return self._compiled[node]
+        if node in self._compiling:
+            raise _Unsupported("recursive sh:property shapes")
+        self._compiling.add(node)
+        sg = self.shapes_graph
+        shape = _Shape(node=node, severity=_single(sg, node, SH.severity) or SH.Violation)
+        shape.messages = list(set(sg.objects(node, SH.message)))
+        deactivated = _single(sg, node, SH.deactivated)
+        if deactivated is not None and not isinstance(deactivated, Literal):
+            raise _Unsupported("non-literal sh:deactivated")
+        shape.deactivated = deactivated is not None and bool(deactivated.value)
+        shape.targets = {target: list(sg.objects(node, target)) for target in _TARGETS}
+        path = _single(sg, node, SH.path)
+        if path is not None:
+            shape.path = path
+            if isinstance(path, URIRef):
+                shape.predicate = path
+            elif isinstance(path, BNode) and set(sg.predicates(path)) == {SH.inversePath}:
+                inverse = _single(sg, path, SH.inversePath)
+                if not isinstance(inverse, URIRef):
+                    raise _Unsupported("nested inverse path")
+                shape.predicate, shape.inverse = inverse, True
+            else:
+                raise _Unsupported("only predicate and inverse predicate paths are supported")
+        for parameter, component in _PARAMETERS.items():
+            values = list(sg.objects(node, parameter))
+            if not values:
+                continue
+            if component in _RANGE_TESTS or component == SH.ClassConstraintComponent:
+                if component in _RANGE_TESTS and not all(isinstance(value, Literal) for value in values):
+                    raise _Unsupported("non-literal value range")
+                shape.constraints.append((component, values))
+                continue
+            value = _single(sg, node, parameter)
+            if parameter in (SH.minCount, SH.maxCount):
+                if not isinstance(value, Literal) or not isinstance(value.value, int):
+                    raise _Unsupported("non-integer cardinality")
+            elif parameter == SH.nodeKind and value not in _NODE_KINDS:
+                raise _Unsupported(f"unknown node kind {value}")
+            elif parameter == SH.datatype and not isinstance(value, URIRef):
+                raise _Unsupported("non-IRI datatype")
+            shape.constraints.append((component, [value]))
+        shape.properties = [self._compile(child) for child in sg.objects(node, SH.property)]
+        for child in shape.properties:
+            if not child.is_property_shape:
+                raise _Unsupported("sh:property value without sh:path")
+        shape.sparql = [self._compile_sparql(shape, constraint) for constraint in sg.objects(node, SH.sparql)]
+        self._compiling.discard(node)
+        self._compiled[node] = shape
+        return shape
+
+    def _compile_sparql(self, shape: _Shape, node) -> _Sparql:
+        sg = self.shapes_graph
+        if shape.is_property_shape:
+            raise _Unsupported("SPARQL constraints on property shapes")
+        select = _single(sg, node, SH.select)
+        if not isinstance(select, Literal) or not isinstance(select.value, str):
+            raise _Unsupported("SPARQL constraint without a sh:select string")
+        text = select.value
+        if _UNSUPPORTED_SPARQL.search(text) or text.upper().count("SELECT") != 1:
+            raise _Unsupported("SPARQL constraint with pre-bound variables or clauses pyshacl rewrites")
+        if (node, SH.deactivated, None) in sg:
+            raise _Unsupported("deactivated SPARQL constraint")
+        prefixes = "".join(f"PREFIX {prefix}: <{namespace}>\n" for prefix, namespace in self._prefixes(node).items())
+        query = prepareQuery(f"{prefixes}\n{text}")
+        bind_this = bool(_BIND_THIS.search(text))
+        projected = {str(var) for var in query.algebra.get("PV", ())}
+        return _Sparql(
+            node=node,
+            query=query,
+            bind_this=bind_this,
+            batched=bind_this and "this" in projected and not _PER_FOCUS_SPARQL.search(text),
+            messages=list(set(sg.objects(node, SH.message))),
+        )
+
+    def _prefixes(self, node) -> Dict[str, str]:
+        """The ``sh:prefixes`` declarations of a SPARQL constraint, resolved as pyshacl does."""
+
+        sg = self.shapes_graph
+        ontologies = set(sg.subjects(RDF.type, OWL.Ontology))
+        graph_declares = set(sg.objects(sg.identifier, SH.declare))
+        global_declares = graph_declares.union(*(set(sg.objects(o, SH.declare)) for o in ontologies))
+        prefixes: Dict[str, str] = {}
+        for holder in sg.objects(node, SH.prefixes):
+            declares = set(sg.objects(holder, SH.declare))
+            declares = declares | graph_declares if declares and holder in ontologies else declares | global_declares
+            for declare in declares:
+                prefix, namespace = _single(sg, declare, SH.prefix), _single(sg, declare, SH.namespace)
+                if not isinstance(prefix, Literal) or not isinstance(namespace, Literal):
+                    raise _Unsupported("malformed sh:declare")
+                prefixes[str(prefix.value)] = str(namespace.value)
+        return prefixes
+
+    # -- validation ---------------------------------------------------------
+
+    def validate(self, data_graph: Graph) -> Tuple[bool, Graph, str]:
+        """Validate ``data_graph``; returns ``(conforms, report_graph, text_report)`` like ``pyshacl.validate``."""
+
+        run = self.prepare(data_graph)
+        run.validate(run.shards(1)[0] if run.focus_count else [])
+        return run.report()
+
+    def prepare(self, data_graph: Graph) -> "_Run":
+        """Close ``data_graph`` and collect the focus nodes of every root shape."""
+
+        run = _Run(self, RdfsClosure(data_graph))
+        run.focus = [list(run.focus_nodes(shape)) for shape in self.roots]
+        return run
+
+    def _validate_shape(self, run: "_Run", shape: _Shape, focus: Iterable) -> None:
+        if shape.deactivated:
+            return
+        value_nodes = {f: run.value_nodes(shape, f) for f in focus}
+        for component, params in shape.constraints:
+            self._evaluators[component](run, shape, component, params, value_nodes)
+        for child in shape.properties:
+            for values in value_nodes.values():
+                for value in values:
+                    self._validate_shape(run, child, [value])
+        for constraint in shape.sparql:
+            self._sparql(run, shape, constraint, value_nodes)
+
+    def _min_count(self, run, shape, component, params, value_nodes) -> None:
+        minimum = int(params[0].value)
+        for focus, values in value_nodes.items():
+            if minimum > 0 and len(values) < minimum:
+                run.result(shape, component, focus, generic=lambda: run.cardinality_message("Less", params[0], shape, focus))
+
+    def _max_count(self, run, shape, component, params, value_nodes) -> None:
+        maximum = int(params[0].value)
+        for focus, values in value_nodes.items():
+            if len(values) > maximum:
+                run.result(shape, component, focus, generic=lambda: run.cardinality_message("More", params[0], shape, focus))
+
+    def _datatype(self, run, shape, component, params, value_nodes) -> None:
+        datatype = params[0]
+        generic = lambda: f"Value is not Literal with datatype {run.shape_text(datatype)}"  # noqa: E731
+        for focus, values in value_nodes.items():
+            for value in values:
+                if not _has_datatype(value, datatype):
+                    run.result(shape, component, focus, value, generic=generic)
+
+    def _class(self, run, shape, component, params, value_nodes) -> None:
+        if len(params) < 2:
+            generic = lambda: f"Value does not have class {run.shape_text(params[0])}"  # noqa: E731
+        else:
+            generic = lambda: f"Value class is not in classes ({', '.join(map(run.shape_text, params))})"  # noqa: E731
+        for required in params:
+            for focus, values in value_nodes.items():
+                for value in values:
+                    if isinstance(value, Literal) or required not in run.types(value):
+                        run.result(shape, component, focus, value, generic=generic)
+
+    def _node_kind(self, run, shape, component, params, value_nodes) -> None:
+        kinds = _NODE_KINDS[params[0]]
+        generic = lambda: f"Value is not of Node Kind {run.shape_text(params[0])}"  # noqa: E731
+        for focus, values in value_nodes.items():
+            for value in values:
+                if not isinstance(value, kinds):
+                    run.result(shape, component, focus, value, generic=generic)
+
+    def _value_range(self, run, shape, component, params, value_nodes) -> None:
+        test, symbol = _RANGE_TESTS[component]
+        if len(params) < 2:
+            generic = lambda: f"Value is not {symbol} {run.shape_text(params[0])}"  # noqa: E731
+        else:
+            generic = lambda: f"Value is not {symbol} in ({', '.join(map(run.shape_text, params))})"  # noqa: E731
+        for bound in params:
+            for focus, values in value_nodes.items():
+                for value in values:
+                    if not _in_range(value, bound, test):
+                        run.result(shape, component, focus, value, generic=generic)
+
+    def _sparql(self, run: "_Run", shape: _Shape, constraint: _Sparql, value_nodes) -> None:
+        graph = run.sparql_graph()
+        rows = run.sparql_rows(constraint) if constraint.batched else {}
+        for focus in value_nodes:
+            if constraint.batched:
+                focus_rows = rows.get(focus, [])
+            else:
+                bindings = {"this": focus} if constraint.bind_this else {}
+                focus_rows = graph.query(constraint.query, initBindings=bindings)
+            seen: Set[tuple] = set()
+            for row in focus_rows:
+                variables = row.asdict()
+                if variables.pop("failure", None) is not None:
+                    key, this, path, value = (True,), None, None, None
+                else:
+                    path, value, this = variables.pop("path", None), variables.pop("value", None), variables.pop("this", None)
+                    if path is None and value is None and this is None:
+                        continue
+                    key = (this, path, value)
+                if key in seen:
+                    continue
+                seen.add(key)
+                bound = dict(variables)
+                for name, term in (("this", this), ("path", path), ("value", value)):
+                    if term is not None:
+                        bound[name] = term
+                run.result(
+                    shape, SH.SPARQLConstraintComponent, this or focus, value if value is not None else focus,
+                    path=path, source_constraint=constraint.node, extra=constraint.messages, bound=bound,
+                )
+
+
+def _has_datatype(value, datatype: URIRef) -> bool:
+    """pyshacl's ``sh:datatype`` test."""
+
+    if not isinstance(value, Literal):
+        return False
+    if value.datatype == datatype:
+        if getattr(value, "ill_typed", None) is True:
+            return False
+    elif datatype == RDFS.Literal or (datatype == RDFS.Datatype and value.datatype):
+        return True
+    elif not (value.datatype is None and value.language is None and datatype == XSD.string) and not (
+        datatype == RDF.langString and value.language
+    ):
+        return False
+    expected = _VALUE_CHECKS.get(datatype)
+    return expected is None or isinstance(value.value, expected)
+
+
+def _compare(left: Literal, right: Literal) -> int:
+    if left.eq(right):
+        return 0
+    if left.value.__class__ in (datetime, time):
+        return 0 if left.value == right.value else (1 if left.value > right.value else -1)
+    return 1 if left > right else -1
+
+
+def _in_range(value, bound: Literal, test: Callable[[int], bool]) -> bool:
+    """pyshacl's value-range test: strings only compare with strings, other terms never pass."""
+
+    if not isinstance(value, Literal) or isinstance(value.value, str) != isinstance(bound.value, str):
+        return False
+    try:
+        return test(_compare(value, bound))
+    except (TypeError, NotImplementedError):
+        return False
+
+
+def report_header(report: Graph, root: BNode, conforms: bool) -> None:
+    report.add((root, RDF.type, SH.ValidationReport))
+    report.add((root, SH.conforms, Literal(conforms)))
+
+
+def report_text(conforms: bool, count: int, body: str) -> str:
+    """pyshacl's text report around the result descriptions in ``body``."""
+
+    header = f"Validation Report\nConforms: {conforms}\n"
+    return header + (f"Results ({count}):\n" if count else "") + body
+
+
+def _format_message(text: str, bound: Dict[str, object]) -> str:
+    for name, term in bound.items():
+        text = re.sub("{{[?$]{}}}".format(name), str(term), text)
+    return text
+
+
+# ---------------------------------------------------------------------------
+# One validation run: closure lookups, results and the report
+
+
+class _Run:
+    def __init__(self, shapes: NativeShapes, closure: RdfsClosure) -> None:
+        self.shapes = shapes
+        self.closure = closure
+        self.results: List[_Result] = []
+        self._types: Dict[object, Set] = {}
+        self._sparql_graph: Optional[Graph] = None
+        self._data_ns = None
+        self._shape_ns = None
+        self._strings: Dict[tuple, str] = {}
+        self._sparql_rows: Dict[int, Dict[object, list]] = {}
+        # Focus nodes per root shape, in ``shapes.roots`` order (see NativeShapes.prepare).
+        self.focus: List[List] = []
+
+    @property
+    def focus_count(self) -> int:
+        return sum(len(nodes) for nodes in self.focus)
+
+    def shards(self, count: int) -> List[List[Tuple[int, int, int]]]:
+        """Split the focus nodes into at most ``count`` contiguous shards of ``(root, start, stop)`` slices."""
+
+        size = max(1, -(-self.focus_count // max(1, count)))
+        shards: List[List[Tuple[int, int, int]]] = []
+        current: List[Tuple[int, int, int]] = []
+        room = size
+        for index, nodes in enumerate(self.focus):
+            start = 0
+            while start < len(nodes):
+                stop = min(len(nodes), start + room)
+                current.append((index, start, stop))
+                room -= stop - start
+                start = stop
+                if not room:
+                    shards.append(current)
+                    current, room = [], size
+        if current:
+            shards.append(current)
+        return shards
+
+    def validate(self, slices: Iterable[Tuple[int, int, int]]) -> None:
+        """Validate the given slices of focus nodes, appending to ``results``."""
+
+        for index, start, stop in slices:
+            self.shapes._validate_shape(self, self.shapes.roots[index], self.focus[index][start:stop])
+
+    def focus_nodes(self, shape: _Shape) -> Set:
+        closure = self.closure
+        found = set(shape.targets[SH.targetNode])
+        classes = list(shape.targets[SH.targetClass]) + ([shape.node] if shape.implicit_class else [])
+        for cls in classes:
+            found |= closure.subjects(RDF.type, cls)
+        for predicate in shape.targets[SH.targetSubjectsOf]:
+            found |= {s for s, _ in closure.pairs(predicate)}
+        for predicate in shape.targets[SH.targetObjectsOf]:
+            found |= {o for _, o in closure.pairs(predicate)}
+        return found
+
+    def value_nodes(self, shape: _Shape, focus) -> Set:
+        if not shape.is_property_shape:
+            return {focus}
+        if shape.inverse:
+            return self.closure.subjects(shape.predicate, focus)
+        return self.closure.objects(focus, shape.predicate)
+
+    def types(self, node) -> Set:
+        # The closure already types every node with all its superclasses.
+        return self.closure.objects(node, RDF.type)
+
+    def sparql_graph(self) -> Graph:
+        if self._sparql_graph is None:
+            self._sparql_graph = self.closure.graph_view()
+        return self._sparql_graph
+
+    def sparql_rows(self, constraint: _Sparql) -> Dict[object, list]:
+        """Rows of one unbound run of a batched constraint, grouped by ``?this``."""
+
+        key = id(constraint)
+        if key not in self._sparql_rows:
+            rows: Dict[object, list] = {}
+            for row in self.sparql_graph().query(constraint.query):
+                rows.setdefault(row.this, []).append(row)
+            self._sparql_rows[key] = rows
+        return self._sparql_rows[key]
+
+    # -- results ------------------------------------------------------------
+
+    def result(
+        self, shape: _Shape, component: URIRef, focus, value=None, path=None, source_constraint=None,
+        generic: Optional[Callable[[], str]] = None, extra: Optional[List[Literal]] = None,
+        bound: Optional[Dict[str, object]] = None,
+    ) -> None:
+        """Record a result with pyshacl's message rules."""
+
+        messages: List[Literal] = []
+        texts: List[str] = []
+        shape_messages = list(shape.messages)
+        if extra:
+            for message in extra:
+                if message in shape_messages:
+                    continue
+                text = str(message.value)
+                if bound is not None:
+                    text = _format_message(text, bound)
+                    message = Literal(text)
+                messages.append(message)
+                texts.append(text)
+        elif not shape_messages and generic is not None:
+            shape_messages = [Literal(generic())]
+        for message in shape_messages:
+            text = str(message.value)
+            if bound is not None:
+                text = _format_message(text, bound)
+                message = Literal(text)
+            messages.append(message)
+            texts.append(text)
+        if path is None and shape.is_property_shape:
+            path = shape.path
+        self.results.append(_Result(shape, component, focus, value, path, source_constraint, messages, texts))
+
+    def cardinality_message(self, comparison: str, count: Literal, shape: _Shape, focus) -> str:
+        return f"{comparison} than {count.value} values on {self.data_text(focus)}->{self.shape_text(shape.path)}"
+
+    # -- rendering ----------------------------------------------------------
+
+    def _namespaces(self, data: bool):
+        if data:
+            if self._data_ns is None:
+                # pyshacl renders data terms through a clone of the data graph.
+                manager = Graph(bind_namespaces="core").namespace_manager
+                for prefix, namespace in self.closure.graph.namespace_manager.namespaces():
+                    manager.bind(prefix, namespace, override=True, replace=True)
+                manager.bind("sh", SH, override=False, replace=False)
+                self._data_ns = manager
+            return self._data_ns
+        if self._shape_ns is None:
+            self._shape_ns = self.shapes.shapes_graph.namespace_manager
+            self._shape_ns.bind("sh", SH, override=False, replace=False)
+        return self._shape_ns
+
+    def _lookup(self, data: bool) -> Callable[[object], Dict[object, Iterable]]:
+        if data:
+            return lambda node: self.closure.spo.get(node, {})
+        sg = self.shapes.shapes_graph
+
+        def shape_lookup(node) -> Dict[object, List]:
+            found: Dict[object, List] = {}
+            for predicate, obj in sg.predicate_objects(node):
+                found.setdefault(predicate, []).append(obj)
+            return found
+
+        return shape_lookup
+
+    def data_text(self, node) -> str:
+        return self._text(node, True, 0)
+
+    def shape_text(self, node) -> str:
+        return self._text(node, False, 0)
+
+    def _text(self, node, data: bool, depth: int) -> str:
+        """pyshacl's ``stringify_node``."""
+
+        manager = self._namespaces(data)
+        if isinstance(node, Literal):
+            lexical, value = str(node), str(node.value)
+            text = f'"{lexical}" = {value}' if lexical != value else f'"{lexical}"'
+            if node.language:
+                text += f", lang={node.language}"
+            if node.datatype:
+                text += f", datatype={self._text(node.datatype, data, depth)}"
+            return f"Literal({text})"
+        if isinstance(node, BNode):
+            return self._blank_text(node, data, depth + 1)
+        if isinstance(node, URIRef):
+            try:
+                return node.n3(namespace_manager=manager)
+            except Exception:
+                return str(node)
+        return str(node)
+
+    def _blank_text(self, node: BNode, data: bool, depth: int) -> str:
+        if depth >= 12:
+            return "<http://recursion.too.deep>"
+        key = (data, str(node))
+        if key in self._strings:
+            return self._strings[key]
+        manager = self._namespaces(data)
+        found = self._lookup(data)(node)
+        if not found:
+            return "[ ]"
+        if RDF.first in found:
+            items, cursor = [], node
+            while cursor is not None and cursor != RDF.nil:
+                entry = self._lookup(data)(cursor)
+                items.extend(self._text(item, data, depth + 1) for item in entry.get(RDF.first, ()))
+                cursor = next(iter(entry.get(RDF.rest, ())), None)
+            return "( {} )".format(" ".join(items))
+        parts: Dict[str, str] = {}
+        for predicate, objects in found.items():
+            texts = sorted(self._text(obj, data, depth + 1) for obj in objects)
+            if texts:
+                parts[predicate.n3(namespace_manager=manager)] = ", ".join(texts)
+        text = "[ {} ]".format(" ; ".join(f"{p} {o}" for p, o in sorted(parts.items())))
+        self._strings[key] = text
+        return text
+
+    def _describe(self, result: _Result) -> str:
+        """pyshacl's text description of one result."""
+
+        severity = "Constraint Violation" if result.shape.severity == SH.Violation else "Validation Result"
+        name = str(result.component).rsplit("#", 1)[-1]
+        lines = [
+            f"{severity} in {name} ({result.component}):",
+            f"\tSeverity: {self.shape_text(result.shape.severity)}",
+            f"\tSource Shape: {self.shape_text(result.shape.node)}",
+            f"\tFocus Node: {self.data_text(result.focus)}",
+        ]
+        if result.value is not None:
+            lines.append(f"\tValue Node: {self.data_text(result.value)}")
+        if result.path is not None:
+            lines.append(f"\tResult Path: {self.shape_text(result.path)}")
+        if result.source_constraint is not None:
+            lines.append(f"\tSource Constraint: {self.shape_text(result.source_constraint)}")
+        lines.extend(f"\tMessage: {text}" for text in result.message_texts)
+        return "\n".join(lines) + "\n"
+
+    def _clone(self, report: Graph, node, data: bool, cloned: Dict[tuple, object], depth: int = 0):
+        """Copy ``node`` into the report graph as pyshacl's ``clone_blank_node`` does.
+
+        The top-level node keeps its label. Nested blank nodes cost two levels of
+        pyshacl's recursion budget each and are copied once per (node, depth), with
+        a label derived from both, so interlinked blank nodes stay linear and every
+        shard of a sharded run clones a node into the same triples.
+        """
+
+        if not isinstance(node, BNode):
+            return node
+        key = (data, str(node), depth)
+        if key in cloned:
+            return cloned[key]
+        copy = cloned[key] = BNode(str(node) if depth == 0 else f"{node}x{depth}")
+        if depth < 10:
+            for predicate, objects in list(self._lookup(data)(node).items()):
+                for obj in list(objects):
+                    report.add((copy, predicate, self._clone(report, obj, data, cloned, depth + 2)))
+        return copy
+
+    def report(self) -> Tuple[bool, Graph, str]:
+        conforms = not self.results
+        report = Graph(bind_namespaces="core")
+        for prefix, namespace in self.shapes.shapes_graph.namespace_manager.namespaces():
+            report.namespace_manager.bind(prefix, namespace)
+        root = BNode()
+        report_header(report, root, conforms)
+        body = self.add_results(report, root)
+        return conforms, report, report_text(conforms, len(self.results), body)
+
+    def add_results(self, report: Graph, root: BNode) -> str:
+        """Add ``results`` to ``report`` under ``root``; returns their text descriptions."""
+
+        blocks: List[str] = []
+        cloned: Dict[tuple, object] = {}
+        for result in self.results:
+            blocks.append(self._describe(result))
+            node = BNode()
+            report.add((root, SH.result, node))
+            report.add((node, RDF.type, SH.ValidationResult))
+            report.add((node, SH.sourceConstraintComponent, result.component))
+            report.add((node, SH.sourceShape, self._clone(report, result.shape.node, False, cloned)))
+            report.add((node, SH.resultSeverity, result.shape.severity))
+            report.add((node, SH.focusNode, self._clone(report, result.focus, True, cloned)))
+            if result.value is not None:
+                report.add((node, SH.value, self._clone(report, result.value, True, cloned)))
+            if result.path is not None:
+                report.add((node, SH.resultPath, self._clone(report, result.path, False, cloned)))
+            if result.source_constraint is not None:
+                report.add((node, SH.sourceConstraint, self._clone(report, result.source_constraint, False, cloned)))
+            for message in result.messages:
+                report.add((node, SH.resultMessage, message))
+        return "".join(blocks)
@@ -0,0 +1,233 @@
+"""Deterministic drafting for well-formed boilerplate requirements.
+
+Requirements written against the EARS-style boilerplates carry a tagged main
+clause such as ``<System:ATM> SHALL <Function:eject> <Item:card>``. When that
+clause matches one of the templates below and every tagged term resolves to a
+class in the :class:`~og_nsd.ontology.SchemaContext`, the axioms can be
+written directly; everything else is left for the LLM.
+
+Supported main clauses (keywords are case-insensitive)::
+
+    <System:s> SHALL <Function:f> [parameters] <Item:i> [, | AND <Item:j>]* [WITH | TO <System:t>]
+    <System:s> SHALL SEND <Item:i> [AND <Item:j>]* [TO <System:t>]
+    <System:s> SHALL SET <Item:i> TO <StateValue:v>
+
+Each relation becomes the same axiom shape :class:`~og_nsd.llm.HeuristicLLM`
+emits (property declaration, class declarations and an ``owl:Axiom`` node
+carrying ``atm:sourceRequirement``), using an existing schema property when
+one with a matching verb, domain and range exists.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from rdflib import Literal, Namespace, URIRef
+from rdflib.namespace import OWL, RDF, RDFS
+
+from .llm import GraphResponse, Triple
+from .ontology import SchemaContext
+from .requirements import Requirement
+
+_TAG = r"<{types}:([^<>]+)>"
+_ITEM = _TAG.format(types="(?:Item|Flow)")
+_ITEMS = rf"(?P<items>{_ITEM}(?:\s*(?:,|\bAND\b)\s*{_ITEM})*)"
+_SUBJECT = r"^\s*<System:(?P<subject>[^<>]+)>\s+SHALL\s+"
+_TARGET = r"(?:\s+(?P<prep>WITH|TO)\s+<System:(?P<target>[^<>]+)>)?\s*\.?\s*$"
+
+_FUNCTION_RE = re.compile(
+    _SUBJECT + r"<Function:(?P<verb>[^<>]+)>\s+(?:parameters\s+)?" + _ITEMS + _TARGET, re.IGNORECASE
+)
+_SEND_RE = re.compile(_SUBJECT + r"(?P<verb>SEND)\s+" + _ITEMS + _TARGET, re.IGNORECASE)
+_SET_RE = re.compile(
+    _SUBJECT + r"SET\s+<Item:(?P<item>[^<>]+)>\s+TO\s+<StateValue:(?P<value>[^<>]+)>\s*\.?\s*$",
+    re.IGNORECASE,
+)
+_ITEM_RE = re.compile(_ITEM, re.IGNORECASE)
+
+# (subject, property, object, add domain/range for a minted property, object is an individual)
+_Relation = Tuple[URIRef, URIRef, URIRef, bool, bool]
+
+
+@dataclass
+class Clause:
+    """A parsed boilerplate main clause."""
+
+    subject: str
+    verb: str
+    objects: List[str]
+    preposition: Optional[str] = None
+    target: Optional[str] = None
+    state_value: Optional[str] = None
+
+
+def parse_main(main: str | None) -> Optional[Clause]:
+    """Match ``main`` against the supported templates; ``None`` if none fits."""
+
+    if not main:
+        return None
+    match = _SET_RE.match(main)
+    if match:
+        return Clause(match["subject"], "set", [match["item"]], state_value=match["value"])
+    match = _FUNCTION_RE.match(main) or _SEND_RE.match(main)
+    if match:
+        return Clause(
+            subject=match["subject"],
+            verb=match["verb"].strip().lower(),
+            objects=_ITEM_RE.findall(match["items"]),
+            preposition=match["prep"].lower() if match["prep"] else None,
+            target=match["target"],
+        )
+    return None
+
+
+@dataclass
+class TemplateResult:
+    """Outcome of :meth:`TemplateCompiler.compile` for one batch."""
+
+    response: Optional[GraphResponse]
+    handled: List[str] = field(default_factory=list)
+    remaining: List[Requirement] = field(default_factory=list)
+
+
+class TemplateCompiler:
+    """Compile boilerplate requirements into axioms grounded in a schema."""
+
+    def __init__(self, schema_context: SchemaContext, base_namespace: str) -> None:
+        self.base_ns = base_namespace.rstrip("#/") + "#"
+        self.context = schema_context
+        self._classes: Dict[str, URIRef] = {}
+        for term in schema_context.classes:
+            self._classes.setdefault(_key(_local_name(term)), self._iri(term))
+        for term, label in schema_context.labels.items():
+            if term in schema_context.classes:
+                self._classes.setdefault(_key(label), self._iri(term))
+        self._properties: List[Tuple[str, URIRef, Optional[URIRef], Optional[URIRef]]] = []
+        for term, signature in schema_context.object_properties.items():
+            domain, range_ = signature.get("domain"), signature.get("range")
+            self._properties.append(
+                (
+                    _key(_local_name(term)),
+                    self._iri(term),
+                    self._iri(domain) if domain and domain != "(unspecified)" else None,
+                    self._iri(range_) if range_ and range_ != "(unspecified)" else None,
+                )
+            )
+
+    def compile(self, requirements: Sequence[Requirement]) -> TemplateResult:
+        """Draft every requirement a template covers; return the rest untouched."""
+
+        atm = Namespace(self.base_ns)
+        result = TemplateResult(response=None)
+        triples: List[Triple] = []
+        notes: List[str] = []
+        for req in requirements:
+            relations = self._relations(parse_main(req.boilerplate_main))
+            if relations is None:
+                result.remaining.append(req)
+                continue
+            for subject, prop, obj, minted, individual in relations:
+                axiom = atm[f"{_local_name(subject)}_{_local_name(prop)}_{_local_name(obj)}"]
+                triples += [
+                    (prop, RDF.type, OWL.ObjectProperty),
+                    (subject, RDF.type, OWL.Class),
+                    (axiom, RDF.type, OWL.Axiom),
+                    (axiom, OWL.annotatedSource, subject),
+                    (axiom, OWL.annotatedProperty, prop),
+                    (axiom, OWL.annotatedTarget, obj),
+                    (axiom, atm.sourceRequirement, Literal(req.identifier)),
+                ]
+                if minted:
+                    triples.append((prop, RDFS.domain, subject))
+                if individual:
+                    triples.append((obj, RDF.type, OWL.NamedIndividual))
+                else:
+                    triples.append((obj, RDF.type, OWL.Class))
+                    if minted:
+                        triples.append((prop, RDFS.range, obj))
+                notes.append(
+                    f"Templated {req.identifier}: {_local_name(subject)} {_local_name(prop)} {_local_name(obj)}"
+                )
+            result.handled.append(req.identifier)
+        if result.handled:
+            namespaces = {"atm": self.base_ns, "owl": str(OWL), "rdfs": str(RDFS)}
+            result.response = GraphResponse("\n".join(notes), triples=triples, namespaces=namespaces)
+        return result
+
+    def _relations(self, clause: Optional[Clause]) -> Optional[List[_Relation]]:
+        """Resolve a clause to relations, or ``None`` if any term is not in the schema."""
+
+        if clause is None:
+            return None
+        subject = self._resolve_class(clause.subject)
+        if clause.state_value is not None:
+            item = self._resolve_class(clause.objects[0])
+            value = _camel(clause.state_value)
+            if subject is None or item is None or not value:
+                return None
+            # hasState is shared by every stateful class, so it gets no domain.
+            return [(item, URIRef(self.base_ns + "hasState"), URIRef(self.base_ns + value), False, True)]
+
+        objects = [self._resolve_class(name) for name in clause.objects]
+        target = self._resolve_class(clause.target) if clause.target else None
+        if subject is None or None in objects or (clause.target and target is None):
+            return None
+        relations: List[_Relation] = []
+        for obj in objects:
+            prop, minted = self._property(clause.verb, subject, obj, suffix="")
+            relations.append((subject, prop, obj, minted, False))
+        if target is not None:
+            prop, minted = self._property(clause.verb, subject, target, suffix=clause.preposition or "")
+            relations.append((subject, prop, target, minted, False))
+        return relations
+
+    def _resolve_class(self, name: str) -> Optional[URIRef]:
+        key = _key(name)
+        if not key:
+            return None
+        if key in self._classes:
+            return self._classes[key]
+        # "card" -> CashCard: accept a unique class whose name ends with the term.
+        candidates = {iri for class_key, iri in self._classes.items() if class_key.endswith(key)}
+        if len(key) >= 3 and len(candidates) == 1:
+            return candidates.pop()
+        return None
+
+    def _property(self, verb: str, subject: URIRef, obj: URIRef, suffix: str) -> Tuple[URIRef, bool]:
+        """Reuse a schema property named after ``verb`` with a matching signature, else mint one."""
+
+        stem = _key(verb).rstrip("e")
+        if stem:
+            for prop_key, iri, domain, range_ in self._properties:
+                if prop_key.startswith(stem) and domain in (None, subject) and range_ in (None, obj):
+                    return iri, False
+        name = _third_person(_key(verb) or "relates") + suffix.capitalize()
+        return URIRef(self.base_ns + name), True
+
+    def _iri(self, term: str) -> URIRef:
+        if "://" in term:
+            return URIRef(term.strip("<>"))
+        prefix, _, local = term.partition(":")
+        namespace = self.context.prefixes.get(prefix)
+        return URIRef(namespace + local) if namespace else URIRef(self.base_ns + local)
+
+
+def _key(text: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", text.lower())
+
+
+def _local_name(term: str) -> str:
+    return re.split(r"[#/:]", str(term).rstrip(">"))[-1]
+
+
+def _camel(text: str) -> str:
+    return "".join(part[:1].upper() + part[1:] for part in re.split(r"[^A-Za-z0-9]+", text) if part)
+
+
+def _third_person(verb: str) -> str:
+    if verb.endswith("y") and verb[-2:-1] not in "aeiou":
+        return verb[:-1] + "ies"
+    if verb.endswith(("s", "sh", "ch", "x", "z")):
+        return verb + "es"
+    return verb + "s"
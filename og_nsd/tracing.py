@@ -0,0 +1,186 @@
+"""Lightweight nested timing spans for pipeline stages."""
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+@dataclass
+class Span:
+    """A timed stage with optional counters (triples, tokens, results, ...)."""
+
+    name: str
+    start: float
+    counts: Dict[str, Any] = field(default_factory=dict)
+    children: List["Span"] = field(default_factory=list)
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    thread_id: int = 0
+
+    def count(self, key: str, value: Any = 1) -> None:
+        """Add ``value`` to a numeric counter (or set it for non-numeric values)."""
+
+        current = self.counts.get(key)
+        if isinstance(value, (int, float)) and isinstance(current, (int, float)):
+            self.counts[key] = current + value
+        else:
+            self.counts[key] = value
+
+    def set(self, **counts: Any) -> None:
+        self.counts.update(counts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "name": self.name,
+            "wall_s": round(self.wall_s, 6),
+            "cpu_s": round(self.cpu_s, 6),
+        }
+        if self.counts:
+            payload["counts"] = dict(self.counts)
+        if self.children:
+            payload["children"] = [child.to_dict() for child in self.children]
+        return payload
+
+
+class _NullSpan(Span):
+    """Span handed out when no tracer is active; all updates are discarded."""
+
+    def count(self, key: str, value: Any = 1) -> None:
+        return None
+
+    def set(self, **counts: Any) -> None:
+        return None
+
+
+_ACTIVE: contextvars.ContextVar[Optional["Tracer"]] = contextvars.ContextVar("og_nsd_tracer", default=None)
+_CURRENT: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("og_nsd_span", default=None)
+
+
+class Tracer:
+    """Collects nested :class:`Span` objects for one run.
+
+    Wall time uses ``time.perf_counter`` and CPU time ``time.process_time``
+    (process-wide, so spans that overlap worker threads include their CPU).
+    """
+
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.roots: List[Span] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self) -> Iterator["Tracer"]:
+        """Make this tracer receive spans opened via :func:`span` in this context."""
+
+        token = _ACTIVE.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE.reset(token)
+
+    @contextmanager
+    def span(self, name: str, **counts: Any) -> Iterator[Span]:
+        parent = _CURRENT.get()
+        current = Span(
+            name=name,
+            start=time.perf_counter() - self.origin,
+            counts=dict(counts),
+            thread_id=threading.get_ident(),
+        )
+        with self._lock:
+            (parent.children if parent is not None else self.roots).append(current)
+        token = _CURRENT.set(current)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield current
+        finally:
+            current.wall_s = time.perf_counter() - wall_start
+            current.cpu_s = time.process_time() - cpu_start
+            _CURRENT.reset(token)
+
+    def stage_totals(self) -> Dict[str, Dict[str, Any]]:
+        """Aggregate calls, wall/CPU time and numeric counters per span name."""
+
+        totals: Dict[str, Dict[str, Any]] = {}
+
+        def _visit(item: Span) -> None:
+            entry = totals.setdefault(item.name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "counts": {}})
+            entry["calls"] += 1
+            entry["wall_s"] += item.wall_s
+            entry["cpu_s"] += item.cpu_s
+            for key, value in item.counts.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    entry["counts"][key] = entry["counts"].get(key, 0) + value
+            for child in item.children:
+                _visit(child)
+
+        for root in self.roots:
+            _visit(root)
+        for entry in totals.values():
+            entry["wall_s"] = round(entry["wall_s"], 6)
+            entry["cpu_s"] = round(entry["cpu_s"], 6)
+            if not entry["counts"]:
+                del entry["counts"]
+        return totals
+
+    def to_report(self) -> Dict[str, Any]:
+        """Return the ``performance`` section embedded in run reports."""
+
+        return {
+            "wall_s": round(sum(root.wall_s for root in self.roots), 6),
+            "stages": self.stage_totals(),
+            "spans": [root.to_dict() for root in self.roots],
+        }
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Render spans as Chrome trace "complete" events (``chrome://tracing``/Perfetto)."""
+
+        events: List[Dict[str, Any]] = []
+        pid = os.getpid()
+
+        def _visit(item: Span) -> None:
+            events.append(
+                {
+                    "name": item.name,
+                    "ph": "X",
+                    "ts": round(item.start * 1e6, 3),
+                    "dur": round(item.wall_s * 1e6, 3),
+                    "pid": pid,
+                    "tid": item.thread_id,
+                    "args": {"cpu_s": round(item.cpu_s, 6), **item.counts},
+                }
+            )
+            for child in item.children:
+                _visit(child)
+
+        for root in self.roots:
+            _visit(root)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome_trace(), default=str), encoding="utf-8")
+
+
+@contextmanager
+def span(name: str, **counts: Any) -> Iterator[Span]:
+    """Open a span on the active tracer, or a no-op span when tracing is off."""
+
+    tracer = _ACTIVE.get()
+    if tracer is None:
+        yield _NullSpan(name=name, start=0.0)
+        return
+    with tracer.span(name, **counts) as current:
+        yield current
+
+
+def active_tracer() -> Optional[Tracer]:
+    return _ACTIVE.get()
@@ -12,6 +12,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from og_nsd import OntologyDraftingPipeline, PipelineConfig  # noqa: E402
+from og_nsd.graphs import load_graph  # noqa: E402
 from og_nsd.metrics import (  # noqa: E402
     compute_exact_metrics_from_graphs,
     compute_semantic_metrics,
@@ -72,7 +73,11 @@ def main() -> None:
     reasoning_result = pipeline.reasoner.run(asserted_graph)
     data_graph = reasoning_result.expanded_graph
 
-    validator = ShaclValidator(pipeline_config.shapes_path) if pipeline_config.shapes_path else None
+    validator = None
+    if pipeline_config.shapes_path:
+        validator = ShaclValidator(
+            pipeline_config.shapes_path, engine=pipeline_config.shacl_engine, workers=pipeline_config.shacl_workers
+        )
     if validator:
         shacl_report = validator.validate(data_graph)
         validation_report_path = output_root / "validation_report.ttl"
@@ -82,7 +87,7 @@ def main() -> None:
         summary_path.write_text(json.dumps(summarize_shacl_report(shacl_report), indent=2), encoding="utf-8")
 
     gold_path = PROJECT_ROOT / cfg.get("gold_path", "gold/atm_gold.ttl")
-    gold_graph = Graph().parse(gold_path)
+    gold_graph = load_graph(gold_path)
     exact_metrics_path = output_root / "metrics_exact.json"
     semantic_metrics_path = output_root / "metrics_semantic.json"
     exact_metrics_path.write_text(
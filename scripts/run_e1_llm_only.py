@@ -15,6 +15,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from og_nsd import OntologyDraftingPipeline, PipelineConfig  # noqa: E402
+from og_nsd.graphs import load_graph  # noqa: E402
 from og_nsd.metrics import compute_exact_metrics, compute_semantic_metrics  # noqa: E402
 from og_nsd.queries import CompetencyQuestionRunner  # noqa: E402
 
@@ -127,7 +128,7 @@ def main() -> None:
         encoding="utf-8",
     )
     (output_root / "metrics_semantic.json").write_text(
-        json.dumps(compute_semantic_metrics(pred_graph, Graph().parse(gold_path)), indent=2),
+        json.dumps(compute_semantic_metrics(pred_graph, load_graph(gold_path)), indent=2),
         encoding="utf-8",
     )
 
@@ -148,8 +149,9 @@ def main() -> None:
         (output_root / "cq_results.json").write_text(json.dumps(cq_payload, indent=2), encoding="utf-8")
 
     run_report = json.loads(Path(run_report_path).read_text(encoding="utf-8")) if run_report_path else {}
-    if pipeline.last_llm_response and pipeline.last_llm_response.token_usage:
-        run_report["token_usage"] = pipeline.last_llm_response.token_usage
+    token_usage = pipeline.ledger.token_totals() if pipeline.ledger else None
+    if token_usage:
+        run_report["token_usage"] = token_usage
     run_report["drift_axioms_sample"] = collect_drift_samples(
         pred_graph, pipeline_config.base_namespace
     )
@@ -14,6 +14,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from og_nsd import OntologyDraftingPipeline, PipelineConfig  # noqa: E402
+from og_nsd.graphs import load_graph  # noqa: E402
 from og_nsd.metrics import compute_exact_metrics, compute_semantic_metrics  # noqa: E402
 from og_nsd.queries import CompetencyQuestionRunner  # noqa: E402
 from og_nsd.shacl import summarize_shacl_report  # noqa: E402
@@ -85,7 +86,7 @@ def main() -> None:
         )
 
     exact_metrics = compute_exact_metrics(pipeline_config.output_path, gold_path)
-    semantic_metrics = compute_semantic_metrics(data_graph, Graph().parse(gold_path))
+    semantic_metrics = compute_semantic_metrics(data_graph, load_graph(gold_path))
 
     (output_root / "metrics_exact.json").write_text(json.dumps(exact_metrics, indent=2), encoding="utf-8")
     (output_root / "metrics_semantic.json").write_text(json.dumps(semantic_metrics, indent=2), encoding="utf-8")
@@ -3,20 +3,35 @@
 from __future__ import annotations
 
 import argparse
+import dataclasses
 import json
 import sys
 from pathlib import Path
 from types import SimpleNamespace
 
-from rdflib import Graph
-
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from og_nsd import OntologyAssembler, load_schema_context  # noqa: E402
-from og_nsd.llm import HeuristicLLM, OpenAILLM  # noqa: E402
+from og_nsd.beam import BeamEvaluator, BeamRepair  # noqa: E402
+from og_nsd.dedup import find_near_duplicates  # noqa: E402
+from og_nsd.forecast import (  # noqa: E402
+    expected_repair_calls,
+    forecast,
+    load_profiles,
+    load_tokenizer,
+    plan_drafting,
+    plan_repairs,
+)
+from og_nsd.graphs import load_graph  # noqa: E402
+from og_nsd.keywords import Lexicon  # noqa: E402
+from og_nsd.ledger import CallLedger, llm_call  # noqa: E402
+from og_nsd.llm import GraphResponse, HeuristicLLM, OpenAILLM  # noqa: E402
+from og_nsd.memo import DraftMemo, draft_fingerprint  # noqa: E402
+from og_nsd.prerepair import PreRepairEngine  # noqa: E402
 from og_nsd.reasoning import OwlreadyReasoner  # noqa: E402
+from og_nsd.repair_memo import RepairMemo  # noqa: E402
 from og_nsd.repair import (  # noqa: E402
     StopDecision,
     cq_results_to_patches,
@@ -27,8 +42,12 @@ from og_nsd.repair import (  # noqa: E402
     should_stop,
 )
 from og_nsd.requirements import RequirementLoader, chunk_requirements  # noqa: E402
+from og_nsd.routing import ModelTier, RoutedLLM  # noqa: E402
+from og_nsd.scheduler import SchedulerConfig  # noqa: E402
 from og_nsd.shacl import ShaclValidator, summarize_shacl_report  # noqa: E402
+from og_nsd.templates import TemplateCompiler  # noqa: E402
 from og_nsd.queries import CompetencyQuestionRunner  # noqa: E402
+from og_nsd.tracing import Tracer, span  # noqa: E402
 
 
 def parse_args() -> argparse.Namespace:
@@ -76,6 +95,32 @@ def parse_args() -> argparse.Namespace:
         help="Skip soft/warning SHACL results when generating patches.",
     )
     parser.set_defaults(use_soft_violations=None)
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Build every drafting prompt and print a token, cost and wall-clock forecast without calling the LLM.",
+    )
+    parser.add_argument(
+        "--ledger",
+        type=Path,
+        nargs="*",
+        default=[],
+        help="llm_calls.ndjson files from earlier runs to fit latency/completion profiles for --dry-run.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=str,
+        default="1,4,8",
+        help="Comma-separated concurrency settings to forecast wall-clock time for (--dry-run).",
+    )
+    parser.add_argument("--prompt-price", type=float, help="USD per million prompt tokens (--dry-run cost).")
+    parser.add_argument("--completion-price", type=float, help="USD per million completion tokens (--dry-run cost).")
+    parser.add_argument("--cached-price", type=float, help="USD per million cached prompt tokens (--dry-run cost).")
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Also export per-stage timing spans as a Chrome trace (trace.json) in each output root.",
+    )
     return parser.parse_args()
 
 
@@ -84,15 +129,93 @@ def load_config(path: Path) -> dict:
         return json.load(handle)
 
 
-def select_llm(cfg: dict, base_namespace: str):
+def select_llm(cfg: dict, base_namespace: str, assembler: OntologyAssembler | None = None, schema_context=None):
     mode = cfg.get("llm_mode", "heuristic")
     temperature = cfg.get("temperature", 0.2)
+    lexicon = Lexicon.load(PROJECT_ROOT / cfg["heuristic_lexicon"]) if cfg.get("heuristic_lexicon") else None
     if mode == "openai":
+        options = {
+            "temperature": temperature,
+            "stream": cfg.get("stream", False),
+            "stream_budget_tokens": cfg.get("stream_budget_tokens"),
+            "stream_parser_factory": assembler.stream_parser if assembler else None,
+        }
         try:
-            return OpenAILLM(temperature=temperature)
+            strong = OpenAILLM(model=cfg.get("model", "gpt-5.2"), **options)
         except RuntimeError:
-            return HeuristicLLM(base_namespace)
-    return HeuristicLLM(base_namespace)
+            return HeuristicLLM(base_namespace, lexicon)
+        fast_model = cfg.get("fast_model")
+        if not fast_model:
+            return strong
+        if fast_model == "heuristic":
+            fast = HeuristicLLM(base_namespace, lexicon)
+        else:
+            fast = OpenAILLM(model=fast_model, scheduler=strong.scheduler, **options)
+        tiers = [
+            ModelTier(fast_model, fast, max_difficulty=cfg.get("route_threshold", 0.5)),
+            ModelTier(strong.model, strong),
+        ]
+        check = assembler.response_triples if assembler else None
+        return RoutedLLM(tiers, schema_context=schema_context, check=check)
+    return HeuristicLLM(base_namespace, lexicon)
+
+
+def forecast_run(args, cfg: dict, llm, requirements, schema_context, policies: list[str], iterations: int) -> dict:
+    """Forecast the LLM calls, tokens, cost and wall-clock time of this E4 run."""
+
+    if isinstance(llm, OpenAILLM):
+        prompt_llm = llm
+    elif isinstance(llm, RoutedLLM) and isinstance(llm.strong.llm, OpenAILLM):
+        prompt_llm = llm.strong.llm
+    else:
+        # Heuristic or fallback mode: forecast what the configured OpenAI model would be sent.
+        prompt_llm = OpenAILLM(model=cfg.get("model", "gpt-5.2"), temperature=cfg.get("temperature", 0.2))
+    counter, encoding = load_tokenizer(prompt_llm.model)
+    profiles = load_profiles(args.ledger)
+    batches = list(chunk_requirements(requirements, size=cfg.get("requirements_chunk_size", 5)))
+    draft = plan_drafting(prompt_llm, batches, counter, schema_context)
+    # The ontology handed to apply_patches is roughly what drafting produced (≈4 characters per token).
+    draft_profile = profiles["generate_axioms"]
+    context_chars = int(4 * sum(draft_profile.completion_for(call) for call in draft.calls))
+    repair_calls = expected_repair_calls("apply_patches", profiles, iterations)
+    repairs = plan_repairs(prompt_llm, "apply_patches", repair_calls, counter, context_chars)
+    phases = []
+    for idx in range(len(policies)):
+        # With the draft memo only the first policy drafts; the others reuse its axioms.
+        if idx == 0 or not cfg.get("draft_memo"):
+            phases.append(draft)
+        phases.append(repairs)
+
+    prices = {
+        key: value
+        for key, value in (
+            ("prompt", args.prompt_price),
+            ("completion", args.completion_price),
+            ("cached", args.cached_price),
+        )
+        if value is not None
+    }
+    limits = SchedulerConfig.from_env()
+    concurrency = [int(value) for value in args.concurrency.split(",") if value.strip()]
+    result = forecast(
+        phases,
+        profiles,
+        concurrency,
+        prices=prices or None,
+        requests_per_minute=limits.requests_per_minute,
+        tokens_per_minute=limits.tokens_per_minute,
+    )
+    result.update(
+        {
+            "model": prompt_llm.model,
+            "tokenizer": encoding,
+            "policies": len(policies),
+            "drafting_batches": len(batches),
+            "repair_calls_per_policy": repair_calls,
+            "profiles": {kind: profile.to_dict() for kind, profile in profiles.items()},
+        }
+    )
+    return result
 
 
 def ensure_dir(path: Path) -> None:
@@ -109,6 +232,14 @@ def _count_patch_types(patches):
     return counts
 
 
+def _patches_in_place(llm) -> bool:
+    """Whether ``llm`` can patch the current graph directly instead of a Turtle copy."""
+
+    if isinstance(llm, RoutedLLM):
+        llm = llm.strong.llm
+    return isinstance(llm, HeuristicLLM)
+
+
 def _normalize_stop_policies(raw) -> list[str]:
     if raw is None:
         return []
@@ -130,6 +261,7 @@ def _save_iteration_log(
     reasoning_result,
     triples_before_reasoning: int,
     stop_decision: StopDecision,
+    performance: dict | None = None,
 ) -> dict:
     payload = {
         "iteration": iteration,
@@ -158,6 +290,8 @@ def _save_iteration_log(
         "stop": {"decision": stop_decision.stop, "reason": stop_decision.reason},
         "stop_reason": stop_decision.reason,
     }
+    if performance is not None:
+        payload["performance"] = performance
     (iter_dir / "iteration_log.json").write_text(json.dumps(payload, indent=2), encoding="utf-8")
     return payload
 
@@ -174,7 +308,8 @@ def main() -> None:
     output_root_base = PROJECT_ROOT / cfg.get("output_root", "runs/E4_full")
     if args.output_root:
         output_root_base = args.output_root
-    ensure_dir(output_root_base)
+    if not args.dry_run:
+        ensure_dir(output_root_base)
 
     iterations_cfg = cfg.get("iterations")
     if iterations_cfg is None:
@@ -223,24 +358,90 @@ def main() -> None:
         base_namespace=base_ns,
         default_prefixes=schema_context.prefixes if schema_context else None,
     )
-    validator = ShaclValidator(PROJECT_ROOT / cfg["shapes_path"]) if cfg.get("validation", True) else None
+    shacl_engine = cfg.get("shacl_engine", "native")
+    validator = (
+        ShaclValidator(PROJECT_ROOT / cfg["shapes_path"], engine=shacl_engine, workers=cfg.get("shacl_workers", 1))
+        if cfg.get("validation", True)
+        else None
+    )
     reasoner = OwlreadyReasoner(enabled=cfg.get("reasoning", True))
     cq_runner = None
     if cfg.get("competency_questions"):
         cq_runner = CompetencyQuestionRunner(PROJECT_ROOT / cfg["competency_questions"])
 
-    llm = select_llm(cfg, base_ns)
-
-    def run_single(policy: str, output_root: Path) -> None:
+    llm = select_llm(cfg, base_ns, assembler, schema_context)
+
+    clusters = None
+    llm_requirements = requirements
+    if cfg.get("dedup_threshold") is not None:
+        clusters = find_near_duplicates(requirements, cfg["dedup_threshold"])
+        llm_requirements = clusters.representatives
+        print(f"Deduplicated {clusters.duplicates} near-duplicate requirements.")
+
+    templated = None
+    if cfg.get("symbolic_drafting", False):
+        if schema_context is None:
+            raise ValueError("symbolic_drafting=true requires an ontology context to resolve boilerplate terms.")
+        templated = TemplateCompiler(schema_context, base_ns).compile(llm_requirements)
+        llm_requirements = templated.remaining
+        print(f"Templated {len(templated.handled)} requirements; {len(llm_requirements)} go to the LLM.")
+    # Every policy drafts the same requirements, so later policies (and reruns) reuse the memo.
+    memo = DraftMemo.open(draft_fingerprint(llm.fingerprint(), schema_context)) if cfg.get("draft_memo") else None
+
+    if args.dry_run:
+        pending = memo.lookup(llm_requirements)[1] if memo is not None else llm_requirements
+        result = forecast_run(args, cfg, llm, pending, schema_context, stop_policies, iterations_cfg)
+        print(json.dumps(result, indent=2))
+        return
+
+    # Shared by every policy (and, through the cache directory, by later runs).
+    repair_memo = RepairMemo.open() if cfg.get("repair_memo") else None
+    local_repair = None
+    if cfg.get("local_repair") and validator is not None:
+        local_repair = PreRepairEngine(validator.shapes_graph)
+
+    # Beam repair applies each patch plan several ways and keeps the best-scoring result.
+    beam = None
+    if cfg.get("beam_width", 1) > 1 and validator is not None:
+        evaluator = BeamEvaluator(
+            PROJECT_ROOT / cfg["shapes_path"],
+            PROJECT_ROOT / cfg["competency_questions"] if cfg.get("competency_questions") else None,
+            reasoning=cfg.get("reasoning", True),
+            workers=cfg.get("beam_workers"),
+            engine=shacl_engine,
+        )
+        beam = BeamRepair(llm, assembler, evaluator, cfg["beam_width"], base_ns)
+
+    def _run_policy(policy: str, output_root: Path, ledger: CallLedger) -> None:
         state = assembler.bootstrap()
         iter_dir = output_root / "iter0"
         ensure_dir(iter_dir)
 
+        def _generate(item):
+            index, batch = item
+            ledger_call = llm_call("generate_axioms", batch_id=f"batch-{index}", requirements=len(batch))
+            with span("llm.generate_axioms", requirements=len(batch)), ledger_call as call:
+                response = llm.generate_axioms(batch, schema_context=schema_context)
+                call.finish(response)
+                return response
+
+        if templated is not None and templated.response is not None:
+            assembler.add_response(state, templated.response)
+        draft_requirements = llm_requirements
+        if memo is not None:
+            cached, draft_requirements = memo.lookup(llm_requirements)
+            ledger.record_cache_hits("generate_axioms", len(llm_requirements) - len(draft_requirements))
+            assembler.add_triples(state, cached)
         chunk_size = cfg.get("requirements_chunk_size", 5)
-        for batch in chunk_requirements(requirements, size=chunk_size):
-            response = llm.generate_axioms(batch, schema_context=schema_context)
+        batches = list(chunk_requirements(draft_requirements, size=chunk_size))
+        scheduler = getattr(llm, "scheduler", None)
+        items = list(enumerate(batches))
+        responses = scheduler.map_ordered(_generate, items) if scheduler else map(_generate, items)
+        for batch, response in zip(batches, responses):
             try:
-                assembler.add_turtle(state, response.turtle)
+                if memo is not None:
+                    memo.store(batch, assembler.response_triples(response), response.attribution)
+                assembler.add_response(state, response)
             except ValueError as exc:
                 (iter_dir / "llm_error.txt").write_text(
                     "Draft generation failed to parse LLM Turtle.\n"
@@ -253,6 +454,7 @@ def main() -> None:
                         "iterations": iterations_cfg,
                         "min_patch_iterations": min_patch_iterations,
                         "requirements_chunk_size": cfg.get("requirements_chunk_size", 5),
+                        "symbolic_drafting": templated is not None,
                         "use_ontology_context": bool(ontology_context_path),
                         "ontology_context_path": str(ontology_context_path) if ontology_context_path else None,
                         "gold_path": str(gold_path),
@@ -269,6 +471,8 @@ def main() -> None:
                 print(f"[{policy}] Aborted at draft due to Turtle parse error. See {iter_dir / 'llm_error.txt'}")
                 return
 
+        if clusters is not None:
+            clusters.expand_provenance(state.graph, base_ns)
         assembler.serialize(state, iter_dir / "pred.ttl")
 
         repair_log: dict = {
@@ -277,6 +481,8 @@ def main() -> None:
                 "iterations": iterations_cfg,
                 "min_patch_iterations": min_patch_iterations,
                 "requirements_chunk_size": cfg.get("requirements_chunk_size", 5),
+                "symbolic_drafting": templated is not None,
+                "deduplication": clusters.to_dict() if clusters is not None else None,
                 "use_ontology_context": bool(ontology_context_path),
                 "ontology_context_path": str(ontology_context_path) if ontology_context_path else None,
                 "gold_path": str(gold_path),
@@ -285,57 +491,67 @@ def main() -> None:
                 "reasoning": cfg.get("reasoning", True),
                 "stop_policy": policy,
                 "use_soft_violations": use_soft_violations,
+                "beam_width": cfg.get("beam_width", 1),
+                "repair_memo": repair_memo is not None,
+                "local_repair": local_repair is not None,
             },
             "iterations": {},
         }
         previous_patches = None
+        apply_span = None
         current_iter = 0
         cq_pass_rate = 0.0
         patch_iterations = 0
+        # Results before the last repair and the triples it inserted, for the repair memo to learn from.
+        memo_before = None
 
         while True:
-            triples_before_reasoning = len(state.graph)
-            reasoning_result = reasoner.run(state.graph)
-            patch_sources: list[str] = []
-
-            def _patch_key(patch) -> tuple[str | None, str | None, str | None]:
-                if hasattr(patch, "subject"):
-                    return (patch.subject, patch.predicate, patch.object)
-                if isinstance(patch, dict):
-                    return (patch.get("subject"), patch.get("predicate"), patch.get("object"))
-                return (None, None, None)
-
-            if cfg.get("validation", True):
-                if validator is None:
-                    raise RuntimeError("Validation enabled but SHACL validator is not configured.")
-                shacl_report = validator.validate(reasoning_result.expanded_graph)
-                summary = summarize_shacl_report(shacl_report)
-                save_shacl_report(shacl_report, iter_dir / "shacl_report.ttl")
-                patches = shacl_report_to_patches(
-                    shacl_report, include_soft_if_no_hard=bool(use_soft_violations)
-                )
+            with span("e4.evaluate", iteration=current_iter) as evaluate_span:
+                triples_before_reasoning = len(state.graph)
+                reasoning_result = reasoner.run(state.graph)
+                patch_sources: list[str] = []
+
+                def _patch_key(patch) -> tuple[str | None, str | None, str | None]:
+                    if hasattr(patch, "subject"):
+                        return (patch.subject, patch.predicate, patch.object)
+                    if isinstance(patch, dict):
+                        return (patch.get("subject"), patch.get("predicate"), patch.get("object"))
+                    return (None, None, None)
+
+                if cfg.get("validation", True):
+                    if validator is None:
+                        raise RuntimeError("Validation enabled but SHACL validator is not configured.")
+                    shacl_report = validator.validate(reasoning_result.expanded_graph)
+                    summary = summarize_shacl_report(shacl_report)
+                    if repair_memo is not None and memo_before is not None:
+                        before_results, added = memo_before
+                        repair_memo.observe(before_results, shacl_report.results, added)
+                    save_shacl_report(shacl_report, iter_dir / "shacl_report.ttl")
+                    patches = shacl_report_to_patches(
+                        shacl_report, include_soft_if_no_hard=bool(use_soft_violations)
+                    )
+                    if patches:
+                        patch_sources.append("shacl")
+                else:
+                    shacl_report = None
+                    summary = {"total": 0, "violations": {"hard": 0, "soft": 0}}
+                    patches = []
+                    (iter_dir / "shacl_report.ttl").write_text("Validation disabled for this run.\n", encoding="utf-8")
+
+                cq_results = cq_runner.run(reasoning_result.expanded_graph) if cq_runner else []
+                cq_pass_rate = (sum(1 for res in cq_results if res.success) / len(cq_results)) if cq_results else 0.0
+                cq_patches = cq_results_to_patches(cq_results) if cq_results else []
+                if cq_patches:
+                    patch_sources.append("competency_questions")
                 if patches:
-                    patch_sources.append("shacl")
-            else:
-                shacl_report = None
-                summary = {"total": 0, "violations": {"hard": 0, "soft": 0}}
-                patches = []
-                (iter_dir / "shacl_report.ttl").write_text("Validation disabled for this run.\n", encoding="utf-8")
-
-            cq_results = cq_runner.run(reasoning_result.expanded_graph) if cq_runner else []
-            cq_pass_rate = (sum(1 for res in cq_results if res.success) / len(cq_results)) if cq_results else 0.0
-            cq_patches = cq_results_to_patches(cq_results) if cq_results else []
-            if cq_patches:
-                patch_sources.append("competency_questions")
-            if patches:
-                existing = {_patch_key(p) for p in patches}
-                for patch in cq_patches:
-                    key = _patch_key(patch)
-                    if key not in existing:
-                        patches.append(patch)
-                        existing.add(key)
-            else:
-                patches = cq_patches
+                    existing = {_patch_key(p) for p in patches}
+                    for patch in cq_patches:
+                        key = _patch_key(patch)
+                        if key not in existing:
+                            patches.append(patch)
+                            existing.add(key)
+                else:
+                    patches = cq_patches
 
             save_patch_plan(patches, iter_dir / "patches.json")
 
@@ -380,6 +596,10 @@ def main() -> None:
                 reasoning_result=reasoning_result,
                 triples_before_reasoning=triples_before_reasoning,
                 stop_decision=stop_decision,
+                performance={
+                    "apply_patches": apply_span.to_dict() if apply_span else None,
+                    "evaluate": evaluate_span.to_dict(),
+                },
             )
             repair_log["iterations"][f"iter{current_iter}"] = iteration_log
 
@@ -391,13 +611,68 @@ def main() -> None:
             next_dir = output_root / f"iter{next_iter}"
             ensure_dir(next_dir)
 
-            context_ttl = state.graph.serialize(format="turtle")
-            patch_response = llm.apply_patches([p.to_dict() for p in patches], context_ttl)
-
-            next_state = assembler.bootstrap()
-            assembler.add_turtle(next_state, context_ttl)
+            with span("e4.apply_patches", iteration=next_iter, patches=len(patches)) as apply_span:
+                llm_patches = patches
+                if shacl_report is not None and (local_repair is not None or repair_memo is not None):
+                    residual = shacl_report.results
+                    added: list = []
+                    if local_repair is not None:
+                        local = local_repair.repair(state.graph, residual)
+                        residual = local.residual
+                        added.extend(local.added)
+                        apply_span.set(local_fixes=len(shacl_report.results) - len(residual))
+                        repair_log["iterations"][f"iter{current_iter}"]["local_repair"] = local.to_dict()
+                    if repair_memo is not None:
+                        memo_before = (residual, added)
+                        memo_triples, residual = repair_memo.apply(residual)
+                        added.extend(triple for triple in memo_triples if triple not in state.graph)
+                        assembler.add_triples(state, memo_triples)
+                        ledger.record_cache_hits(
+                            "apply_patches", len(memo_before[0]) - len(residual), batch_id=f"iter{next_iter}-memo"
+                        )
+                        apply_span.set(memo_triples=len(memo_triples))
+                    if len(residual) < len(shacl_report.results):
+                        # Violations fixed locally are dropped; the rest (and CQ patches) go to the LLM.
+                        residual_report = dataclasses.replace(shacl_report, results=residual)
+                        residual_keys = {
+                            _patch_key(patch)
+                            for patch in shacl_report_to_patches(residual_report, bool(use_soft_violations))
+                        }
+                        llm_patches = [p for p in patches if p.severity == "CQ" or _patch_key(p) in residual_keys]
+                    apply_span.set(llm_patches=len(llm_patches))
+                if not llm_patches or (beam is None and _patches_in_place(llm)):
+                    # Patch the current graph in place: no Turtle round trip, and the
+                    # response only carries the (already added) delta.
+                    next_state = state
+                    patch_response = GraphResponse("All patches applied locally", triples=[])
+                    if llm_patches:
+                        ledger_call = llm_call("apply_patches", batch_id=f"iter{next_iter}")
+                        with span("llm.apply_patches"), ledger_call as call:
+                            patch_response = llm.patch_graph([p.to_dict() for p in llm_patches], state.graph)
+                            call.finish(patch_response)
+                else:
+                    context_ttl = state.graph.serialize(format="turtle")
+                    if beam is not None:
+                        patch_response, candidates = beam.step(llm_patches, context_ttl, label=f"iter{next_iter}")
+                        beam_log = [candidate.to_dict() for candidate in candidates]
+                        (next_dir / "beam_candidates.json").write_text(json.dumps(beam_log, indent=2), encoding="utf-8")
+                        repair_log["iterations"][f"iter{current_iter}"]["beam"] = beam_log
+                    else:
+                        ledger_call = llm_call("apply_patches", batch_id=f"iter{next_iter}")
+                        with span("llm.apply_patches"), ledger_call as call:
+                            patch_response = llm.apply_patches([p.to_dict() for p in llm_patches], context_ttl)
+                            call.finish(patch_response)
+
+                    next_state = assembler.bootstrap()
+                    assembler.add_turtle(next_state, context_ttl)
             try:
-                assembler.add_turtle(next_state, patch_response.turtle)
+                if repair_memo is not None and memo_before is not None:
+                    patch_triples = assembler.response_triples(patch_response)
+                    if next_state is not state:
+                        # A rebuilt state re-emits the old graph; keep only what the patch added.
+                        patch_triples = [triple for triple in patch_triples if triple not in state.graph]
+                    memo_before[1].extend(patch_triples)
+                assembler.add_response(next_state, patch_response)
             except ValueError as exc:
                 (next_dir / "llm_error.txt").write_text(
                     "Patch application failed to parse LLM Turtle.\n"
@@ -407,9 +682,10 @@ def main() -> None:
                 fallback_notes = ["llm_patch_parse_error"]
                 try:
                     fallback_llm = HeuristicLLM(base_ns)
-                    fallback_response = fallback_llm.apply_patches([p.to_dict() for p in patches], context_ttl)
-                    assembler.add_turtle(next_state, fallback_response.turtle)
+                    fallback_response = fallback_llm.patch_graph([p.to_dict() for p in llm_patches], next_state.graph)
                     fallback_notes.append("fallback_heuristic_patch_applied")
+                    if repair_memo is not None and memo_before is not None:
+                        memo_before[1].extend(fallback_response.triples)
                     (next_dir / "fallback_patch.ttl").write_text(fallback_response.turtle, encoding="utf-8")
                 except Exception as fallback_exc:  # pragma: no cover - defensive guard
                     fallback_notes.append(f"fallback_failed: {fallback_exc}")
@@ -477,7 +753,7 @@ def main() -> None:
         ensure_dir(final_dir)
         assembler.serialize(state, final_dir / "pred.ttl")
 
-        gold_graph = Graph().parse(gold_path)
+        gold_graph = load_graph(gold_path)
         metrics_payload = final_metrics(reasoning_result.expanded_graph, gold_graph)
         (final_dir / "metrics_exact.json").write_text(json.dumps(metrics_payload["exact"], indent=2), encoding="utf-8")
         (final_dir / "metrics_semantic.json").write_text(json.dumps(metrics_payload["semantic"], indent=2), encoding="utf-8")
@@ -499,6 +775,32 @@ def main() -> None:
 
         print(f"[{policy}] E4 run complete. Outputs written to {output_root}")
 
+    def run_single(policy: str, output_root: Path) -> None:
+        tracer = Tracer()
+        ledger = CallLedger()
+        with tracer.activate(), ledger.activate(), span("e4.run", policy=policy):
+            _run_policy(policy, output_root, ledger)
+        if beam is not None:
+            beam.evaluator.close()
+        ledger.write_ndjson(output_root / "llm_calls.ndjson")
+        repair_log_path = output_root / "repair_log.json"
+        if repair_log_path.exists():
+            repair_log = json.loads(repair_log_path.read_text(encoding="utf-8"))
+            repair_log["performance"] = tracer.to_report()
+            repair_log["performance"]["llm_calls"] = ledger.summary()
+            scheduler = getattr(llm, "scheduler", None)
+            if scheduler is not None:
+                repair_log["performance"]["llm_scheduler"] = scheduler.snapshot()
+            if isinstance(llm, RoutedLLM):
+                repair_log["performance"]["llm_routing"] = llm.stats.to_dict()
+            if memo is not None:
+                repair_log["performance"]["draft_memo"] = memo.stats.to_dict()
+            if repair_memo is not None:
+                repair_log["performance"]["repair_memo"] = repair_memo.stats.to_dict()
+            repair_log_path.write_text(json.dumps(repair_log, indent=2), encoding="utf-8")
+        if args.trace:
+            tracer.export_chrome_trace(output_root / "trace.json")
+
     for policy in stop_policies:
         policy_output_root = output_root_base
         if len(stop_policies) > 1:
@@ -14,6 +14,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from og_nsd import OntologyDraftingPipeline, PipelineConfig  # noqa: E402
+from og_nsd.graphs import load_graph  # noqa: E402
 from og_nsd.metrics import compute_exact_metrics, compute_semantic_metrics  # noqa: E402
 from og_nsd.shacl import summarize_shacl_report  # noqa: E402
 
@@ -66,6 +67,7 @@ def run_domain(name: str, cfg_path: Path, output_root: Path | None, llm_mode_ove
         use_ontology_context=cfg.get("use_ontology_context", True),
         grounding_ontology_path=PROJECT_ROOT / cfg["ontology_path"] if cfg.get("ontology_path") else None,
         base_namespace=cfg.get("base_namespace", "http://lod.csd.auth.gr/atm/atm.ttl#"),
+        heuristic_lexicon_path=PROJECT_ROOT / cfg["heuristic_lexicon"] if cfg.get("heuristic_lexicon") else None,
     )
 
     pipeline = OntologyDraftingPipeline(pipeline_config)
@@ -86,7 +88,7 @@ def run_domain(name: str, cfg_path: Path, output_root: Path | None, llm_mode_ove
         encoding="utf-8",
     )
     (resolved_output_root / "metrics_semantic.json").write_text(
-        json.dumps(compute_semantic_metrics(data_graph, Graph().parse(gold_path)), indent=2),
+        json.dumps(compute_semantic_metrics(data_graph, load_graph(gold_path)), indent=2),
         encoding="utf-8",
     )
 
@@ -14,6 +14,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from og_nsd import OntologyDraftingPipeline, PipelineConfig  # noqa: E402
+from og_nsd.graphs import load_graph  # noqa: E402
 from og_nsd.metrics import compute_exact_metrics, compute_semantic_metrics  # noqa: E402
 from og_nsd.shacl import summarize_shacl_report  # noqa: E402
 
@@ -82,7 +83,7 @@ def main() -> None:
         encoding="utf-8",
     )
     (output_root / "metrics_semantic.json").write_text(
-        json.dumps(compute_semantic_metrics(data_graph, Graph().parse(gold_path)), indent=2),
+        json.dumps(compute_semantic_metrics(data_graph, load_graph(gold_path)), indent=2),
         encoding="utf-8",
     )
 
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Serve recorded LLM responses on a local OpenAI-compatible endpoint.
+
+Replay (default)::
+
+    python scripts/run_mock_llm_server.py --cassette runs/cassettes/atm.json --latency lognormal --mean 2.5 --stddev 1.0
+
+Record against the real API (requests are forwarded and saved)::
+
+    python scripts/run_mock_llm_server.py --cassette runs/cassettes/atm.json --record
+
+Then point any experiment script at it::
+
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=mock python scripts/run_e4_iterative.py
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from og_nsd.mock_llm import (  # noqa: E402
+    LATENCY_DISTRIBUTIONS,
+    MISS_POLICIES,
+    Cassette,
+    FaultInjection,
+    LatencyModel,
+    MockLLMServer,
+    ThroughputLimits,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run a local mock of the OpenAI chat.completions API")
+    parser.add_argument("--cassette", type=Path, help="Cassette JSON to replay from (or record into)")
+    parser.add_argument("--record", action="store_true", help="Forward requests upstream and record the responses")
+    parser.add_argument("--upstream", default="https://api.openai.com/v1", help="Upstream base URL in record mode")
+    parser.add_argument("--on-miss", choices=MISS_POLICIES, default="kind", help="Replay fallback for unrecorded requests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=0)
+    latency = parser.add_argument_group("latency")
+    latency.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="none")
+    latency.add_argument("--mean", type=float, default=0.0, help="Mean latency in seconds (fixed/normal/lognormal)")
+    latency.add_argument("--stddev", type=float, default=0.0)
+    latency.add_argument("--min", dest="min_s", type=float, default=0.0, help="Uniform lower bound")
+    latency.add_argument("--max", dest="max_s", type=float, default=0.0, help="Uniform upper bound")
+    latency.add_argument("--per-token", type=float, default=0.0, help="Extra seconds per completion token")
+    faults = parser.add_argument_group("fault injection")
+    faults.add_argument("--rate-429", type=float, default=0.0, help="Probability of an injected 429")
+    faults.add_argument("--rate-5xx", type=float, default=0.0, help="Probability of an injected 500/502/503")
+    faults.add_argument("--rate-timeout", type=float, default=0.0, help="Probability of hanging and dropping the connection")
+    faults.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with injected 429s")
+    faults.add_argument("--hang", type=float, default=30.0, help="Seconds to hang before dropping a timed-out request")
+    limits = parser.add_argument_group("throughput limits")
+    limits.add_argument("--rpm", type=float, help="Requests per minute before 429s")
+    limits.add_argument("--tpm", type=float, help="Tokens per minute before 429s")
+    limits.add_argument("--max-concurrency", type=int, help="In-flight requests served at once (others queue)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.record and args.cassette is None:
+        raise SystemExit("--record needs --cassette to write to")
+    cassette = Cassette.load(args.cassette) if args.cassette else Cassette()
+    server = MockLLMServer(
+        cassette,
+        mode="record" if args.record else "replay",
+        upstream=args.upstream if args.record else None,
+        on_miss=args.on_miss,
+        latency=LatencyModel(
+            distribution=args.latency,
+            mean_s=args.mean,
+            stddev_s=args.stddev,
+            min_s=args.min_s,
+            max_s=args.max_s,
+            per_token_s=args.per_token,
+        ),
+        faults=FaultInjection(
+            rate_limit_rate=args.rate_429,
+            server_error_rate=args.rate_5xx,
+            timeout_rate=args.rate_timeout,
+            retry_after_s=args.retry_after,
+            hang_s=args.hang,
+        ),
+        limits=ThroughputLimits(
+            requests_per_minute=args.rpm,
+            tokens_per_minute=args.tpm,
+            max_concurrency=args.max_concurrency,
+        ),
+        seed=args.seed,
+        host=args.host,
+        port=args.port,
+    )
+    mode = "recording" if args.record else f"replaying {len(cassette)} interaction(s)"
+    print(f"Mock LLM server {mode} at {server.url}")
+    print(f"  export OPENAI_BASE_URL={server.url} OPENAI_API_KEY=${{OPENAI_API_KEY:-mock}}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(asdict(server.stats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from og_nsd import OntologyDraftingPipeline, PipelineConfig
+from og_nsd.shacl import SHACL_ENGINES
 
 
 def parse_args() -> tuple[argparse.ArgumentParser, argparse.Namespace]:
@@ -28,6 +29,69 @@ def parse_args() -> tuple[argparse.ArgumentParser, argparse.Namespace]:
     parser.add_argument("--reasoning", action="store_true", help="Enable owlready2 reasoning (requires Pellet)")
     parser.add_argument("--iterations", type=int, default=2, help="Maximum repair iterations")
     parser.add_argument("--temperature", type=float, default=0.2, help="LLM sampling temperature")
+    parser.add_argument("--model", default="gpt-5.2", help="OpenAI model for drafting and repair")
+    parser.add_argument(
+        "--fast-model",
+        help="Cheaper model (or 'heuristic') for easy drafting batches; failed drafts escalate to --model",
+    )
+    parser.add_argument(
+        "--route-threshold",
+        type=float,
+        default=0.5,
+        help="Batches with a difficulty score below this go to --fast-model (0-1)",
+    )
+    parser.add_argument(
+        "--lexicon",
+        type=Path,
+        help="Keyword lexicon JSON for the heuristic model (defaults to the built-in ATM terms)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream OpenAI responses and parse Turtle statements as they arrive",
+    )
+    parser.add_argument(
+        "--stream-budget",
+        type=int,
+        help="Abort a streamed response after roughly this many completion tokens",
+    )
+    parser.add_argument(
+        "--symbolic-drafting",
+        action="store_true",
+        help="Draft well-formed boilerplate requirements from templates and send only the rest to the LLM",
+    )
+    parser.add_argument(
+        "--dedup-threshold",
+        type=float,
+        help="Draft one representative per cluster of near-duplicate requirements (shingle Jaccard, e.g. 0.8)",
+    )
+    parser.add_argument(
+        "--memo",
+        action="store_true",
+        help="Reuse per-requirement drafts from earlier runs and only draft new or changed requirements",
+    )
+    parser.add_argument(
+        "--repair-memo",
+        action="store_true",
+        help="Reapply repairs that resolved the same SHACL violation before and only send the rest to the LLM",
+    )
+    parser.add_argument(
+        "--local-repair",
+        action="store_true",
+        help="Fix class, datatype and min-count violations with local rules and only send the rest to the LLM",
+    )
+    parser.add_argument(
+        "--shacl-engine",
+        choices=SHACL_ENGINES,
+        default="native",
+        help="SHACL validator: the built-in SHACL Core engine (falls back to pyshacl when needed) or pyshacl",
+    )
+    parser.add_argument(
+        "--shacl-workers",
+        type=int,
+        default=1,
+        help="Shard large native SHACL validations across this many processes",
+    )
     parser.add_argument(
         "--use-ontology-context",
         action="store_true",
@@ -44,7 +108,18 @@ def parse_args() -> tuple[argparse.ArgumentParser, argparse.Namespace]:
         help="Stop after the initial LLM draft and write the raw ontology without validation or repair",
     )
     parser.add_argument("--dev-split", type=Path, help="Optional file containing dev requirement IDs")
+    parser.add_argument(
+        "--few-shot-k", type=int, default=3, help="Most similar dev exemplars to include per drafting batch"
+    )
+    parser.add_argument(
+        "--few-shot-budget",
+        type=int,
+        default=1200,
+        help="Approximate token budget for the few-shot exemplars of one batch",
+    )
     parser.add_argument("--test-split", type=Path, help="Optional file containing test requirement IDs")
+    parser.add_argument("--trace", type=Path, help="Optional Chrome-trace JSON path for per-stage timings")
+    parser.add_argument("--call-log", type=Path, help="Optional NDJSON path recording every LLM call")
     args = parser.parse_args()
     return parser, args
 
@@ -65,11 +140,28 @@ def main() -> None:
         reasoning_enabled=args.reasoning,
         max_iterations=args.iterations,
         llm_temperature=args.temperature,
+        llm_model=args.model,
+        llm_fast_model=args.fast_model,
+        llm_route_threshold=args.route_threshold,
+        heuristic_lexicon_path=args.lexicon,
+        llm_streaming=args.stream,
+        llm_stream_budget_tokens=args.stream_budget,
+        symbolic_drafting=args.symbolic_drafting,
+        draft_memo=args.memo,
+        repair_memo=args.repair_memo,
+        local_repair=args.local_repair,
+        shacl_engine=args.shacl_engine,
+        shacl_workers=args.shacl_workers,
+        dedup_threshold=args.dedup_threshold,
         draft_only=args.draft_only,
         use_ontology_context=args.use_ontology_context,
         grounding_ontology_path=args.ontology_context,
         dev_split_path=args.dev_split,
+        few_shot_k=args.few_shot_k,
+        few_shot_token_budget=args.few_shot_budget,
         test_split_path=args.test_split,
+        trace_path=args.trace,
+        llm_call_log_path=args.call_log,
     )
     pipeline = OntologyDraftingPipeline(config)
     report = pipeline.run()
@@ -79,6 +171,8 @@ def main() -> None:
                 return f"conforms={value.get('conforms')} ({len(value.get('results', []))} results)"
             if key == "reasoner":
                 return f"consistent={value.get('consistent')}"
+            if key == "performance":
+                return f"wall={value.get('wall_s', 0.0):.2f}s ({len(value.get('stages', {}))} stages)"
             return ", ".join(value.keys())
         if isinstance(value, list):
             if key == "competency_questions" and value:
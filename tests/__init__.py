@@ -0,0 +1,10 @@
+"""Test package setup: keep every on-disk cache inside a per-run temporary directory."""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+_CACHE_DIR = tempfile.mkdtemp(prefix="og_nsd-tests-")
+os.environ["OG_NSD_CACHE_DIR"] = _CACHE_DIR
+atexit.register(shutil.rmtree, _CACHE_DIR, ignore_errors=True)
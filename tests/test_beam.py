@@ -0,0 +1,113 @@
+"""Unit tests for speculative (beam) patch application."""
+
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from og_nsd.beam import BeamEvaluator, BeamRepair, propose_candidates
+from og_nsd.llm import HeuristicLLM, LLMClient, LLMResponse, OpenAILLM
+from og_nsd.ontology import OntologyAssembler
+from og_nsd.repair import Patch
+from og_nsd.routing import ModelTier, RoutedLLM
+
+ATM_NS = "http://lod.csd.auth.gr/atm/atm.ttl#"
+_SHAPES = """
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix ex: <http://example.org/shapes#> .
+
+ex:LabelledClassShape a sh:NodeShape ;
+    sh:targetClass owl:Class ;
+    sh:property [ sh:path rdfs:label ; sh:minCount 1 ] .
+"""
+_CONTEXT = """
+@prefix atm: <http://lod.csd.auth.gr/atm/atm.ttl#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+atm:ATM a owl:Class .
+"""
+_LABEL_PATCH = Patch("addTriple", "atm:ATM", "rdfs:label", "ATM", "Less than 1 values on atm:ATM->rdfs:label",
+                     "LabelledClassShape", "Violation")
+_CQ_PATCH = Patch("addTriple", "atm:ATM", "atm:dispenses", "atm:Cash", "CQ failed", None, "CQ")
+
+
+class _StandIn(LLMClient):
+    """Local stand-in model answering every patch request with fixed Turtle."""
+
+    def __init__(self, turtle: str) -> None:
+        self.turtle = turtle
+        self.calls = 0
+
+    def generate_axioms(self, requirements, schema_context=None, exemplars=None) -> LLMResponse:
+        raise NotImplementedError
+
+    def generate_patch(self, prompts, context_ttl) -> LLMResponse:
+        raise NotImplementedError
+
+    def apply_patches(self, patches, context_ttl) -> LLMResponse:
+        self.calls += 1
+        return LLMResponse(turtle=self.turtle, reasoning_notes="stand-in")
+
+
+class ProposeCandidatesTests(unittest.TestCase):
+    def test_structural_candidates_then_temperature_resamples(self) -> None:
+        patches = [_LABEL_PATCH, _CQ_PATCH]
+        heuristic = propose_candidates(HeuristicLLM(ATM_NS), patches, width=5, base_namespace=ATM_NS)
+        self.assertEqual(["llm", "llm_shacl_only", "llm_cq_only"], [c.name for c in heuristic])
+        self.assertEqual([[_LABEL_PATCH], [_CQ_PATCH]], [c.patches for c in heuristic[1:]])
+
+        with patch.dict("os.environ", {"OPENAI_API_KEY": "test"}):
+            llm = OpenAILLM(model="mock")
+        candidates = propose_candidates(llm, patches, width=5, base_namespace=ATM_NS)
+        names = ["llm", "heuristic", "llm_shacl_only", "llm_cq_only", "llm_t0.4"]
+        self.assertEqual(names, [c.name for c in candidates])
+        self.assertEqual(0.4, candidates[-1].llm.temperature)
+        self.assertIs(llm.scheduler, candidates[-1].llm.scheduler)
+        self.assertEqual(0.1, llm.temperature)
+        self.assertEqual(["llm"], [c.name for c in propose_candidates(llm, patches, 1, ATM_NS)])
+
+    def test_routed_llm_resamples_its_strong_openai_tier(self) -> None:
+        with patch.dict("os.environ", {"OPENAI_API_KEY": "test"}):
+            strong = OpenAILLM(model="mock")
+        routed = RoutedLLM([ModelTier("fast", HeuristicLLM(ATM_NS), max_difficulty=0.5), ModelTier("strong", strong)])
+        candidates = propose_candidates(routed, [_LABEL_PATCH], width=3, base_namespace=ATM_NS)
+        self.assertEqual(["llm", "heuristic", "llm_t0.4"], [c.name for c in candidates])
+        self.assertIsInstance(candidates[-1].llm, OpenAILLM)
+        self.assertEqual(0.4, candidates[-1].llm.temperature)
+
+
+class BeamRepairTests(unittest.TestCase):
+    def _step(self, turtle: str, workers: int) -> tuple:
+        llm = _StandIn(turtle)
+        assembler = OntologyAssembler(None, base_namespace=ATM_NS)
+        with TemporaryDirectory() as tmpdir:
+            shapes = Path(tmpdir) / "shapes.ttl"
+            shapes.write_text(_SHAPES, encoding="utf-8")
+            with BeamEvaluator(shapes, workers=workers) as evaluator:
+                beam = BeamRepair(llm, assembler, evaluator, width=2, base_namespace=ATM_NS)
+                response, candidates = beam.step([_LABEL_PATCH], _CONTEXT, label="iter1")
+        self.assertEqual(1, llm.calls)
+        return response, candidates
+
+    def test_keeps_the_candidate_with_fewest_hard_violations(self) -> None:
+        worse = "@prefix atm: <http://lod.csd.auth.gr/atm/atm.ttl#> .\natm:Extra a owl:Class ."
+        for workers in (2, 1):
+            response, candidates = self._step(worse, workers)
+            log = json.loads(json.dumps([candidate.to_dict() for candidate in candidates]))
+
+            self.assertIs(candidates[1].response, response)
+            self.assertEqual([2, 0], [entry["score"]["hard"] for entry in log])
+
+    def test_unparseable_candidates_are_dropped(self) -> None:
+        response, candidates = self._step("atm:ATM a {{ broken", workers=1)
+
+        self.assertIs(candidates[1].response, response)
+        self.assertIsNotNone(candidates[0].error)
+        # A single survivor is returned without scoring; the repair loop evaluates it.
+        self.assertIsNone(candidates[1].score)
+
+
+if __name__ == "__main__":
+    unittest.main()
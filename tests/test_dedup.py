@@ -0,0 +1,81 @@
+"""Unit tests for near-duplicate requirement detection."""
+
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from rdflib import Graph, Literal, Namespace
+
+from og_nsd.config import PipelineConfig
+from og_nsd.dedup import MinHasher, find_near_duplicates, jaccard, shingles
+from og_nsd.pipeline import OntologyDraftingPipeline
+from og_nsd.requirements import Requirement
+
+ATM = Namespace("http://lod.csd.auth.gr/atm/atm.ttl#")
+
+_TEXTS = {
+    "R1": "If the cash card is valid, the ATM shall send the serial number and bank code to the bank computer.",
+    "R2": "The customer shall maintain an account with the bank.",
+    "R3": "If the cash card is valid the ATM shall send the serial number and the bank code to the bank computer!",
+    "R4": "If the cash card is invalid, the ATM shall eject the card and display an error message.",
+    "R5": "The Customer shall maintain an account with the bank.",
+}
+
+
+def _requirements() -> list[Requirement]:
+    return [Requirement(rid, rid, text, None, None, None, None) for rid, text in _TEXTS.items()]
+
+
+class NearDuplicateTests(unittest.TestCase):
+    def test_clusters_near_duplicates_under_first_requirement(self) -> None:
+        clusters = find_near_duplicates(_requirements(), threshold=0.8)
+        self.assertEqual(["R1", "R2", "R4"], [req.identifier for req in clusters.representatives])
+        self.assertEqual({"R1": ["R3"], "R2": ["R5"]}, clusters.members)
+        self.assertEqual(2, clusters.duplicates)
+
+    def test_threshold_keeps_distinct_requirements_apart(self) -> None:
+        self.assertLess(jaccard(shingles(_TEXTS["R1"]), shingles(_TEXTS["R4"])), 0.3)
+        clusters = find_near_duplicates(_requirements(), threshold=1.0)
+        self.assertEqual(["R2"], list(clusters.members))
+
+    def test_minhash_signatures_are_deterministic(self) -> None:
+        shingle_set = shingles(_TEXTS["R1"])
+        self.assertEqual(MinHasher().signature(shingle_set), MinHasher().signature(shingle_set))
+        self.assertEqual(16, len(MinHasher().band_keys(MinHasher().signature(shingle_set))))
+
+    def test_expand_provenance_copies_representative_annotations(self) -> None:
+        clusters = find_near_duplicates(_requirements(), threshold=0.8)
+        graph = Graph()
+        graph.add((ATM.ATM_sends_Message, ATM.sourceRequirement, Literal("R1")))
+        self.assertEqual(1, clusters.expand_provenance(graph, str(ATM)))
+        self.assertIn((ATM.ATM_sends_Message, ATM.sourceRequirement, Literal("R3")), graph)
+
+    def test_pipeline_drafts_representatives_only(self) -> None:
+        with TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            requirements = tmp_path / "reqs.jsonl"
+            requirements.write_text(
+                "\n".join(json.dumps({"id": rid, "text": text}) for rid, text in _TEXTS.items()), encoding="utf-8"
+            )
+            config = PipelineConfig(
+                requirements_path=requirements,
+                shapes_path=None,
+                base_ontology_path=None,
+                competency_questions_path=None,
+                output_path=tmp_path / "out.ttl",
+                draft_only=True,
+                dedup_threshold=0.8,
+                intermediate_dir=tmp_path / "build",
+            )
+            report = OntologyDraftingPipeline(config).run()
+            graph = Graph().parse(config.output_path)
+
+        self.assertEqual(3, report["performance"]["stages"]["draft"]["counts"]["requirements"])
+        self.assertEqual({"R1": ["R3"], "R2": ["R5"]}, report["deduplication"]["clusters"])
+        sources = {str(source) for source in graph.objects(None, ATM.sourceRequirement)}
+        self.assertEqual(set(_TEXTS), sources)
+
+
+if __name__ == "__main__":
+    unittest.main()
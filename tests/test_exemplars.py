@@ -0,0 +1,99 @@
+"""Unit tests for retrieval-based few-shot exemplar selection."""
+
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from og_nsd.config import PipelineConfig
+from og_nsd.exemplars import ExemplarIndex, render_exemplar, tokenize
+from og_nsd.llm import OpenAILLM
+from og_nsd.pipeline import OntologyDraftingPipeline
+from og_nsd.requirements import Requirement
+
+_AXIOMS = {"tbox": ["atm:CashCard a owl:Class ."]}
+
+
+def _requirement(identifier: str, text: str, main: str | None = None, axioms: dict | None = None) -> Requirement:
+    return Requirement(identifier, identifier, text, axioms, None, main, None, split="dev")
+
+
+_DEV = [
+    _requirement(
+        "D1", "The ATM shall eject the cash card.", "<System:ATM> SHALL <Function:eject> <Item:card>", _AXIOMS
+    ),
+    _requirement("D2", "The bank computer shall verify the password."),
+    _requirement("D3", "The customer shall withdraw money from the account."),
+    _requirement("D4", "The bank computer shall send a message to the ATM when the password is invalid."),
+]
+
+
+class ExemplarIndexTests(unittest.TestCase):
+    def test_tokenize_keeps_tag_values(self) -> None:
+        tokens = tokenize("<System:ATM> SHALL <Function:eject> the cash card")
+        self.assertEqual(["atm", "eject", "cash", "card"], tokens)
+
+    def test_selects_most_similar_exemplars(self) -> None:
+        index = ExemplarIndex(_DEV, k=2)
+        text = "If the password is wrong the bank computer shall reject it."
+        batch = [Requirement("R1", "R1", text, None, None, None, None)]
+        self.assertEqual(["D2", "D4"], [req.identifier for req in index.select(batch)])
+
+        batch = [Requirement("R2", "R2", "Eject the card.", None, None, None, None)]
+        self.assertEqual(["D1"], [req.identifier for req in index.select(batch)])
+
+    def test_never_selects_batch_members_or_exceeds_budget(self) -> None:
+        index = ExemplarIndex(_DEV, k=3)
+        self.assertNotIn("D2", [req.identifier for req in index.select([_DEV[1]])])
+
+        budget = len(render_exemplar(_DEV[3])) // 4
+        index = ExemplarIndex(_DEV, k=3, token_budget=budget)
+        batch = [Requirement("R1", "R1", "The bank computer shall verify the password.", None, None, None, None)]
+        self.assertEqual(["D2"], [req.identifier for req in index.select(batch)])
+
+    def test_prompt_renders_each_exemplar_once(self) -> None:
+        with patch.dict("os.environ", {"OPENAI_API_KEY": "test"}):
+            llm = OpenAILLM(model="mock")
+        first = llm._format_few_shot_examples(_DEV[:2])
+        self.assertEqual(
+            "FEW-SHOT EXAMPLES (dev only):\n[D1] The ATM shall eject the cash card.\natm:CashCard a owl:Class .\n---\n"
+            "[D2] The bank computer shall verify the password.",
+            first,
+        )
+        with patch("og_nsd.llm.render_exemplar") as render:
+            self.assertEqual(first, llm._format_few_shot_examples(_DEV[:2]))
+        render.assert_not_called()
+
+
+class PipelineExemplarTests(unittest.TestCase):
+    def test_batches_get_retrieved_exemplars_from_the_dev_split(self) -> None:
+        with TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            records = [{"id": req.identifier, "text": req.text} for req in _DEV]
+            # The dev requirements fill the first batch, so the last batch drafts T1 alone.
+            records.append({"id": "T0", "text": "The system shall keep a log."})
+            records.append({"id": "T1", "text": "The ATM shall eject an invalid cash card."})
+            requirements = tmp_path / "reqs.jsonl"
+            requirements.write_text("\n".join(json.dumps(record) for record in records), encoding="utf-8")
+            dev_split = tmp_path / "dev.txt"
+            dev_split.write_text("\n".join(req.identifier for req in _DEV), encoding="utf-8")
+            config = PipelineConfig(
+                requirements_path=requirements,
+                shapes_path=None,
+                base_ontology_path=None,
+                competency_questions_path=None,
+                output_path=tmp_path / "out.ttl",
+                draft_only=True,
+                dev_split_path=dev_split,
+                few_shot_k=1,
+                intermediate_dir=tmp_path / "build",
+            )
+            pipeline = OntologyDraftingPipeline(config)
+            pipeline.run()
+
+        self.assertEqual(["D1"], pipeline.last_llm_response.exemplar_ids)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""Unit tests for dry-run cost and time forecasts."""
+
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from og_nsd.forecast import (
+    CallProfile,
+    Phase,
+    PlannedCall,
+    expected_repair_calls,
+    fit_profiles,
+    forecast,
+    load_profiles,
+    plan_drafting,
+    plan_repairs,
+)
+from og_nsd.llm import OpenAILLM
+from og_nsd.requirements import Requirement
+
+
+def _record(kind: str, completion: int, latency: float, **extra) -> dict:
+    return {"kind": kind, "completion_tokens": completion, "latency_s": latency, "attempts": 1, **extra}
+
+
+class ProfileTests(unittest.TestCase):
+    def test_fits_latency_completions_and_calls_per_run(self) -> None:
+        records = [
+            _record("generate_axioms", 100, 1.5, requirements=1, prompt_tokens=400, cached_tokens=100),
+            _record("generate_axioms", 300, 2.5, requirements=3, prompt_tokens=600, cached_tokens=150),
+            _record("apply_patches", 1000, 6.0),
+            _record("apply_patches", 1000, 6.0),
+            {"kind": "generate_axioms", "requirements": 5, "cache_hit": True},
+        ]
+        profiles = fit_profiles(records, runs=2)
+
+        draft = profiles["generate_axioms"]
+        self.assertAlmostEqual(1.0, draft.base_latency_s)
+        self.assertAlmostEqual(0.005, draft.per_token_s)
+        self.assertAlmostEqual(100.0, draft.completion_per_requirement)
+        self.assertAlmostEqual(0.25, draft.cached_fraction)
+        self.assertEqual(1, expected_repair_calls("apply_patches", profiles, max_calls=3))
+        self.assertEqual(3, expected_repair_calls("generate_patch", profiles, max_calls=3))
+
+    def test_loads_call_logs(self) -> None:
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "llm_calls.ndjson"
+            path.write_text(json.dumps(_record("generate_patch", 50, 0.5)) + "\n", encoding="utf-8")
+            profiles = load_profiles([path])
+        self.assertEqual(1, profiles["generate_patch"].samples)
+        self.assertEqual(0, profiles["generate_axioms"].samples)
+
+
+class ForecastTests(unittest.TestCase):
+    def test_concurrency_shortens_only_concurrent_phases(self) -> None:
+        profiles = {
+            "generate_axioms": CallProfile(base_latency_s=10.0, per_token_s=0.0, completion_tokens=100.0),
+            "apply_patches": CallProfile(base_latency_s=5.0, per_token_s=0.0, completion_tokens=200.0),
+        }
+        phases = [
+            Phase("draft", [PlannedCall("generate_axioms", 1000) for _ in range(4)]),
+            Phase("repair", [PlannedCall("apply_patches", 500) for _ in range(2)], concurrent=False),
+        ]
+        result = forecast(phases, profiles, concurrency=[1, 2, 4], prices={"prompt": 1.0, "completion": 10.0})
+
+        self.assertEqual({"1": 50.0, "2": 30.0, "4": 20.0}, result["wall_s"])
+        self.assertEqual(6, result["calls"])
+        self.assertEqual(5000, result["prompt_tokens"])
+        self.assertEqual(800, result["completion_tokens"])
+        self.assertAlmostEqual((5000 * 1.0 + 800 * 10.0) / 1e6, result["cost_usd"])
+
+        limited = forecast(phases, profiles, concurrency=[4], requests_per_minute=6)
+        self.assertEqual({"4": 60.0}, limited["wall_s"])
+
+    def test_plans_the_prompts_the_run_would_send(self) -> None:
+        with patch.dict("os.environ", {"OPENAI_API_KEY": "test"}):
+            llm = OpenAILLM(model="mock")
+        batch = [Requirement("R1", "R1", "The ATM shall dispense cash.", None, None, None, None)]
+
+        def counter(text: str) -> int:
+            return len(text)
+
+        draft = plan_drafting(llm, [batch, batch], counter)
+        expected = sum(len(message["content"]) + 4 for message in llm.axiom_messages(batch))
+        self.assertEqual([expected, expected], [call.prompt_tokens for call in draft.calls])
+        self.assertEqual(1, draft.calls[0].requirements)
+
+        repairs = plan_repairs(llm, "apply_patches", 2, counter, context_chars=10000)
+        self.assertFalse(repairs.concurrent)
+        self.assertEqual(2, len(repairs.calls))
+        # The patch-application prompt truncates the ontology to 6000 characters.
+        self.assertLess(repairs.calls[0].prompt_tokens, 10000)
+
+
+if __name__ == "__main__":
+    unittest.main()
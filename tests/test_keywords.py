@@ -0,0 +1,62 @@
+"""Unit tests for heuristic keyword lexicons."""
+
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from og_nsd.keywords import ATM_LEXICON, KeywordMatcher, Lexicon
+from og_nsd.llm import HeuristicLLM
+from og_nsd.requirements import Requirement
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+class KeywordMatcherTests(unittest.TestCase):
+    def test_atm_lexicon_keeps_rule_priority(self) -> None:
+        matcher = KeywordMatcher(ATM_LEXICON)
+        self.assertEqual(
+            [
+                ("Customer", "Transaction", "logs"),
+                ("Bank", "CashCard", "verifies"),
+                ("ATM", "RequirementTarget", "relatesTo"),
+                ("ATM", "Account", "dispenses"),
+            ],
+            matcher.classify_batch(
+                [
+                    "The bank CUSTOMER shall log each transaction on the card.",
+                    "The bank shall verify the card.",
+                    "The ATM shall be available.",
+                    "The dispenser shall dispense cash for the account.",
+                ]
+            ),
+        )
+
+    def test_loads_domain_lexicon_from_json(self) -> None:
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "shop.json"
+            path.write_text(
+                json.dumps({"subject": {"Clerk's": "Clerk"}, "object": [["order", "Order"]], "defaults": {"subject": "Shop"}}),
+                encoding="utf-8",
+            )
+            lexicon = Lexicon.load(path)
+
+        matcher = KeywordMatcher(lexicon)
+        self.assertEqual("shop", lexicon.name)
+        self.assertEqual(("Clerk", "Order", "relatesTo"), matcher.classify("The clerk's terminal shall ship each ORDER."))
+        self.assertEqual(("Shop", "RequirementTarget", "relatesTo"), matcher.classify("Nothing relevant."))
+        with self.assertRaises(ValueError):
+            Lexicon.from_dict({"subject": [["", "Empty"]]})
+
+    def test_heuristic_llm_uses_health_lexicon(self) -> None:
+        lexicon = Lexicon.load(PROJECT_ROOT / "configs/lexicons/health.json")
+        llm = HeuristicLLM("http://example.org/health#", lexicon=lexicon)
+        requirement = Requirement("R12", "R12", "Prescriptions must name the prescribing doctor.", None, None, None, None)
+
+        response = llm.generate_axioms([requirement])
+
+        self.assertIn("Mapped 'Prescriptions must name the prescribing doctor.' → atm:Doctor prescribes atm:Prescription", response.reasoning_notes)
+
+
+if __name__ == "__main__":
+    unittest.main()
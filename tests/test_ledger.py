@@ -0,0 +1,107 @@
+"""Unit tests for the per-run LLM call ledger."""
+
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from og_nsd.config import PipelineConfig
+from og_nsd.ledger import CallLedger, llm_call
+from og_nsd.llm import OpenAILLM
+from og_nsd.pipeline import OntologyDraftingPipeline
+from og_nsd.requirements import Requirement
+from og_nsd.scheduler import RequestScheduler, SchedulerConfig
+
+
+class _ServerError(Exception):
+    status_code = 503
+
+
+class _FlakyCompletions:
+    """Fails once with a 503, then answers with usage including cached prompt tokens."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            raise _ServerError("HTTP 503")
+        usage = SimpleNamespace(
+            prompt_tokens=120,
+            completion_tokens=30,
+            total_tokens=150,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=64),
+        )
+        message = SimpleNamespace(content="atm:ATM a owl:Class .")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+class CallLedgerTests(unittest.TestCase):
+    def test_records_attempts_tokens_and_cached_tokens(self) -> None:
+        scheduler = RequestScheduler(SchedulerConfig(backoff_base_s=0.0), sleep=lambda _: None)
+        with patch.dict("os.environ", {"OPENAI_API_KEY": "test"}):
+            llm = OpenAILLM(model="mock", scheduler=scheduler)
+        llm._client = SimpleNamespace(chat=SimpleNamespace(completions=_FlakyCompletions()))
+        requirement = Requirement("R1", "R1", "The ATM shall dispense cash.", None, None, None, None)
+
+        ledger = CallLedger()
+        with ledger.activate(), llm_call("generate_axioms", batch_id="batch-0", requirements=1) as call:
+            call.finish(llm.generate_axioms([requirement]))
+        ledger.record_cache_hits("generate_axioms", 4, batch_id="draft_memo")
+
+        record = ledger.records[0].to_dict()
+        self.assertEqual("mock", record["model"])
+        self.assertEqual((2, 1), (record["attempts"], record["retries"]))
+        tokens = [record[key] for key in ("prompt_tokens", "completion_tokens", "cached_tokens", "total_tokens")]
+        self.assertEqual([120, 30, 64, 150], tokens)
+        summary = ledger.summary()["by_kind"]["generate_axioms"]
+        self.assertEqual((1, 4, 1), (summary["calls"], summary["cache_hits"], summary["retries"]))
+        self.assertIsNotNone(summary["latency_s"]["p99"])
+
+    def test_failed_calls_are_recorded(self) -> None:
+        ledger = CallLedger()
+        with ledger.activate(), self.assertRaises(RuntimeError):
+            with llm_call("generate_patch"):
+                raise RuntimeError("boom")
+        self.assertEqual(1, ledger.summary()["errors"])
+
+    def test_detached_calls_without_a_ledger(self) -> None:
+        with llm_call("generate_axioms") as call:
+            call.finish(SimpleNamespace(token_usage={"total_tokens": 5}))
+        self.assertEqual(5, call.total_tokens)
+
+
+class PipelineLedgerTests(unittest.TestCase):
+    def test_every_batch_is_in_the_report_and_call_log(self) -> None:
+        texts = [f"The ATM shall verify card number {idx}." for idx in range(7)]
+        with TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            requirements = tmp_path / "reqs.jsonl"
+            requirements.write_text(
+                "\n".join(json.dumps({"id": f"R{idx}", "text": text}) for idx, text in enumerate(texts)),
+                encoding="utf-8",
+            )
+            config = PipelineConfig(
+                requirements_path=requirements,
+                shapes_path=None,
+                base_ontology_path=None,
+                competency_questions_path=None,
+                output_path=tmp_path / "out.ttl",
+                draft_only=True,
+                intermediate_dir=tmp_path / "build",
+                llm_call_log_path=tmp_path / "calls.ndjson",
+            )
+            report = OntologyDraftingPipeline(config).run()
+            lines = config.llm_call_log_path.read_text(encoding="utf-8").splitlines()
+
+        calls = report["performance"]["llm_calls"]
+        self.assertEqual(2, calls["by_kind"]["generate_axioms"]["calls"])
+        self.assertEqual(7, calls["requirements"])
+        self.assertEqual(["batch-0", "batch-1"], [json.loads(line)["batch_id"] for line in lines])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""Unit tests for the per-requirement draft memo."""
+
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from rdflib import Graph, Literal, Namespace
+from rdflib.namespace import OWL, RDF, RDFS
+from rdflib.compare import isomorphic
+
+from og_nsd.config import PipelineConfig
+from og_nsd.llm import HeuristicLLM, LLMResponse
+from og_nsd.memo import DraftMemo, attribute_triples
+from og_nsd.ontology import OntologyAssembler
+from og_nsd.pipeline import OntologyDraftingPipeline
+from og_nsd.requirements import Requirement, chunk_requirements
+
+ATM = Namespace("http://lod.csd.auth.gr/atm/atm.ttl#")
+
+_TEXTS = [
+    "The ATM shall verify the card.",
+    "The bank shall maintain the account.",
+    "The customer shall log the transaction.",
+    "The ATM shall dispense cash.",
+    "The ATM shall print a receipt.",
+    "The bank shall verify the account.",
+    "The ATM shall log every transaction.",
+]
+
+
+def _requirements(texts) -> list[Requirement]:
+    return [Requirement(f"R{idx}", f"R{idx}", text, None, None, None, None) for idx, text in texts]
+
+
+def _draft(llm: HeuristicLLM, requirements, memo: DraftMemo | None = None) -> tuple[Graph, int]:
+    """Draft like the pipeline does; return the graph and how many requirements reached the model."""
+
+    assembler = OntologyAssembler(None, base_namespace=str(ATM))
+    state = assembler.bootstrap()
+    drafted = 0
+    if memo is not None:
+        cached, requirements = memo.lookup(requirements)
+        assembler.add_triples(state, cached)
+    for batch in chunk_requirements(requirements, size=3):
+        response = llm.generate_axioms(batch)
+        drafted += len(batch)
+        if memo is not None:
+            memo.store(batch, assembler.response_triples(response), response.attribution)
+        assembler.add_response(state, response)
+    return state.graph, drafted
+
+
+class AttributionTests(unittest.TestCase):
+    def test_heuristic_output_is_fully_attributed(self) -> None:
+        requirements = _requirements(enumerate(_TEXTS[:3]))
+        response = HeuristicLLM(str(ATM)).generate_axioms(requirements)
+
+        self.assertEqual(7 * len(requirements), len(response.triples))
+        self.assertEqual(set(response.triples), {triple for owned in response.attribution.values() for triple in owned})
+        owned = set(response.attribution["R0"])
+        self.assertIn((ATM.ATM_verifies_CashCard, ATM.sourceRequirement, Literal("R0")), owned)
+        self.assertTrue(any(triple[0] == ATM.verifies for triple in owned))
+        self.assertFalse(any(str(triple[2]) == "R1" for triple in owned))
+
+    def test_provenance_pulls_in_mentioned_declarations(self) -> None:
+        axiom = ATM.ATM_verifies_CashCard
+        triples = [
+            (ATM.verifies, RDF.type, OWL.ObjectProperty),
+            (ATM.verifies, RDFS.domain, ATM.ATM),
+            (axiom, OWL.annotatedProperty, ATM.verifies),
+            (axiom, ATM.sourceRequirement, Literal("R0")),
+            (ATM.Other, RDF.type, OWL.Class),
+        ]
+        attributed, leftover = attribute_triples(triples, ["R0"])
+
+        self.assertEqual(set(triples[:4]), set(attributed["R0"]))
+        self.assertEqual([(ATM.Other, RDF.type, OWL.Class)], leftover)
+
+
+class DraftMemoTests(unittest.TestCase):
+    def test_only_new_and_changed_requirements_are_redrafted(self) -> None:
+        llm = HeuristicLLM(str(ATM))
+        original = _requirements(enumerate(_TEXTS))
+        with TemporaryDirectory() as tmpdir:
+            _, drafted = _draft(llm, original, DraftMemo("fp", Path(tmpdir)))
+            self.assertEqual(len(original), drafted)
+
+            # Insert one requirement near the top and edit another; a fresh memo reads from disk.
+            edited = list(original)
+            edited.insert(1, Requirement("R99", "R99", "The customer shall verify the account.", None, None, None, None))
+            edited[5] = Requirement("R4", "R4", "The ATM shall dispense the card.", None, None, None, None)
+            memo = DraftMemo("fp", Path(tmpdir))
+            graph, drafted = _draft(llm, edited, memo)
+
+        self.assertEqual(2, drafted)
+        self.assertEqual(len(original) - 1, memo.stats.hits)
+        self.assertTrue(isomorphic(_draft(llm, edited)[0], graph))
+
+    def test_unattributed_batches_are_reused_only_together(self) -> None:
+        requirements = _requirements(enumerate(_TEXTS[:3]))
+        memo = DraftMemo("fp")
+        turtle = "@prefix atm: <http://lod.csd.auth.gr/atm/atm.ttl#> .\natm:ATM a owl:Class .\n"
+        assembler = OntologyAssembler(None, base_namespace=str(ATM))
+        memo.store(requirements[:2], assembler.response_triples(LLMResponse(turtle=turtle, reasoning_notes="")))
+        memo.store(requirements[2:], [])
+
+        _, misses = memo.lookup(requirements)
+        self.assertEqual([], misses)
+        changed = [requirements[0], Requirement("R1", "R1", "Changed.", None, None, None, None), requirements[2]]
+        _, misses = memo.lookup(changed)
+        self.assertEqual(["R0", "R1"], [req.identifier for req in misses])
+        self.assertEqual(2, memo.stats.grouped)
+
+    def test_pipeline_reuses_drafts_across_runs(self) -> None:
+        with TemporaryDirectory() as tmpdir, patch.dict("os.environ", {"OG_NSD_CACHE_DIR": tmpdir}):
+            tmp_path = Path(tmpdir)
+            requirements = tmp_path / "reqs.jsonl"
+            requirements.write_text(
+                "\n".join(json.dumps({"id": f"R{idx}", "text": text}) for idx, text in enumerate(_TEXTS)),
+                encoding="utf-8",
+            )
+            config = PipelineConfig(
+                requirements_path=requirements,
+                shapes_path=None,
+                base_ontology_path=None,
+                competency_questions_path=None,
+                output_path=tmp_path / "out.ttl",
+                draft_only=True,
+                draft_memo=True,
+                intermediate_dir=tmp_path / "build",
+            )
+            OntologyDraftingPipeline(config).run()
+            first = Graph().parse(config.output_path)
+            report = OntologyDraftingPipeline(config).run()
+            second = Graph().parse(config.output_path)
+
+        self.assertEqual(len(_TEXTS), report["performance"]["draft_memo"]["hits"])
+        self.assertNotIn("draft.batch", report["performance"]["stages"])
+        self.assertTrue(isomorphic(first, second))
+
+
+if __name__ == "__main__":
+    unittest.main()
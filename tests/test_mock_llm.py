@@ -0,0 +1,100 @@
+"""Unit tests for the offline OpenAI-compatible mock server."""
+
+import json
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from og_nsd.llm import OpenAILLM
+from og_nsd.mock_llm import (
+    Cassette,
+    FaultInjection,
+    LatencyModel,
+    MockLLMServer,
+    ThroughputLimits,
+    classify_request,
+)
+from og_nsd.requirements import Requirement
+
+
+def _requirement(identifier: str, text: str) -> Requirement:
+    return Requirement(identifier, identifier, text, None, None, None, None)
+
+
+def _post(url: str, body: dict) -> tuple[int, dict, dict]:
+    request = urllib.request.Request(
+        f"{url}/chat/completions",
+        data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, dict(response.headers), json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, dict(exc.headers), json.loads(exc.read())
+
+
+_BODY = {"model": "mock", "messages": [{"role": "user", "content": "SECTION C — Requirements Input\nTitle: R1"}]}
+
+
+class MockLLMServerTests(unittest.TestCase):
+    def test_record_then_replay_through_openai_client(self) -> None:
+        requirements = [_requirement("R1", "The ATM shall dispense cash.")]
+        with TemporaryDirectory() as tmp, patch.dict("os.environ", {"OPENAI_API_KEY": "mock"}):
+            cassette_path = Path(tmp) / "cassette.json"
+            with MockLLMServer(on_miss="synthetic") as upstream:
+                with MockLLMServer(Cassette(cassette_path), mode="record", upstream=upstream.url) as recorder:
+                    recorded = OpenAILLM(model="mock", base_url=recorder.url).generate_axioms(requirements)
+
+            cassette = Cassette.load(cassette_path)
+            self.assertEqual(["generate_axioms"], [item.kind for item in cassette.interactions])
+            with MockLLMServer(cassette, on_miss="error") as replay:
+                replayed = OpenAILLM(model="mock", base_url=replay.url).generate_axioms(requirements)
+                self.assertEqual(1, replay.stats.hits)
+
+        self.assertIn("atm:Mock_R1 a owl:Class", recorded.turtle)
+        self.assertEqual(recorded.turtle, replayed.turtle)
+        self.assertEqual(recorded.token_usage, replayed.token_usage)
+
+    def test_injected_rate_limit_sets_retry_after(self) -> None:
+        with MockLLMServer(faults=FaultInjection(rate_limit_rate=1.0, retry_after_s=3)) as server:
+            status, headers, payload = _post(server.url, _BODY)
+
+        self.assertEqual(429, status)
+        self.assertEqual("3", headers["Retry-After"])
+        self.assertEqual("rate_limit_exceeded", payload["error"]["type"])
+        self.assertEqual({"429": 1}, server.stats.injected)
+
+    def test_requests_per_minute_limit(self) -> None:
+        with MockLLMServer(on_miss="synthetic", limits=ThroughputLimits(requests_per_minute=2)) as server:
+            statuses = [_post(server.url, _BODY)[0] for _ in range(3)]
+
+        self.assertEqual([200, 200, 429], statuses)
+        self.assertEqual(1, server.stats.throttled)
+
+    def test_latency_model(self) -> None:
+        import random
+
+        rng = random.Random(0)
+        self.assertEqual(0.5, LatencyModel("fixed", mean_s=0.5).sample(rng))
+        self.assertEqual(1.25, LatencyModel("recorded", per_token_s=0.01).sample(rng, recorded_s=0.25, completion_tokens=100))
+        samples = [LatencyModel("lognormal", mean_s=2.0, stddev_s=1.0).sample(rng) for _ in range(2000)]
+        self.assertAlmostEqual(2.0, sum(samples) / len(samples), delta=0.15)
+
+    def test_classifies_openai_prompts(self) -> None:
+        llm = OpenAILLM.__new__(OpenAILLM)
+        repair = llm._build_repair_prompt(["Missing label"], "")
+        apply = llm._build_patch_application_prompt([{"action": "add"}], "")
+        draft = llm._build_prompt([_requirement("R1", "text")], None)
+
+        self.assertEqual("generate_patch", classify_request([{"role": "user", "content": repair}]))
+        self.assertEqual("apply_patches", classify_request([{"role": "user", "content": apply}]))
+        self.assertEqual("generate_axioms", classify_request([{"role": "user", "content": draft}]))
+
+
+if __name__ == "__main__":
+    unittest.main()
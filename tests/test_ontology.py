@@ -5,13 +5,19 @@ from pathlib import Path
 from unittest.mock import patch
 from tempfile import TemporaryDirectory
 
-from rdflib import BNode, Graph, Literal, URIRef, OWL, RDF
+from rdflib import BNode, Graph, Literal, URIRef, OWL, RDF, RDFS
+from rdflib.compare import isomorphic
 from rdflib.namespace import XSD
 
 from og_nsd.config import PipelineConfig
+from og_nsd import graphs
+from og_nsd.graphs import clear_graph_cache, load_cached, load_graph
 from og_nsd.llm import HeuristicLLM
+from og_nsd import ontology
 from og_nsd.ontology import (
     OntologyAssembler,
+    extract_schema_context,
+    load_schema_context,
     _ensure_standard_prefixes,
     _normalize_base_prefix,
     _sanitize_turtle,
@@ -22,6 +28,7 @@ from og_nsd.reasoning import (
     _strip_invalid_restrictions,
 )
 from og_nsd.pipeline import OntologyDraftingPipeline
+from og_nsd.requirements import Requirement
 
 
 class EnsureStandardPrefixesTests(unittest.TestCase):
@@ -87,6 +94,136 @@ class BaseNamespaceNormalizationTests(unittest.TestCase):
         self.assertTrue(str(subject).startswith(self.base_ns))
 
 
+class GraphCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_graph_cache()
+        self._tmp = TemporaryDirectory()
+        self.cache_dir = Path(self._tmp.name) / "cache"
+        env = patch.dict("os.environ", {"OG_NSD_CACHE_DIR": str(self.cache_dir)})
+        env.start()
+        self.addCleanup(env.stop)
+        self.path = Path(self._tmp.name) / "base.ttl"
+        self.path.write_text(
+            "@prefix atm: <http://example.org/atm#> .\n"
+            "@prefix owl: <http://www.w3.org/2002/07/owl#> .\n"
+            "atm:ATM a owl:Class .\natm:Bank a owl:Class .\n",
+            encoding="utf-8",
+        )
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+        clear_graph_cache()
+
+    def test_parses_once_per_content_hash(self) -> None:
+        first = load_cached(self.path)
+        self.assertIs(first, load_cached(self.path))
+
+        self.path.write_text(self.path.read_text(encoding="utf-8") + "atm:Card a owl:Class .\n", encoding="utf-8")
+
+        refreshed = load_cached(self.path)
+        self.assertIsNot(first, refreshed)
+        self.assertEqual(3, len(refreshed.graph))
+
+    def test_overlay_writes_do_not_touch_shared_base(self) -> None:
+        base = load_cached(self.path).graph
+        view = load_graph(self.path)
+        atm = "http://example.org/atm#"
+        removed = (URIRef(atm + "ATM"), RDF.type, OWL.Class)
+
+        view.remove(removed)
+        view.add((URIRef(atm + "Card"), RDF.type, OWL.Class))
+
+        self.assertEqual(2, len(base))
+        self.assertIn(removed, base)
+        self.assertNotIn(removed, view)
+        self.assertEqual(2, len(view))
+        self.assertEqual(2, len(load_graph(self.path)))
+        self.assertIn("@prefix atm:", view.serialize(format="turtle"))
+
+    def test_bootstrap_reuses_cached_base(self) -> None:
+        assembler = OntologyAssembler(self.path, base_namespace="http://example.org/atm#")
+        first = assembler.bootstrap()
+        second = assembler.bootstrap()
+
+        assembler.add_turtle(first, "atm:Card a owl:Class .")
+
+        self.assertEqual(3, len(first.graph))
+        self.assertEqual(2, len(second.graph))
+        self.assertIs(first.turtle_snippets[0], second.turtle_snippets[0])
+
+    def test_binary_cache_round_trips_without_reparsing_turtle(self) -> None:
+        self.path.write_text(
+            self.path.read_text(encoding="utf-8")
+            + 'atm:ATM atm:limit "100.5"^^<http://www.w3.org/2001/XMLSchema#decimal> ; '
+            'atm:label "Geldautomat"@de ; atm:owner [ a owl:Class ] .\n',
+            encoding="utf-8",
+        )
+        original = load_cached(self.path).graph
+        clear_graph_cache()
+
+        with patch.object(Graph, "parse", side_effect=AssertionError("Turtle re-parsed")):
+            cached = load_cached(self.path).graph
+
+        self.assertTrue(isomorphic(original, cached))
+        self.assertEqual("http://example.org/atm#", str(cached.namespace_manager.store.namespace("atm")))
+
+    def test_binary_cache_invalidated_by_library_version(self) -> None:
+        load_cached(self.path)
+        clear_graph_cache()
+
+        with patch.object(graphs.rdflib, "__version__", "0.0.0-test"):
+            self.assertIsNone(graphs._load_binary(graphs.file_digest(self.path)))
+        [written] = list((self.cache_dir / "graphs").iterdir())
+        written.write_bytes(written.read_bytes()[:-4])
+        self.assertIsNone(graphs.load_binary_graph(written))
+
+
+class SchemaContextCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_graph_cache()
+        ontology._SCHEMA_MEMO.clear()
+        self._tmp = TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        env = patch.dict("os.environ", {"OG_NSD_CACHE_DIR": str(Path(self._tmp.name) / "cache")})
+        env.start()
+        self.addCleanup(env.stop)
+        self.path = Path(self._tmp.name) / "tbox.ttl"
+        self.path.write_text(
+            "@prefix atm: <http://example.org/atm#> .\n"
+            "@prefix owl: <http://www.w3.org/2002/07/owl#> .\n"
+            "@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .\n"
+            "@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .\n"
+            "atm:ATM a owl:Class ; rdfs:label \"ATM\" .\n"
+            "atm:Bank a owl:Class .\n"
+            "atm:operatedBy a owl:ObjectProperty ; rdfs:domain atm:ATM ; rdfs:range atm:Bank .\n"
+            "atm:balance a owl:DatatypeProperty ; rdfs:domain atm:Bank ; rdfs:range xsd:decimal .\n"
+            "atm:orphan a owl:ObjectProperty .\n",
+            encoding="utf-8",
+        )
+
+    def test_single_pass_extraction(self) -> None:
+        context = extract_schema_context(load_cached(self.path).graph, "http://example.org/atm#")
+
+        self.assertEqual(["atm:ATM", "atm:Bank"], context.classes)
+        self.assertEqual({"domain": "atm:ATM", "range": "atm:Bank"}, context.object_properties["atm:operatedBy"])
+        self.assertEqual({"domain": "(unspecified)", "range": "(unspecified)"}, context.object_properties["atm:orphan"])
+        self.assertEqual({"domain": "atm:Bank", "range": "xsd:decimal"}, context.datatype_properties["atm:balance"])
+        self.assertEqual({"atm:ATM": "ATM"}, context.labels)
+
+    def test_persisted_context_skips_extraction(self) -> None:
+        first = load_schema_context(self.path, "http://example.org/atm#")
+        first.prefixes["mutated"] = "http://example.org/mutated#"
+        clear_graph_cache()
+        ontology._SCHEMA_MEMO.clear()
+
+        with patch("og_nsd.ontology.extract_schema_context", side_effect=AssertionError("re-extracted")):
+            second = load_schema_context(self.path, "http://example.org/atm#")
+
+        self.assertEqual(first.classes, second.classes)
+        self.assertEqual(first.object_properties, second.object_properties)
+        self.assertNotIn("mutated", second.prefixes)
+
+
 class SanitizeTurtleTests(unittest.TestCase):
     def test_comments_lines_starting_with_not(self) -> None:
         turtle = (
@@ -291,6 +428,76 @@ class RestrictionSanitizationTests(unittest.TestCase):
         self.assertEqual(0, len(list(sanitized.objects(subject, OWL.equivalentClass))))
 
 
+class NativeTripleResponseTests(unittest.TestCase):
+    BASE = "http://example.org/atm#"
+
+    def _requirements(self) -> list[Requirement]:
+        texts = ["The customer shall verify the card.", 'The bank shall log the "transaction".']
+        return [Requirement(f"R{idx}", f"R{idx}", text, None, None, None, None) for idx, text in enumerate(texts)]
+
+    def test_heuristic_triples_match_their_turtle(self) -> None:
+        llm = HeuristicLLM(self.BASE)
+        assembler = OntologyAssembler(None, base_namespace=self.BASE)
+        responses = [
+            llm.generate_axioms(self._requirements()),
+            llm.generate_patch(['atm:ATM missing "label".'], ""),
+        ]
+        for response in responses:
+            self.assertIsNotNone(response.triples)
+            self.assertIsNone(response.materialized_turtle())
+
+            native = assembler.bootstrap()
+            assembler.add_response(native, response)
+            self.assertIsNone(response.materialized_turtle(), "merging must not render Turtle")
+
+            parsed = assembler.bootstrap()
+            assembler.add_turtle(parsed, response.turtle)
+            self.assertTrue(isomorphic(native.graph, parsed.graph))
+            self.assertEqual("atm", native.graph.qname(URIRef(self.BASE + "ATM")).split(":")[0])
+
+    def test_apply_patches_returns_the_delta(self) -> None:
+        llm = HeuristicLLM(self.BASE)
+        context = (f"@prefix atm: <{self.BASE}> .\nPREFIX ex: <http://example.org/ex#>\n"
+                   "atm:Card a <http://www.w3.org/2002/07/owl#Class> ; ex:issuer ex:Bank .")
+        patches = [
+            {"action": "addSubclass", "subject": "atm:Card", "object": "atm:Token"},
+            {"action": "addTriple", "subject": "atm:Card", "predicate": "ex:issuer", "object": "ex:Bank"},
+        ]
+        # Only the prefixes of the context are read, so its body is never parsed.
+        with patch.object(Graph, "parse", side_effect=AssertionError("context parsed")):
+            response = llm.apply_patches(patches, context)
+
+        assembler = OntologyAssembler(None, base_namespace=self.BASE)
+        state = assembler.bootstrap()
+        assembler.add_turtle(state, context)
+        size = len(state.graph)
+        assembler.add_response(state, response)
+        card, token = URIRef(self.BASE + "Card"), URIRef(self.BASE + "Token")
+        self.assertIn((card, RDFS.subClassOf, token), state.graph)
+        self.assertIn((card, URIRef("http://example.org/ex#issuer"), URIRef("http://example.org/ex#Bank")),
+                      response.triples)
+        self.assertEqual(size + 2, len(state.graph))
+        self.assertIsNone(response.materialized_turtle())
+
+    def test_patch_graph_patches_in_place(self) -> None:
+        llm = HeuristicLLM(self.BASE)
+        state = OntologyAssembler(None, base_namespace=self.BASE).bootstrap()
+        state.graph.bind("ex", "http://example.org/ex#")
+        state.graph.add((URIRef(self.BASE + "Card"), RDF.type, OWL.Class))
+        patches = [
+            {"action": "addProperty", "subject": "atm:Card", "predicate": "ex:issuedBy", "object": "Bank"},
+            {"action": "addTriple", "subject": "Card", "predicate": "rdfs:label", "object": "Card"},
+        ]
+
+        response = llm.patch_graph(patches, state.graph)
+
+        issued_by = URIRef("http://example.org/ex#issuedBy")
+        self.assertIn((issued_by, RDFS.range, URIRef(self.BASE + "Bank")), state.graph)
+        self.assertIn((URIRef(self.BASE + "Card"), RDFS.label, Literal("Card")), state.graph)
+        self.assertEqual(5, len(response.triples))
+        self.assertEqual(6, len(state.graph))
+
+
 class LLMSelectionTests(unittest.TestCase):
     def _build_config(self, tmpdir: str) -> PipelineConfig:
         base = Path(tmpdir)
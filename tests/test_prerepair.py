@@ -0,0 +1,103 @@
+"""Unit tests for deterministic local pre-repair."""
+
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from rdflib import Graph, Literal, Namespace
+from rdflib.namespace import OWL, RDF, RDFS, XSD
+
+from og_nsd.config import PipelineConfig
+from og_nsd.llm import LLMClient, LLMResponse
+from og_nsd.pipeline import OntologyDraftingPipeline
+from og_nsd.prerepair import PreRepairEngine
+from og_nsd.shacl import ShaclValidator
+
+ATM = Namespace("http://lod.csd.auth.gr/atm/atm.ttl#")
+_SHAPES = """
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+@prefix atm: <http://lod.csd.auth.gr/atm/atm.ttl#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+
+atm:WithdrawalShape a sh:NodeShape ;
+    sh:targetClass atm:Withdrawal ;
+    sh:property [ sh:path atm:performedBy ; sh:class atm:Customer ; sh:minCount 1 ] ;
+    sh:property [ sh:path atm:onAccount ; sh:class atm:Account ; sh:minCount 1 ] ;
+    sh:property [ sh:path atm:requestedAmount ; sh:datatype xsd:decimal ; sh:minCount 1 ] ;
+    sh:property [ sh:path atm:transactionTimestamp ; sh:datatype xsd:dateTime ] .
+"""
+_DRAFT = """
+@prefix atm: <http://lod.csd.auth.gr/atm/atm.ttl#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+atm:onAccount a owl:ObjectProperty .
+atm:w1 a atm:Withdrawal ; atm:performedBy atm:bob ; atm:requestedAmount "12" .
+"""
+
+
+class PreRepairEngineTests(unittest.TestCase):
+    def test_fixes_class_datatype_and_min_count_violations(self) -> None:
+        with TemporaryDirectory() as tmpdir:
+            shapes = Path(tmpdir) / "shapes.ttl"
+            shapes.write_text(_SHAPES, encoding="utf-8")
+            validator = ShaclValidator(shapes)
+        graph = Graph().parse(data=_DRAFT, format="turtle")
+        graph.add((ATM.w1, ATM.transactionTimestamp, Literal("soon")))
+        report = validator.validate(graph)
+
+        outcome = PreRepairEngine(validator.shapes_graph).repair(graph, report.results)
+
+        expected = {"ClassConstraintComponent": 1, "DatatypeConstraintComponent": 1, "MinCountConstraintComponent": 1}
+        self.assertEqual(expected, outcome.fixed)
+        # "soon" is not a valid xsd:dateTime, so that one is left for the LLM.
+        self.assertEqual([str(ATM.transactionTimestamp)], [result.path for result in outcome.residual])
+        self.assertIn((ATM.bob, RDF.type, ATM.Customer), graph)
+        self.assertIn((ATM.w1, ATM.requestedAmount, Literal("12", datatype=XSD.decimal)), graph)
+        self.assertIn((ATM.w1, ATM.onAccount, ATM.w1_onAccount), graph)
+        self.assertIn((ATM.performedBy, RDFS.range, ATM.Customer), graph)
+        self.assertIn((ATM.performedBy, RDFS.domain, ATM.Withdrawal), graph)
+        self.assertIn((ATM.Account, RDF.type, OWL.Class), graph)
+        self.assertEqual([str(ATM.transactionTimestamp)], [result.path for result in validator.validate(graph).results])
+
+
+class _Drafter(LLMClient):
+    def __init__(self) -> None:
+        self.repairs = 0
+
+    def generate_axioms(self, requirements, schema_context=None, exemplars=None) -> LLMResponse:
+        return LLMResponse(turtle=_DRAFT, reasoning_notes="stand-in")
+
+    def generate_patch(self, prompts, context_ttl) -> LLMResponse:
+        self.repairs += 1
+        return LLMResponse(turtle="", reasoning_notes="no-op")
+
+
+class PipelineLocalRepairTests(unittest.TestCase):
+    def test_mechanical_violations_never_reach_the_llm(self) -> None:
+        with TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            requirements = tmp_path / "reqs.jsonl"
+            requirements.write_text(json.dumps({"id": "R1", "text": "The customer shall withdraw cash."}), encoding="utf-8")
+            shapes = tmp_path / "shapes.ttl"
+            shapes.write_text(_SHAPES, encoding="utf-8")
+            config = PipelineConfig(
+                requirements_path=requirements,
+                shapes_path=shapes,
+                base_ontology_path=None,
+                competency_questions_path=None,
+                output_path=tmp_path / "out.ttl",
+                intermediate_dir=tmp_path / "build",
+                local_repair=True,
+            )
+            pipeline = OntologyDraftingPipeline(config)
+            pipeline.llm = _Drafter()
+            report = pipeline.run()
+
+        self.assertEqual(0, pipeline.llm.repairs)
+        self.assertEqual([False, True], [item["conforms"] for item in report["iterations"]])
+        repair = report["performance"]["stages"]["repair"]["counts"]
+        self.assertEqual(3, repair["local_fixes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
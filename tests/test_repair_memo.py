@@ -0,0 +1,116 @@
+"""Unit tests for the violation-signature repair memo."""
+
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from rdflib import Graph, Literal, Namespace, URIRef
+from rdflib.namespace import OWL, RDF, RDFS
+
+from og_nsd.config import PipelineConfig
+from og_nsd.llm import LLMClient, LLMResponse
+from og_nsd.pipeline import OntologyDraftingPipeline
+from og_nsd.repair_memo import RepairMemo, violation_signature
+from og_nsd.shacl import ShaclResult
+
+ATM = Namespace("http://lod.csd.auth.gr/atm/atm.ttl#")
+_MIN_COUNT = "http://www.w3.org/ns/shacl#MinCountConstraintComponent"
+_SHAPES = """
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix ex: <http://example.org/shapes#> .
+
+ex:LabelledClassShape a sh:NodeShape ;
+    sh:targetClass owl:Class ;
+    sh:property [ sh:path rdfs:label ; sh:minCount 1 ] .
+"""
+
+
+def _missing_label(focus: URIRef, shape: str = "n3f2a") -> ShaclResult:
+    return ShaclResult(str(focus), str(RDFS.label), "Less than 1 values", "Violation", shape, _MIN_COUNT, None)
+
+
+class RepairMemoTests(unittest.TestCase):
+    def test_signature_ignores_anonymous_shapes(self) -> None:
+        self.assertEqual(
+            violation_signature(_missing_label(ATM.ATM, "n3f2a")),
+            violation_signature(_missing_label(ATM.CashCard, "nb81c")),
+        )
+        named = _missing_label(ATM.ATM, "http://example.org/shapes#LabelShape")
+        self.assertNotEqual(violation_signature(named), violation_signature(_missing_label(ATM.ATM)))
+
+    def test_learns_validated_repairs_and_reapplies_them_with_substitution(self) -> None:
+        with TemporaryDirectory() as tmpdir:
+            before = [_missing_label(ATM.ATM), _missing_label(ATM.Bank)]
+            added = [(ATM.ATM, RDFS.label, Literal("ATM")), (ATM.Other, RDFS.comment, Literal("unrelated"))]
+            memo = RepairMemo(Path(tmpdir))
+            # Only the ATM violation was resolved by the round.
+            memo.observe(before, [_missing_label(ATM.Bank)], added)
+            self.assertEqual(1, memo.stats.learned)
+
+            shared = RepairMemo(Path(tmpdir))
+            triples, residual = shared.apply([_missing_label(ATM.CashCard)])
+            self.assertEqual([(ATM.CashCard, RDFS.label, Literal("CashCard"))], triples)
+            self.assertEqual([], residual)
+
+            # The reapplied repair did not resolve the violation, so it is forgotten.
+            shared.observe([_missing_label(ATM.CashCard)], [_missing_label(ATM.CashCard)], triples)
+            self.assertEqual(1, shared.stats.forgotten)
+            self.assertEqual(([], [_missing_label(ATM.Bank)]), RepairMemo(Path(tmpdir)).apply([_missing_label(ATM.Bank)]))
+
+
+class _Labeller(LLMClient):
+    """Stand-in model that drafts two classes and labels every unlabelled class on repair."""
+
+    def __init__(self) -> None:
+        self.repairs = 0
+
+    def generate_axioms(self, requirements, schema_context=None, exemplars=None) -> LLMResponse:
+        turtle = "@prefix atm: <http://lod.csd.auth.gr/atm/atm.ttl#> .\natm:ATM a owl:Class .\natm:CashCard a owl:Class ."
+        return LLMResponse(turtle=turtle, reasoning_notes="stand-in")
+
+    def generate_patch(self, prompts, context_ttl) -> LLMResponse:
+        self.repairs += 1
+        graph = Graph().parse(data=context_ttl, format="turtle")
+        patch_graph = Graph()
+        for cls in graph.subjects(RDF.type, OWL.Class):
+            if graph.value(cls, RDFS.label) is None:
+                patch_graph.add((cls, RDFS.label, Literal(str(cls).rsplit("#", 1)[-1])))
+        return LLMResponse(turtle=patch_graph.serialize(format="turtle"), reasoning_notes="labels")
+
+
+class PipelineRepairMemoTests(unittest.TestCase):
+    def test_second_run_repairs_without_the_llm(self) -> None:
+        with TemporaryDirectory() as tmpdir, patch.dict("os.environ", {"OG_NSD_CACHE_DIR": tmpdir}):
+            tmp_path = Path(tmpdir)
+            requirements = tmp_path / "reqs.jsonl"
+            requirements.write_text(json.dumps({"id": "R1", "text": "The ATM shall eject the card."}), encoding="utf-8")
+            shapes = tmp_path / "shapes.ttl"
+            shapes.write_text(_SHAPES, encoding="utf-8")
+            reports, models = [], []
+            for run in range(2):
+                config = PipelineConfig(
+                    requirements_path=requirements,
+                    shapes_path=shapes,
+                    base_ontology_path=None,
+                    competency_questions_path=None,
+                    output_path=tmp_path / f"out{run}.ttl",
+                    intermediate_dir=tmp_path / "build",
+                    repair_memo=True,
+                )
+                pipeline = OntologyDraftingPipeline(config)
+                pipeline.llm = _Labeller()
+                reports.append(pipeline.run())
+                models.append(pipeline.llm)
+
+        self.assertEqual([1, 0], [model.repairs for model in models])
+        self.assertEqual(1, reports[0]["performance"]["repair_memo"]["learned"])
+        self.assertEqual(2, reports[1]["performance"]["repair_memo"]["hits"])
+        self.assertTrue(reports[1]["iterations"][-1]["conforms"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+"""Unit tests for difficulty-based model routing."""
+
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from rdflib import Graph, URIRef
+from rdflib.namespace import RDFS
+
+from og_nsd.config import PipelineConfig
+from og_nsd.llm import HeuristicLLM, LLMClient, LLMResponse
+from og_nsd.mock_llm import MockLLMServer
+from og_nsd.ontology import OntologyAssembler, SchemaContext
+from og_nsd.pipeline import OntologyDraftingPipeline
+from og_nsd.requirements import Requirement
+from og_nsd.routing import ModelTier, RoutedLLM, schema_vocabulary, score_requirement
+
+ATM_NS = "http://lod.csd.auth.gr/atm/atm.ttl#"
+_EASY_MAIN = "<System:ATM> SHALL <Function:eject> <Item:cash card>"
+_HARD_TEXT = (
+    "If the customer enters an invalid password three times in a row during one session, the ATM shall "
+    "retain the cash card, notify the bank computer and display a message explaining how to recover it."
+)
+_SCHEMA = SchemaContext(
+    classes=["atm:ATM", "atm:CashCard", "atm:BankComputer"],
+    object_properties={"atm:ejects": {"domain": "atm:ATM", "range": "atm:CashCard"}},
+    datatype_properties={},
+    labels={},
+    prefixes={"atm": ATM_NS},
+)
+
+
+def _easy(identifier: str) -> Requirement:
+    return Requirement(identifier, identifier, "The ATM shall eject the cash card.", None, None, _EASY_MAIN, None)
+
+
+def _hard(identifier: str) -> Requirement:
+    return Requirement(identifier, identifier, _HARD_TEXT, None, None, None, None)
+
+
+class _StandIn(LLMClient):
+    """Local stand-in model returning fixed Turtle and recording what it was asked."""
+
+    def __init__(self, turtle: str) -> None:
+        self.turtle = turtle
+        self.batches: list[list[str]] = []
+        self.repairs = 0
+
+    def generate_axioms(self, requirements, schema_context=None, exemplars=None) -> LLMResponse:
+        self.batches.append([req.identifier for req in requirements])
+        return LLMResponse(turtle=self.turtle, reasoning_notes="stand-in")
+
+    def generate_patch(self, prompts, context_ttl) -> LLMResponse:
+        self.repairs += 1
+        return LLMResponse(turtle=self.turtle, reasoning_notes="stand-in patch")
+
+
+_VALID = "@prefix atm: <http://lod.csd.auth.gr/atm/atm.ttl#> .\natm:ATM a owl:Class ."
+
+
+class DifficultyTests(unittest.TestCase):
+    def test_boilerplate_and_schema_coverage_lower_the_score(self) -> None:
+        vocabulary = schema_vocabulary(_SCHEMA)
+        self.assertTrue({"atm", "cash", "card", "bank", "computer", "ejects"} <= vocabulary)
+        easy = score_requirement(_easy("R1"), vocabulary)
+        self.assertEqual(0.0, easy.boilerplate)
+        self.assertLess(easy.uncovered, score_requirement(_easy("R1")).uncovered)
+        self.assertLess(easy.score, 0.2)
+        self.assertGreater(score_requirement(_hard("R2"), vocabulary).score, 0.5)
+        self.assertEqual(1.0, score_requirement(_easy("R1"), vocabulary, failed=True).score)
+
+
+class RoutedLLMTests(unittest.TestCase):
+    def _router(self, fast_turtle: str = _VALID) -> tuple[RoutedLLM, _StandIn, _StandIn]:
+        fast, strong = _StandIn(fast_turtle), _StandIn(_VALID)
+        check = OntologyAssembler(None, base_namespace=ATM_NS).response_triples
+        tiers = [ModelTier("fast", fast, max_difficulty=0.5), ModelTier("strong", strong)]
+        return RoutedLLM(tiers, schema_context=_SCHEMA, check=check), fast, strong
+
+    def test_easy_batches_go_to_fast_tier_and_repairs_to_strong(self) -> None:
+        router, fast, strong = self._router()
+        router.generate_axioms([_easy("R1"), _easy("R2")])
+        router.generate_axioms([_easy("R3"), _hard("R4")])
+        router.generate_patch(["ATM violates shape"], "")
+
+        self.assertEqual([["R1", "R2"]], fast.batches)
+        self.assertEqual([["R3", "R4"]], strong.batches)
+        self.assertEqual(1, strong.repairs)
+        stats = router.stats.to_dict()
+        self.assertEqual(2, stats["tiers"]["fast"]["requirements"])
+        self.assertEqual(0, stats["escalations"])
+
+    def test_unparseable_fast_draft_escalates_and_sticks(self) -> None:
+        router, fast, strong = self._router(fast_turtle="atm:ATM a {{ broken")
+        response = router.generate_axioms([_easy("R1")])
+        router.generate_axioms([_easy("R1")])
+
+        self.assertEqual(_VALID, response.turtle)
+        self.assertEqual([["R1"]], fast.batches)
+        self.assertEqual([["R1"], ["R1"]], strong.batches)
+        self.assertEqual(1, router.stats.escalations)
+        self.assertEqual(1, router.stats.tiers["fast"].failures)
+
+    def test_patch_graph_goes_to_a_heuristic_strong_tier(self) -> None:
+        strong = HeuristicLLM(ATM_NS)
+        router = RoutedLLM([ModelTier("fast", _StandIn(_VALID), max_difficulty=0.5), ModelTier("strong", strong)])
+        graph = Graph()
+        response = router.patch_graph([{"action": "addSubclass", "subject": "atm:Card", "object": "atm:Token"}], graph)
+
+        self.assertIn((URIRef(ATM_NS + "Card"), RDFS.subClassOf, URIRef(ATM_NS + "Token")), graph)
+        self.assertEqual(len(graph), len(response.triples))
+        self.assertEqual(1, router.stats.repairs)
+        self.assertEqual(1, router.stats.tiers["strong"].batches)
+
+
+class PipelineRoutingTests(unittest.TestCase):
+    def test_pipeline_routes_easy_batches_to_heuristic_model(self) -> None:
+        easy = {"text": "The ATM shall eject the cash card.", "boilerplate": {"main": _EASY_MAIN}}
+        records = [{"id": f"E{idx}", **easy} for idx in range(5)]
+        records.append({"id": "H1", "text": _HARD_TEXT})
+        with TemporaryDirectory() as tmpdir, MockLLMServer(on_miss="synthetic") as server, patch.dict(
+            "os.environ", {"OPENAI_API_KEY": "mock", "OPENAI_BASE_URL": server.url, "OG_NSD_CACHE_DIR": tmpdir}
+        ):
+            tmp_path = Path(tmpdir)
+            requirements = tmp_path / "reqs.jsonl"
+            requirements.write_text("\n".join(json.dumps(record) for record in records), encoding="utf-8")
+            config = PipelineConfig(
+                requirements_path=requirements,
+                shapes_path=None,
+                base_ontology_path=None,
+                competency_questions_path=None,
+                output_path=tmp_path / "out.ttl",
+                llm_mode="openai",
+                llm_model="mock",
+                llm_fast_model="heuristic",
+                draft_only=True,
+                intermediate_dir=tmp_path / "build",
+            )
+            report = OntologyDraftingPipeline(config).run()
+
+        routing = report["performance"]["llm_routing"]
+        self.assertEqual(5, routing["tiers"]["heuristic"]["requirements"])
+        self.assertEqual(1, routing["tiers"]["mock"]["requirements"])
+        self.assertEqual(1, server.stats.requests)
+
+
+if __name__ == "__main__":
+    unittest.main()
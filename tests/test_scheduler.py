@@ -0,0 +1,183 @@
+"""Unit tests for the LLM request scheduler."""
+
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from og_nsd.llm import OpenAILLM
+from og_nsd.mock_llm import FaultInjection, MockLLMServer
+from og_nsd.requirements import Requirement
+from og_nsd.scheduler import (
+    AdaptiveLimiter,
+    RequestScheduler,
+    SchedulerConfig,
+    TokenBucket,
+    classify_failure,
+    retry_after_seconds,
+)
+
+
+class _Response:
+    def __init__(self, headers: dict, status_code: int) -> None:
+        self.headers = headers
+        self.status_code = status_code
+
+
+class _ProviderError(Exception):
+    def __init__(self, status_code: int, headers: dict | None = None) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = _Response(headers or {}, status_code)
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _scheduler(clock: _FakeClock, **config) -> RequestScheduler:
+    return RequestScheduler(SchedulerConfig(**config), sleep=clock.sleep, clock=clock)
+
+
+class RequestSchedulerTests(unittest.TestCase):
+    def test_retries_rate_limits_and_honors_retry_after(self) -> None:
+        clock = _FakeClock()
+        scheduler = _scheduler(clock, backoff_base_s=0.5)
+        outcomes = [_ProviderError(429, {"retry-after": "7"}), _ProviderError(503), "ok"]
+
+        def _call(timeout):
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        self.assertEqual("ok", scheduler.call(_call))
+        stats = scheduler.snapshot()
+        self.assertEqual(2, stats["retries"])
+        self.assertEqual({"rate_limit": 1, "server_error": 1}, stats["retry_reasons"])
+        self.assertEqual(1, stats["retry_after_honored"])
+        self.assertGreaterEqual(clock.sleeps[0], 7.0)
+        self.assertLessEqual(clock.sleeps[1], 1.0)
+
+    def test_final_errors_are_not_retried(self) -> None:
+        clock = _FakeClock()
+        scheduler = _scheduler(clock)
+        calls = []
+
+        def _call(timeout):
+            calls.append(timeout)
+            raise _ProviderError(400)
+
+        with self.assertRaises(_ProviderError):
+            scheduler.call(_call)
+        self.assertEqual(1, len(calls))
+        self.assertEqual(1, scheduler.stats.failures)
+
+    def test_gives_up_after_max_retries(self) -> None:
+        clock = _FakeClock()
+        scheduler = _scheduler(clock, max_retries=2)
+
+        def _call(timeout):
+            raise TimeoutError("slow")
+
+        with self.assertRaises(TimeoutError):
+            scheduler.call(_call)
+        self.assertEqual(3, scheduler.stats.attempts)
+        self.assertEqual(2, scheduler.stats.retries)
+
+    def test_token_buckets_throttle_requests(self) -> None:
+        clock = _FakeClock()
+        scheduler = _scheduler(clock, requests_per_minute=60, tokens_per_minute=600)
+
+        for _ in range(61):
+            scheduler.call(lambda timeout: "ok", estimated_tokens=1)
+        self.assertEqual([1.0], [round(delay, 6) for delay in clock.sleeps])
+
+        bucket = TokenBucket(600, clock=clock)
+        self.assertEqual(0.0, bucket.reserve(500))
+        self.assertAlmostEqual(40.0, bucket.reserve(500))
+
+    def test_aimd_limiter(self) -> None:
+        clock = _FakeClock()
+        limiter = AdaptiveLimiter(initial=4, minimum=1, maximum=8, clock=clock)
+        for _ in range(4):
+            limiter.acquire()
+        self.assertFalse(limiter.try_acquire())
+        for _ in range(4):
+            limiter.release("success")
+        self.assertGreater(limiter.limit, 4.9)
+
+        limiter.acquire()
+        limiter.release("congestion")
+        limiter.acquire()
+        limiter.release("congestion")  # same burst: no second decrease
+        self.assertAlmostEqual(2.5, limiter.limit, places=1)
+        self.assertEqual(1, limiter.decreases)
+
+    def test_hedged_request_wins_over_slow_primary(self) -> None:
+        scheduler = RequestScheduler(SchedulerConfig(hedge_after_s=0.05, initial_concurrency=4))
+        release = threading.Event()
+        first = threading.Event()
+
+        def _call(timeout):
+            if not first.is_set():
+                first.set()
+                release.wait(2)
+                return "slow"
+            return "fast"
+
+        try:
+            self.assertEqual("fast", scheduler.call(_call))
+        finally:
+            release.set()
+        self.assertEqual(1, scheduler.stats.hedged)
+        self.assertEqual(1, scheduler.stats.hedge_wins)
+
+    def test_map_ordered_preserves_order(self) -> None:
+        scheduler = RequestScheduler(SchedulerConfig(max_concurrency=4))
+
+        def _work(item: int) -> int:
+            time.sleep(0.01 * (5 - item))
+            return item * 10
+
+        self.assertEqual([0, 10, 20, 30, 40], list(scheduler.map_ordered(_work, range(5))))
+
+    def test_classification_helpers(self) -> None:
+        self.assertEqual("rate_limit", classify_failure(_ProviderError(429)))
+        self.assertEqual("server_error", classify_failure(_ProviderError(502)))
+        self.assertEqual("timeout", classify_failure(TimeoutError()))
+        self.assertIsNone(classify_failure(_ProviderError(401)))
+        self.assertEqual(0.25, retry_after_seconds(_ProviderError(429, {"retry-after-ms": "250"})))
+        self.assertIsNone(retry_after_seconds(_ProviderError(429, {"retry-after": "soon"})))
+
+    def test_config_from_env(self) -> None:
+        config = SchedulerConfig.from_env({"OG_NSD_LLM_RPM": "500", "OG_NSD_LLM_TIMEOUT": "off"})
+        self.assertEqual(500.0, config.requests_per_minute)
+        self.assertIsNone(config.timeout_s)
+
+    def test_openai_client_survives_injected_server_errors(self) -> None:
+        requirements = [Requirement("R1", "R1", "The ATM shall dispense cash.", None, None, None, None)]
+        scheduler = RequestScheduler(SchedulerConfig(backoff_base_s=0.01, max_retries=10))
+        faults = FaultInjection(server_error_rate=0.5)
+        with patch.dict("os.environ", {"OPENAI_API_KEY": "mock"}), MockLLMServer(
+            on_miss="synthetic", faults=faults, seed=3
+        ) as server:
+            llm = OpenAILLM(model="mock", base_url=server.url, scheduler=scheduler)
+            responses = [llm.generate_axioms(requirements) for _ in range(4)]
+
+        self.assertTrue(all("atm:Mock_R1" in response.turtle for response in responses))
+        self.assertEqual(4, scheduler.stats.successes)
+        self.assertGreater(scheduler.stats.retry_reasons.get("server_error", 0), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
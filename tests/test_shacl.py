@@ -0,0 +1,67 @@
+"""Unit tests for SHACL validation helpers."""
+
+import unittest
+
+from og_nsd.shacl import ShaclReport, ShaclResult, cluster_shacl_results
+from og_nsd.pipeline import OntologyDraftingPipeline
+
+SH = "http://www.w3.org/ns/shacl#"
+
+
+def _result(focus: str, path: str, component: str, severity: str = "Violation", shape: str = "s1") -> ShaclResult:
+    return ShaclResult(
+        focus_node=f"http://example.org/{focus}",
+        path=f"http://example.org/{path}",
+        message=f"{path} check failed",
+        severity=SH + severity,
+        source_shape=shape,
+        constraint_component=SH + component,
+        value=None,
+    )
+
+
+class ViolationClusteringTests(unittest.TestCase):
+    def test_groups_by_shape_path_and_component(self) -> None:
+        results = [_result(f"w{i}", "performedBy", "MinCountConstraintComponent") for i in range(50)]
+        results.append(_result("w0", "onAccount", "MinCountConstraintComponent", shape="s2"))
+
+        clusters = cluster_shacl_results(results, max_examples=3)
+
+        self.assertEqual(2, len(clusters))
+        self.assertEqual(50, clusters[0].count)
+        self.assertEqual(3, len(clusters[0].focus_nodes))
+        self.assertIn("(+47 more)", clusters[0].to_prompt())
+        self.assertIn("constraint=MinCountConstraintComponent", clusters[0].to_prompt())
+
+    def test_hidden_focus_count_ignores_repeated_focus_nodes(self) -> None:
+        results = [_result(f"w{i % 5}", "performedBy", "ClassConstraintComponent") for i in range(20)]
+
+        cluster = cluster_shacl_results(results, max_examples=3)[0]
+
+        self.assertEqual(20, cluster.count)
+        self.assertIn("(+2 more)", cluster.to_prompt())
+
+    def test_orders_by_severity_then_impact(self) -> None:
+        results = [_result(f"w{i}", "note", "DatatypeConstraintComponent", severity="Warning") for i in range(10)]
+        results.append(_result("w0", "onAccount", "ClassConstraintComponent"))
+        results.extend(_result(f"w{i}", "usesCard", "MaxCountConstraintComponent") for i in range(3))
+
+        clusters = cluster_shacl_results(results)
+
+        self.assertEqual(
+            ["usesCard", "onAccount", "note"],
+            [cluster.path.rsplit("/", 1)[-1] for cluster in clusters],
+        )
+
+    def test_repair_prompts_scale_with_distinct_problems(self) -> None:
+        results = [_result(f"w{i}", "performedBy", "MinCountConstraintComponent") for i in range(200)]
+        report = ShaclReport(False, "Validation Report", None, results)
+
+        prompts = OntologyDraftingPipeline._synthesize_repair_prompts(None, report)  # type: ignore[arg-type]
+
+        self.assertEqual(1, len(prompts))
+        self.assertIn("count=200", prompts[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
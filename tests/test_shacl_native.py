@@ -0,0 +1,174 @@
+"""Differential tests for the native SHACL Core engine against pyshacl."""
+
+import random
+import threading
+import unittest
+from collections import Counter
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.namespace import RDF, RDFS, SH, XSD
+
+from og_nsd.shacl import ShaclResult, ShaclValidator
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_GOLD = PROJECT_ROOT / "gold"
+_VALUES = {
+    XSD.decimal: Literal("12.5", datatype=XSD.decimal),
+    XSD.integer: Literal(7),
+    XSD.dateTime: Literal("2024-01-01T10:00:00", datatype=XSD.dateTime),
+    XSD.string: Literal("a"),
+}
+
+
+def _key(result: ShaclResult) -> tuple:
+    # Blank-node focus and value nodes get fresh labels in every report.
+    focus = result.focus_node if ":" in (result.focus_node or "") else "_"
+    value = result.value if result.value is None or ":" in result.value or " " in result.value else "_"
+    return (focus, result.path, result.message, result.severity, result.source_shape,
+            result.constraint_component, value)
+
+
+def _abox(shapes: Graph, tbox: Path, size: int, seed: int) -> Graph:
+    """Instances of every target class with missing, extra and ill-typed values."""
+
+    rng = random.Random(seed)
+    graph = Graph().parse(tbox)
+    classes = sorted(set(shapes.objects(None, SH.targetClass)))
+    namespace = str(classes[0]).rsplit("#", 1)[0] + "#"
+    for index in range(size):
+        cls = rng.choice(classes)
+        focus = URIRef(f"{namespace}i{index}") if rng.random() < 0.9 else BNode()
+        graph.add((focus, RDF.type, cls))
+        for shape in shapes.subjects(SH.targetClass, cls):
+            for prop in shapes.objects(shape, SH.property):
+                path = shapes.value(prop, SH.path)
+                inverse = shapes.value(path, SH.inversePath) if isinstance(path, BNode) else None
+                datatype, required = shapes.value(prop, SH.datatype), shapes.value(prop, SH["class"])
+                for _ in range(rng.choice([0, 1, 1, 2])):
+                    draw = rng.random()
+                    value = URIRef(f"{namespace}v{rng.randrange(size)}")
+                    if datatype is not None:
+                        value = rng.choice([_VALUES.get(datatype, Literal("x")), Literal("12"), Literal(5), value])
+                    elif draw < 0.5 and required is not None:
+                        graph.add((value, RDF.type, required))
+                    elif draw < 0.6:
+                        value = Literal("lit")
+                    if inverse is None:
+                        graph.add((focus, path, value))
+                    elif not isinstance(value, Literal):
+                        graph.add((value, inverse, focus))
+    special = URIRef(f"{namespace}Special")
+    graph.add((special, RDFS.subClassOf, classes[0]))
+    graph.add((URIRef(f"{namespace}s1"), RDF.type, special))
+    return graph
+
+
+def _cyclic(tbox: Path, size: int) -> Graph:
+    """Blank-node withdrawals that all perform each other, a cycle through every focus and value node."""
+
+    graph = Graph().parse(tbox)
+    namespace = "http://lod.csd.auth.gr/atm/atm.ttl#"
+    nodes = [BNode() for _ in range(size)]
+    for node in nodes:
+        graph.add((node, RDF.type, URIRef(f"{namespace}Withdrawal")))
+        for other in nodes:
+            graph.add((node, URIRef(f"{namespace}performedBy"), other))
+    return graph
+
+
+class NativeShaclEngineTests(unittest.TestCase):
+    def test_matches_pyshacl_on_the_gold_shapes(self) -> None:
+        for shapes_name, tbox_name in (("shapes_atm.ttl", "atm_gold.ttl"), ("shapes_health.ttl", "health_gold.ttl")):
+            native = ShaclValidator(_GOLD / shapes_name)
+            reference = ShaclValidator(_GOLD / shapes_name, engine="pyshacl")
+            self.assertEqual("native", native.engine)
+            for seed in range(3):
+                with self.subTest(shapes=shapes_name, seed=seed):
+                    graph = _abox(native.shapes_graph, _GOLD / tbox_name, 30, seed)
+                    expected, actual = reference.validate(graph), native.validate(graph)
+                    self.assertEqual(expected.conforms, actual.conforms)
+                    self.assertTrue(actual.results)
+                    self.assertEqual(Counter(map(_key, expected.results)), Counter(map(_key, actual.results)))
+
+    def test_cyclic_blank_nodes_are_cloned_once_per_depth(self) -> None:
+        native = ShaclValidator(_GOLD / "shapes_atm.ttl")
+        reference = ShaclValidator(_GOLD / "shapes_atm.ttl", engine="pyshacl")
+        graph = _cyclic(_GOLD / "atm_gold.ttl", 4)
+        expected, actual = reference.validate(graph), native.validate(graph)
+        self.assertEqual(Counter(map(_key, expected.results)), Counter(map(_key, actual.results)))
+
+        # One expanded copy per node and depth (0 to 8), instead of one per path through the cycle.
+        report = Graph().parse(data=native.validate(_cyclic(_GOLD / "atm_gold.ttl", 12)).report_graph_ttl)
+        withdrawal = URIRef("http://lod.csd.auth.gr/atm/atm.ttl#Withdrawal")
+        self.assertEqual(12 * 5, len(set(report.subjects(RDF.type, withdrawal))))
+
+    def test_sharded_validation_merges_shards_deterministically(self) -> None:
+        serial = ShaclValidator(_GOLD / "shapes_atm.ttl")
+        sharded = ShaclValidator(_GOLD / "shapes_atm.ttl", workers=2)
+        graph = _abox(serial.shapes_graph, _GOLD / "atm_gold.ttl", 60, 0)
+        expected = serial.validate(graph)
+        with patch("og_nsd.shacl._MIN_SHARD_FOCUS_NODES", 0):
+            first, second = sharded.validate(graph), sharded.validate(graph)
+
+        # Sharded runs keep the workers' N-Triples as the report graph.
+        self.assertTrue(first.report_graph_ttl.startswith("_:"))
+        self.assertEqual(Counter(map(_key, expected.results)), Counter(map(_key, first.results)))
+        self.assertEqual(list(map(_key, first.results)), list(map(_key, second.results)))
+        self.assertEqual(first.text_report, second.text_report)
+        self.assertEqual(sorted(expected.text_report.splitlines()), sorted(first.text_report.splitlines()))
+        merged = Graph().parse(data=first.report_graph_ttl, format="turtle")
+        self.assertEqual(len(Graph().parse(data=expected.report_graph_ttl, format="turtle")), len(merged))
+        self.assertEqual(1, len(list(merged.subjects(RDF.type, SH.ValidationReport))))
+
+    def test_sharded_cyclic_blank_nodes_clone_to_the_same_triples(self) -> None:
+        serial = ShaclValidator(_GOLD / "shapes_atm.ttl")
+        sharded = ShaclValidator(_GOLD / "shapes_atm.ttl", workers=2)
+        graph = _cyclic(_GOLD / "atm_gold.ttl", 12)
+        expected = serial.validate(graph)
+        with patch("og_nsd.shacl._MIN_SHARD_FOCUS_NODES", 0):
+            report = sharded.validate(graph)
+
+        # Shards label nested copies by node and depth, so overlapping copies merge.
+        self.assertTrue(report.report_graph_ttl.startswith("_:"))
+        merged = Graph().parse(data=report.report_graph_ttl, format="turtle")
+        self.assertEqual(len(Graph().parse(data=expected.report_graph_ttl, format="turtle")), len(merged))
+
+    def test_validation_stays_serial_while_other_threads_run(self) -> None:
+        validator = ShaclValidator(_GOLD / "shapes_atm.ttl", workers=2)
+        graph = _abox(validator.shapes_graph, _GOLD / "atm_gold.ttl", 20, 0)
+        release = threading.Event()
+        worker = threading.Thread(target=release.wait)
+        worker.start()
+        try:
+            with patch("og_nsd.shacl._MIN_SHARD_FOCUS_NODES", 0):
+                report = validator.validate(graph)
+        finally:
+            release.set()
+            worker.join()
+
+        self.assertTrue(report.report_graph_ttl.startswith("@prefix"))
+
+    def test_unsupported_shapes_fall_back_to_pyshacl(self) -> None:
+        with TemporaryDirectory() as tmpdir:
+            shapes = Path(tmpdir) / "shapes.ttl"
+            shapes.write_text(
+                "@prefix sh: <http://www.w3.org/ns/shacl#> .\n@prefix ex: <http://example.org/> .\n"
+                "ex:CodeShape a sh:NodeShape ; sh:targetClass ex:Item ;\n"
+                "    sh:property [ sh:path ex:code ; sh:pattern \"^[A-Z]+$\" ] .\n",
+                encoding="utf-8",
+            )
+            validator = ShaclValidator(shapes)
+        self.assertEqual("pyshacl", validator.engine)
+        self.assertIn("pattern", validator.fallback_reason)
+        graph = Graph().parse(data="<http://example.org/i> a <http://example.org/Item> ; "
+                                   "<http://example.org/code> \"abc\" .", format="turtle")
+        report = validator.validate(graph)
+        self.assertFalse(report.conforms)
+        self.assertEqual([str(SH.PatternConstraintComponent)], [result.constraint_component for result in report.results])
+
+
+if __name__ == "__main__":
+    unittest.main()
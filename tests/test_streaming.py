@@ -0,0 +1,141 @@
+"""Unit tests for streamed LLM responses and incremental Turtle parsing."""
+
+import unittest
+from unittest.mock import patch
+
+from rdflib import Literal, Namespace, URIRef
+from rdflib.compare import isomorphic
+from rdflib.namespace import OWL, RDF, RDFS
+
+from og_nsd.llm import OpenAILLM
+from og_nsd.mock_llm import MockLLMServer
+from og_nsd.ontology import (
+    IncrementalTurtleParser,
+    OntologyAssembler,
+    StreamAborted,
+    TurtleStatementSplitter,
+)
+from og_nsd.requirements import Requirement
+
+ATM = Namespace("http://lod.csd.auth.gr/atm/atm.ttl#")
+
+_TURTLE = '''```turtle
+@prefix atm: <http://example.org/other#> .
+PREFIX ex: <http://example.org/ex/>
+# comments may contain dots. like this
+atm:ATM a owl:Class ; rdfs:label "A.T.M." ; atm:limit 2.50 .
+atm:Card rdfs:subClassOf [ a owl:Restriction ; owl:onProperty atm:issuedBy ; owl:someValuesFrom ex:Bank ] .
+ex:Bank rdfs:comment """Multi-line . text
+with "quotes".""" .
+atm:Account a owl:Class
+```'''
+
+
+def _split(text: str, size: int) -> list[str]:
+    splitter = TurtleStatementSplitter()
+    statements: list[str] = []
+    for start in range(0, len(text), size):
+        statements.extend(splitter.feed(text[start : start + size]))
+    return statements + splitter.flush()
+
+
+class TurtleStatementSplitterTests(unittest.TestCase):
+    def test_statement_boundaries_are_independent_of_chunking(self) -> None:
+        expected = _split(_TURTLE, len(_TURTLE))
+        self.assertEqual(6, len(expected))
+        self.assertTrue(expected[2].endswith("atm:limit 2.50 ."))
+        self.assertEqual("atm:Account a owl:Class", expected[-1])
+        for size in (1, 2, 3, 7, 16):
+            self.assertEqual(expected, _split(_TURTLE, size), f"chunk size {size}")
+
+    def test_statement_is_held_until_terminator_is_confirmed(self) -> None:
+        splitter = TurtleStatementSplitter()
+        self.assertEqual([], splitter.feed("atm:A atm:value 1."))
+        self.assertEqual([], splitter.feed("5 ."))
+        self.assertEqual(["atm:A atm:value 1.5 ."], splitter.feed("\n"))
+
+
+class IncrementalTurtleParserTests(unittest.TestCase):
+    def _parser(self, **limits) -> IncrementalTurtleParser:
+        return OntologyAssembler(None, base_namespace=str(ATM)).stream_parser(**limits)
+
+    def test_parses_chunks_like_add_turtle(self) -> None:
+        parser = self._parser()
+        graph = parser.feed_all(_TURTLE[start : start + 5] for start in range(0, len(_TURTLE), 5))
+
+        assembler = OntologyAssembler(None, base_namespace=str(ATM))
+        state = assembler.bootstrap()
+        assembler.add_turtle(state, _TURTLE.replace("atm:Account a owl:Class\n", "atm:Account a owl:Class .\n"))
+        self.assertTrue(isomorphic(state.graph, graph))
+        self.assertIn((ATM.ATM, RDFS.label, Literal("A.T.M.")), graph)
+        self.assertIn((ATM.Account, RDF.type, OWL.Class), graph)
+        self.assertEqual(0, parser.stats.failed_statements)
+        self.assertIsNotNone(parser.stats.first_triple_s)
+
+    def test_recovers_sanitizable_statements(self) -> None:
+        parser = self._parser()
+        parser.feed("atm:A rdfs:seeAlso ?atm:Amount .\natm:B a owl:Class .\n")
+        graph = parser.close()
+        self.assertIn((ATM.B, RDF.type, OWL.Class), graph)
+        self.assertIn((ATM.A, RDFS.seeAlso, ATM.Amount), graph)
+        self.assertEqual(0, parser.stats.failed_statements)
+
+    def test_labelled_blank_nodes_span_statements(self) -> None:
+        parser = self._parser()
+        parser.feed("_:r a owl:Restriction .\n")
+        parser.feed("atm:Card rdfs:subClassOf _:r .\n")
+        graph = parser.close()
+        restriction = graph.value(ATM.Card, RDFS.subClassOf)
+        self.assertIn((restriction, RDF.type, OWL.Restriction), graph)
+
+    def test_aborts_on_budget(self) -> None:
+        parser = self._parser(max_chars=40)
+        parser.feed("atm:A a owl:Class .\n")
+        with self.assertRaises(StreamAborted) as ctx:
+            parser.feed("atm:B a owl:Class .\natm:C a owl:Class .\n")
+        self.assertEqual("budget", ctx.exception.reason)
+        self.assertEqual({(ATM.A, RDF.type, OWL.Class)}, set(parser.graph))
+
+    def test_aborts_when_output_stops_parsing(self) -> None:
+        parser = self._parser(max_consecutive_failures=2)
+        parser.feed("atm:A a owl:Class .\n")
+        with self.assertRaises(StreamAborted) as ctx:
+            for _ in range(3):
+                parser.feed("this is not turtle at all .\n")
+        self.assertEqual("unparseable", ctx.exception.reason)
+        self.assertEqual("unparseable", parser.stats.aborted)
+        self.assertEqual(1, len(parser.graph))
+
+
+class StreamingOpenAITests(unittest.TestCase):
+    def test_streams_through_mock_server(self) -> None:
+        requirements = [
+            Requirement(f"R{idx}", f"R{idx}", "The ATM shall dispense cash.", None, None, None, None)
+            for idx in range(12)
+        ]
+        assembler = OntologyAssembler(None, base_namespace=str(ATM))
+        with patch.dict("os.environ", {"OPENAI_API_KEY": "mock"}), MockLLMServer(on_miss="synthetic") as server:
+            full = OpenAILLM(model="mock", base_url=server.url).generate_axioms(requirements)
+            streamed = OpenAILLM(
+                model="mock", base_url=server.url, stream=True, stream_parser_factory=assembler.stream_parser
+            ).generate_axioms(requirements)
+            capped = OpenAILLM(
+                model="mock", base_url=server.url, stream=True, stream_budget_tokens=50
+            ).generate_axioms(requirements)
+
+        self.assertEqual(full.turtle, streamed.turtle)
+        self.assertEqual(full.token_usage, streamed.token_usage)
+        self.assertIn((ATM.Mock_R0, RDF.type, OWL.Class), streamed.graph)
+        self.assertEqual(24, len(streamed.graph))
+        self.assertIsNone(streamed.streaming["aborted"])
+
+        self.assertEqual("budget", capped.streaming["aborted"])
+        self.assertLess(len(capped.graph), len(streamed.graph))
+
+        state = assembler.bootstrap()
+        assembler.add_response(state, streamed)
+        self.assertIn((URIRef(ATM.Mock_R11), RDF.type, OWL.Class), state.graph)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""Unit tests for template-based symbolic drafting."""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from rdflib import Literal, Namespace
+from rdflib.namespace import OWL, RDF, RDFS
+
+from og_nsd.ontology import OntologyAssembler, SchemaContext
+from og_nsd.requirements import Requirement, RequirementLoader
+from og_nsd.templates import TemplateCompiler, parse_main
+
+ATM = Namespace("http://lod.csd.auth.gr/atm/atm.ttl#")
+
+_CONTEXT = SchemaContext(
+    classes=["atm:ATM", "atm:BankComputer", "atm:CashCard", "atm:Message", "atm:Transaction"],
+    object_properties={
+        "atm:sendsMessageTo": {"domain": "atm:ATM", "range": "atm:BankComputer"},
+        "atm:usesCard": {"domain": "atm:Transaction", "range": "atm:CashCard"},
+    },
+    datatype_properties={"atm:bankCode": {"domain": "atm:CashCard", "range": "xsd:string"}},
+    labels={},
+    prefixes={"atm": str(ATM)},
+)
+
+
+def _requirement(identifier: str, main: str) -> Requirement:
+    return Requirement(identifier, identifier, main, None, None, main, None)
+
+
+class ParseMainTests(unittest.TestCase):
+    def test_recognizes_supported_clauses(self) -> None:
+        clause = parse_main(
+            "<System:ATM> SHALL <Function:verify> <Item:password> AND <Item:bank code> WITH <System:bank computer>"
+        )
+        self.assertEqual(("ATM", "verify", ["password", "bank code"]), (clause.subject, clause.verb, clause.objects))
+        self.assertEqual(("with", "bank computer"), (clause.preposition, clause.target))
+
+        clause = parse_main("<System:ATM> SHALL SET <Item:cash_card> TO <StateValue:valid>")
+        self.assertEqual(("set", "valid"), (clause.verb, clause.state_value))
+
+        self.assertEqual("send", parse_main("<System:ATM> SHALL SEND <Item:a> AND <Item:b>").verb)
+
+    def test_rejects_free_form_and_negated_clauses(self) -> None:
+        for main in (
+            None,
+            "<System:ATM> SHALL NOT SET <Item:card> TO <StateValue:accepted>",
+            "<System:ATM> SHALL KEEP <Item:card> ALSO <System:ATM> SHALL DISPLAY <Item:message>",
+            "The <Environment:bank> SHALL BE RESPONSIBLE FOR the security of their own computer.",
+        ):
+            self.assertIsNone(parse_main(main), main)
+
+
+class TemplateCompilerTests(unittest.TestCase):
+    def test_compiles_grounded_requirements_and_leaves_the_rest(self) -> None:
+        requirements = [
+            _requirement("R1", "<System:ATM> SHALL <Function:eject> <Item:card>"),
+            _requirement("R2", "<System:ATM> SHALL <Function:send> <Flow:message> TO <System:bank computer>"),
+            _requirement("R3", "<System:ATM> SHALL SET <Item:transaction> TO <StateValue:to_be_dispensed>"),
+            _requirement("R4", "<System:ATM> SHALL <Function:verify> <Item:password> WITH <System:bank computer>"),
+            _requirement("R5", "The ATM checks the card."),
+        ]
+        result = TemplateCompiler(_CONTEXT, str(ATM)).compile(requirements)
+
+        self.assertEqual(["R1", "R2", "R3"], result.handled)
+        self.assertEqual(["R4", "R5"], [req.identifier for req in result.remaining])
+
+        assembler = OntologyAssembler(None, base_namespace=str(ATM))
+        state = assembler.bootstrap()
+        assembler.add_response(state, result.response)
+        graph = state.graph
+        # "card" resolves to the schema's CashCard; the verb becomes a new property.
+        self.assertIn((ATM.ejects, RDFS.domain, ATM.ATM), graph)
+        self.assertIn((ATM.ejects, RDFS.range, ATM.CashCard), graph)
+        self.assertIn((ATM.ATM_ejects_CashCard, ATM.sourceRequirement, Literal("R1")), graph)
+        # An existing property with the same verb and signature is reused, not redefined.
+        self.assertIn((ATM.ATM_sendsMessageTo_BankComputer, OWL.annotatedProperty, ATM.sendsMessageTo), graph)
+        self.assertNotIn((ATM.sendsMessageTo, RDFS.domain, ATM.ATM), graph)
+        self.assertIn((ATM.ToBeDispensed, RDF.type, OWL.NamedIndividual), graph)
+        self.assertIn((ATM.Transaction_hasState_ToBeDispensed, OWL.annotatedTarget, ATM.ToBeDispensed), graph)
+
+    def test_nothing_handled_returns_no_response(self) -> None:
+        result = TemplateCompiler(_CONTEXT, str(ATM)).compile([_requirement("R1", "Free text only.")])
+        self.assertIsNone(result.response)
+        self.assertEqual(1, len(result.remaining))
+
+
+class RequirementLoaderBoilerplateTests(unittest.TestCase):
+    def test_keeps_boilerplate_type_and_placeholders(self) -> None:
+        record = {
+            "title": "Functional requirement 8",
+            "text": "The ATM ejects the card.",
+            "boilerplate": {"main": "<System:ATM> SHALL <Function:eject> <Item:card>"},
+            "boilerplate_type": "M1",
+            "placeholders": [{"span": "card", "type": "Item", "start": 40, "end": 44}],
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "reqs.json"
+            path.write_text(json.dumps([record]), encoding="utf-8")
+            (requirement,) = RequirementLoader(path).load()
+        self.assertEqual("M1", requirement.boilerplate_type)
+        self.assertEqual("card", requirement.placeholders[0]["span"])
+
+
+if __name__ == "__main__":
+    unittest.main()
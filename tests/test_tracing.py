@@ -0,0 +1,81 @@
+"""Unit tests for per-stage timing spans."""
+
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from og_nsd.config import PipelineConfig
+from og_nsd.pipeline import OntologyDraftingPipeline
+from og_nsd.tracing import Tracer, span
+
+
+class TracerTests(unittest.TestCase):
+    def test_spans_nest_and_aggregate(self) -> None:
+        tracer = Tracer()
+        with tracer.activate():
+            with span("outer", triples=10):
+                for _ in range(3):
+                    with span("inner") as stage:
+                        stage.count("tokens", 5)
+
+        report = tracer.to_report()
+
+        self.assertEqual(["outer"], [root["name"] for root in report["spans"]])
+        self.assertEqual(3, len(report["spans"][0]["children"]))
+        self.assertEqual(3, report["stages"]["inner"]["calls"])
+        self.assertEqual(15, report["stages"]["inner"]["counts"]["tokens"])
+        self.assertEqual(10, report["stages"]["outer"]["counts"]["triples"])
+
+    def test_span_is_noop_without_active_tracer(self) -> None:
+        with span("orphan", triples=1) as stage:
+            stage.count("tokens", 3)
+        self.assertEqual({}, stage.counts)
+
+    def test_chrome_trace_export(self) -> None:
+        tracer = Tracer()
+        with tracer.activate(), span("outer"), span("inner"):
+            pass
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "trace.json"
+            tracer.export_chrome_trace(path)
+            events = json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+
+        self.assertEqual(["outer", "inner"], [event["name"] for event in events])
+        self.assertTrue(all(event["ph"] == "X" for event in events))
+
+
+class PipelinePerformanceReportTests(unittest.TestCase):
+    def test_draft_run_reports_stage_timings(self) -> None:
+        with TemporaryDirectory() as tmp, patch.dict("os.environ", {"OG_NSD_CACHE_DIR": tmp}):
+            tmp_path = Path(tmp)
+            requirements = tmp_path / "reqs.jsonl"
+            requirements.write_text(
+                json.dumps({"id": "R1", "text": "The ATM shall dispense cash."}) + "\n",
+                encoding="utf-8",
+            )
+            config = PipelineConfig(
+                requirements_path=requirements,
+                shapes_path=None,
+                base_ontology_path=None,
+                competency_questions_path=None,
+                output_path=tmp_path / "out.ttl",
+                report_path=tmp_path / "report.json",
+                trace_path=tmp_path / "trace.json",
+                draft_only=True,
+                intermediate_dir=tmp_path / "build",
+            )
+            report = OntologyDraftingPipeline(config).run()
+            saved = json.loads(config.report_path.read_text(encoding="utf-8"))
+            self.assertTrue(config.trace_path.exists())
+
+        stages = report["performance"]["stages"]
+        for name in ("pipeline.run", "requirements.load", "draft", "llm.generate_axioms", "ontology.add_triples"):
+            self.assertIn(name, stages)
+        self.assertEqual(1, stages["requirements.load"]["counts"]["requirements"])
+        self.assertIn("performance", saved)
+
+
+if __name__ == "__main__":
+    unittest.main()